@@ -2,5 +2,6 @@
 # Handles external LLM service integration - OpenAI
 
 from .client import LLMClient, LLMError, InvalidAPIKeyError
+from .response_cache import LLMResponseCache
 
-__all__ = ["LLMClient", "LLMError", "InvalidAPIKeyError"]
+__all__ = ["LLMClient", "LLMError", "InvalidAPIKeyError", "LLMResponseCache"]
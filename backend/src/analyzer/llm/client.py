@@ -9,18 +9,31 @@ import mimetypes
 import os
 import time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, Dict, List, Any, Mapping, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, List, Any, Awaitable, Callable, Mapping, Tuple
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 import tiktoken
 from pathlib import Path
 import json
 import re
 
+from .response_cache import LLMResponseCache, get_default_response_cache
+from .transport import (
+    backoff_delay,
+    create_async_http_client,
+    get_max_retries,
+    get_shared_http_client,
+    get_shared_rate_limiter,
+    is_retryable_error,
+    retry_after_seconds,
+)
+
 try:
+    from scanner.content_store import get_shared_content_store
     from scanner.media import AUDIO_EXTENSIONS, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
 except ImportError:  # pragma: no cover - fallback when scanner isn't on sys.path
+    from ...scanner.content_store import get_shared_content_store
     from ...scanner.media import AUDIO_EXTENSIONS, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
 
 try:
@@ -54,6 +67,165 @@ class InvalidAPIKeyError(Exception):
     pass
 
 
+# Upper bound for AI_MAX_CONCURRENT_SUMMARIES.
+_MAX_SUMMARY_CONCURRENCY = 32
+
+
+class _SummarySlots:
+    """
+    Async concurrency limit that can be resized while slots are held.
+
+    Only used from coroutines on the scheduler loop; ``limit`` may be
+    changed from any thread and takes effect as slots are acquired.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def wake_all(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            condition.notify_all()
+
+    async def __aenter__(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._active -= 1
+            condition.notify()
+
+
+class _SummaryScheduler:
+    """
+    Process-wide event loop for file summarization.
+
+    One background loop is shared by every LLMClient so a single concurrency
+    limit caps in-flight summaries across all scans, and no thread/loop is
+    spun up per batch. The limit follows AI_MAX_CONCURRENT_SUMMARIES as it
+    changes (see ``resize``).
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._loop = asyncio.new_event_loop()
+        # Sized for the largest allowed limit; threads are only started on demand.
+        self._loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=_MAX_SUMMARY_CONCURRENCY, thread_name_prefix="llm-summary")
+        )
+        self._slots = _SummarySlots(self.max_concurrency)
+        self._http_client = None
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="llm-summary-scheduler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def slot(self) -> _SummarySlots:
+        """Global concurrency slot; only call from coroutines running on this loop."""
+        return self._slots
+
+    def resize(self, max_concurrency: int) -> None:
+        """Change the concurrency limit; waiting summaries are woken if it grew."""
+        max_concurrency = max(1, int(max_concurrency))
+        if max_concurrency == self.max_concurrency:
+            return
+        grew = max_concurrency > self.max_concurrency
+        self.max_concurrency = max_concurrency
+        self._slots.limit = max_concurrency
+        if grew:
+            asyncio.run_coroutine_threadsafe(self._slots.wake_all(), self._loop)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def http_client(self):
+        """Pooled async HTTP client shared by all AsyncOpenAI clients on this loop."""
+        if self._http_client is None:
+            self._http_client = create_async_http_client()
+        return self._http_client
+
+    def run(
+        self,
+        coro,
+        heartbeat_callback: Optional[Any] = None,
+        heartbeat_interval_sec: int = 15,
+    ):
+        """Block until ``coro`` finishes on the scheduler loop, emitting heartbeats."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        heartbeat_every = max(1, int(heartbeat_interval_sec))
+        while True:
+            try:
+                return future.result(timeout=heartbeat_every)
+            except FutureTimeoutError:
+                if callable(heartbeat_callback):
+                    try:
+                        heartbeat_callback()
+                    except Exception:
+                        # Best effort progress signal.
+                        pass
+
+
+class _SummaryBudget:
+    """
+    Time and token budget for one scan's file summaries.
+
+    A multi-project scan passes the same budget to every project, so the
+    deadline and the reserved tokens cover the whole scan. Only touched from
+    coroutines on the scheduler loop, so it needs no lock.
+    """
+
+    def __init__(self, time_budget_sec: int = 0, token_budget: int = 0):
+        self.time_budget_sec = time_budget_sec
+        self.token_budget = token_budget
+        self.deadline = time.monotonic() + time_budget_sec if time_budget_sec > 0 else None
+        self.tokens_reserved = 0
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def reserve(self, tokens: int) -> bool:
+        """Reserve ``tokens`` against the budget; False if that would exceed it."""
+        if self.token_budget > 0 and self.tokens_reserved + tokens > self.token_budget:
+            return False
+        self.tokens_reserved += tokens
+        return True
+
+
+# model -> monotonic time tiktoken last failed to load its encoding. Encodings
+# are fetched over the network on first use, so an offline host would
+# otherwise wait on that download for every token count.
+_tokenizer_failed_at: Dict[str, float] = {}
+_TOKENIZER_RETRY_SEC = 600.0
+
+_summary_scheduler: Optional[_SummaryScheduler] = None
+_summary_scheduler_lock = threading.Lock()
+
+
+def _get_summary_scheduler(max_concurrency: int) -> _SummaryScheduler:
+    """The shared scheduler, resized to ``max_concurrency`` if that changed."""
+    global _summary_scheduler
+    with _summary_scheduler_lock:
+        if _summary_scheduler is None:
+            _summary_scheduler = _SummaryScheduler(max_concurrency)
+        else:
+            _summary_scheduler.resize(max_concurrency)
+        return _summary_scheduler
+
+
 class LLMClient:
     """
     Client for interacting with OpenAI's API.
@@ -66,16 +238,20 @@ class LLMClient:
     DEFAULT_TEMPERATURE = 0.7
     DEFAULT_MAX_TOKENS = 4000
     DEFAULT_REQUEST_TIMEOUT_SEC = 90
-    DEFAULT_SINGLE_PROJECT_BATCH_SIZE = 10
     DEFAULT_BATCH_HEARTBEAT_SEC = 15
     DEFAULT_FILE_SUMMARY_TIMEOUT_SEC = 300
     DEFAULT_MAX_FILE_SUMMARY_TOKENS = 12000
+    DEFAULT_MAX_CONCURRENT_SUMMARIES = 8
+    DEFAULT_MAX_SUMMARY_FILES = 80
     
     def __init__(
         self, 
         api_key: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        sleep: Optional[Callable[[float], Any]] = None,
+        async_sleep: Optional[Callable[[float], Awaitable[Any]]] = None,
     ):
         """
         Initialize the LLM client.
@@ -86,12 +262,23 @@ class LLMClient:
                         Lower = more focused/deterministic, higher = more creative/random.
             max_tokens: Maximum tokens in response. Default 1000 (recommended).
                        Higher values allow longer responses but cost more.
+            response_cache: Optional response cache. Defaults to the shared
+                       on-disk cache when LLM_RESPONSE_CACHE=1.
+            sleep: Optional replacement for time.sleep between retries.
+            async_sleep: Optional replacement for asyncio.sleep between async retries.
         """
         self.api_key = api_key
         self.client = None
+        self._async_client = None
         self.logger = logging.getLogger(__name__)
         self._tokenizer_cache: Dict[str, Any] = {}
         self._tokenizer_warning_emitted = False
+        self.response_cache = response_cache if response_cache is not None else get_default_response_cache()
+        self._cache_stats_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._sleep = sleep
+        self._async_sleep = async_sleep
         
         self.temperature = temperature if temperature is not None else self.DEFAULT_TEMPERATURE
         self.max_tokens = max_tokens if max_tokens is not None else self.DEFAULT_MAX_TOKENS
@@ -101,6 +288,8 @@ class LLMClient:
             minimum=15,
             maximum=600,
         )
+        self.max_retries = get_max_retries()
+        self.rate_limiter = get_shared_rate_limiter()
 
         if not 0.0 <= self.temperature <= 2.0:
             raise ValueError("Temperature must be between 0.0 and 2.0")
@@ -109,7 +298,12 @@ class LLMClient:
         
         if api_key:
             try:
-                self.client = OpenAI(api_key=api_key)
+                # Retries are handled by _create_with_retry so they share the rate limiter.
+                self.client = OpenAI(
+                    api_key=api_key,
+                    max_retries=0,
+                    http_client=get_shared_http_client(),
+                )
                 self.logger.info(
                     f"LLM client initialized (model: {self.DEFAULT_MODEL}, "
                     f"temperature: {self.temperature}, max_tokens: {self.max_tokens})"
@@ -164,6 +358,22 @@ class LLMClient:
             "max_tokens": self.max_tokens
         }
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache hit/miss counts for calls made by this client.
+        
+        Returns:
+            Dict with hits, misses, hit_rate and whether caching is enabled
+        """
+        with self._cache_stats_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                "enabled": self.response_cache is not None,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": (self._cache_hits / lookups) if lookups else 0.0,
+            }
+
     def verify_api_key(self) -> bool:
         """
         Verify that the API key is valid by making a test request.
@@ -249,6 +459,9 @@ class LLMClient:
         cached = self._tokenizer_cache.get(tokenizer_model)
         if cached is not None:
             return cached
+        failed_at = _tokenizer_failed_at.get(tokenizer_model)
+        if failed_at is not None and time.monotonic() - failed_at < _TOKENIZER_RETRY_SEC:
+            return None
 
         normalized_model = tokenizer_model.lower()
         preferred_encoding_name = None
@@ -284,6 +497,7 @@ class LLMClient:
                 except Exception:
                     continue
 
+        _tokenizer_failed_at[tokenizer_model] = time.monotonic()
         return None
     
     def _count_tokens(self, text: str, model: Optional[str] = None) -> int:
@@ -699,6 +913,165 @@ class LLMClient:
 
         return None
     
+    def _prepare_llm_call(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        response_format: Optional[Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], Optional[str], Optional[str]]:
+        """Resolve defaults and consult the response cache.
+
+        Returns:
+            (request kwargs, cache key or None, cached response or None)
+        """
+        if not self.is_configured():
+            raise LLMError("LLM client is not configured with an API key")
+
+        model = model or self.DEFAULT_MODEL
+        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
+        temperature = temperature if temperature is not None else self.temperature
+
+        kwargs: Dict[str, Any] = dict(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if response_format:
+            kwargs["response_format"] = response_format
+        kwargs["timeout"] = self.request_timeout_sec
+
+        if self.response_cache is None:
+            return kwargs, None, None
+
+        cache_key = LLMResponseCache.make_key(model, messages, temperature, max_tokens, response_format)
+        cached = self.response_cache.get(cache_key)
+        with self._cache_stats_lock:
+            if cached is not None:
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
+        if cached is not None:
+            self.logger.debug("LLM cache hit (%s)", cache_key[:12])
+        return kwargs, cache_key, cached
+
+    def _evict_cached_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Drop a cached response the caller could not use, so reruns ask the model again."""
+        if self.response_cache is None:
+            return
+        self.response_cache.delete(LLMResponseCache.make_key(
+            model or self.DEFAULT_MODEL,
+            messages,
+            temperature if temperature is not None else self.temperature,
+            max_tokens if max_tokens is not None else self.max_tokens,
+            response_format,
+        ))
+
+    def _finish_llm_call(self, response: Any, cache_key: Optional[str]) -> str:
+        if response and response.choices:
+            content = response.choices[0].message.content.strip()
+            if cache_key is not None:
+                self.response_cache.set(cache_key, content)
+            return content
+
+        raise LLMError("Empty response from API")
+
+    @staticmethod
+    def _estimate_request_tokens(kwargs: Mapping[str, Any]) -> int:
+        """Rough prompt + completion token count for rate limiting (~4 chars per token)."""
+        prompt_chars = 0
+        for message in kwargs.get("messages") or []:
+            content = message.get("content") if isinstance(message, Mapping) else None
+            if isinstance(content, str):
+                prompt_chars += len(content)
+        return prompt_chars // 4 + int(kwargs.get("max_tokens") or 0)
+
+    def _log_retry(self, exc: Exception, attempt: int, delay: float) -> None:
+        self.logger.warning(
+            "LLM call failed (%s), retry %d/%d in %.1fs",
+            type(exc).__name__,
+            attempt + 1,
+            self.max_retries,
+            delay,
+        )
+
+    def _create_with_retry(self, kwargs: Dict[str, Any]) -> Any:
+        """Rate-limited chat completion with jittered backoff on transient errors."""
+        estimated_tokens = self._estimate_request_tokens(kwargs)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(estimated_tokens)
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable_error(exc):
+                    raise
+                delay = backoff_delay(attempt, retry_after_seconds(exc))
+                self._log_retry(exc, attempt, delay)
+                (self._sleep or time.sleep)(delay)
+                attempt += 1
+
+    async def _create_with_retry_async(self, kwargs: Dict[str, Any]) -> Any:
+        """Async counterpart of _create_with_retry; waits without blocking the loop."""
+        estimated_tokens = self._estimate_request_tokens(kwargs)
+        client = self._get_async_client()
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async(estimated_tokens)
+            try:
+                return await client.chat.completions.create(**kwargs)
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable_error(exc):
+                    raise
+                delay = backoff_delay(attempt, retry_after_seconds(exc))
+                self._log_retry(exc, attempt, delay)
+                await (self._async_sleep or asyncio.sleep)(delay)
+                attempt += 1
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI bound to the summary scheduler loop and its pooled HTTP client."""
+        if self._async_client is None:
+            scheduler = self._get_scheduler()
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=0,
+                http_client=scheduler.http_client(),
+            )
+        return self._async_client
+
+    def _map_llm_error(self, e: Exception) -> LLMError:
+        """Translate an API/client exception into the LLMError hierarchy."""
+        error_msg = str(e).lower()
+
+        # Check error message content to determine error type
+        if (
+            isinstance(e, openai.AuthenticationError)
+            or "authentication" in error_msg
+            or "api key" in error_msg
+            or "unauthorized" in error_msg
+            or "invalid key" in error_msg
+        ):
+            return InvalidAPIKeyError("Invalid API key. Please verify your OpenAI API key is correct.")
+        elif isinstance(e, openai.APIError) or "api error" in error_msg:
+            return LLMError(f"API error: {str(e)}")
+        elif "rate limit" in error_msg or "quota" in error_msg:
+            return LLMError(f"Rate limit exceeded. Please wait a moment and try again, or check your API quota: {str(e)}")
+        elif "connection" in error_msg or "network" in error_msg:
+            return LLMError(f"Connection error. Please check your internet connection and try again: {str(e)}")
+        elif "timeout" in error_msg:
+            return LLMError(f"Request timed out. Please check your internet connection and try again: {str(e)}")
+        else:
+            return LLMError(f"LLM call failed: {str(e)}")
+
     def _make_llm_call(
         self, 
         messages: List[Dict[str, str]], 
@@ -722,53 +1095,69 @@ class LLMClient:
         Raises:
             LLMError: If API call fails
         """
-        if not self.is_configured():
-            raise LLMError("LLM client is not configured with an API key")
-        
-        model = model or self.DEFAULT_MODEL
-        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
-        temperature = temperature if temperature is not None else self.temperature
-        
+        kwargs, cache_key, cached = self._prepare_llm_call(
+            messages, model, max_tokens, temperature, response_format
+        )
+        if cached is not None:
+            return cached
+
         try:
-            kwargs: Dict[str, Any] = dict(
-                model=model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
+            response = self._create_with_retry(kwargs)
+            return self._finish_llm_call(response, cache_key)
+        except Exception as e:
+            raise self._map_llm_error(e)
+
+    async def _make_llm_call_async(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Async-native _make_llm_call over the shared connection pool.
+        
+        Requests run on the summary scheduler loop (which owns the pooled
+        AsyncOpenAI client); awaiting from any other loop hops over to it.
+        """
+        scheduler = self._get_scheduler()
+        if asyncio.get_running_loop() is not scheduler.loop:
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+                self._make_llm_call_async(
+                    messages,
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    response_format=response_format,
+                ),
+                scheduler.loop,
+            ))
+
+        # Cache reads/writes (decrypt, encrypt, file writes, eviction) run on
+        # the loop's default executor so they never stall other summaries.
+        if self.response_cache is None:
+            kwargs, cache_key, cached = self._prepare_llm_call(
+                messages, model, max_tokens, temperature, response_format
+            )
+        else:
+            kwargs, cache_key, cached = await scheduler.loop.run_in_executor(
+                None,
+                self._prepare_llm_call,
+                messages, model, max_tokens, temperature, response_format,
             )
-            if response_format:
-                kwargs["response_format"] = response_format
-            kwargs["timeout"] = self.request_timeout_sec
+        if cached is not None:
+            return cached
 
-            response = self.client.chat.completions.create(**kwargs)
-            
-            if response and response.choices:
-                return response.choices[0].message.content.strip()
-            
-            raise LLMError("Empty response from API")
-            
+        try:
+            response = await self._create_with_retry_async(kwargs)
+            if cache_key is None:
+                return self._finish_llm_call(response, cache_key)
+            return await scheduler.loop.run_in_executor(
+                None, self._finish_llm_call, response, cache_key
+            )
         except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Check error message content to determine error type
-            if (
-                isinstance(e, openai.AuthenticationError)
-                or "authentication" in error_msg
-                or "api key" in error_msg
-                or "unauthorized" in error_msg
-                or "invalid key" in error_msg
-            ):
-                raise InvalidAPIKeyError("Invalid API key. Please verify your OpenAI API key is correct.")
-            elif isinstance(e, openai.APIError) or "api error" in error_msg:
-                raise LLMError(f"API error: {str(e)}")
-            elif "rate limit" in error_msg or "quota" in error_msg:
-                raise LLMError(f"Rate limit exceeded. Please wait a moment and try again, or check your API quota: {str(e)}")
-            elif "connection" in error_msg or "network" in error_msg:
-                raise LLMError(f"Connection error. Please check your internet connection and try again: {str(e)}")
-            elif "timeout" in error_msg:
-                raise LLMError(f"Request timed out. Please check your internet connection and try again: {str(e)}")
-            else:
-                raise LLMError(f"LLM call failed: {str(e)}")
+            raise self._map_llm_error(e)
 
     def make_llm_call(
         self,
@@ -811,61 +1200,95 @@ class LLMClient:
             raise LLMError("LLM client is not configured")
         
         try:
-            try:
-                encoding = self._get_tokenizer(self.DEFAULT_MODEL)
-                if encoding is None:
-                    raise ValueError("No tokenizer available")
-                tokens = encoding.encode(text)
-                decode_tokens = encoding.decode
-            except Exception as exc:
-                # Fall back when model mapping is unavailable in tiktoken
-                self.logger.warning(f"Failed to load tokenizer for {self.DEFAULT_MODEL}: {exc}. Using fallback chunking.")
-                tokens = [text[i:i + 4] for i in range(0, len(text), 4)]  # Approximate 4 chars per token
-                decode_tokens = lambda chunk_tokens: "".join(chunk_tokens)
-            chunks = []
-            
-            i = 0
-            while i < len(tokens):
-                chunk_tokens = tokens[i:i + chunk_size]
-                chunk_text = decode_tokens(chunk_tokens)
-                chunks.append(chunk_text)
-                i += chunk_size - overlap
-            
-            self.logger.info(f"Split text into {len(chunks)} chunks")
+            chunks = self._split_into_chunks(text, chunk_size, overlap)
+            chunk_summaries = [
+                self._make_llm_call(**self._chunk_request(chunk, idx, len(chunks), file_type))
+                for idx, chunk in enumerate(chunks)
+            ]
+            final_summary = self._make_llm_call(**self._merge_chunks_request(chunk_summaries, file_type))
             
-            chunk_summaries = []
-            for idx, chunk in enumerate(chunks):
-                prompt = f"""Summarize this section of a {file_type} file. Focus on key functionality and important details.
-                
-                Section {idx + 1}/{len(chunks)}:
-                {chunk}
-
-                Provide a concise summary of this section."""
-
-                messages = [{"role": "user", "content": prompt}]
-                summary = self._make_llm_call(messages, max_tokens=300, temperature=0.5)
-                chunk_summaries.append(summary)
+            return {
+                "final_summary": final_summary,
+                "num_chunks": len(chunks),
+                "chunk_summaries": chunk_summaries
+            }
             
-            merge_prompt = f"""You are reviewing summaries of different sections of a {file_type} file.
-            Create a coherent, comprehensive summary that captures the overall purpose and key functionality.
+        except Exception as e:
+            self.logger.error(f"Chunk and summarize failed: {e}")
+            raise LLMError(f"Failed to chunk and summarize: {str(e)}")
 
-            Section summaries:
-            {chr(10).join(f"{i+1}. {s}" for i, s in enumerate(chunk_summaries))}
+    async def chunk_and_summarize_async(self, text: str, file_type: str = "",
+                                        chunk_size: int = 2000, overlap: int = 100) -> Dict[str, Any]:
+        """Async chunk_and_summarize over the shared AsyncOpenAI client."""
+        if not self.is_configured():
+            raise LLMError("LLM client is not configured")
 
-            Provide a unified summary (100-200 words) that captures the essence of the entire file."""
+        try:
+            chunks = self._split_into_chunks(text, chunk_size, overlap)
+            # One request at a time: the caller holds a single scheduler slot.
+            chunk_summaries = [
+                await self._make_llm_call_async(**self._chunk_request(chunk, idx, len(chunks), file_type))
+                for idx, chunk in enumerate(chunks)
+            ]
+            final_summary = await self._make_llm_call_async(
+                **self._merge_chunks_request(chunk_summaries, file_type)
+            )
 
-            messages = [{"role": "user", "content": merge_prompt}]
-            final_summary = self._make_llm_call(messages, max_tokens=400, temperature=0.5)
-            
             return {
                 "final_summary": final_summary,
                 "num_chunks": len(chunks),
                 "chunk_summaries": chunk_summaries
             }
-            
+
         except Exception as e:
             self.logger.error(f"Chunk and summarize failed: {e}")
             raise LLMError(f"Failed to chunk and summarize: {str(e)}")
+
+    def _split_into_chunks(self, text: str, chunk_size: int, overlap: int) -> List[str]:
+        """Split text into overlapping chunks of about ``chunk_size`` tokens."""
+        try:
+            encoding = self._get_tokenizer(self.DEFAULT_MODEL)
+            if encoding is None:
+                raise ValueError("No tokenizer available")
+            tokens = encoding.encode(text)
+            decode_tokens = encoding.decode
+        except Exception as exc:
+            # Fall back when model mapping is unavailable in tiktoken
+            self.logger.warning(f"Failed to load tokenizer for {self.DEFAULT_MODEL}: {exc}. Using fallback chunking.")
+            tokens = [text[i:i + 4] for i in range(0, len(text), 4)]  # Approximate 4 chars per token
+            decode_tokens = lambda chunk_tokens: "".join(chunk_tokens)
+        chunks = []
+        
+        i = 0
+        while i < len(tokens):
+            chunk_tokens = tokens[i:i + chunk_size]
+            chunk_text = decode_tokens(chunk_tokens)
+            chunks.append(chunk_text)
+            i += chunk_size - overlap
+        
+        self.logger.info(f"Split text into {len(chunks)} chunks")
+        return chunks
+
+    @staticmethod
+    def _chunk_request(chunk: str, idx: int, total: int, file_type: str) -> Dict[str, Any]:
+        prompt = f"""Summarize this section of a {file_type} file. Focus on key functionality and important details.
+                
+                Section {idx + 1}/{total}:
+                {chunk}
+
+                Provide a concise summary of this section."""
+        return {"messages": [{"role": "user", "content": prompt}], "max_tokens": 300, "temperature": 0.5}
+
+    @staticmethod
+    def _merge_chunks_request(chunk_summaries: List[str], file_type: str) -> Dict[str, Any]:
+        merge_prompt = f"""You are reviewing summaries of different sections of a {file_type} file.
+            Create a coherent, comprehensive summary that captures the overall purpose and key functionality.
+
+            Section summaries:
+            {chr(10).join(f"{i+1}. {s}" for i, s in enumerate(chunk_summaries))}
+
+            Provide a unified summary (100-200 words) that captures the essence of the entire file."""
+        return {"messages": [{"role": "user", "content": merge_prompt}], "max_tokens": 400, "temperature": 0.5}
     
     @staticmethod
     def _compute_file_metadata(content: str, file_path: str, file_type: str) -> Dict[str, Any]:
@@ -926,57 +1349,121 @@ class LLMClient:
             raise LLMError("LLM client is not configured")
         
         try:
-            token_count = self._count_tokens(content)
-            self.logger.info(f"Summarizing {file_path} ({token_count} tokens)")
-
-            # Guardrail: extremely large files can stall an entire batch.
-            max_summary_tokens = self._get_int_env(
-                "AI_MAX_FILE_SUMMARY_TOKENS",
-                self.DEFAULT_MAX_FILE_SUMMARY_TOKENS,
-                minimum=2000,
-                maximum=80000,
+            content, needs_chunking, truncated_for_budget = self._prepare_tagged_file(file_path, content)
+            content_to_analyze = (
+                self.chunk_and_summarize(content, file_type)["final_summary"] if needs_chunking else content
             )
-            truncated_for_budget = False
-            if token_count > max_summary_tokens:
-                approx_chars = max_summary_tokens * 4
-                content = content[:approx_chars]
-                token_count = self._count_tokens(content)
-                truncated_for_budget = True
-                self.logger.warning(
-                    "Truncated oversized file for AI summary (%s): capped to %s tokens",
-                    file_path,
-                    max_summary_tokens,
-                )
+            response = self._make_llm_call(**self._tagged_file_request(
+                file_path, file_type, content_to_analyze, truncated_for_budget, file_metadata, project_context
+            ))
+            
+            return {
+                "file_path": file_path,
+                "file_type": file_type,
+                "analysis": response
+            }
             
-            if token_count > 2000:
-                chunk_result = self.chunk_and_summarize(content, file_type)
-                content_to_analyze = chunk_result["final_summary"]
+        except Exception as e:
+            self.logger.error(f"Failed to summarize tagged file: {e}")
+            raise LLMError(f"File summarization failed: {str(e)}")
+
+    async def summarize_tagged_file_async(
+        self,
+        file_path: str,
+        content: str,
+        file_type: str,
+        file_metadata: Optional[Dict[str, Any]] = None,
+        project_context: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Async summarize_tagged_file, used by the summary scheduler.
+
+        Requests run on the shared AsyncOpenAI client, so cancelling the
+        coroutine (e.g. on a per-file timeout) cancels the HTTP request too.
+        """
+        if not self.is_configured():
+            raise LLMError("LLM client is not configured")
+
+        try:
+            content, needs_chunking, truncated_for_budget = self._prepare_tagged_file(file_path, content)
+            if needs_chunking:
+                content_to_analyze = (await self.chunk_and_summarize_async(content, file_type))["final_summary"]
             else:
                 content_to_analyze = content
+            response = await self._make_llm_call_async(**self._tagged_file_request(
+                file_path, file_type, content_to_analyze, truncated_for_budget, file_metadata, project_context
+            ))
 
-            if truncated_for_budget:
-                content_to_analyze = (
-                    "[Note: file content was truncated for latency budget before summarization.]\n"
-                    + content_to_analyze
-                )
+            return {
+                "file_path": file_path,
+                "file_type": file_type,
+                "analysis": response
+            }
 
-            # ── Build metadata header ────────────────────────────────────
-            meta_header = ""
-            if file_metadata:
-                meta_lines = [
-                    f"Lines: {file_metadata.get('line_count', '?')}",
-                    f"Imports/includes: {file_metadata.get('import_count', '?')}",
-                    f"Complexity signals (if/for/class/def etc.): {file_metadata.get('complexity_signals', '?')}",
-                    f"Is test file: {'yes' if file_metadata.get('has_tests') else 'no'}",
-                ]
-                meta_header = "\nFile metadata:\n" + "\n".join(f"  {l}" for l in meta_lines) + "\n"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to summarize tagged file: {e}")
+            raise LLMError(f"File summarization failed: {str(e)}")
 
-            # ── Build project context prefix ─────────────────────────────
-            context_prefix = ""
-            if project_context:
-                context_prefix = f"\nPROJECT CONTEXT SO FAR:\n{project_context}\n"
+    def _prepare_tagged_file(self, file_path: str, content: str) -> Tuple[str, bool, bool]:
+        """Cap oversized content; returns (content, needs_chunking, truncated_for_budget)."""
+        token_count = self._count_tokens(content)
+        self.logger.info(f"Summarizing {file_path} ({token_count} tokens)")
+
+        # Guardrail: extremely large files can stall an entire batch.
+        max_summary_tokens = self._get_int_env(
+            "AI_MAX_FILE_SUMMARY_TOKENS",
+            self.DEFAULT_MAX_FILE_SUMMARY_TOKENS,
+            minimum=2000,
+            maximum=80000,
+        )
+        truncated_for_budget = False
+        if token_count > max_summary_tokens:
+            approx_chars = max_summary_tokens * 4
+            content = content[:approx_chars]
+            token_count = self._count_tokens(content)
+            truncated_for_budget = True
+            self.logger.warning(
+                "Truncated oversized file for AI summary (%s): capped to %s tokens",
+                file_path,
+                max_summary_tokens,
+            )
+        
+        return content, token_count > 2000, truncated_for_budget
+
+    @staticmethod
+    def _tagged_file_request(
+        file_path: str,
+        file_type: str,
+        content_to_analyze: str,
+        truncated_for_budget: bool,
+        file_metadata: Optional[Dict[str, Any]],
+        project_context: Optional[str],
+    ) -> Dict[str, Any]:
+        if truncated_for_budget:
+            content_to_analyze = (
+                "[Note: file content was truncated for latency budget before summarization.]\n"
+                + content_to_analyze
+            )
 
-            prompt = f"""Analyze this {file_type} file and provide a brief structured summary.{context_prefix}
+        # ── Build metadata header ────────────────────────────────────
+        meta_header = ""
+        if file_metadata:
+            meta_lines = [
+                f"Lines: {file_metadata.get('line_count', '?')}",
+                f"Imports/includes: {file_metadata.get('import_count', '?')}",
+                f"Complexity signals (if/for/class/def etc.): {file_metadata.get('complexity_signals', '?')}",
+                f"Is test file: {'yes' if file_metadata.get('has_tests') else 'no'}",
+            ]
+            meta_header = "\nFile metadata:\n" + "\n".join(f"  {l}" for l in meta_lines) + "\n"
+
+        # ── Build project context prefix ─────────────────────────────
+        context_prefix = ""
+        if project_context:
+            context_prefix = f"\nPROJECT CONTEXT SO FAR:\n{project_context}\n"
+
+        prompt = f"""Analyze this {file_type} file and provide a brief structured summary.{context_prefix}
 File: {file_path}{meta_header}
 Content:
 {content_to_analyze}
@@ -989,18 +1476,179 @@ KEY FUNCTIONALITY: [3-4 bullet points of main features]
 
 NOTABLE PATTERNS: [1-2 notable techniques or patterns used]"""
 
-            messages = [{"role": "user", "content": prompt}]
-            response = self._make_llm_call(messages, max_tokens=150, temperature=0.6)
+        return {"messages": [{"role": "user", "content": prompt}], "max_tokens": 150, "temperature": 0.6}
+
+    def summarize_file_pack(
+        self,
+        files: List[Tuple[str, str, str]],
+        project_context: Optional[str] = None,
+        fallback: bool = True,
+    ) -> List[Dict[str, str]]:
+        """
+        Summarize several small files with a single LLM call.
+        
+        The model is asked for one JSON entry per file; each entry is turned
+        back into the same shape summarize_tagged_file() returns.
+        
+        Args:
+            files: List of (file_path, content, file_type) tuples
+            project_context: Optional rolling project context from prior batches
+            fallback: Summarize files missing from the packed response one by one
             
-            return {
+        Returns:
+            Per-file summaries in input order. Without fallback, files the
+            model did not answer for are left out.
+            
+        Raises:
+            LLMError: If the packed call fails and fallback is disabled
+        """
+        if not self.is_configured():
+            raise LLMError("LLM client is not configured")
+        if not files:
+            return []
+
+        parsed: Dict[str, Dict[str, Any]] = {}
+        request = self._build_file_pack_request(files, project_context)
+        try:
+            response = self._make_llm_call(**request)
+            parsed = self._parse_file_pack_response(response)
+            if not parsed:
+                self._evict_cached_response(**request)
+        except Exception as e:
+            if not fallback:
+                raise LLMError(f"Packed file summarization failed: {str(e)}")
+            self.logger.warning(f"Packed summary of {len(files)} files failed, falling back: {e}")
+
+        results: List[Dict[str, str]] = []
+        for file_path, content, file_type in files:
+            entry = parsed.get(file_path)
+            if entry is not None:
+                results.append({
+                    "file_path": file_path,
+                    "file_type": file_type,
+                    "analysis": self._format_pack_entry(entry),
+                })
+            elif fallback:
+                results.append(self.summarize_tagged_file(
+                    file_path,
+                    content,
+                    file_type,
+                    file_metadata=self._compute_file_metadata(content, file_path, file_type),
+                    project_context=project_context,
+                ))
+        return results
+
+    async def summarize_file_pack_async(
+        self,
+        files: List[Tuple[str, str, str]],
+        project_context: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Async summarize_file_pack without fallback, used by the summary scheduler.
+        
+        Returns:
+            Summaries for the files the model answered for, in input order
+            
+        Raises:
+            LLMError: If the packed call fails
+        """
+        if not self.is_configured():
+            raise LLMError("LLM client is not configured")
+        if not files:
+            return []
+
+        request = self._build_file_pack_request(files, project_context)
+        try:
+            response = await self._make_llm_call_async(**request)
+        except Exception as e:
+            raise LLMError(f"Packed file summarization failed: {str(e)}")
+        parsed = self._parse_file_pack_response(response)
+        if not parsed:
+            self._evict_cached_response(**request)
+        return [
+            {
                 "file_path": file_path,
                 "file_type": file_type,
-                "analysis": response
+                "analysis": self._format_pack_entry(parsed[file_path]),
             }
-            
-        except Exception as e:
-            self.logger.error(f"Failed to summarize tagged file: {e}")
-            raise LLMError(f"File summarization failed: {str(e)}")
+            for file_path, _, file_type in files
+            if file_path in parsed
+        ]
+
+    def _build_file_pack_request(
+        self,
+        files: List[Tuple[str, str, str]],
+        project_context: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Keyword arguments for the packed summary LLM call."""
+        context_prefix = ""
+        if project_context:
+            context_prefix = f"\nPROJECT CONTEXT SO FAR:\n{project_context}\n"
+
+        sections = []
+        for file_path, content, file_type in files:
+            file_metadata = self._compute_file_metadata(content, file_path, file_type)
+            sections.append(
+                f"=== FILE: {file_path} ({file_type}, {file_metadata['line_count']} lines) ===\n{content}"
+            )
+
+        prompt = f"""Analyze each of the following {len(files)} files and provide a brief structured summary per file.{context_prefix}
+{chr(10).join(sections)}
+
+Respond with ONLY this JSON, one entry per file, using each file path exactly as given:
+{{"files": [{{"file_path": "string", "summary": "2-3 sentences on what the file does", "key_functionality": ["3-4 short bullets"], "notable_patterns": ["1-2 techniques or patterns"]}}]}}"""
+
+        return {
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 150 * len(files) + 50,
+            "temperature": 0.6,
+            "response_format": {"type": "json_object"},
+        }
+
+    @staticmethod
+    def _parse_file_pack_response(response: str) -> Dict[str, Dict[str, Any]]:
+        """Map file_path -> entry from a packed summary response; empty on malformed output."""
+        if not isinstance(response, str):
+            return {}
+        response_text = response.strip()
+        response_text = re.sub(r'^```(?:json)?\s*\n?', '', response_text)
+        response_text = re.sub(r'\n?```\s*$', '', response_text)
+        try:
+            payload = json.loads(response_text)
+        except json.JSONDecodeError:
+            json_match = re.search(r'\{[\s\S]*\}', response_text)
+            if not json_match:
+                return {}
+            try:
+                payload = json.loads(json_match.group(0))
+            except json.JSONDecodeError:
+                return {}
+
+        entries = payload.get("files") if isinstance(payload, dict) else None
+        if not isinstance(entries, list):
+            return {}
+        parsed: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            file_path = entry.get("file_path")
+            if isinstance(file_path, str) and str(entry.get("summary") or "").strip():
+                parsed[file_path] = entry
+        return parsed
+
+    @staticmethod
+    def _format_pack_entry(entry: Mapping[str, Any]) -> str:
+        """Render a packed JSON entry in the SUMMARY/KEY FUNCTIONALITY/NOTABLE PATTERNS text format."""
+        def _bullets(value: Any) -> str:
+            if isinstance(value, list):
+                return "\n".join(f"- {str(item).strip()}" for item in value if str(item).strip())
+            return str(value or "").strip()
+
+        return (
+            f"SUMMARY: {str(entry.get('summary', '')).strip()}\n\n"
+            f"KEY FUNCTIONALITY:\n{_bullets(entry.get('key_functionality'))}\n\n"
+            f"NOTABLE PATTERNS:\n{_bullets(entry.get('notable_patterns'))}"
+        )
 
     @staticmethod
     def _is_test_path(path: str) -> bool:
@@ -2211,128 +2859,302 @@ Rules:
             self.logger.error(f"Feedback generation failed: {e}")
             raise LLMError(f"Failed to generate feedback: {str(e)}")
     
-    def _run_async_in_thread(
+    def _get_summary_budget(self) -> _SummaryBudget:
+        """Start the file summarization budget for a scan; 0 disables a budget."""
+        time_budget_sec = self._get_int_env("AI_SUMMARY_TIME_BUDGET_SEC", 0, minimum=0, maximum=3600)
+        token_budget = self._get_int_env("AI_SUMMARY_TOKEN_BUDGET", 0, minimum=0)
+        return _SummaryBudget(time_budget_sec, token_budget)
+
+    def _get_file_summary_timeout(self) -> int:
+        """Per-file (or per-pack) summarization timeout in seconds."""
+        return self._get_int_env(
+            "AI_FILE_SUMMARY_TIMEOUT_SEC",
+            self.DEFAULT_FILE_SUMMARY_TIMEOUT_SEC,
+            minimum=20,
+            maximum=900,
+        )
+
+    def _apply_summary_file_cap(
+        self,
+        files_to_analyze: List[tuple],
+        skipped_files: List[Dict[str, Any]],
+        mode_label: str,
+    ) -> List[tuple]:
+        """Keep the top-ranked files up to AI_MAX_SUMMARY_FILES, recording the rest as skipped."""
+        max_files = self._get_int_env(
+            "AI_MAX_SUMMARY_FILES",
+            self.DEFAULT_MAX_SUMMARY_FILES,
+            minimum=1,
+            maximum=2000,
+        )
+        if len(files_to_analyze) <= max_files:
+            return files_to_analyze
+        self.logger.info(
+            f"Capping {mode_label} file summarization to {max_files} files (was {len(files_to_analyze)})"
+        )
+        for f in files_to_analyze[max_files:]:
+            skipped_files.append({
+                'path': f[0],
+                'size_mb': int(f[3]) / (1024 * 1024),
+                'reason': f'Skipped by {max_files} file smart ranking cap'
+            })
+        return files_to_analyze[:max_files]
+
+    def _get_scheduler(self) -> _SummaryScheduler:
+        return _get_summary_scheduler(
+            self._get_int_env(
+                "AI_MAX_CONCURRENT_SUMMARIES",
+                self.DEFAULT_MAX_CONCURRENT_SUMMARIES,
+                minimum=1,
+                maximum=_MAX_SUMMARY_CONCURRENCY,
+            )
+        )
+
+    def _run_on_scheduler(
         self,
         coro,
         heartbeat_callback: Optional[Any] = None,
         heartbeat_interval_sec: int = 15,
     ):
-        """Run an async coroutine in a dedicated thread with its own event loop.
-        
-        This prevents conflicts with existing event loops and is safe to call
-        from synchronous code.
-        
+        """Run a coroutine on the shared summary scheduler loop.
+
+        Safe to call from synchronous code, including threads that already
+        run their own event loop.
+
         Args:
             coro: The coroutine to run
-            
+
         Returns:
             The result of the coroutine
         """
-        result = None
-        exception = None
-        
-        def run_in_thread():
-            nonlocal result, exception
+        return self._get_scheduler().run(
+            coro,
+            heartbeat_callback=heartbeat_callback,
+            heartbeat_interval_sec=heartbeat_interval_sec,
+        )
+
+    async def _summarize_single_file(
+        self,
+        file_info: tuple,
+        per_file_timeout_sec: int = 120,
+        skipped_files: Optional[List[Dict[str, Any]]] = None,
+        project_context: Optional[str] = None,
+        content: Optional[str] = None,
+    ) -> Optional[Dict[str, str]]:
+        """Summarize one (file_path, full_path, file_type, file_size) entry."""
+        file_path, full_path, file_type, file_size = file_info
+        try:
+            if content is None:
+                content = get_shared_content_store().read_text(full_path)
+
+            # Compute lightweight metadata
+            file_metadata = self._compute_file_metadata(content, file_path, file_type)
+
+            # Async end to end, so a timeout cancels the in-flight request
+            # instead of leaving a worker thread waiting on it.
+            summary_result = await asyncio.wait_for(
+                self.summarize_tagged_file_async(
+                    file_path,
+                    content,
+                    file_type,
+                    file_metadata=file_metadata,
+                    project_context=project_context,
+                ),
+                timeout=per_file_timeout_sec,
+            )
+            self.logger.info(f"Summarized: {file_path}")
+            return summary_result
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                "Timed out summarizing %s after %ss",
+                file_path,
+                per_file_timeout_sec,
+            )
+            if skipped_files is not None:
+                skipped_files.append({
+                    'path': file_path,
+                    'size_mb': file_size / (1024 * 1024),
+                    'reason': f'Summarization timed out after {per_file_timeout_sec}s',
+                })
+            return None
+        except Exception as e:
+            self.logger.error(f"Error analyzing {file_path}: {e}")
+            return None
+
+    def _build_summary_units(self, files_to_analyze: List[tuple]) -> List[List[tuple]]:
+        """Group small files into token-budgeted packs; other files become single-file units.
+
+        Each unit is a list of (order, file_info, content) members where content is
+        pre-read for packed files and None otherwise. Packs are filled first-fit
+        decreasing by token count up to AI_PACK_TOKEN_BUDGET.
+        """
+        singles: List[List[tuple]] = []
+        if not self._get_int_env("AI_PACK_SMALL_FILES", 1, minimum=0, maximum=1):
+            return [[(order, info, None)] for order, info in enumerate(files_to_analyze)]
+
+        pack_budget = self._get_int_env("AI_PACK_TOKEN_BUDGET", 3000, minimum=500, maximum=12000)
+        max_file_tokens = self._get_int_env("AI_PACK_MAX_FILE_TOKENS", 600, minimum=50, maximum=pack_budget)
+        max_pack_files = self._get_int_env("AI_PACK_MAX_FILES", 8, minimum=2, maximum=32)
+
+        candidates: List[Tuple[int, int, tuple, str]] = []
+        for order, info in enumerate(files_to_analyze):
+            # Skip reading anything that is obviously too big to pack (~4 bytes per token).
+            if int(info[3]) > max_file_tokens * 8:
+                singles.append([(order, info, None)])
+                continue
             try:
-                # Create a new event loop for this thread
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    result = loop.run_until_complete(coro)
-                finally:
-                    loop.close()
-            except Exception as e:
-                exception = e
-        
-        thread = threading.Thread(target=run_in_thread)
-        thread.start()
+                content = get_shared_content_store().read_text(info[1])
+            except OSError:
+                singles.append([(order, info, None)])
+                continue
+            tokens = self._count_tokens(content)
+            if tokens > max_file_tokens:
+                singles.append([(order, info, content)])
+            else:
+                candidates.append((tokens, order, info, content))
+
+        bins: List[Tuple[List[int], List[tuple]]] = []
+        for tokens, order, info, content in sorted(candidates, key=lambda c: c[0], reverse=True):
+            for used, members in bins:
+                if used[0] + tokens <= pack_budget and len(members) < max_pack_files:
+                    used[0] += tokens
+                    members.append((order, info, content))
+                    break
+            else:
+                bins.append(([tokens], [(order, info, content)]))
 
-        heartbeat_every = max(1, int(heartbeat_interval_sec))
-        while thread.is_alive():
-            thread.join(timeout=heartbeat_every)
-            if thread.is_alive() and callable(heartbeat_callback):
-                try:
-                    heartbeat_callback()
-                except Exception:
-                    # Best effort progress signal.
-                    pass
-        
-        if exception:
-            raise exception
-        return result
-    
-    async def _summarize_file_batch(
+        return singles + [sorted(members, key=lambda m: m[0]) for _, members in bins]
+
+    async def _summarize_files_scheduled(
         self,
-        files_batch: List[tuple],
-        base_path,
+        files_to_analyze: List[tuple],
         per_file_timeout_sec: int = 120,
         skipped_files: Optional[List[Dict[str, Any]]] = None,
         project_context: Optional[str] = None,
+        on_file_done: Optional[Any] = None,
+        budget: Optional[_SummaryBudget] = None,
+        cancel_token: Optional[Any] = None,
     ) -> List[Dict[str, str]]:
-        """Process a batch of files in parallel.
-        
+        """Summarize files through a priority queue drained by a fixed worker set.
+
+        Workers pull the next unit (a single file or a pack of small files) as
+        soon as they finish the previous one, so a slow file only occupies its
+        own slot. Logic-heavy work is dequeued first. Concurrency is bounded by
+        the scheduler's global semaphore. Packed files that the model does not
+        answer for are re-queued as single-file units.
+
         Args:
-            files_batch: List of (file_path, full_path, file_type, file_size) tuples
-            base_path: Base path for file reading
-            project_context: Optional rolling project context from prior batches
-            
+            files_to_analyze: List of (file_path, full_path, file_type, file_size) tuples
+            on_file_done: Optional callback invoked with each summary as it completes
+            budget: Scan-wide time/token budget; files are skipped once it is spent
+            cancel_token: Stop dequeuing once this CancellationToken is triggered
+
         Returns:
-            List of file summary results
+            File summaries in priority order
         """
-        
-        async def analyze_single_file(file_info):
-            file_path, full_path, file_type, file_size = file_info
+        if not files_to_analyze:
+            return []
+
+        scheduler = self._get_scheduler()
+        loop = asyncio.get_running_loop()
+        units = await loop.run_in_executor(None, self._build_summary_units, files_to_analyze)
+
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+
+        def _enqueue(unit: List[tuple], budget_reserved: bool = False) -> None:
+            heavy = any(LLMClient._is_logic_heavy_candidate(member[1][0]) for member in unit)
+            queue.put_nowait((0 if heavy else 1, unit[0][0], budget_reserved, unit))
+
+        for unit in units:
+            _enqueue(unit)
+
+        if budget is None:
+            budget = _SummaryBudget()
+        results: Dict[int, Dict[str, str]] = {}
+
+        def _skip(file_info: tuple, reason: str) -> None:
+            if skipped_files is not None:
+                skipped_files.append({
+                    'path': file_info[0],
+                    'size_mb': int(file_info[3]) / (1024 * 1024),
+                    'reason': reason,
+                })
+
+        def _record(order: int, summary: Dict[str, str]) -> None:
+            results[order] = summary
+            if callable(on_file_done):
+                try:
+                    on_file_done(summary)
+                except Exception:
+                    pass
+
+        async def _run_pack(unit: List[tuple]) -> None:
+            pack = [(info[0], content, info[2]) for _, info, content in unit]
             try:
-                content = full_path.read_text(encoding='utf-8', errors='ignore')
-
-                # Compute lightweight metadata
-                file_metadata = self._compute_file_metadata(content, file_path, file_type)
-
-                # Run the synchronous summarize in thread pool
-                loop = asyncio.get_event_loop()
-                summary_result = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        None,
-                        lambda: self.summarize_tagged_file(
-                            file_path,
-                            content,
-                            file_type,
-                            file_metadata=file_metadata,
-                            project_context=project_context,
-                        ),
-                    ),
+                summaries = await asyncio.wait_for(
+                    self.summarize_file_pack_async(pack, project_context=project_context),
                     timeout=per_file_timeout_sec,
                 )
-                self.logger.info(f"Summarized: {file_path}")
-                return summary_result
-            except asyncio.TimeoutError:
-                self.logger.warning(
-                    "Timed out summarizing %s after %ss",
-                    file_path,
-                    per_file_timeout_sec,
-                )
-                if skipped_files is not None:
-                    skipped_files.append({
-                        'path': file_path,
-                        'size_mb': file_size / (1024 * 1024),
-                        'reason': f'Summarization timed out after {per_file_timeout_sec}s',
-                    })
-                return None
             except Exception as e:
-                self.logger.error(f"Error analyzing {file_path}: {e}")
-                return None
-        
-        # Process batch in parallel
-        results = await asyncio.gather(*[analyze_single_file(f) for f in files_batch])
-        return [r for r in results if r is not None]
-    
+                self.logger.warning(f"Packed summary of {len(unit)} files failed, retrying individually: {e}")
+                summaries = []
+            answered = {summary["file_path"]: summary for summary in summaries}
+            for member in unit:
+                summary = answered.get(member[1][0])
+                if summary is not None:
+                    _record(member[0], summary)
+                else:
+                    _enqueue([member], budget_reserved=True)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    _, _, budget_reserved, unit = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if cancel_token is not None and cancel_token.is_set():
+                    for member in unit:
+                        _skip(member[1], 'Skipped because the analysis was cancelled')
+                    continue
+                if budget.expired():
+                    for member in unit:
+                        _skip(member[1], f'Skipped after {budget.time_budget_sec}s AI summary time budget')
+                    continue
+                if not budget_reserved:
+                    # ~4 bytes per token is close enough for budgeting without reading the file.
+                    estimated_tokens = sum(max(1, int(member[1][3]) // 4) for member in unit)
+                    if not budget.reserve(estimated_tokens):
+                        for member in unit:
+                            _skip(member[1], f'Skipped by {budget.token_budget} token AI summary budget')
+                        continue
+                async with scheduler.slot():
+                    if len(unit) > 1:
+                        await _run_pack(unit)
+                        continue
+                    order, file_info, content = unit[0]
+                    summary = await self._summarize_single_file(
+                        file_info,
+                        per_file_timeout_sec=per_file_timeout_sec,
+                        skipped_files=skipped_files,
+                        project_context=project_context,
+                        content=content,
+                    )
+                if summary is not None:
+                    _record(order, summary)
+
+        worker_count = min(scheduler.max_concurrency, len(units))
+        await asyncio.gather(*[worker() for _ in range(worker_count)])
+        return [results[order] for order in sorted(results)]
+
     def summarize_scan_with_ai(self, scan_summary: Dict[str, Any], 
                                relevant_files: List[Dict[str, Any]],
                                scan_base_path: str,
                                max_file_size_mb: int = 10,
                                project_dirs: Optional[List[str]] = None,
                                progress_callback: Optional[Any] = None,
-                               include_media: bool = True) -> Dict[str, Any]:
+                               include_media: bool = True,
+                               summary_callback: Optional[Any] = None,
+                               cancel_token: Optional[Any] = None) -> Dict[str, Any]:
         """
         Comprehensive AI analysis workflow for CLI integration.
         
@@ -2344,6 +3166,8 @@ Rules:
             project_dirs: Optional list of project directory paths (e.g., Git repo roots).
                          If provided, files are grouped by project and analyzed separately.
             progress_callback: Optional callback function for progress updates
+            summary_callback: Optional callback receiving each file summary as soon as it completes
+            cancel_token: Optional CancellationToken; queued file summaries are skipped once triggered
             
         Returns:
             Dict containing:
@@ -2380,6 +3204,8 @@ Rules:
                     max_file_size_mb=max_file_size_mb,
                     progress_callback=progress_callback,
                     include_media=include_media,
+                    summary_callback=summary_callback,
+                    cancel_token=cancel_token,
                 )
 
             media_briefings: list[str] = []
@@ -2398,7 +3224,7 @@ Rules:
             
             total_files = len(relevant_files)
             
-            # Prepare files for batch processing
+            # Prepare files for summarization
             files_to_analyze = []
             for file_meta in relevant_files:
                 file_path = file_meta.get('path', '')
@@ -2428,97 +3254,64 @@ Rules:
                     file_type = full_path.suffix or 'unknown'
                     files_to_analyze.append((file_path, full_path, file_type, file_size))
             
-            batch_size = self._get_int_env(
-                "AI_SINGLE_PROJECT_BATCH_SIZE",
-                self.DEFAULT_SINGLE_PROJECT_BATCH_SIZE,
-                minimum=1,
-                maximum=8,
-            )
             heartbeat_sec = self._get_int_env(
                 "AI_BATCH_HEARTBEAT_SEC",
                 self.DEFAULT_BATCH_HEARTBEAT_SEC,
                 minimum=5,
                 maximum=120,
             )
-            per_file_timeout_sec = self._get_int_env(
-                "AI_FILE_SUMMARY_TIMEOUT_SEC",
-                self.DEFAULT_FILE_SUMMARY_TIMEOUT_SEC,
-                minimum=20,
-                maximum=900,
-            )
+            per_file_timeout_sec = self._get_file_summary_timeout()
+            budget = self._get_summary_budget()
 
-            # Balance heavier files across batches and apply smart ranking.
+            # Smart ranking: logic-heavy and larger files first.
             files_to_analyze.sort(key=lambda item: (
                 1 if LLMClient._is_logic_heavy_candidate(item[0]) else 0,
                 int(item[3])
             ), reverse=True)
-            
-            # Smart ranking: cap the logic to the top 80 most critical files
-            if len(files_to_analyze) > 80:
-                self.logger.info(f"Capping single-project file summarization to 80 files (was {len(files_to_analyze)})")
-                for f in files_to_analyze[80:]:
-                    skipped_files.append({
-                        'path': f[0],
-                        'size_mb': f[3] / (1024 * 1024),
-                        'reason': 'Skipped by 80 file smart ranking cap'
-                    })
-                files_to_analyze = files_to_analyze[:80]
-            total_batches = (len(files_to_analyze) + batch_size - 1) // batch_size
-            balanced_batches: List[List[tuple]] = [[] for _ in range(total_batches)]
-            batch_weight = [0] * total_batches
-            for file_tuple in files_to_analyze:
-                idx = min(
-                    range(total_batches),
-                    key=lambda i: (len(balanced_batches[i]), batch_weight[i]),
-                )
-                balanced_batches[idx].append(file_tuple)
-                batch_weight[idx] += int(file_tuple[3])
+            files_to_analyze = self._apply_summary_file_cap(
+                files_to_analyze, skipped_files, "single-project"
+            )
 
-            processed_count = 0
-            
-            for batch_num, batch in enumerate(balanced_batches, start=1):
-                batch_size_mb = sum(int(item[3]) for item in batch) / (1024 * 1024)
-                batch_started_at = time.monotonic()
-                
+            total_to_analyze = len(files_to_analyze)
+            if progress_callback and total_to_analyze:
+                progress_callback(f"Single-project: Summarizing {total_to_analyze} files…")
+
+            summarize_started_at = time.monotonic()
+            completed_summaries: List[Dict[str, str]] = []
+
+            def _on_file_done(summary: Dict[str, str]) -> None:
+                completed_summaries.append(summary)
+                if callable(summary_callback):
+                    summary_callback(summary)
                 if progress_callback:
                     progress_callback(
-                        f"Single-project: Batch {batch_num}/{total_batches} ({len(batch)} files, {batch_size_mb:.2f}MB)…"
+                        f"Single-project: Completed {len(completed_summaries)}/{total_to_analyze} files "
+                        f"({summary.get('file_path', '')})…"
                     )
-                
-                try:
-                    # Process batch in parallel using dedicated thread
-                    batch_results = self._run_async_in_thread(
-                        self._summarize_file_batch(
-                            batch,
-                            scan_base_path,
-                            per_file_timeout_sec=per_file_timeout_sec,
-                            skipped_files=skipped_files,
-                            project_context=project_context_so_far or None,
-                        ),
-                        heartbeat_interval_sec=heartbeat_sec,
-                        heartbeat_callback=(
-                            (lambda bn=batch_num, tb=total_batches, bs=batch_started_at:
-                                progress_callback(
-                                    f"Single-project: Batch {bn}/{tb} still running ({int(time.monotonic() - bs)}s elapsed)…"
-                                )
-                            ) if progress_callback else None
-                        ),
-                    )
-                    file_summaries.extend(batch_results)
-                    processed_count += len(batch_results)
-                    
-                    if progress_callback:
-                        duration = int(time.monotonic() - batch_started_at)
-                        progress_callback(
-                            f"Single-project: Completed {processed_count}/{len(files_to_analyze)} files (batch {batch_num} in {duration}s)…"
-                        )
 
-                    # ── Removed rolling project context update per optimization plan ─────
+            try:
+                file_summaries.extend(self._run_on_scheduler(
+                    self._summarize_files_scheduled(
+                        files_to_analyze,
+                        per_file_timeout_sec=per_file_timeout_sec,
+                        skipped_files=skipped_files,
+                        project_context=project_context_so_far or None,
+                        on_file_done=_on_file_done,
+                        budget=budget,
+                        cancel_token=cancel_token,
+                    ),
+                    heartbeat_interval_sec=heartbeat_sec,
+                    heartbeat_callback=(
+                        (lambda: progress_callback(
+                            f"Single-project: {len(completed_summaries)}/{total_to_analyze} files done "
+                            f"({int(time.monotonic() - summarize_started_at)}s elapsed)…"
+                        )) if progress_callback else None
+                    ),
+                ))
+            except Exception as e:
+                self.logger.error(f"Error summarizing files: {e}")
+                file_summaries.extend(completed_summaries)
 
-                except Exception as e:
-                    self.logger.error(f"Error processing batch: {e}")
-                    continue
-            
             if progress_callback:
                 progress_callback("Generating project insights…")
             
@@ -2555,7 +3348,9 @@ Rules:
                                    project_dirs: List[str],
                                    max_file_size_mb: int = 10,
                                    progress_callback: Optional[Any] = None,
-                                   include_media: bool = True) -> Dict[str, Any]:
+                                   include_media: bool = True,
+                                   summary_callback: Optional[Any] = None,
+                                   cancel_token: Optional[Any] = None) -> Dict[str, Any]:
         """
         Analyze multiple projects separately (e.g., multiple Git repos in one scan).
         
@@ -2580,6 +3375,9 @@ Rules:
         
         max_file_size_bytes = max_file_size_mb * 1024 * 1024
         base_path = Path(scan_base_path)
+        per_file_timeout_sec = self._get_file_summary_timeout()
+        # One budget for the whole scan, not one per project.
+        budget = self._get_summary_budget()
         
         # Normalize project dirs to relative paths
         project_dirs_normalized = []
@@ -2676,7 +3474,7 @@ Rules:
             
             self.logger.info(f"Analyzing project '{proj_name}' ({len(proj_files)} files)")
             
-            # Prepare files for batch processing
+            # Prepare files for summarization
             media_briefings: list[str] = []
             if include_media:
                 media_briefings = self._build_media_briefings(
@@ -2714,53 +3512,52 @@ Rules:
                     continue
                 
                 file_type = full_path.suffix or 'unknown'
-                files_to_analyze.append((file_path, full_path, file_type))
+                files_to_analyze.append((file_path, full_path, file_type, file_size))
             
             # Apply smart ranking and cap before processing
             files_to_analyze.sort(key=lambda item: (
                 1 if LLMClient._is_logic_heavy_candidate(item[0]) else 0,
                 0
             ), reverse=True)
-            
-            if len(files_to_analyze) > 80:
-                self.logger.info(f"Capping multi-project file summarization to 80 files (was {len(files_to_analyze)})")
-                for f in files_to_analyze[80:]:
-                    skipped_files.append({
-                        'path': f[0],
-                        'size_mb': 0.0,
-                        'reason': 'Skipped by 80 file smart ranking cap'
-                    })
-                files_to_analyze = files_to_analyze[:80]
-                
-            # Process files in batches for parallel execution
-            BATCH_SIZE = 10
-            processed_count = 0
-            
-            for i in range(0, len(files_to_analyze), BATCH_SIZE):
-                batch = files_to_analyze[i:i + BATCH_SIZE]
-                batch_num = (i // BATCH_SIZE) + 1
-                total_batches = (len(files_to_analyze) + BATCH_SIZE - 1) // BATCH_SIZE
-                
+            files_to_analyze = self._apply_summary_file_cap(
+                files_to_analyze, skipped_files, "multi-project"
+            )
+
+            if progress_callback and files_to_analyze:
+                if proj_dir != '_unassigned':
+                    progress_callback(f"Project {project_index}/{total_projects} - Summarizing {len(files_to_analyze)} files…")
+                else:
+                    progress_callback(f"[{proj_name}] Summarizing {len(files_to_analyze)} files…")
+
+            completed_summaries: List[Dict[str, str]] = []
+
+            def _on_file_done(
+                summary: Dict[str, str],
+                _name=proj_name,
+                _total=len(files_to_analyze),
+                _completed=completed_summaries,
+            ) -> None:
+                _completed.append(summary)
+                if callable(summary_callback):
+                    summary_callback(summary)
                 if progress_callback:
-                    if proj_dir != '_unassigned':
-                        progress_callback(f"Project {project_index}/{total_projects} - Batch {batch_num}/{total_batches} ({len(batch)} files)…")
-                    else:
-                        progress_callback(f"[{proj_name}] Batch {batch_num}/{total_batches} ({len(batch)} files)…")
-                
-                try:
-                    # Process batch in parallel using dedicated thread
-                    batch_results = self._run_async_in_thread(
-                        self._summarize_file_batch(batch, base_path)
+                    progress_callback(f"[{_name}] Completed {len(_completed)}/{_total} files…")
+
+            try:
+                file_summaries.extend(self._run_on_scheduler(
+                    self._summarize_files_scheduled(
+                        files_to_analyze,
+                        per_file_timeout_sec=per_file_timeout_sec,
+                        skipped_files=skipped_files,
+                        on_file_done=_on_file_done,
+                        budget=budget,
+                        cancel_token=cancel_token,
                     )
-                    file_summaries.extend(batch_results)
-                    processed_count += len(batch_results)
-                    
-                    if progress_callback:
-                        progress_callback(f"[{proj_name}] Completed {processed_count}/{len(files_to_analyze)} files…")
-                except Exception as e:
-                    self.logger.error(f"[{proj_name}] Error processing batch: {e}")
-                    continue
-            
+                ))
+            except Exception as e:
+                self.logger.error(f"[{proj_name}] Error summarizing files: {e}")
+                file_summaries.extend(completed_summaries)
+
             project_summary = {
                 "project_name": proj_name,
                 "project_path": proj_dir,
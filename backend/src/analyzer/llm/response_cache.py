@@ -0,0 +1,290 @@
+# LLM Response Cache Module
+# Content-addressed on-disk cache for chat completion responses
+# Opt-in (LLM_RESPONSE_CACHE=1); entries are AES-encrypted when ENCRYPTION_MASTER_KEY is set
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "capstone" / "llm_responses"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class EntryCipher(Protocol):
+    """Encrypts cache entries at rest (services.services.encryption.EncryptionService fits)."""
+
+    def encrypt_json(self, payload: Any) -> Any: ...
+
+    def decrypt_json(self, envelope: Dict[str, Any]) -> Any: ...
+
+
+class LLMResponseCache:
+    """
+    Disk cache for LLM responses keyed by a fingerprint of the request.
+
+    Entries live as one JSON file each under ``cache_dir``. Reads refresh the
+    file mtime so eviction (triggered when the cache grows past ``max_bytes``)
+    drops the least recently used entries first. Entries older than
+    ``ttl_seconds`` are treated as misses and removed.
+
+    With a ``cipher`` the response is stored only as an encrypted envelope,
+    and entries written without one (or with another key) read as misses.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        cipher: Optional[EntryCipher] = None,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.cipher = cipher
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Stable SHA-256 fingerprint of everything that shapes the response."""
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": response_format,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` or None on miss/expiry."""
+        path = self._entry_path(key)
+        try:
+            with path.open("r", encoding="utf-8") as fp:
+                entry = json.load(fp)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        created_at = entry.get("created_at", 0)
+        if self.ttl_seconds and time.time() - float(created_at) > self.ttl_seconds:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        response = self._open_entry(entry)
+        if response is None:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store ``response`` under ``key``; failures are logged and ignored."""
+        path = self._entry_path(key)
+        try:
+            entry: Dict[str, Any] = {"created_at": time.time()}
+            if self.cipher is not None:
+                entry["envelope"] = self._envelope_dict(self.cipher.encrypt_json({"response": response}))
+            else:
+                entry["response"] = response
+            data = json.dumps(entry, ensure_ascii=False)
+            encoded = data.encode("utf-8")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous_size = path.stat().st_size if path.exists() else 0
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(encoded)
+            os.replace(tmp_name, path)
+        except Exception as exc:
+            logger.debug("Failed to write LLM cache entry %s: %s", key, exc)
+            return
+
+        with self._lock:
+            total = self._current_total_bytes()
+            self._total_bytes = total - previous_size + len(encoded)
+            needs_eviction = self.max_bytes and self._total_bytes > self.max_bytes
+        if needs_eviction:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        """Drop the entry for ``key`` (e.g. a response the caller could not use)."""
+        path = self._entry_path(key)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        if self._remove(path):
+            with self._lock:
+                if self._total_bytes is not None:
+                    self._total_bytes = max(0, self._total_bytes - size)
+
+    def _open_entry(self, entry: Dict[str, Any]) -> Optional[str]:
+        if self.cipher is None:
+            response = entry.get("response")
+            return response if isinstance(response, str) else None
+        envelope = entry.get("envelope")
+        if not isinstance(envelope, dict):
+            return None
+        try:
+            response = self.cipher.decrypt_json(envelope).get("response")
+        except Exception:
+            return None
+        return response if isinstance(response, str) else None
+
+    @staticmethod
+    def _envelope_dict(envelope: Any) -> Dict[str, Any]:
+        return envelope.to_dict() if hasattr(envelope, "to_dict") else envelope
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        for entry in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% so a burst of writes doesn't trigger eviction on every set.
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= target:
+                break
+            if self._remove(entry):
+                total -= size
+                removed += 1
+
+        with self._lock:
+            self._total_bytes = total
+        if removed:
+            logger.info("Evicted %d LLM cache entries", removed)
+        return removed
+
+    def clear(self) -> None:
+        for entry in self.cache_dir.glob("*/*.json"):
+            self._remove(entry)
+        with self._lock:
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "bytes": self._current_total_bytes(),
+                "max_bytes": self.max_bytes,
+            }
+
+    def _current_total_bytes(self) -> int:
+        # Caller must hold self._lock.
+        if self._total_bytes is None:
+            total = 0
+            for entry in self.cache_dir.glob("*/*.json"):
+                try:
+                    total += entry.stat().st_size
+                except OSError:
+                    continue
+            self._total_bytes = total
+        return self._total_bytes
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Shared cache configured from the environment, or None when caching is off.
+
+    Caching is opt-in: LLM_RESPONSE_CACHE=1 enables it, since entries hold
+    summaries of users' code. Entries are encrypted with ENCRYPTION_MASTER_KEY
+    when it is configured; without it they are written in plaintext (meant
+    for single-user local runs). LLM_RESPONSE_CACHE_DIR,
+    LLM_RESPONSE_CACHE_TTL_SEC and LLM_RESPONSE_CACHE_MAX_MB tune it.
+    """
+    global _default_cache
+    if os.getenv("LLM_RESPONSE_CACHE", "0").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            cache_dir = os.getenv("LLM_RESPONSE_CACHE_DIR")
+            try:
+                ttl_seconds = int(os.getenv("LLM_RESPONSE_CACHE_TTL_SEC", str(DEFAULT_TTL_SECONDS)))
+            except ValueError:
+                ttl_seconds = DEFAULT_TTL_SECONDS
+            try:
+                max_bytes = int(os.getenv("LLM_RESPONSE_CACHE_MAX_MB", "256")) * 1024 * 1024
+            except ValueError:
+                max_bytes = DEFAULT_MAX_BYTES
+            _default_cache = LLMResponseCache(
+                cache_dir=Path(cache_dir).expanduser() if cache_dir else None,
+                ttl_seconds=ttl_seconds,
+                max_bytes=max_bytes,
+                cipher=_default_cipher(),
+            )
+        return _default_cache
+
+
+def _default_cipher() -> Optional[EntryCipher]:
+    if not os.getenv("ENCRYPTION_MASTER_KEY"):
+        logger.warning("LLM response cache enabled without ENCRYPTION_MASTER_KEY; entries are stored unencrypted")
+        return None
+    try:
+        try:
+            from services.services.encryption import EncryptionService
+        except ImportError:  # pragma: no cover - package-style imports
+            from backend.src.services.services.encryption import EncryptionService
+        return EncryptionService()
+    except Exception as exc:
+        # A configured key that cannot be used must not silently fall back to plaintext.
+        raise RuntimeError(f"LLM response cache cannot encrypt entries: {exc}") from exc
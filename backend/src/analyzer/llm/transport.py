@@ -0,0 +1,188 @@
+# LLM Transport Module
+# Shared HTTP connection pools, client-side rate limiting and retry policy for LLM calls
+
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+import httpx
+import openai
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200_000
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE_SEC = 0.5
+DEFAULT_BACKOFF_CAP_SEC = 30.0
+DEFAULT_MAX_CONNECTIONS = 20
+
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(minimum, int(str(raw).strip()))
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at ``rate_per_minute``.
+
+    ``reserve`` debits immediately (the balance may go negative) and returns
+    how long the caller has to wait before its reservation is covered, so the
+    same bucket serves both blocking and asyncio callers.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_sec = float(rate_per_minute) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._available = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        if self.rate_per_sec <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._available = min(self.capacity, self._available + elapsed * self.rate_per_sec)
+            self._updated_at = now
+            # Never ask for more than a full bucket, otherwise a single huge prompt waits forever.
+            self._available -= min(float(amount), self.capacity)
+            if self._available >= 0:
+                return 0.0
+            return -self._available / self.rate_per_sec
+
+
+class LLMRateLimiter:
+    """Client-side limiter for requests/min and tokens/min; a limit of 0 disables that bucket."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+
+    def reserve(self, estimated_tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(max(1, int(estimated_tokens))))
+        return wait
+
+    def acquire(self, estimated_tokens: int) -> float:
+        wait = self.reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, estimated_tokens: int) -> float:
+        wait = self.reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """True for transient failures (rate limits, timeouts, connection drops, 5xx)."""
+    if isinstance(exc, openai.AuthenticationError):
+        return False
+    if getattr(exc, "code", None) == "insufficient_quota":
+        # A 429 for an exhausted quota will not clear up by waiting.
+        return False
+    if isinstance(exc, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    status_code = getattr(exc, "status_code", None)
+    return isinstance(status_code, int) and status_code in RETRYABLE_STATUS_CODES
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Read Retry-After (or retry-after-ms) from an API error response, if present."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        retry_after = headers.get("retry-after")
+    except Exception:
+        return None
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(str(retry_after))
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    base: float = DEFAULT_BACKOFF_BASE_SEC,
+    cap: float = DEFAULT_BACKOFF_CAP_SEC,
+) -> float:
+    """
+    Delay before retry ``attempt`` (0-based).
+
+    Honours the server's Retry-After when given (plus a little jitter so
+    waiting callers don't retry in lockstep); otherwise full-jitter
+    exponential backoff.
+    """
+    if retry_after is not None:
+        return min(cap, retry_after) + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def get_max_retries() -> int:
+    return _env_int("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+
+
+_shared_limiter: Optional[LLMRateLimiter] = None
+_shared_http_client: Optional[httpx.Client] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> LLMRateLimiter:
+    """Process-wide limiter sized by LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = LLMRateLimiter(
+                _env_int("LLM_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE),
+                _env_int("LLM_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE),
+            )
+        return _shared_limiter
+
+
+def _pool_limits() -> httpx.Limits:
+    max_connections = _env_int("LLM_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS, minimum=1)
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+def get_shared_http_client() -> httpx.Client:
+    """Process-wide pooled HTTP client shared by every synchronous OpenAI client."""
+    global _shared_http_client
+    with _shared_lock:
+        if _shared_http_client is None:
+            _shared_http_client = httpx.Client(limits=_pool_limits(), follow_redirects=True)
+        return _shared_http_client
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """Pooled async HTTP client; callers own it and must use it from a single event loop."""
+    return httpx.AsyncClient(limits=_pool_limits(), follow_redirects=True)
@@ -7,10 +7,14 @@ build configurations, and directory structure.
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    from scanner.inventory import FileInventory
+
 logger = logging.getLogger(__name__)
 
 
@@ -205,13 +209,20 @@ class ProjectDetector:
     # Public API
     # ------------------------------------------------------------------
 
-    def detect_projects(self, root_path: Path, max_depth: int = 5) -> List[ProjectInfo]:
+    def detect_projects(
+        self,
+        root_path: Path,
+        max_depth: int = 5,
+        inventory: Optional["FileInventory"] = None,
+    ) -> List[ProjectInfo]:
         """
         Detect all projects within a directory tree.
 
         Args:
             root_path: Root directory to search
             max_depth: Maximum depth to traverse (prevents infinite recursion)
+            inventory: Optional scan inventory; directory listings are read
+                       from it instead of the filesystem where it has them
 
         Returns:
             List of detected ProjectInfo objects
@@ -225,19 +236,18 @@ class ProjectDetector:
         # One git repository == one project, regardless of how many
         # backend/frontend/etc. subdirectories it contains.
         # ------------------------------------------------------------------
-        has_git = (root_path / '.git').is_dir()
+        has_git = '.git' in self._list_subdir_names(root_path, inventory)
         if has_git:
             # Gather markers from root + immediate subdirs for accurate typing
-            _, root_markers = self._find_project_markers(root_path)
+            _, root_markers = self._find_project_markers(root_path, inventory)
             root_markers = list(root_markers)  # copy
             # .git is already picked up as a supplementary marker; avoid double-counting
             if '.git' not in root_markers:
                 root_markers.append('.git')
             try:
-                for subdir in root_path.iterdir():
-                    if subdir.is_dir() and subdir.name not in self.excluded_dirs:
-                        _, sub_markers = self._find_project_markers(subdir)
-                        root_markers.extend(sub_markers)
+                for subdir in self._iter_subdirs(root_path, inventory):
+                    _, sub_markers = self._find_project_markers(subdir, inventory)
+                    root_markers.extend(sub_markers)
             except PermissionError:
                 logger.debug(f"Permission denied reading subdirs of: {root_path}")
 
@@ -256,7 +266,7 @@ class ProjectDetector:
         # project root.  A requirements.txt / package.json / pom.xml at the
         # top level means the whole directory is one project.
         # ------------------------------------------------------------------
-        primary_found, all_markers = self._find_project_markers(root_path)
+        primary_found, all_markers = self._find_project_markers(root_path, inventory)
         if primary_found:
             project_type = self._determine_project_type(all_markers)
             logger.info(f"Root markers found — treating '{root_path.name}' as single {project_type} project")
@@ -276,17 +286,16 @@ class ProjectDetector:
         # ------------------------------------------------------------------
         projects: List[ProjectInfo] = []
         visited_roots: Set[Path] = set()
-        self._scan_directory(root_path, root_path, projects, visited_roots, 0, max_depth)
+        self._scan_directory(root_path, root_path, projects, visited_roots, 0, max_depth, inventory=inventory)
 
         if not projects:
             # Fallback: no independent projects found — gather type info from
             # immediate subdirs so the single project entry has a useful type.
             all_sub_markers: List[str] = []
             try:
-                for subdir in root_path.iterdir():
-                    if subdir.is_dir() and subdir.name not in self.excluded_dirs:
-                        _, sub_markers = self._find_project_markers(subdir)
-                        all_sub_markers.extend(sub_markers)
+                for subdir in self._iter_subdirs(root_path, inventory):
+                    _, sub_markers = self._find_project_markers(subdir, inventory)
+                    all_sub_markers.extend(sub_markers)
             except PermissionError:
                 pass
 
@@ -335,6 +344,7 @@ class ProjectDetector:
         depth: int,
         max_depth: int,
         inside_project: bool = False,
+        inventory: Optional["FileInventory"] = None,
     ):
         """
         Recursively scan directory for project markers (Rule 3 only).
@@ -351,7 +361,7 @@ class ProjectDetector:
         if current_path in visited_roots:
             return
 
-        primary_found, all_markers = self._find_project_markers(current_path)
+        primary_found, all_markers = self._find_project_markers(current_path, inventory)
         dir_name_lower = current_path.name.lower()
 
         if primary_found:
@@ -379,12 +389,12 @@ class ProjectDetector:
                 # Recurse into direct children; mark them as inside_project so
                 # their own subtrees are not scanned for further project roots.
                 try:
-                    for subdir in current_path.iterdir():
-                        if subdir.is_dir() and subdir.name not in self.excluded_dirs:
-                            self._scan_directory(
-                                subdir, root_path, projects, visited_roots,
-                                depth + 1, max_depth, inside_project=True,
-                            )
+                    for subdir in self._iter_subdirs(current_path, inventory):
+                        self._scan_directory(
+                            subdir, root_path, projects, visited_roots,
+                            depth + 1, max_depth, inside_project=True,
+                            inventory=inventory,
+                        )
                 except PermissionError:
                     logger.debug(f"Permission denied: {current_path}")
             # else: primary markers found but dir is a known sub-component →
@@ -397,16 +407,44 @@ class ProjectDetector:
             # level because they may contain genuine independent sub-projects).
             if not inside_project and dir_name_lower not in self.structural_dirs:
                 try:
-                    for subdir in current_path.iterdir():
-                        if subdir.is_dir() and subdir.name not in self.excluded_dirs:
-                            self._scan_directory(
-                                subdir, root_path, projects, visited_roots,
-                                depth + 1, max_depth, inside_project=False,
-                            )
+                    for subdir in self._iter_subdirs(current_path, inventory):
+                        self._scan_directory(
+                            subdir, root_path, projects, visited_roots,
+                            depth + 1, max_depth, inside_project=False,
+                            inventory=inventory,
+                        )
                 except PermissionError:
                     logger.debug(f"Permission denied: {current_path}")
 
-    def _find_project_markers(self, directory: Path) -> Tuple[List[str], List[str]]:
+    def _list_dir(
+        self, directory: Path, inventory: Optional["FileInventory"] = None
+    ) -> Tuple[List[str], List[str]]:
+        """(subdirectory names, all entry names) for ``directory``.
+
+        Raises PermissionError like Path.iterdir() when read from disk.
+        """
+        listing = inventory.list_dir(directory) if inventory is not None else None
+        if listing is not None:
+            dir_names, file_names = listing
+            return list(dir_names), list(dir_names) + list(file_names)
+        with os.scandir(directory) as iterator:
+            contents = list(iterator)
+        return [entry.name for entry in contents if entry.is_dir()], [entry.name for entry in contents]
+
+    def _list_subdir_names(self, directory: Path, inventory: Optional["FileInventory"] = None) -> List[str]:
+        try:
+            return self._list_dir(directory, inventory)[0]
+        except OSError:
+            return []
+
+    def _iter_subdirs(self, directory: Path, inventory: Optional["FileInventory"] = None) -> List[Path]:
+        """Non-excluded child directories of ``directory``."""
+        dir_names, _ = self._list_dir(directory, inventory)
+        return [directory / name for name in dir_names if name not in self.excluded_dirs]
+
+    def _find_project_markers(
+        self, directory: Path, inventory: Optional["FileInventory"] = None
+    ) -> Tuple[List[str], List[str]]:
         """
         Find project marker files in a directory.
 
@@ -420,13 +458,13 @@ class ProjectDetector:
         all_markers: List[str] = []
 
         try:
-            dir_contents = list(directory.iterdir())
-            dir_names = {p.name for p in dir_contents}
+            _, entry_names = self._list_dir(directory, inventory)
+            dir_names = set(entry_names)
 
             # Check primary markers first
             for marker in self.primary_markers:
                 if marker in self.suffix_patterns:
-                    if any(p.name.endswith(marker) for p in dir_contents):
+                    if any(name.endswith(marker) for name in entry_names):
                         primary_found.append(marker)
                         all_markers.append(marker)
                 else:
@@ -441,7 +479,7 @@ class ProjectDetector:
                     if marker in primary_set:
                         continue  # already counted
                     if marker in self.suffix_patterns:
-                        if any(p.name.endswith(marker) for p in dir_contents):
+                        if any(name.endswith(marker) for name in entry_names):
                             all_markers.append(marker)
                     else:
                         if marker in dir_names:
@@ -12,7 +12,7 @@ This module identifies evidence of:
 - Software engineering practices
 """
 
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Mapping, Set, Optional, Any
 from dataclasses import dataclass, field
 from collections import defaultdict
 from datetime import datetime
@@ -513,7 +513,7 @@ class SkillsExtractor:
         self,
         code_analysis: Optional[Dict] = None,
         git_analysis: Optional[Dict] = None,
-        file_contents: Optional[Dict[str, str]] = None,
+        file_contents: Optional[Mapping[str, str]] = None,
         repo_path: Optional[str] = None
     ) -> Dict[str, Skill]:
         """
@@ -822,7 +822,7 @@ class SkillsExtractor:
             description = self._get_skill_description(skill_name, category, skill_name.lower())
             self._add_skill(skill_name, category, description, evidence)
 
-    def _extract_from_source_code(self, file_contents: Dict[str, str]):
+    def _extract_from_source_code(self, file_contents: Mapping[str, str]):
         """Extract skills by analyzing actual source code."""
         
         for file_path, content in file_contents.items():
@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field
 from api.dependencies import AuthContext, get_auth_context
 from auth.session import AuthError, Session, SupabaseAuth
 from security.rate_limit import limiter
+from services.token_verifier import get_token_verifier
 
 
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
@@ -128,6 +129,7 @@ def reset_password(request: Request, payload: PasswordResetConfirm) -> dict:
 def logout(request: Request, auth: AuthContext = Depends(get_auth_context)) -> dict:
     try:
         SupabaseAuth().sign_out(auth.access_token)
+        get_token_verifier().revoke(auth.access_token)
         return {"ok": True}
     except AuthError as exc:
         raise _raise_auth_error(exc)
@@ -136,3 +138,4 @@ def logout(request: Request, auth: AuthContext = Depends(get_auth_context)) -> d
 @router.get("/session", response_model=AuthSessionInfo, status_code=status.HTTP_200_OK)
 async def get_session(auth: AuthContext = Depends(get_auth_context)) -> AuthSessionInfo:
     return AuthSessionInfo(user_id=auth.user_id, email=auth.email)
+
@@ -9,6 +9,7 @@ from fastapi import Header, HTTPException, status
 
 from api.request_context import set_request_access_token
 from services.services.supabase_keys import resolve_supabase_api_key
+from services.token_verifier import TokenRejected, get_token_verifier
 
 
 @dataclass(frozen=True)
@@ -66,6 +67,14 @@ async def get_user_profile(access_token: str) -> Dict[str, Any]:
     return await _fetch_user(access_token)
 
 
+async def _verify_user(access_token: str) -> Dict[str, Any]:
+    """Resolve a token locally (cache, then JWT signature) before asking Supabase."""
+    try:
+        return await get_token_verifier().verify(access_token, _fetch_user)
+    except TokenRejected:
+        _raise_auth_error("Invalid or expired access token")
+
+
 async def get_auth_context(authorization: Optional[str] = Header(default=None)) -> AuthContext:
     if not authorization:
         _raise_auth_error("Authorization header missing")
@@ -81,7 +90,7 @@ async def get_auth_context(authorization: Optional[str] = Header(default=None))
 
     set_request_access_token(access_token)
 
-    user = await get_user_profile(access_token)
+    user = await _verify_user(access_token)
     return AuthContext(
         user_id=user["id"],
         access_token=access_token,
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
 from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
@@ -383,16 +382,26 @@ class DuplicateGroup(BaseModel):
     files: List[DuplicateFileInfo]
 
 
+class SimilarFileGroup(BaseModel):
+    """A group of near-duplicate source files (MinHash similarity)."""
+    similarity: float
+    file_count: int
+    project_count: int
+    files: List[DuplicateFileInfo]
+
+
 class DedupSummary(BaseModel):
     """Summary of deduplication analysis."""
     duplicate_groups_count: int
     total_wasted_bytes: int
+    similar_file_groups_count: int = 0
 
 
 class DedupReport(BaseModel):
     """Full deduplication report."""
     summary: DedupSummary
     duplicate_groups: List[DuplicateGroup]
+    similar_file_groups: List[SimilarFileGroup] = Field(default_factory=list)
 
 
 class PortfolioRefreshResponse(BaseModel):
@@ -420,92 +429,66 @@ def refresh_portfolio(
     """
     Refresh entire portfolio with cross-project duplicate detection.
 
-    Scans all user projects and detects files duplicated across multiple projects.
-    Returns a deduplication report identifying duplicate files by SHA-256 hash.
+    Detects files duplicated across multiple projects from the user-wide
+    content-hash index. Returns a deduplication report identifying duplicate
+    files by content hash, plus near-duplicate source files (copied
+    assignments, vendored forks) by MinHash similarity.
     """
     try:
-        # Get all user projects
-        projects = service.get_user_projects(auth.user_id)
-
-        total_files = 0
-        total_size_bytes = 0
-
-        # Map: sha256 -> list of (file_info, size_bytes)
-        hash_to_files: Dict[str, List[tuple]] = defaultdict(list)
-
-        # Build a mapping of project_id -> project_name for quick lookup
-        project_names: Dict[str, str] = {p["id"]: p.get("project_name", "Unknown") for p in projects}
-
-        # Scan each project for cached files
-        for project in projects:
-            project_id = project["id"]
-            project_name = project.get("project_name", "Unknown")
+        project_names = _portfolio_project_names(service, auth.user_id)
+        index = service.get_content_hash_index(auth.user_id)
 
-            try:
-                cached_files = service.get_cached_files(auth.user_id, project_id)
-            except Exception as exc:
-                logger.warning(f"Failed to get cached files for project {project_id}: {exc}")
-                continue
-
-            for rel_path, file_meta in cached_files.items():
-                sha256 = file_meta.get("sha256")
-                size_bytes = file_meta.get("size_bytes", 0)
-
-                total_files += 1
-                total_size_bytes += size_bytes
-
-                if sha256:
-                    hash_to_files[sha256].append({
-                        "path": rel_path,
-                        "project_id": project_id,
-                        "project_name": project_name,
-                        "size_bytes": size_bytes,
-                    })
+        total_files, total_size_bytes = index.totals(project_names)
 
         # Build dedup report if requested
         dedup_report = None
         if request.include_duplicates:
-            duplicate_groups = []
-            total_wasted_bytes = 0
-
-            for sha256, files in hash_to_files.items():
-                # Only consider duplicates across different projects
-                unique_projects = set(f["project_id"] for f in files)
-                if len(unique_projects) > 1:
-                    # This is a cross-project duplicate
-                    file_size = files[0]["size_bytes"]
-                    # Wasted bytes = (count - 1) * size (keeping one copy is not wasted)
-                    wasted = (len(files) - 1) * file_size
-                    total_wasted_bytes += wasted
-
-                    duplicate_groups.append(DuplicateGroup(
-                        sha256=sha256,
-                        file_count=len(files),
-                        wasted_bytes=wasted,
-                        files=[
-                            DuplicateFileInfo(
-                                path=f["path"],
-                                project_id=f["project_id"],
-                                project_name=f["project_name"],
-                            )
-                            for f in files
-                        ],
-                    ))
-
-            # Sort by wasted bytes descending
-            duplicate_groups.sort(key=lambda g: g.wasted_bytes, reverse=True)
+            duplicate_groups = [
+                DuplicateGroup(
+                    sha256=group["hash"],
+                    file_count=len(group["files"]),
+                    wasted_bytes=group["wasted_bytes"],
+                    files=[
+                        DuplicateFileInfo(
+                            path=path,
+                            project_id=project_id,
+                            project_name=project_names.get(project_id, "Unknown"),
+                        )
+                        for project_id, path, _ in group["files"]
+                    ],
+                )
+                for group in index.duplicate_groups(project_names)
+            ]
+            similar_file_groups = [
+                SimilarFileGroup(
+                    similarity=round(group["similarity"], 3),
+                    file_count=len(group["files"]),
+                    project_count=group["project_count"],
+                    files=[
+                        DuplicateFileInfo(
+                            path=path,
+                            project_id=project_id,
+                            project_name=project_names.get(project_id, "Unknown"),
+                        )
+                        for project_id, path, _ in group["files"]
+                    ],
+                )
+                for group in index.similar_file_groups(project_names)
+            ]
 
             dedup_report = DedupReport(
                 summary=DedupSummary(
                     duplicate_groups_count=len(duplicate_groups),
-                    total_wasted_bytes=total_wasted_bytes,
+                    total_wasted_bytes=sum(group.wasted_bytes for group in duplicate_groups),
+                    similar_file_groups_count=len(similar_file_groups),
                 ),
                 duplicate_groups=duplicate_groups,
+                similar_file_groups=similar_file_groups,
             )
 
         return PortfolioRefreshResponse(
             status="completed",
-            projects_scanned=len(projects),
+            projects_scanned=len(project_names),
             total_files=total_files,
             total_size_bytes=total_size_bytes,
             dedup_report=dedup_report,
@@ -525,6 +508,12 @@ def refresh_portfolio(
         ) from exc
 
 
+def _portfolio_project_names(service: ProjectsService, user_id: str) -> Dict[str, str]:
+    """project_id -> project_name, from the portfolio aggregate."""
+    projects = service.get_portfolio_aggregate(user_id)["views"]["projects"]
+    return {str(p["id"]): p.get("project_name") or "Unknown" for p in projects if p.get("id")}
+
+
 # ============================================================================
 # Portfolio Generation Endpoint
 # ============================================================================
@@ -765,9 +754,8 @@ def get_resource_suggestions(
 ):
     """Return personalised learning resource suggestions based on scanned skills."""
     try:
-        projects = projects_service.get_user_projects(auth.user_id)
-        if not isinstance(projects, list):
-            projects = []
+        aggregate = projects_service.get_portfolio_aggregate(auth.user_id)
+        skill_tiers = dict(aggregate["views"]["skill_tiers"])
     except Exception as exc:
         logger.exception("Failed to load projects for resource suggestions")
         raise HTTPException(
@@ -779,8 +767,9 @@ def get_resource_suggestions(
 
     result = get_suggestions(
         user_id=auth.user_id,
-        projects=projects,
+        projects=[],
         role=role,
+        skills=skill_tiers,
     )
 
     return ResourceSuggestionsResponse(
@@ -826,7 +815,13 @@ def generate_linkedin_post(
     )
 
     try:
-        projects = projects_service.get_user_projects(auth.user_id)
+        if body.scope == "project" and body.project_id:
+            projects = projects_service.get_user_projects(auth.user_id)
+        else:
+            # Portfolio posts only need the aggregate's per-project summaries.
+            aggregate = projects_service.get_portfolio_aggregate(auth.user_id)
+            projects = list(aggregate["views"]["projects"])
+            all_skills = list(aggregate["views"]["skill_names"])
         if not isinstance(projects, list):
             projects = []
     except Exception as exc:
@@ -857,9 +852,6 @@ def generate_linkedin_post(
             )
         post_text = build_project_post(project)
     else:
-        from services.services.resource_suggestions_service import collect_skill_names
-
-        all_skills = collect_skill_names(projects)
         post_text = build_portfolio_post(
             projects=projects,
             skills=all_skills,
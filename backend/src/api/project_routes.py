@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any, cast
 from datetime import datetime, timezone
 import asyncio
+import functools
 import json
 import logging
 import sys
@@ -49,15 +50,24 @@ except (ModuleNotFoundError, ImportError):  # pragma: no cover - test/import fal
     from backend.src.services.services.export_service import ExportService
 
 try:
-    from scanner.parser import parse_zip
+    from scanner.parser import attach_content_signatures, hash_files, parse_zip
+    from scanner.content_hash import available_algorithms, default_algorithm, normalize_hash, split_hash
 except (ModuleNotFoundError, ImportError):  # pragma: no cover - test/import fallback
-    from backend.src.scanner.parser import parse_zip
+    from backend.src.scanner.parser import attach_content_signatures, hash_files, parse_zip
+    from backend.src.scanner.content_hash import available_algorithms, default_algorithm, normalize_hash, split_hash
 
 try:
     from scanner.models import ScanPreferences
 except (ModuleNotFoundError, ImportError):  # pragma: no cover - test/import fallback
     from backend.src.scanner.models import ScanPreferences
 
+try:
+    from scanner.inventory import FileInventory
+    from services.cancellation import CancellationToken, ScanCancelled
+except (ModuleNotFoundError, ImportError):  # pragma: no cover - test/import fallback
+    from backend.src.scanner.inventory import FileInventory
+    from backend.src.services.cancellation import CancellationToken, ScanCancelled
+
 try:
     from services.language_stats import summarize_languages
     from services.services.skills_analysis_service import SkillsAnalysisService
@@ -493,19 +503,34 @@ def _build_skill_progression_from_scan(
     return timeline, None, None
 
 
-def _run_git_analysis_for_path(target_path: Path) -> List[Dict[str, Any]]:
+def _run_git_analysis_for_path(
+    target_path: Path,
+    inventory: Optional[FileInventory] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> List[Dict[str, Any]]:
     git_results: List[Dict[str, Any]] = []
-    if (target_path / ".git").exists():
-        result = analyze_git_repo(str(target_path))
+
+    def analyze(repo_path: Path) -> None:
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+            result = analyze_git_repo(str(repo_path), cancel_token=cancel_token)
+        else:
+            result = analyze_git_repo(str(repo_path))
         if "error" not in result:
             git_results.append(result)
+
+    if inventory is not None and inventory.relative(target_path) == "":
+        # The scan inventory already knows every directory holding a .git.
+        for repo_path in inventory.git_roots():
+            analyze(repo_path)
+        return git_results
+    if (target_path / ".git").exists():
+        analyze(target_path)
     for git_dir in target_path.rglob(".git"):
         if git_dir.is_dir():
             repo_path = git_dir.parent
             if repo_path != target_path:
-                result = analyze_git_repo(str(repo_path))
-                if "error" not in result:
-                    git_results.append(result)
+                analyze(repo_path)
     return git_results
 
 
@@ -564,6 +589,7 @@ def _serialize_parse_files(files: List[Any]) -> List[Dict[str, Any]]:
                 "created_at": created_at.isoformat() if created_at else None,
                 "modified_at": modified_at.isoformat() if modified_at else None,
                 "file_hash": getattr(meta, "file_hash", None),
+                "content_signature": getattr(meta, "content_signature", None),
                 "media_info": media_info,
             }
         )
@@ -756,11 +782,22 @@ def _run_document_analysis(target_path: Path, parse_result: Any) -> Optional[Lis
         return None
 
 
-def _run_duplicate_detection(parse_result: Any) -> Optional[Dict[str, Any]]:
-    """Run duplicate detection on parsed files."""
+def _run_duplicate_detection(
+    parse_result: Any,
+    source: Optional[Path] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> Optional[Dict[str, Any]]:
+    """Run duplicate detection on parsed files.
+
+    When ``source`` (the scanned directory or archive) is given, source files
+    are MinHashed first so their signatures are stored with the scan.
+    """
     logger.info("🔍 Starting duplicate detection...")
     try:
         from services.services.duplicate_detection_service import DuplicateDetectionService
+        if source is not None and isinstance(parse_result.files, list):
+            signed = attach_content_signatures(parse_result.files, source, cancel_token=cancel_token)
+            logger.info(f"🔏 Signed {signed} source files for near-duplicate detection")
         service = DuplicateDetectionService()
         result = service.analyze_duplicates(parse_result)
         
@@ -776,18 +813,38 @@ def _run_duplicate_detection(parse_result: Any) -> Optional[Dict[str, Any]]:
                     "count": len(group.files),
                 })
                 total_wasted_bytes += group.wasted_bytes
+
+        near_duplicates = [
+            {
+                "hash": group.file_hash,
+                "files": [f.path for f in group.files],
+                "wasted_bytes": group.wasted_bytes,
+                "count": len(group.files),
+                "max_distance": group.max_distance,
+            }
+            for group in result.near_duplicate_groups
+        ]
         
-        if not duplicates:
+        if not duplicates and not near_duplicates:
             logger.info("⚠️ No duplicate files found")
             return None
         
-        logger.info(f"✅ Duplicate detection completed: {len(duplicates)} duplicate groups found")
-        return {
+        logger.info(
+            f"✅ Duplicate detection completed: {len(duplicates)} duplicate groups, "
+            f"{len(near_duplicates)} near-duplicate groups found"
+        )
+        report = {
             "duplicate_groups": duplicates,
             "total_duplicates": len(duplicates),
             "total_wasted_bytes": total_wasted_bytes,
             "total_wasted_mb": total_wasted_bytes / (1024 * 1024),
         }
+        if near_duplicates:
+            report["near_duplicate_groups"] = near_duplicates
+            report["near_duplicate_wasted_bytes"] = result.near_duplicate_wasted_bytes
+        return report
+    except ScanCancelled:
+        raise
     except Exception as e:
         logger.error(f"❌ Duplicate detection failed: {e}", exc_info=True)
         return None
@@ -796,6 +853,8 @@ def _run_duplicate_detection(parse_result: Any) -> Optional[Dict[str, Any]]:
 def _run_code_analysis_for_path(
     target_path: Path,
     preferences: Optional[ScanPreferences],
+    inventory: Optional[FileInventory] = None,
+    cancel_token: Optional[CancellationToken] = None,
 ) -> Optional[Dict[str, Any]]:
     logger.info(f"Starting code analysis for path: {target_path}")
     try:
@@ -809,7 +868,10 @@ def _run_code_analysis_for_path(
 
     try:
         service = CodeAnalysisService()
-        result = service.run_analysis(target_path, preferences)
+        if cancel_token is not None:
+            result = service.run_analysis(target_path, preferences, inventory=inventory, cancel_token=cancel_token)
+        else:
+            result = service.run_analysis(target_path, preferences, inventory=inventory)
 
         summary = getattr(result, "summary", {}) or {}
         
@@ -907,6 +969,8 @@ def _run_code_analysis_for_path(
                 "error_handling": error_handling_examples,
             }
         }
+    except ScanCancelled:
+        raise
     except Exception as exc:
         if "CodeAnalysisUnavailableError" in type(exc).__name__ or "tree-sitter" in str(exc).lower():
             logger.warning(f"Code analysis unavailable (tree-sitter issue): {exc}")
@@ -1394,14 +1458,17 @@ async def create_project_from_upload(
             summary: Dict[str, Any] = dict(parse_result.summary)
             summary["languages"] = languages
 
-            git_analysis = _run_git_analysis_for_path(analysis_target)
+            # One walk of the extracted tree shared by every analyzer below.
+            inventory = FileInventory.build(analysis_target)
+
+            git_analysis = _run_git_analysis_for_path(analysis_target, inventory)
             git_data = git_analysis[0] if git_analysis else None
 
             logger.info("Running code analysis...")
-            code_analysis = _run_code_analysis_for_path(analysis_target, preferences)
+            code_analysis = _run_code_analysis_for_path(analysis_target, preferences, inventory)
             logger.info(f"Code analysis result: {'SUCCESS' if code_analysis else 'NONE'} - Keys: {list(code_analysis.keys()) if code_analysis else 'N/A'}")
 
-            skills_service = SkillsAnalysisService()
+            skills_service = SkillsAnalysisService(inventory=inventory)
             skills_service.extract_skills(
                 target_path=analysis_target,
                 code_analysis_result=code_analysis,
@@ -1445,7 +1512,7 @@ async def create_project_from_upload(
             document_analysis = _run_document_analysis(analysis_target, parse_result)
             
             # Run duplicate detection
-            duplicate_report = _run_duplicate_detection(parse_result)
+            duplicate_report = _run_duplicate_detection(parse_result, analysis_target)
             logger.info("=" * 50)
             logger.info("✨ All analysis pipelines completed")
             logger.info("=" * 50)
@@ -1510,7 +1577,7 @@ async def create_project_from_upload(
                 logger.warning(f"⚠️  Project auto-categorization failed: {e}")
 
             # File snippets for AI analysis (stored at scan time for reliability)
-            file_snippets_for_ai = _collect_files_for_ai(analysis_target)
+            file_snippets_for_ai = _collect_files_for_ai(analysis_target, inventory=inventory)
             if file_snippets_for_ai:
                 scan_data["file_snippets"] = file_snippets_for_ai
                 logger.info(f"💾 Saving {len(file_snippets_for_ai)} file snippets for AI analysis")
@@ -2100,6 +2167,7 @@ def _is_text_file(path_str: str, mime_type: str) -> bool:
 def _collect_files_for_ai(
     source_path: Path,
     max_files: int = _AI_MAX_FILES,
+    inventory: Optional[FileInventory] = None,
 ) -> List[Dict[str, str]]:
     """
     Read text/code file contents from a directory for LLM context.
@@ -2115,20 +2183,26 @@ def _collect_files_for_ai(
 
     source_resolved = source_path.resolve()
 
-    try:
-        all_files = sorted(source_path.rglob("*"))
-    except (OSError, FileNotFoundError):
-        # Windows MAX_PATH exceeded or broken symlinks (e.g. circular node_modules)
-        all_files = []
+    from_inventory = inventory is not None and inventory.covers(source_path)
+    if from_inventory:
+        all_files = sorted(inventory.path_of(entry) for entry in inventory.files(under=source_path))
+        source_path = source_resolved
+    else:
+        try:
+            all_files = sorted(source_path.rglob("*"))
+        except (OSError, FileNotFoundError):
+            # Windows MAX_PATH exceeded or broken symlinks (e.g. circular node_modules)
+            all_files = []
     for fpath in all_files:
         if len(results) >= max_files or total_chars >= _AI_MAX_TOTAL_CHARS:
             break
 
-        try:
-            if not fpath.is_file():
+        if not from_inventory:
+            try:
+                if not fpath.is_file():
+                    continue
+            except (OSError, FileNotFoundError):
                 continue
-        except (OSError, FileNotFoundError):
-            continue
 
         path_str = str(fpath.relative_to(source_path))
         if not _is_text_file(path_str, ""):
@@ -4429,6 +4503,55 @@ def _to_utc_iso(dt: datetime) -> str:
 _to_pg_timestamptz = _to_utc_iso
 
 
+def _parse_append_upload(
+    upload_id: str,
+    storage_path: Path,
+    existing_files: Dict[str, Optional[str]],
+) -> tuple[Any, Dict[str, set]]:
+    """Worker-pool entry point: parse an upload and re-hash it for legacy stored hashes.
+
+    Files scanned before the current hash algorithm still store legacy (e.g.
+    untagged MD5) hashes. For each such algorithm, only the upload's files at
+    those paths, and at paths the project does not have yet (so moved files
+    still match), are hashed once more; files stored under the current
+    algorithm are not read again.
+
+    Args:
+        upload_id: Upload being appended (for logging)
+        storage_path: The upload's .zip archive
+        existing_files: path -> stored hash of the project's files
+
+    Returns:
+        (parse result, path -> the upload's tagged hashes under legacy algorithms)
+    """
+    parse_result = parse_zip(storage_path, relevant_only=False)
+    upload_algorithm = default_algorithm()
+    recomputable = set(available_algorithms())
+    legacy_paths: Dict[str, set] = {}  # algorithm -> paths stored under it
+    for path, stored_hash in existing_files.items():
+        algorithm = split_hash(stored_hash)[0] if stored_hash else None
+        if algorithm and algorithm != upload_algorithm and algorithm in recomputable:
+            legacy_paths.setdefault(algorithm, set()).add(path)
+
+    upload_hashes: Dict[str, set] = {}
+    for algorithm, paths in sorted(legacy_paths.items()):
+        files = [
+            meta for meta in parse_result.files
+            if meta.path.replace("\\", "/") in paths
+            or meta.path.replace("\\", "/") not in existing_files
+        ]
+        if not files:
+            continue
+        try:
+            rehashed = hash_files(files, storage_path, algorithm)
+        except Exception as exc:
+            logger.warning(f"Failed to hash upload {upload_id} with {algorithm}: {exc}")
+            continue
+        for path, digest in rehashed.items():
+            upload_hashes.setdefault(path.replace("\\", "/"), set()).add(digest)
+    return parse_result, upload_hashes
+
+
 class AppendUploadRequest(BaseModel):
     """Request body for appending an upload to a project."""
     skip_duplicates: bool = Field(True, description="Skip files with matching SHA-256 hash")
@@ -4490,7 +4613,13 @@ async def append_upload_to_project(
         Detailed status for each file in the upload
     """
     # Import upload helpers lazily to avoid circular imports
-    from .upload_routes import uploads_store, uploads_store_lock
+    from .upload_routes import (
+        _parse_executor,
+        parse_results_lock,
+        parse_results_store,
+        uploads_store,
+        uploads_store_lock,
+    )
 
     # Verify upload exists and user owns it
     with uploads_store_lock:
@@ -4508,46 +4637,31 @@ async def append_upload_to_project(
             detail="Access denied to this upload",
         )
 
-    # Verify project exists and user owns it
+    # Verify the project exists and load the path -> hash of its files
+    # (scan plus earlier appends). No scan payload is decrypted once
+    # scan_files mirrors the project's latest scan.
     service = get_projects_service()
-    project = service.get_project_scan(user_id, project_id)
+    try:
+        existing_files = service.get_project_file_hashes(user_id, project_id)
+    except ProjectsServiceError as exc:
+        logger.error(f"Failed to load files of project {project_id}: {exc}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load project files",
+        )
 
-    if not project:
+    if existing_files is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project {project_id} not found",
         )
 
-    # Get existing cached files from scan_files table
-    try:
-        existing_files = service.get_cached_files(user_id, project_id)
-    except ProjectsServiceError as exc:
-        logger.warning(f"Failed to get cached files for project {project_id}: {exc}")
-        existing_files = {}
-
-    # Also build hash+path lookups from the project's scan_data (the
-    # authoritative source from the original scan).  scan_files may be
-    # incomplete due to Supabase RLS or row limits, but scan_data has
-    # all files from the original scan embedded in the project record.
-    scan_data = project.get("scan_data") or {}
-    scan_data_files = scan_data.get("files") or []
-    for entry in scan_data_files:
-        path = entry.get("path")
-        if not path:
-            continue
-        normalized = str(path).replace("\\", "/")
-        file_hash = entry.get("file_hash")
-        if normalized not in existing_files:
-            existing_files[normalized] = {
-                "sha256": file_hash,
-                "size_bytes": entry.get("size_bytes"),
-                "mime_type": entry.get("mime_type"),
-            }
-
-    # Build a lookup of existing hashes for deduplication
-    existing_hashes: Dict[str, str] = {}  # sha256 -> path
-    for path, meta in existing_files.items():
-        sha = meta.get("sha256")
+    # Build a lookup of existing hashes for deduplication. Stored hashes
+    # carry their algorithm tag (legacy untagged ones are tagged here), so
+    # they compare directly against freshly parsed hashes.
+    existing_hashes: Dict[str, str] = {}  # tagged content hash -> path
+    for path, stored_hash in existing_files.items():
+        sha = normalize_hash(stored_hash)
         if sha:
             existing_hashes[sha] = path
 
@@ -4564,8 +4678,13 @@ async def append_upload_to_project(
             detail="Upload file not found on disk",
         )
 
+    # Parse (and re-hash for legacy stored hashes) on the upload parse pool
     try:
-        parse_result = parse_zip(storage_path, relevant_only=False)
+        loop = asyncio.get_running_loop()
+        parse_result, upload_hashes = await loop.run_in_executor(
+            _parse_executor,
+            functools.partial(_parse_append_upload, upload_id, storage_path, existing_files),
+        )
     except Exception as exc:
         logger.exception(f"Failed to parse upload {upload_id}")
         raise HTTPException(
@@ -4579,6 +4698,7 @@ async def append_upload_to_project(
     files_skipped_duplicate = 0
     file_statuses: List[AppendFileStatus] = []
     files_to_upsert: List[Dict[str, Any]] = []
+    changed_files: List[Any] = []  # FileMetadata behind each files_to_upsert entry
 
     for file_meta in parse_result.files:
         rel_path = file_meta.path.replace("\\", "/")
@@ -4587,15 +4707,28 @@ async def append_upload_to_project(
         mime_type = file_meta.mime_type
 
         file_status: str
+        candidate_hashes = upload_hashes.get(rel_path, set())
+        if sha256:
+            candidate_hashes = candidate_hashes | {normalize_hash(sha256)}
 
         # Check if this exact file (by hash) already exists
-        if request.skip_duplicates and sha256 and sha256 in existing_hashes:
+        if request.skip_duplicates and not candidate_hashes.isdisjoint(existing_hashes):
             file_status = "skipped_duplicate"
             files_skipped_duplicate += 1
         elif rel_path in existing_files:
-            # Path exists - check if content changed
-            existing_sha = existing_files[rel_path].get("sha256")
-            if existing_sha == sha256:
+            # Path exists - check if content changed. A missing stored hash
+            # (too large to hash, or hashing failed) counts as changed unless
+            # the upload has no hash either; a stored hash this server cannot
+            # recompute (opaque, or an unavailable algorithm) cannot show a change.
+            existing_sha = normalize_hash(existing_files[rel_path])
+            if existing_sha:
+                unchanged = (
+                    split_hash(existing_sha)[0] not in available_algorithms()
+                    or existing_sha in candidate_hashes
+                )
+            else:
+                unchanged = not sha256
+            if unchanged:
                 # Same content, skip
                 file_status = "skipped_duplicate"
                 files_skipped_duplicate += 1
@@ -4603,11 +4736,13 @@ async def append_upload_to_project(
                 # Different content, update
                 file_status = "updated"
                 files_updated += 1
+                changed_files.append(file_meta)
                 files_to_upsert.append({
                     "relative_path": rel_path,
                     "size_bytes": size_bytes,
                     "mime_type": mime_type,
                     "sha256": sha256,
+                    "content_signature": file_meta.content_signature,
                     "metadata": {},
                     "last_seen_modified_at": _to_utc_iso(file_meta.modified_at),
                     "last_scanned_at": datetime.utcnow().isoformat() + "Z",
@@ -4618,11 +4753,13 @@ async def append_upload_to_project(
             files_added += 1
             if files_added <= 3:
                 logger.debug("Append: new file %s (hash=%s)", rel_path, sha256)
+            changed_files.append(file_meta)
             files_to_upsert.append({
                 "relative_path": rel_path,
                 "size_bytes": size_bytes,
                 "mime_type": mime_type,
                 "sha256": sha256,
+                "content_signature": file_meta.content_signature,
                 "metadata": {},
                 "last_seen_modified_at": _to_utc_iso(file_meta.modified_at),
                 "last_scanned_at": datetime.utcnow().isoformat() + "Z",
@@ -4634,31 +4771,36 @@ async def append_upload_to_project(
             sha256=sha256,
         ))
 
-    # Persist new/updated files into the project's scan_data so they are
-    # recognised as duplicates on subsequent appends.  The scan_files table
-    # upsert is kept as a best-effort secondary write but is not relied upon
-    # because Supabase RLS may silently block inserts.
+    # Persist new/updated files into the project's scan_data (authoritative)
+    # and into scan_files, which mirrors it so subsequent appends can read
+    # just the path -> hash columns.
     if files_to_upsert:
-        # 1) Append new file entries to scan_data.files (authoritative source)
-        #    Re-read the project to avoid overwriting concurrent appends.
+        # Only the new or changed files are read to sign them for near-duplicate detection.
         try:
-            fresh_project = service.get_project_scan(user_id, project_id)
-            fresh_scan_data = (fresh_project or {}).get("scan_data") or {}
-            existing_scan_files = list(fresh_scan_data.get("files") or [])
-            existing_paths = {
-                (e.get("path") or "").replace("\\", "/") for e in existing_scan_files
-            }
-            for entry in files_to_upsert:
-                rel = entry["relative_path"]
-                if rel not in existing_paths:
-                    existing_scan_files.append({
-                        "path": rel,
-                        "size_bytes": entry.get("size_bytes"),
-                        "mime_type": entry.get("mime_type"),
-                        "file_hash": entry.get("sha256"),
-                    })
-            fresh_scan_data["files"] = existing_scan_files
-            service.update_project_scan_data(user_id, project_id, fresh_scan_data)
+            await loop.run_in_executor(
+                _parse_executor,
+                functools.partial(attach_content_signatures, changed_files, storage_path),
+            )
+        except Exception as exc:
+            logger.warning(f"Content signatures failed for upload {upload_id}: {exc}")
+        for entry, file_meta in zip(files_to_upsert, changed_files):
+            entry["content_signature"] = file_meta.content_signature
+
+        # 1) Append the entries as a scan_data segment (authoritative source).
+        #    Segments are merged over scan_data.files on read, so concurrent
+        #    appends never overwrite each other and the stored blob is not
+        #    re-read or rewritten here.
+        try:
+            service.append_scan_files(user_id, project_id, [
+                {
+                    "path": entry["relative_path"],
+                    "size_bytes": entry.get("size_bytes"),
+                    "mime_type": entry.get("mime_type"),
+                    "file_hash": entry.get("sha256"),
+                    "content_signature": entry.get("content_signature"),
+                }
+                for entry in files_to_upsert
+            ])
         except Exception as exc:
             logger.error(f"Failed to update scan_data with appended files: {exc}")
             raise HTTPException(
@@ -4666,7 +4808,7 @@ async def append_upload_to_project(
                 detail="Failed to persist appended file data",
             )
 
-        # 2) Write to scan_files cache table
+        # 2) Write to the scan_files mirror
         try:
             service.upsert_cached_files(user_id, project_id, files_to_upsert)
         except ProjectsServiceError as exc:
@@ -4683,6 +4825,8 @@ async def append_upload_to_project(
             logger.info(f"Cleaned up upload file: {storage_path}")
         with uploads_store_lock:
             uploads_store.pop(upload_id, None)
+        with parse_results_lock:
+            parse_results_store.pop(upload_id, None)
     except OSError as exc:
         logger.warning(f"Failed to clean up upload file {storage_path}: {exc}")
 
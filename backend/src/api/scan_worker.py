@@ -0,0 +1,121 @@
+# scan_worker.py
+# Standalone scan workers that drain the durable scan job queue.
+# - Claims queued scans fairly across users (per-user concurrency cap)
+# - Returns scans whose worker died or restarted to the queue, prunes old finished jobs
+# - Run with: python -m api.scan_worker --processes 2   (from backend/src)
+# Set SCAN_QUEUE_MODE=worker on the API so it only enqueues.
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+try:
+    from dotenv import load_dotenv
+except Exception:  # pragma: no cover - optional dependency
+    load_dotenv = None  # type: ignore
+
+try:
+    from api.spec_routes import (
+        _execute_scan_job,
+        _max_scans_per_user,
+        _scan_lease_sec,
+        recover_expired_scans,
+    )
+    from services.job_queue import get_job_queue
+except (ModuleNotFoundError, ImportError):  # pragma: no cover - test/import fallback
+    from backend.src.api.spec_routes import (
+        _execute_scan_job,
+        _max_scans_per_user,
+        _scan_lease_sec,
+        recover_expired_scans,
+    )
+    from backend.src.services.job_queue import get_job_queue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_SEC = 1.0
+
+
+def run_once(worker_id: str) -> bool:
+    """Claim and run at most one scan. Returns False when nothing was claimable."""
+    recover_expired_scans()
+    job = get_job_queue().claim(
+        worker_id,
+        lease_sec=_scan_lease_sec(),
+        max_per_user=_max_scans_per_user(),
+    )
+    if job is None:
+        return False
+    logger.info(f"Worker {worker_id} running scan {job.job_id} (attempt {job.attempts})")
+    _execute_scan_job(job, worker_id)
+    return True
+
+
+def run_worker(
+    worker_id: Optional[str] = None,
+    stop_event: Optional[threading.Event] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL_SEC,
+) -> None:
+    """Poll the queue until ``stop_event`` is set, running one scan at a time."""
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    stop_event = stop_event or threading.Event()
+    logger.info(f"Scan worker {worker_id} started")
+    while not stop_event.is_set():
+        try:
+            if run_once(worker_id):
+                continue
+        except Exception:
+            logger.exception(f"Scan worker {worker_id} failed to process a job")
+        stop_event.wait(poll_interval)
+    logger.info(f"Scan worker {worker_id} stopped")
+
+
+def _worker_process_main(poll_interval: float) -> None:
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    run_worker(stop_event=stop_event, poll_interval=poll_interval)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run scan queue workers")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL_SEC)
+    args = parser.parse_args(argv)
+    if load_dotenv:
+        backend_root = Path(__file__).resolve().parents[2]
+        load_dotenv(backend_root / ".env", override=False)
+        load_dotenv(backend_root.parent / ".env", override=False)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+
+    if args.processes <= 1:
+        _worker_process_main(args.poll_interval)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_process_main, args=(args.poll_interval,), name=f"scan-worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,18 +8,23 @@ services incrementally.
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import os
 import sys
 import threading
 import tempfile
+import time
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+from collections.abc import MutableMapping
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 try:
@@ -37,6 +42,11 @@ try:
         _extract_archive_for_analysis,
         _collect_files_for_ai,
     )
+    from scanner.inventory import FileInventory
+    from services.task_graph import TaskGraph, TaskOutcome, outcome_timings
+    from services.cancellation import CancellationToken, ScanCancelled, run_in_worker_process
+    from services.job_queue import ClaimedJob, get_job_queue
+    from services.progress_bus import get_shared_progress_bus
 except (ModuleNotFoundError, ImportError):  # pragma: no cover - test/import fallback
     from backend.src.api.dependencies import AuthContext, get_auth_context
     from backend.src.services.services.projects_service import ProjectsService, ProjectsServiceError
@@ -52,6 +62,11 @@ except (ModuleNotFoundError, ImportError):  # pragma: no cover - test/import fal
         _extract_archive_for_analysis,
         _collect_files_for_ai,
     )
+    from backend.src.scanner.inventory import FileInventory
+    from backend.src.services.task_graph import TaskGraph, TaskOutcome, outcome_timings
+    from backend.src.services.cancellation import CancellationToken, ScanCancelled, run_in_worker_process
+    from backend.src.services.job_queue import ClaimedJob, get_job_queue
+    from backend.src.services.progress_bus import get_shared_progress_bus
 
 # Add parent directory to path for absolute imports (needed for lazy imports in background tasks)
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -117,6 +132,7 @@ class ParseOptions(BaseModel):
 class Progress(BaseModel):
     percent: float = 0.0
     message: Optional[str] = None
+    phase: Optional[str] = None
 
 
 class ScanRequest(BaseModel):
@@ -462,15 +478,63 @@ class ConfigResponse(BaseModel):
         extra = "allow"
 
 
+class ScanQueueStatus(BaseModel):
+    mode: str
+    queued: int
+    running: int
+    user_queued: int
+    user_running: int
+    max_concurrent_per_user: int
+
+
+_TERMINAL_SCAN_STATES = (JobState.succeeded, JobState.failed, JobState.canceled)
+
+
+class _QueuedScanStore(MutableMapping):
+    """
+    ScanStatus view over the durable scan job queue.
+
+    Scan statuses live next to their jobs (services.job_queue), so they
+    survive restarts and are visible to separate worker processes. A status
+    in a terminal state retires its job from the queue.
+    """
+
+    def __getitem__(self, scan_id: str) -> ScanStatus:
+        document = get_job_queue().get_status(scan_id)
+        if document is None:
+            raise KeyError(scan_id)
+        return ScanStatus.model_validate(document)
+
+    def __setitem__(self, scan_id: str, scan: ScanStatus) -> None:
+        get_job_queue().put_status(
+            scan_id,
+            scan.user_id,
+            scan.model_dump(mode="json"),
+            finished=scan.state in _TERMINAL_SCAN_STATES,
+        )
+
+    def __delitem__(self, scan_id: str) -> None:
+        if not get_job_queue().delete(scan_id):
+            raise KeyError(scan_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(get_job_queue().job_ids())
+
+    def __len__(self) -> int:
+        return len(get_job_queue().job_ids())
+
+
 # In-memory placeholders
 _upload_store: Dict[str, Upload] = {}
-_scan_store: Dict[str, ScanStatus] = {}
+_scan_store: MutableMapping = _QueuedScanStore()
 _project_store: Dict[str, ProjectDetail] = {}
 _resume_store: Dict[str, ResumeItem] = {}
 _consent_store: Dict[str, ConsentStatus] = {}
 
-# Thread lock for scan store access
+# Serialises check-then-write sequences on the scan store and guards _scan_tokens
 _scan_store_lock = threading.Lock()
+# Cancellation tokens for scans that are queued or running, keyed by scan_id.
+_scan_tokens: Dict[str, CancellationToken] = {}
 
 # Lazy-initialized scan service
 _scan_service = None
@@ -510,21 +574,84 @@ def _update_scan_status(
     result: Optional[Dict[str, Any]] = None,
     project_id: Optional[str] = None,
 ) -> None:
-    """Thread-safe update of scan status using immutable pattern."""
-    with _scan_store_lock:
-        if scan_id in _scan_store:
-            current = _scan_store[scan_id]
-            updates: Dict[str, Any] = {"state": state}
-            if progress is not None:
-                updates["progress"] = progress
-            if error is not None:
-                updates["error"] = error
-            if result is not None:
-                updates["result"] = result
-            if project_id is not None:
-                updates["project_id"] = project_id
-            # Use model_copy instead of direct mutation (Pydantic v2 best practice)
-            _scan_store[scan_id] = current.model_copy(update=updates)
+    """Atomic update of scan status in the job queue using immutable pattern.
+
+    The new status is also published to the progress bus for streaming clients.
+    """
+    def mutate(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        current = ScanStatus.model_validate(document)
+        if current.state == JobState.canceled:
+            # A canceled scan stays canceled; late progress from its workers is dropped.
+            return None
+        updates: Dict[str, Any] = {"state": state}
+        if progress is not None:
+            updates["progress"] = progress
+        if error is not None:
+            updates["error"] = error
+        if result is not None:
+            updates["result"] = result
+        if project_id is not None:
+            updates["project_id"] = project_id
+        # Use model_copy instead of direct mutation (Pydantic v2 best practice)
+        return current.model_copy(update=updates).model_dump(mode="json")
+
+    updated = get_job_queue().update_status(
+        scan_id,
+        mutate,
+        finished=lambda document: document.get("state") in [item.value for item in _TERMINAL_SCAN_STATES],
+    )
+    if updated is not None:
+        _publish_scan_status(ScanStatus.model_validate(updated))
+
+
+def _progress_event_data(scan: ScanStatus) -> Dict[str, Any]:
+    """Compact streaming form of a scan status; clients fetch the full result via GET."""
+    progress = scan.progress or Progress()
+    data: Dict[str, Any] = {
+        "scan_id": scan.scan_id,
+        "state": scan.state.value,
+        "percent": progress.percent,
+        "message": progress.message,
+        "phase": progress.phase,
+    }
+    if scan.error is not None:
+        data["error"] = scan.error.model_dump()
+    return data
+
+
+def _publish_scan_status(scan: ScanStatus) -> None:
+    get_shared_progress_bus().publish(
+        scan.scan_id,
+        _progress_event_data(scan),
+        final=scan.state in _TERMINAL_SCAN_STATES,
+    )
+
+
+def _report_progress(
+    scan_id: str,
+    percent: float,
+    message: str,
+    *,
+    phase: str,
+    timings: Optional[Dict[str, float]] = None,
+) -> None:
+    """Report running-scan progress.
+
+    Every update reaches streaming subscribers through the progress bus;
+    the durable scan status is written at most SCAN_PROGRESS_MAX_HZ times
+    per second, so per-file callbacks no longer rewrite it for every file.
+    """
+    bus = get_shared_progress_bus()
+    if bus.due(scan_id):
+        _update_scan_status(
+            scan_id,
+            JobState.running,
+            progress=Progress(percent=percent, message=message, phase=phase),
+        )
+    else:
+        bus.publish(scan_id, {"state": JobState.running.value, "percent": percent, "message": message, "phase": phase})
+    if timings is not None:
+        bus.publish(scan_id, {"timings": dict(timings)})
 
 
 def _validate_scan_path(source_path: str) -> Path:
@@ -688,6 +815,241 @@ def _default_config() -> Dict[str, Any]:
     }
 
 
+_WORKER_STOP_GRACE_SEC = 5
+
+
+def _use_worker_process(total_files: int) -> bool:
+    """Run code analysis in a killable process for targets of at least SCAN_WORKER_MIN_FILES files.
+
+    Small scans stay in-process (cooperative cancellation only) to avoid the
+    cost of starting an interpreter; SCAN_WORKER_MIN_FILES=0 disables workers.
+    """
+    try:
+        threshold = int(os.getenv("SCAN_WORKER_MIN_FILES", "200"))
+    except ValueError:
+        threshold = 200
+    return threshold > 0 and total_files >= threshold
+
+
+def _queue_setting(name: str, default: int, minimum: int = 0) -> int:
+    try:
+        value = int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+    return max(minimum, value)
+
+
+def _scan_queue_mode() -> str:
+    """SCAN_QUEUE_MODE: "inline" runs each queued scan in the API process; "worker" leaves it to api.scan_worker."""
+    mode = (os.getenv("SCAN_QUEUE_MODE") or "inline").strip().lower()
+    return mode if mode in ("inline", "worker") else "inline"
+
+
+def _scan_lease_sec() -> int:
+    return _queue_setting("SCAN_JOB_LEASE_SEC", 60, minimum=5)
+
+
+def _max_scans_per_user() -> int:
+    """SCAN_MAX_CONCURRENT_PER_USER caps claimed scans per user across workers (0 = unlimited)."""
+    return _queue_setting("SCAN_MAX_CONCURRENT_PER_USER", 2)
+
+
+def _seal_access_token(access_token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Encrypt the caller's token for a worker process; without a master key it is not persisted."""
+    if not access_token:
+        return None
+    try:
+        from services.services.encryption import EncryptionService
+        return EncryptionService().encrypt_json({"access_token": access_token}).to_dict()
+    except Exception as exc:
+        logger.debug(f"Access token not queued with scan: {exc}")
+        return None
+
+
+def _open_access_token(envelope: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not envelope:
+        return None
+    try:
+        from services.services.encryption import EncryptionService
+        return EncryptionService().decrypt_json(envelope).get("access_token")
+    except Exception as exc:
+        logger.warning(f"Unable to decrypt queued access token: {exc}")
+        return None
+
+
+def _execute_scan_job(job: ClaimedJob, worker_id: str, access_token: Optional[str] = None) -> None:
+    """Run a claimed scan job while keeping its lease alive.
+
+    A heartbeat thread renews the lease and watches the stored status, so a
+    DELETE handled by another process still cancels the scan here. The job
+    is retired from the queue when the pipeline returns.
+    """
+    queue = get_job_queue()
+    lease_sec = _scan_lease_sec()
+    with _scan_store_lock:
+        cancel_token = _scan_tokens.setdefault(job.job_id, CancellationToken())
+    stop = threading.Event()
+
+    def heartbeat() -> None:
+        while not stop.wait(lease_sec / 3):
+            try:
+                if not queue.heartbeat(job.job_id, worker_id, lease_sec=lease_sec):
+                    cancel_token.cancel("Scan lease lost")
+                    return
+                document = queue.get_status(job.job_id) or {}
+                if document.get("state") == JobState.canceled.value:
+                    cancel_token.cancel("Canceled by user")
+                    return
+            except Exception:
+                logger.debug(f"Heartbeat for scan {job.job_id} failed", exc_info=True)
+
+    monitor = threading.Thread(target=heartbeat, name=f"scan-heartbeat-{job.job_id}", daemon=True)
+    monitor.start()
+    payload = job.payload
+    try:
+        _run_scan_background(
+            scan_id=job.job_id,
+            source_path=payload["source_path"],
+            relevance_only=bool(payload.get("relevance_only")),
+            persist_project=bool(payload.get("persist_project", True)),
+            profile_id=payload.get("profile_id"),
+            access_token=access_token or _open_access_token(payload.get("access_token")),
+        )
+    finally:
+        stop.set()
+        queue.finish(job.job_id, worker_id)
+
+
+_PRUNE_INTERVAL_SEC = 600.0
+_last_prune: Optional[float] = None
+
+
+def recover_expired_scans() -> int:
+    """Requeue scans whose lease lapsed; scans out of attempts are marked failed.
+
+    Also drops finished jobs older than SCAN_JOB_RETENTION_SEC (at most once
+    every few minutes). Returns the number of scans returned to the queue.
+    """
+    global _last_prune
+    queue = get_job_queue()
+    outcome = queue.requeue_expired()
+    for scan_id in outcome["abandoned"]:
+        _update_scan_status(
+            scan_id,
+            JobState.failed,
+            error=ErrorResponse(
+                code="SCAN_ABANDONED",
+                message="Scan worker stopped repeatedly before the scan finished",
+            ),
+        )
+    if outcome["requeued"]:
+        logger.info(f"Requeued {len(outcome['requeued'])} scan(s) with expired leases")
+
+    now = time.monotonic()
+    if _last_prune is None or now - _last_prune >= _PRUNE_INTERVAL_SEC:
+        _last_prune = now
+        pruned = queue.prune_finished(_queue_setting("SCAN_JOB_RETENTION_SEC", 7 * 24 * 3600, minimum=60))
+        if pruned:
+            logger.info(f"Pruned {pruned} finished scan job(s)")
+    return len(outcome["requeued"])
+
+
+class _InlineScanDispatcher:
+    """
+    Runs queued scans inside the API process (SCAN_QUEUE_MODE=inline).
+
+    A daemon thread recovers lapsed leases, then claims jobs through the
+    queue's fair ``claim`` (honouring SCAN_MAX_CONCURRENT_PER_USER) until
+    SCAN_INLINE_CONCURRENCY scans are running. It wakes when a scan is
+    submitted or one finishes, and otherwise every SCAN_QUEUE_POLL_SEC, so
+    scans left queued or running by a previous process are picked up
+    again after a restart.
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = f"api-{os.getpid()}"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = 0
+        # Tokens of scans submitted to this process; queued payloads carry a sealed copy.
+        self._access_tokens: Dict[str, str] = {}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="scan-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def submit(self, scan_id: str, access_token: Optional[str] = None) -> None:
+        if access_token:
+            with self._lock:
+                self._access_tokens[scan_id] = access_token
+        self.start()
+        self._wake.set()
+
+    def _loop(self) -> None:
+        poll_sec = _queue_setting("SCAN_QUEUE_POLL_SEC", 5, minimum=1)
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                recover_expired_scans()
+                self._drain()
+            except Exception:
+                logger.exception("Inline scan dispatcher failed to process the queue")
+            self._wake.wait(poll_sec)
+
+    def _drain(self) -> None:
+        capacity = _queue_setting("SCAN_INLINE_CONCURRENCY", 4, minimum=1)
+        queue = get_job_queue()
+        while not self._stop.is_set():
+            with self._lock:
+                if self._running >= capacity:
+                    return
+            job = queue.claim(self.worker_id, lease_sec=_scan_lease_sec(), max_per_user=_max_scans_per_user())
+            if job is None:
+                return
+            with self._lock:
+                self._running += 1
+                access_token = self._access_tokens.pop(job.job_id, None)
+            threading.Thread(
+                target=self._run,
+                args=(job, access_token),
+                name=f"scan-{job.job_id}",
+                daemon=True,
+            ).start()
+
+    def _run(self, job: ClaimedJob, access_token: Optional[str]) -> None:
+        try:
+            _execute_scan_job(job, self.worker_id, access_token=access_token)
+        except Exception:
+            logger.exception(f"Inline scan {job.job_id} failed")
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._wake.set()
+
+
+_inline_dispatcher = _InlineScanDispatcher()
+
+
+def start_scan_dispatcher() -> None:
+    """Start inline scan dispatch at API startup; a no-op when dedicated workers run scans."""
+    if _scan_queue_mode() == "inline":
+        _inline_dispatcher.start()
+
+
+def stop_scan_dispatcher() -> None:
+    _inline_dispatcher.stop()
+
+
 def _run_scan_background(
     scan_id: str,
     source_path: str,
@@ -696,13 +1058,21 @@ def _run_scan_background(
     profile_id: Optional[str],
     access_token: Optional[str] = None,
 ) -> None:
-    """Background task that executes the scan pipeline."""
+    """Background task that executes the scan pipeline.
+
+    Stops at the next checkpoint once the scan's cancellation token is
+    triggered (DELETE /api/scans/{scan_id}); CPU-heavy code analysis of
+    large targets runs in a worker process that is killed on cancel.
+    """
+    with _scan_store_lock:
+        cancel_token = _scan_tokens.setdefault(scan_id, CancellationToken())
     try:
+        cancel_token.raise_if_cancelled()
         # Update status to running
         _update_scan_status(
             scan_id,
             JobState.running,
-            progress=Progress(percent=5.0, message="Starting scan..."),
+            progress=Progress(percent=5.0, message="Starting scan...", phase="starting"),
         )
 
         target = Path(source_path)
@@ -720,23 +1090,12 @@ def _run_scan_background(
         # Progress callback for scan service
         def progress_callback(payload):
             if isinstance(payload, str):
-                _update_scan_status(
-                    scan_id,
-                    JobState.running,
-                    progress=Progress(percent=30.0, message=payload),
-                )
+                _report_progress(scan_id, 30.0, payload, phase="scanning")
             elif isinstance(payload, dict) and payload.get("type") == "files":
                 processed = payload.get("processed", 0)
                 total = payload.get("total", 1)
                 percent = min(90.0, 30.0 + (processed / max(total, 1)) * 60.0)
-                _update_scan_status(
-                    scan_id,
-                    JobState.running,
-                    progress=Progress(
-                        percent=percent,
-                        message=f"Processing files ({processed}/{total})...",
-                    ),
-                )
+                _report_progress(scan_id, percent, f"Processing files ({processed}/{total})...", phase="scanning")
 
         # Run the scan
         from src.scanner.models import ScanPreferences
@@ -752,234 +1111,151 @@ def _run_scan_background(
             relevant_only=relevance_only,
             preferences=preferences,
             progress_callback=progress_callback,
+            cancel_token=cancel_token,
         )
 
         analysis_target = target
         temp_analysis_dir: Optional[tempfile.TemporaryDirectory[str]] = None
+        # Reuse the scan's single directory walk for every analyzer below.
+        inventory = getattr(scan_result, "inventory", None)
+        if not isinstance(inventory, FileInventory):
+            inventory = None
 
         if target.is_file() and target.suffix.lower() == ".zip":
             temp_analysis_dir = tempfile.TemporaryDirectory(prefix="scan-analysis-")
             _extract_archive_for_analysis(target, Path(temp_analysis_dir.name))
             analysis_target = Path(temp_analysis_dir.name)
+            inventory = FileInventory.build(analysis_target)
 
         # ========================================
         # RUN ALL ANALYSES (optimized with parallel execution)
         # ========================================
         logger.info("=" * 50)
-        logger.info("🚀 Starting all analysis pipelines (parallel mode)...")
+        logger.info("🚀 Starting all analysis pipelines (dependency graph)...")
         logger.info("=" * 50)
         
+        stage_timings: Dict[str, float] = {
+            label: round(seconds, 3) for label, seconds in (getattr(scan_result, "timings", None) or ())
+        }
         _update_scan_status(
             scan_id,
             JobState.running,
-            progress=Progress(percent=40.0, message="Running parallel analyses..."),
+            progress=Progress(percent=40.0, message="Running parallel analyses...", phase="analysis"),
         )
+        get_shared_progress_bus().publish(scan_id, {"timings": dict(stage_timings)})
         
-        # PHASE 1: Run independent analyses in parallel
-        # Git, Media, PDF, Document can all run simultaneously
-        import concurrent.futures
-        import threading
-        
-        git_analysis = None
-        media_analysis = None
-        pdf_analysis = None
-        document_analysis = None
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            logger.info("🔄 Phase 1: Running independent analyses in parallel...")
-            
-            # Submit all independent analyses
-            future_git = executor.submit(_run_git_analysis_for_path, analysis_target)
-            future_media = executor.submit(_run_media_analysis, scan_result.parse_result)
-            future_pdf = executor.submit(_run_pdf_analysis, analysis_target, scan_result.parse_result)
-            future_document = executor.submit(_run_document_analysis, analysis_target, scan_result.parse_result)
-            
-            # Collect results as they complete
-            try:
-                git_analysis = future_git.result(timeout=120)
-                logger.info("✅ Git analysis completed")
-            except Exception as e:
-                logger.warning(f"⚠️  Git analysis failed: {e}")
-            
-            try:
-                media_analysis = future_media.result(timeout=60)
-                logger.info("✅ Media analysis completed")
-            except Exception as e:
-                logger.warning(f"⚠️  Media analysis failed: {e}")
-            
-            try:
-                pdf_analysis = future_pdf.result(timeout=90)
-                logger.info("✅ PDF analysis completed")
-            except Exception as e:
-                logger.warning(f"⚠️  PDF analysis failed: {e}")
-            
-            try:
-                document_analysis = future_document.result(timeout=60)
-                logger.info("✅ Document analysis completed")
-            except Exception as e:
-                logger.warning(f"⚠️  Document analysis failed: {e}")
-        
-        logger.info("✨ Phase 1 complete")
-        
-        git_data = git_analysis[0] if git_analysis else None
-        
-        # PHASE 2: Code Analysis (with timeout to prevent hanging)
-        _update_scan_status(
-            scan_id,
-            JobState.running,
-            progress=Progress(percent=50.0, message="Running code analysis..."),
+        # Each analysis declares what it consumes and starts as soon as those
+        # settle, so code analysis no longer waits for git, media or documents.
+        # Failed or timed-out inputs reach their consumers as None.
+        def run_git_analysis():
+            return _run_git_analysis_for_path(analysis_target, inventory, cancel_token)
+
+        def run_media_analysis():
+            return _run_media_analysis(scan_result.parse_result)
+
+        def run_pdf_analysis():
+            return _run_pdf_analysis(analysis_target, scan_result.parse_result)
+
+        def run_document_analysis():
+            return _run_document_analysis(analysis_target, scan_result.parse_result)
+
+        # Code analysis timeout scales with file count (minimum 60s, +10s per 100 files, capped at 5 minutes)
+        total_files = len(scan_result.parse_result.files) if scan_result and scan_result.parse_result else 0
+        code_timeout = min(max(60, 60 + (total_files // 100) * 10), 300)
+        code_in_worker = _use_worker_process(total_files)
+
+        def run_code_analysis():
+            if code_in_worker:
+                # A worker process is killed on timeout or cancel instead of being left running.
+                return run_in_worker_process(
+                    _run_code_analysis_for_path,
+                    analysis_target,
+                    preferences,
+                    inventory,
+                    timeout=code_timeout,
+                    cancel_token=cancel_token,
+                )
+            return _run_code_analysis_for_path(analysis_target, preferences, inventory, cancel_token)
+
+        def run_duplicate_detection():
+            return _run_duplicate_detection(scan_result.parse_result, analysis_target, cancel_token)
+
+        def run_skills_analysis(git, code):
+            from services.services.skills_analysis_service import SkillsAnalysisService
+            skills_service = SkillsAnalysisService(inventory=inventory)
+            skills_service.extract_skills(
+                target_path=analysis_target,
+                code_analysis_result=code,
+                git_analysis_result=git[0] if git else None,
+            )
+            return _build_skills_analysis(skills_service)
+
+        def run_contribution_metrics(git, code):
+            if not git:
+                return None
+            from services.services.contribution_analysis_service import ContributionAnalysisService
+            metrics = ContributionAnalysisService().analyze_contributions(
+                git_analysis=git[0],
+                code_analysis=code,
+                parse_result=scan_result.parse_result,
+            )
+            return _serialize_contribution_metrics(metrics), metrics
+
+        def run_skills_progress(skills, contributions):
+            chronological = (skills or {}).get("chronological_overview") or []
+            if not chronological:
+                return None
+            from local_analysis.skill_progress_timeline import build_skill_progression
+            from api.project_routes import _period_to_dict
+            progression = build_skill_progression(chronological, contributions[1] if contributions else None)
+            return {"timeline": [_period_to_dict(period) for period in progression.timeline]}
+
+        graph = (
+            TaskGraph()
+            .add("git", run_git_analysis, timeout=120)
+            .add("media", run_media_analysis, timeout=60)
+            .add("pdf", run_pdf_analysis, timeout=90)
+            .add("documents", run_document_analysis, timeout=60)
+            # The worker enforces its own timeout; the extra grace lets it stop the process first.
+            .add("code", run_code_analysis, timeout=code_timeout + (_WORKER_STOP_GRACE_SEC if code_in_worker else 0))
+            # Signing source files for near-duplicates reads them, so this scales like code analysis.
+            .add("duplicates", run_duplicate_detection, timeout=code_timeout)
+            .add("skills", run_skills_analysis, deps=("git", "code"), timeout=120)
+            .add("contributions", run_contribution_metrics, deps=("git", "code"), timeout=90)
+            .add("skills_progress", run_skills_progress, deps=("skills", "contributions"), timeout=60)
         )
-        
-        code_analysis = None
-        try:
-            # Calculate timeout based on file count (minimum 60s, +10s per 100 files)
-            total_files = len(scan_result.parse_result.files) if scan_result and scan_result.parse_result else 0
-            base_timeout = 60
-            file_based_timeout = max(base_timeout, base_timeout + (total_files // 100) * 10)
-            timeout_seconds = min(file_based_timeout, 300)  # Cap at 5 minutes
-            
-            logger.info(f"🔄 Phase 2: Code analysis starting...")
-            logger.info(f"   Target: {analysis_target}")
-            logger.info(f"   Timeout: {timeout_seconds}s for {total_files} files")
-            
-            # Run code analysis with dynamic timeout
-            result_container = [None]
-            exception_container = [None]
-            
-            def run_with_exception_handling():
-                try:
-                    logger.info(f"   Starting code analysis thread...")
-                    result_container[0] = _run_code_analysis_for_path(analysis_target, preferences)
-                    logger.info(f"   Code analysis thread completed")
-                except Exception as e:
-                    logger.error(f"   Code analysis thread error: {e}")
-                    exception_container[0] = e
-            
-            thread = threading.Thread(target=run_with_exception_handling, daemon=True)
-            thread.start()
-            logger.info(f"   Waiting for code analysis (max {timeout_seconds}s)...")
-            thread.join(timeout=timeout_seconds)
-            
-            if thread.is_alive():
-                logger.warning(f"⚠️  Code analysis timed out after {timeout_seconds} seconds - skipping")
-                code_analysis = None
-            elif exception_container[0]:
-                logger.warning(f"⚠️  Code analysis error: {exception_container[0]} - skipping")
-                code_analysis = None
+
+        def on_analysis_complete(outcome: TaskOutcome, settled: int, total: int) -> None:
+            if outcome.ok:
+                logger.info(f"✅ {outcome.name} analysis completed in {outcome.duration:.2f}s")
             else:
-                code_analysis = result_container[0]
-                if code_analysis:
-                    logger.info(f"✅ Code analysis completed: {list(code_analysis.keys())}")
-                else:
-                    logger.info("⚠️  Code analysis returned None")
-        except Exception as e:
-            logger.warning(f"⚠️  Code analysis setup error: {e} - skipping")
-            code_analysis = None
-        
-        logger.info("✨ Phase 2 complete")
-        
-        # PHASE 3: Run dependent analyses in parallel
-        # Skills, Contribution Metrics, and Duplicate Detection can run together
-        _update_scan_status(
-            scan_id,
-            JobState.running,
-            progress=Progress(percent=65.0, message="Running dependent analyses..."),
-        )
-        
-        skills_analysis = None
-        contribution_metrics_payload = None
-        metrics_obj = None
-        duplicate_report = None
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            logger.info("🔄 Phase 3: Running dependent analyses in parallel...")
-            
-            # Skills Analysis
-            def run_skills_analysis():
-                try:
-                    from services.services.skills_analysis_service import SkillsAnalysisService
-                    skills_service = SkillsAnalysisService()
-                    skills_service.extract_skills(
-                        target_path=analysis_target,
-                        code_analysis_result=code_analysis,
-                        git_analysis_result=git_data,
-                    )
-                    return _build_skills_analysis(skills_service)
-                except Exception as e:
-                    logger.error(f"❌ Skills analysis failed: {e}", exc_info=True)
-                    return None
-            
-            # Contribution Metrics
-            def run_contribution_metrics():
-                if not git_data:
-                    return None, None
-                try:
-                    from services.services.contribution_analysis_service import ContributionAnalysisService
-                    metrics = ContributionAnalysisService().analyze_contributions(
-                        git_analysis=git_data,
-                        code_analysis=code_analysis,
-                        parse_result=scan_result.parse_result,
-                    )
-                    payload = _serialize_contribution_metrics(metrics)
-                    return payload, metrics
-                except Exception as e:
-                    logger.error(f"❌ Contribution analysis failed: {e}", exc_info=True)
-                    return None, None
-            
-            # Duplicate Detection
-            def run_duplicate_detection():
-                try:
-                    return _run_duplicate_detection(scan_result.parse_result)
-                except Exception as e:
-                    logger.warning(f"⚠️  Duplicate detection failed: {e}")
-                    return None
-            
-            # Submit parallel tasks
-            future_skills = executor.submit(run_skills_analysis)
-            future_contrib = executor.submit(run_contribution_metrics)
-            future_dupes = executor.submit(run_duplicate_detection)
-            
-            # Collect results
-            try:
-                skills_analysis = future_skills.result(timeout=120)
-                if skills_analysis:
-                    logger.info("✅ Skills analysis completed")
-            except Exception as e:
-                logger.warning(f"⚠️  Skills analysis timeout/error: {e}")
-            
-            try:
-                contribution_metrics_payload, metrics_obj = future_contrib.result(timeout=90)
-                if contribution_metrics_payload:
-                    logger.info("✅ Contribution metrics completed")
-            except Exception as e:
-                logger.warning(f"⚠️  Contribution metrics timeout/error: {e}")
-            
-            try:
-                duplicate_report = future_dupes.result(timeout=60)
-                if duplicate_report:
-                    logger.info("✅ Duplicate detection completed")
-            except Exception as e:
-                logger.warning(f"⚠️  Duplicate detection timeout/error: {e}")
-        
-        logger.info("✨ Phase 3 complete")
-        
-        # PHASE 4: Skills Progress Timeline (depends on skills analysis)
-        skills_progress = None
-        if skills_analysis:
-            chronological = skills_analysis.get("chronological_overview") or []
-            if chronological:
-                try:
-                    logger.info("🔄 Phase 4: Building skills progress timeline...")
-                    from local_analysis.skill_progress_timeline import build_skill_progression
-                    progression = build_skill_progression(chronological, metrics_obj)
-                    from api.project_routes import _period_to_dict
-                    skills_progress = {
-                        "timeline": [_period_to_dict(period) for period in progression.timeline],
-                    }
-                    logger.info("✅ Skills progress timeline completed")
-                except Exception as e:
-                    logger.error(f"❌ Skills progress failed: {e}", exc_info=True)
-        
+                logger.warning(f"⚠️  {outcome.name} analysis {outcome.status}: {outcome.error}")
+            if outcome.started_at is not None:
+                stage_timings[f"Analysis: {outcome.name}"] = round(outcome.duration, 3)
+            _report_progress(
+                scan_id,
+                40.0 + 45.0 * settled / max(total, 1),
+                f"Running analyses ({settled}/{total})...",
+                phase="analysis",
+                timings=stage_timings,
+            )
+
+        logger.info(f"🔄 Running analysis graph (code analysis timeout {code_timeout}s for {total_files} files)...")
+        outcomes = graph.run(cancel_event=cancel_token, on_complete=on_analysis_complete)
+        cancel_token.raise_if_cancelled()
+        results = {name: outcome.value for name, outcome in outcomes.items()}
+
+        git_analysis = results.get("git")
+        media_analysis = results.get("media")
+        pdf_analysis = results.get("pdf")
+        document_analysis = results.get("documents")
+        code_analysis = results.get("code")
+        duplicate_report = results.get("duplicates")
+        skills_analysis = results.get("skills")
+        contribution_metrics_payload = (results.get("contributions") or (None, None))[0]
+        skills_progress = results.get("skills_progress")
+        analysis_timings = outcome_timings(outcomes, prefix="Analysis: ")
+
         logger.info("=" * 50)
         logger.info("✨ All analysis pipelines completed")
         logger.info("=" * 50)
@@ -1007,7 +1283,7 @@ def _run_scan_background(
             "document_count": len(scan_result.document_candidates),
             "git_repos_count": len(scan_result.git_repos),
             "files": files_data,
-            "timings": scan_result.timings,
+            "timings": list(scan_result.timings) + analysis_timings,
         }
         
         # Add all analyses to the result payload
@@ -1057,7 +1333,7 @@ def _run_scan_background(
             result_payload["project_source_path"] = str(source_path)
 
         # Collect file snippets at scan time for AI analysis
-        file_snippets = _collect_files_for_ai(analysis_target)
+        file_snippets = _collect_files_for_ai(analysis_target, inventory=inventory)
         if file_snippets:
             logger.info(f"Saving {len(file_snippets)} file snippets for AI analysis")
             result_payload["file_snippets"] = file_snippets
@@ -1089,6 +1365,9 @@ def _run_scan_background(
         result_payload = convert_sets_to_lists(result_payload)
         logger.info("✅ Converted all sets to lists for JSON serialization")
 
+        # Nothing has been written yet; a cancel up to here leaves no trace.
+        cancel_token.raise_if_cancelled()
+
         # Optionally persist to database
         project_id = None
         if persist_project and profile_id:
@@ -1201,6 +1480,13 @@ def _run_scan_background(
             project_id=project_id,
         )
 
+    except ScanCancelled as exc:
+        logger.info(f"Scan {scan_id} canceled: {exc}")
+        _update_scan_status(
+            scan_id,
+            JobState.canceled,
+            progress=Progress(percent=100.0, message="Scan canceled"),
+        )
     except Exception as exc:
         logger.exception(f"Scan {scan_id} failed with error: {exc}")
         _update_scan_status(
@@ -1211,6 +1497,10 @@ def _run_scan_background(
                 message=str(exc),
             ),
         )
+    finally:
+        with _scan_store_lock:
+            _scan_tokens.pop(scan_id, None)
+        get_shared_progress_bus().discard(scan_id)
 
 
 router = APIRouter()
@@ -1258,7 +1548,6 @@ def set_consent(payload: ConsentUpdateRequest = Body(...)):
 @router.post("/api/scans", response_model=ScanStatus, status_code=status.HTTP_202_ACCEPTED)
 async def create_scan(
     request: ScanRequest,
-    background_tasks: BackgroundTasks,
     auth: AuthContext = Depends(get_auth_context),
     idempotency_key: Optional[str] = Header(default=None, convert_underscores=True),
 ):
@@ -1266,21 +1555,21 @@ async def create_scan(
     Start a new scan job for a source path.
 
     Requires authentication. Returns immediately with a scan_id that can be
-    polled via GET /api/scans/{scan_id}. The scan runs in the background and
-    updates its status as it progresses.
+    polled via GET /api/scans/{scan_id}. The scan is placed on the durable
+    job queue and run by a worker (or by this process's inline dispatcher
+    when SCAN_QUEUE_MODE=inline), updating its status as it progresses.
     """
     scan_id = idempotency_key or str(uuid.uuid4())
 
     # Return existing scan if idempotency key matches AND belongs to this user
-    with _scan_store_lock:
-        if scan_id in _scan_store:
-            existing = _scan_store[scan_id]
-            if existing.user_id != auth.user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail={"code": "forbidden", "message": "Scan belongs to another user"},
-                )
-            return existing
+    existing = await asyncio.to_thread(_get_scan_status, scan_id)
+    if existing is not None:
+        if existing.user_id != auth.user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"code": "forbidden", "message": "Scan belongs to another user"},
+            )
+        return existing
 
     # Validate request - must have source_path or upload_id
     if not request.source_path and not request.upload_id:
@@ -1322,23 +1611,68 @@ async def create_scan(
         result=None,
     )
 
-    with _scan_store_lock:
-        _scan_store[scan_id] = scan_status
+    payload: Dict[str, Any] = {
+        "source_path": request.source_path,
+        "relevance_only": request.relevance_only,
+        "persist_project": request.persist_project,
+        "profile_id": profile_id,
+    }
+    # Sealed so a worker process, or this API after a restart, can still act for the user.
+    sealed_token = _seal_access_token(auth.access_token)
+    if sealed_token is not None:
+        payload["access_token"] = sealed_token
 
-    # Schedule background scan
-    background_tasks.add_task(
-        _run_scan_background,
-        scan_id=scan_id,
-        source_path=request.source_path,
-        relevance_only=request.relevance_only,
-        persist_project=request.persist_project,
-        profile_id=profile_id,
-        access_token=auth.access_token,
-    )
+    existing = await asyncio.to_thread(_enqueue_scan, scan_status, payload)
+    if existing is not None:
+        # Lost a race with another request using the same idempotency key.
+        return existing
+
+    # Without dedicated workers the API process claims and runs the job itself.
+    if _scan_queue_mode() == "inline":
+        _inline_dispatcher.submit(scan_id, auth.access_token)
 
     return scan_status
 
 
+def _get_scan_status(scan_id: str) -> Optional[ScanStatus]:
+    with _scan_store_lock:
+        return _scan_store.get(scan_id)
+
+
+def _enqueue_scan(scan_status: ScanStatus, payload: Dict[str, Any]) -> Optional[ScanStatus]:
+    """Queue a new scan; returns the stored status instead when the id is already taken."""
+    with _scan_store_lock:
+        if not get_job_queue().enqueue(
+            scan_status.scan_id, scan_status.user_id, payload, scan_status.model_dump(mode="json")
+        ):
+            return _scan_store[scan_status.scan_id]
+        _scan_tokens[scan_status.scan_id] = CancellationToken()
+    return None
+
+
+@router.get("/api/scans/queue", response_model=ScanQueueStatus)
+async def get_scan_queue(auth: AuthContext = Depends(get_auth_context)):
+    """
+    Report scan queue depth overall and for the authenticated user.
+
+    ``running`` counts jobs currently claimed by a worker (or by the API
+    process in inline mode).
+    """
+    queue = get_job_queue()
+    overall, mine = await asyncio.gather(
+        asyncio.to_thread(queue.depth),
+        asyncio.to_thread(queue.depth, auth.user_id),
+    )
+    return ScanQueueStatus(
+        mode=_scan_queue_mode(),
+        queued=overall["queued"],
+        running=overall["running"],
+        user_queued=mine["queued"],
+        user_running=mine["running"],
+        max_concurrent_per_user=_max_scans_per_user(),
+    )
+
+
 @router.get("/api/scans/{scan_id}", response_model=ScanStatus)
 async def get_scan(
     scan_id: str,
@@ -1351,8 +1685,7 @@ async def get_scan(
     Poll this endpoint to track scan progress. The scan is complete when
     state is 'succeeded' or 'failed'.
     """
-    with _scan_store_lock:
-        scan = _scan_store.get(scan_id)
+    scan = await asyncio.to_thread(_get_scan_status, scan_id)
     if not scan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1367,6 +1700,134 @@ async def get_scan(
     return scan
 
 
+@router.delete("/api/scans/{scan_id}", response_model=ScanStatus, status_code=status.HTTP_202_ACCEPTED)
+async def cancel_scan(
+    scan_id: str,
+    auth: AuthContext = Depends(get_auth_context),
+):
+    """
+    Cancel a queued or running scan job.
+
+    Requires authentication. Users can only cancel their own scans. The scan
+    is marked 'canceled' immediately; its background work stops at the next
+    checkpoint and any worker process is terminated. Canceling an already
+    canceled scan is a no-op; finished scans cannot be canceled.
+    """
+    scan, token = await asyncio.to_thread(_cancel_scan, scan_id, auth.user_id)
+    if token is not None:
+        token.cancel("Canceled by user")
+        _publish_scan_status(scan)
+    return scan
+
+
+def _cancel_scan(scan_id: str, user_id: str) -> tuple[ScanStatus, Optional[CancellationToken]]:
+    """Mark a scan canceled; returns its status and the token to trigger (None if already canceled)."""
+    with _scan_store_lock:
+        scan = _scan_store.get(scan_id)
+        if not scan:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"code": "not_found", "message": "Scan not found"},
+            )
+        if scan.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"code": "forbidden", "message": "Access denied"},
+            )
+        if scan.state == JobState.canceled:
+            return scan, None
+        if scan.state in (JobState.succeeded, JobState.failed):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"code": "conflict", "message": f"Scan already {scan.state.value}"},
+            )
+        # Registered here too so a scan canceled before it starts never runs.
+        token = _scan_tokens.setdefault(scan_id, CancellationToken())
+        scan = scan.model_copy(update={
+            "state": JobState.canceled,
+            "progress": Progress(percent=scan.progress.percent if scan.progress else 0.0, message="Scan canceled"),
+        })
+        # Also retires a still-queued job; workers elsewhere notice on their next heartbeat.
+        _scan_store[scan_id] = scan
+    return scan, token
+
+
+_SSE_POLL_SEC = 1.0
+_SSE_KEEPALIVE_SEC = 15.0
+
+
+@router.get("/api/scans/{scan_id}/events")
+async def stream_scan_events(
+    scan_id: str,
+    auth: AuthContext = Depends(get_auth_context),
+):
+    """
+    Stream scan progress as server-sent events.
+
+    Requires authentication. Each ``progress`` event carries the scan's
+    state, percent, message, phase and per-stage timings so far; bursts of
+    updates are coalesced to at most SCAN_PROGRESS_MAX_HZ events per second.
+    The stream ends after the event for a terminal state (succeeded, failed,
+    canceled); fetch GET /api/scans/{scan_id} for the full result.
+    """
+    scan = await asyncio.to_thread(_get_scan_status, scan_id)
+    if not scan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "not_found", "message": "Scan not found"},
+        )
+    if scan.user_id != auth.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "forbidden", "message": "Access denied"},
+        )
+
+    bus = get_shared_progress_bus()
+    terminal = {item.value for item in _TERMINAL_SCAN_STATES}
+
+    async def events():
+        latest = bus.latest(scan_id)
+        seq = latest.seq if latest else 0
+        data = latest.data if latest else _progress_event_data(scan)
+        last_sent: Optional[Dict[str, Any]] = None
+        idle = 0.0
+        while True:
+            if data != last_sent:
+                yield f"event: progress\ndata: {json.dumps(data)}\n\n"
+                last_sent = data
+                idle = 0.0
+                if data.get("state") in terminal:
+                    return
+                # Coalesce: whatever arrives meanwhile is sent as one snapshot.
+                await asyncio.sleep(bus.min_interval)
+            elif idle >= _SSE_KEEPALIVE_SEC:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+
+            event = await bus.wait(scan_id, after_seq=seq, timeout=_SSE_POLL_SEC)
+            if event is not None:
+                seq = event.seq
+                data = event.data
+                continue
+            idle += _SSE_POLL_SEC
+            # Nothing published in this process (e.g. a separate scan worker
+            # owns the job, or it just finished): fall back to the durable status.
+            current = await asyncio.to_thread(_get_scan_status, scan_id)
+            if current is None:
+                yield f"event: error\ndata: {json.dumps({'code': 'not_found', 'message': 'Scan not found'})}\n\n"
+                return
+            stored = _progress_event_data(current)
+            if "timings" in (last_sent or {}):
+                stored["timings"] = last_sent["timings"]
+            data = stored
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/api/analysis/portfolio")
 def start_analysis(payload: Dict[str, Any] = Body(...)):
     job_id = str(uuid.uuid4())
@@ -3,21 +3,29 @@ Upload and Parse API routes
 Implements /api/uploads endpoints per api-plan.md
 """
 
+import asyncio
+import functools
+import json
 import logging
 import os
 import shutil
 import threading
+import time
 import uuid
-import hashlib
 import zipfile as _zipfile
 import magic
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Request, status, Body, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, status, Body, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from scanner.content_hash import hash_bytes, hash_file
+from scanner.file_table import FileTable
 from scanner.parser import parse_zip, _EXCLUDED_DIRS
 from scanner.models import ParseResult, ScanPreferences, FileMetadata as ScanFileMetadata, ParseIssue as ScanParseIssue
 from api.dependencies import AuthContext, get_auth_context
@@ -83,7 +91,7 @@ class ParseRequest(BaseModel):
 
 
 class ParseResponse(BaseModel):
-    """Parse result response"""
+    """Parse result response (``files`` holds the first page only)"""
     upload_id: str
     status: str = "parsed"
     files: List[FileMetadata]
@@ -92,6 +100,16 @@ class ParseResponse(BaseModel):
     parse_started_at: str
     parse_completed_at: str
     duplicate_count: int = 0
+    total_files: int = 0
+    next_cursor: Optional[str] = None
+
+
+class ParsedFilesPage(BaseModel):
+    """One page of files from a stored parse result"""
+    upload_id: str
+    files: List[FileMetadata]
+    total_files: int
+    next_cursor: Optional[str] = None
 
 
 # Configuration
@@ -99,6 +117,13 @@ UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "data/uploads"))
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE_MB", "200")) * 1024 * 1024
 UPLOAD_TTL_SECONDS = int(os.getenv("UPLOAD_TTL_SECONDS", "86400"))
+PARSE_PAGE_SIZE = int(os.getenv("PARSE_PAGE_SIZE", "500"))
+PARSE_MAX_PAGE_SIZE = 5000
+PARSE_MAX_WORKERS = max(1, int(os.getenv("PARSE_MAX_WORKERS", "2")))
+PARSE_RESULT_TTL_SECONDS = int(os.getenv("PARSE_RESULT_TTL_SECONDS", "1800"))
+PARSE_RESULTS_MAX_ENTRIES = max(1, int(os.getenv("PARSE_RESULTS_MAX_ENTRIES", "16")))
+# Upload archives have always been hashed with SHA-256; keep new ones comparable.
+UPLOAD_HASH_ALGORITHM = "sha256"
 ALLOWED_MIME_TYPES = [
     "application/zip",
     "application/x-zip-compressed",
@@ -118,6 +143,48 @@ _UPLOAD_EXCLUDED = _EXCLUDED_DIRS | {
 uploads_store: Dict[str, Dict[str, Any]] = {}
 uploads_store_lock = threading.Lock()
 
+# Parse results are kept server-side so the file list can be paged or streamed
+# instead of serialized into a single response. The store is an LRU of
+# upload_id -> (last access, result), capped at PARSE_RESULTS_MAX_ENTRIES and
+# expired after PARSE_RESULT_TTL_SECONDS idle; evicted uploads must be re-parsed.
+parse_results_store: "OrderedDict[str, Tuple[float, ParseResult]]" = OrderedDict()
+parse_results_lock = threading.Lock()
+
+# parse_zip is CPU/IO bound; run it on a bounded pool so it never blocks the event loop.
+_parse_executor = ThreadPoolExecutor(max_workers=PARSE_MAX_WORKERS, thread_name_prefix="upload-parse")
+
+
+def _evict_parse_results_locked(now: float) -> None:
+    """Drop least recently used parse results over the cap or past their TTL (hold parse_results_lock)."""
+    while parse_results_store:
+        upload_id, (accessed_at, _) = next(iter(parse_results_store.items()))
+        expired = PARSE_RESULT_TTL_SECONDS > 0 and accessed_at <= now - PARSE_RESULT_TTL_SECONDS
+        if not expired and len(parse_results_store) <= PARSE_RESULTS_MAX_ENTRIES:
+            break
+        parse_results_store.popitem(last=False)
+        logger.debug("Evicted parse result for upload %s", upload_id)
+
+
+def _store_parse_result(upload_id: str, parse_result: ParseResult) -> None:
+    now = time.monotonic()
+    with parse_results_lock:
+        parse_results_store[upload_id] = (now, parse_result)
+        parse_results_store.move_to_end(upload_id)
+        _evict_parse_results_locked(now)
+
+
+def _load_parse_result(upload_id: str) -> Optional[ParseResult]:
+    """Return a stored parse result and mark it recently used, or None if absent or evicted."""
+    now = time.monotonic()
+    with parse_results_lock:
+        _evict_parse_results_locked(now)
+        entry = parse_results_store.get(upload_id)
+        if entry is None:
+            return None
+        parse_results_store[upload_id] = (now, entry[1])
+        parse_results_store.move_to_end(upload_id)
+        return entry[1]
+
 
 def _parse_created_at_epoch(upload_data: Dict[str, Any]) -> Optional[float]:
     created_at_epoch = upload_data.get("created_at_epoch")
@@ -171,6 +238,11 @@ def cleanup_expired_uploads() -> int:
                 continue
             expired_entries.append(upload_data)
 
+    if expired_ids:
+        with parse_results_lock:
+            for upload_id in expired_ids:
+                parse_results_store.pop(upload_id, None)
+
     for upload_data in expired_entries:
         _delete_upload_file(upload_data)
 
@@ -212,20 +284,137 @@ def validate_zip_file(file_content: bytes, filename: str) -> tuple[bool, Optiona
 
 
 def compute_file_hash(content: bytes) -> str:
-    """Compute SHA-256 hash of file content"""
-    return hashlib.sha256(content).hexdigest()
+    """Compute the algorithm-tagged content hash of file content"""
+    return hash_bytes(content, UPLOAD_HASH_ALGORITHM)
+
+
+def compute_file_hash_streaming(path: Path) -> str:
+    """Compute the algorithm-tagged content hash of a file using streaming reads to avoid loading it all into RAM."""
+    return hash_file(path, UPLOAD_HASH_ALGORITHM)
+
+
+def _to_api_file(file_meta: ScanFileMetadata) -> FileMetadata:
+    """Convert a scanner FileMetadata into its API representation."""
+    file_dict = {
+        "path": file_meta.path,
+        "size_bytes": file_meta.size_bytes,
+        "mime_type": file_meta.mime_type,
+        "created_at": file_meta.created_at.replace(tzinfo=None).isoformat() + "Z",
+        "modified_at": file_meta.modified_at.replace(tzinfo=None).isoformat() + "Z",
+        "file_hash": file_meta.file_hash
+    }
+
+    # Add media info if present
+    if file_meta.media_info:
+        file_dict["media_info"] = {
+            "media_type": file_meta.media_info.get("media_type"),
+            "duration_seconds": file_meta.media_info.get("duration_seconds"),
+            "width": file_meta.media_info.get("width"),
+            "height": file_meta.media_info.get("height"),
+            "format": file_meta.media_info.get("format"),
+        }
+
+    return FileMetadata(**file_dict)
+
+
+def _count_duplicates(parse_result: ParseResult) -> int:
+    """Count hashes that appear on more than one file."""
+    if isinstance(parse_result.files, FileTable):
+        groups = parse_result.files.group_by("file_hash")
+        return sum(1 for file_hash, rows in groups.items() if file_hash and len(rows) > 1)
+    file_hashes: Dict[str, int] = {}
+    for file_meta in parse_result.files:
+        if file_meta.file_hash:
+            file_hashes[file_meta.file_hash] = file_hashes.get(file_meta.file_hash, 0) + 1
+    return sum(1 for count in file_hashes.values() if count > 1)
+
+
+def _parse_upload_sync(
+    storage_path: Path,
+    relevant_only: bool,
+    preferences: Optional[ScanPreferences],
+) -> tuple[ParseResult, int]:
+    """Worker-pool entry point: parse the archive and count duplicates.
+
+    The result stays in ``parse_results_store`` for paging, so its files are
+    kept as a columnar FileTable rather than one object per file.
+    """
+    parse_result = parse_zip(storage_path, relevant_only=relevant_only, preferences=preferences)
+    parse_result.files = FileTable.from_files(parse_result.files)
+    return parse_result, _count_duplicates(parse_result)
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        offset = int(cursor)
+    except ValueError:
+        offset = -1
+    if offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "invalid_cursor",
+                "message": "Cursor is not valid for this upload"
+            }
+        )
+    return offset
+
 
+def _page_files(
+    parse_result: ParseResult, offset: int, limit: int
+) -> tuple[List[FileMetadata], Optional[str]]:
+    window = parse_result.files[offset: offset + limit]
+    end = offset + len(window)
+    next_cursor = str(end) if end < len(parse_result.files) else None
+    return [_to_api_file(file_meta) for file_meta in window], next_cursor
 
-def compute_file_hash_streaming(path: Path, chunk_size: int = 65536) -> str:
-    """Compute SHA-256 hash of a file using streaming reads to avoid loading it all into RAM."""
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        while True:
-            chunk = f.read(chunk_size)
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.hexdigest()
+
+def _get_owned_upload(upload_id: str, user_id: str) -> Dict[str, Any]:
+    with uploads_store_lock:
+        upload_data = uploads_store.get(upload_id)
+
+    if upload_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "not_found",
+                "message": f"Upload with ID '{upload_id}' not found"
+            }
+        )
+
+    if upload_data.get("user_id") != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "error": "forbidden",
+                "message": "Access denied to this upload"
+            }
+        )
+    return upload_data
+
+
+def _get_parse_result(upload_id: str, user_id: str) -> ParseResult:
+    upload_data = _get_owned_upload(upload_id, user_id)
+    parse_result = _load_parse_result(upload_id)
+    if parse_result is None and upload_data.get("status") == "parsed":
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail={
+                "error": "parse_expired",
+                "message": "Parse result has expired; parse the upload again"
+            }
+        )
+    if parse_result is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "error": "not_parsed",
+                "message": "Upload has not been parsed yet"
+            }
+        )
+    return parse_result
 
 
 class UploadFromPathRequest(BaseModel):
@@ -581,50 +770,25 @@ async def parse_upload(
                 follow_symlinks=prefs_dict.get("follow_symlinks")
             )
         
-        # Run parse
-        parse_result: ParseResult = parse_zip(
-            storage_path,
-            relevant_only=parse_request.relevance_only,
-            preferences=preferences
+        # Run parse on the worker pool so other requests keep being served
+        loop = asyncio.get_running_loop()
+        parse_result, duplicate_count = await loop.run_in_executor(
+            _parse_executor,
+            functools.partial(
+                _parse_upload_sync,
+                storage_path,
+                parse_request.relevance_only,
+                preferences,
+            ),
         )
-        
+
         parse_completed = datetime.utcnow()
-        
-        # Convert scanner models to API models
-        files = []
-        file_hashes = {}
-        for file_meta in parse_result.files:
-            file_dict = {
-                "path": file_meta.path,
-                "size_bytes": file_meta.size_bytes,
-                "mime_type": file_meta.mime_type,
-                "created_at": file_meta.created_at.replace(tzinfo=None).isoformat() + "Z",
-                "modified_at": file_meta.modified_at.replace(tzinfo=None).isoformat() + "Z",
-                "file_hash": file_meta.file_hash
-            }
-            
-            # Add media info if present
-            if file_meta.media_info:
-                file_dict["media_info"] = {
-                    "media_type": file_meta.media_info.get("media_type"),
-                    "duration_seconds": file_meta.media_info.get("duration_seconds"),
-                    "width": file_meta.media_info.get("width"),
-                    "height": file_meta.media_info.get("height"),
-                    "format": file_meta.media_info.get("format"),
-                }
-            
-            files.append(FileMetadata(**file_dict))
-            
-            # Track duplicates by hash
-            if file_meta.file_hash:
-                if file_meta.file_hash in file_hashes:
-                    file_hashes[file_meta.file_hash] += 1
-                else:
-                    file_hashes[file_meta.file_hash] = 1
-        
-        # Count duplicates (files with same hash)
-        duplicate_count = sum(1 for count in file_hashes.values() if count > 1)
-        
+
+        _store_parse_result(upload_id, parse_result)
+
+        total_files = len(parse_result.files)
+        files, next_cursor = _page_files(parse_result, 0, PARSE_PAGE_SIZE)
+
         # Convert issues
         issues = [
             ParseIssueResponse(
@@ -641,7 +805,7 @@ async def parse_upload(
             if current_upload_data is not None:
                 current_upload_data["status"] = "parsed"
                 current_upload_data["parse_completed_at"] = parse_completed.isoformat() + "Z"
-                current_upload_data["file_count"] = len(files)
+                current_upload_data["file_count"] = total_files
                 current_upload_data["duplicate_count"] = duplicate_count
         
         return ParseResponse(
@@ -652,7 +816,9 @@ async def parse_upload(
             summary=parse_result.summary,
             parse_started_at=parse_started.isoformat() + "Z",
             parse_completed_at=parse_completed.isoformat() + "Z",
-            duplicate_count=duplicate_count
+            duplicate_count=duplicate_count,
+            total_files=total_files,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
@@ -670,3 +836,45 @@ async def parse_upload(
                 "message": "Failed to parse upload"
             }
         )
+
+
+@router.get("/{upload_id}/files", response_model=ParsedFilesPage)
+async def list_parsed_files(
+    upload_id: str,
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: int = Query(PARSE_PAGE_SIZE, ge=1, le=PARSE_MAX_PAGE_SIZE),
+    user_id: str = Depends(verify_auth_token)
+):
+    """
+    Page through the files of a parsed upload
+
+    - Pass ``next_cursor`` from the previous response to fetch the next page
+    - ``next_cursor`` is null on the last page
+    - Requires authentication and upload ownership
+    """
+    parse_result = _get_parse_result(upload_id, user_id)
+    offset = _decode_cursor(cursor)
+    files, next_cursor = _page_files(parse_result, offset, limit)
+    return ParsedFilesPage(
+        upload_id=upload_id,
+        files=files,
+        total_files=len(parse_result.files),
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{upload_id}/files/stream")
+async def stream_parsed_files(
+    upload_id: str,
+    user_id: str = Depends(verify_auth_token)
+):
+    """
+    Stream every file of a parsed upload as NDJSON (one FileMetadata per line)
+    """
+    parse_result = _get_parse_result(upload_id, user_id)
+
+    def _iter_lines() -> Iterator[str]:
+        for file_meta in parse_result.files:
+            yield json.dumps(_to_api_file(file_meta).model_dump()) + "\n"
+
+    return StreamingResponse(_iter_lines(), media_type="application/x-ndjson")
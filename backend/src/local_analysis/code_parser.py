@@ -29,6 +29,15 @@ lib_path = Path(__file__).parent / "lib"
 if lib_path.exists():
     sys.path.insert(0, str(lib_path))
 
+try:
+    from scanner.content_store import SourceContentStore, get_shared_content_store
+except ImportError:  # pragma: no cover - fallback when scanner isn't on sys.path
+    from ..scanner.content_store import SourceContentStore, get_shared_content_store
+
+if TYPE_CHECKING:
+    from scanner.inventory import FileInventory
+    from services.cancellation import CancellationToken
+
 try:
     from tree_sitter import Language, Parser, Node
     TREE_SITTER_AVAILABLE = True
@@ -645,7 +654,8 @@ class CodeAnalyzer:
         max_file_mb: float = 5.0,
         max_depth: int = 10,
         languages: Optional[Set[str]] = None,
-        excluded: Optional[Set[str]] = None
+        excluded: Optional[Set[str]] = None,
+        content_store: Optional[SourceContentStore] = None,
     ):
         if not TREE_SITTER_AVAILABLE:
             raise ImportError("tree-sitter not available")
@@ -654,6 +664,7 @@ class CodeAnalyzer:
         self.max_depth = max_depth
         self.enabled_langs = languages or set(SUPPORTED_LANGS.keys())
         self.excluded_dirs = excluded or EXCLUDED_DIRS
+        self.content_store = content_store or get_shared_content_store()
         self.parsers = self._init_parsers()
         
         # For cross-file analysis
@@ -1494,10 +1505,8 @@ class CodeAnalyzer:
                 result.error = f"File too large: {result.size_bytes / (1024*1024):.2f}MB"
                 return result
             
-            with open(path, 'rb') as f:
-                code_bytes = f.read()
-            
-            code = code_bytes.decode('utf-8', errors='ignore')
+            # Shared with the skills and AI analyzers so each file is read once per scan
+            code_bytes, code = self.content_store.read(path)
             lines = code.split('\n')
             
             parser = self.parsers[lang]
@@ -1546,8 +1555,13 @@ class CodeAnalyzer:
         result.analysis_time_ms = (time.time() - start) * 1000
         return result
     
-    def walk_directory(self, path: Path, depth: int = 0) -> List[Path]:
-        """Recursively find analyzable files"""
+    def walk_directory(
+        self,
+        path: Path,
+        depth: int = 0,
+        inventory: Optional["FileInventory"] = None,
+    ) -> List[Path]:
+        """Recursively find analyzable files (from the scan inventory when one covers path)"""
         if depth >= self.max_depth:
             return []
         
@@ -1558,6 +1572,18 @@ class CodeAnalyzer:
                 supported_exts.update(config['ext'])
         
         max_size_bytes = self.max_file_mb * 1024 * 1024
+
+        if inventory is not None and inventory.covers(path):
+            return [
+                inventory.path_of(entry)
+                for entry in inventory.files(
+                    under=path,
+                    exclude_dirs=self.excluded_dirs,
+                    extensions=supported_exts,
+                    max_size=max_size_bytes,
+                    max_depth=self.max_depth - depth,
+                )
+            ]
         
         try:
             for item in path.iterdir():
@@ -1607,7 +1633,13 @@ class CodeAnalyzer:
         
         return cross_file_dups[:20]
     
-    def analyze_directory(self, path: Path, recursive: bool = True) -> DirectoryResult:
+    def analyze_directory(
+        self,
+        path: Path,
+        recursive: bool = True,
+        inventory: Optional["FileInventory"] = None,
+        cancel_token: Optional["CancellationToken"] = None,
+    ) -> DirectoryResult:
         """Analyze a directory with comprehensive insights"""
         logger.info(f"Analyzing: {path}")
         
@@ -1619,7 +1651,7 @@ class CodeAnalyzer:
         result = DirectoryResult(path=str(path))
         
         if recursive:
-            files = self.walk_directory(path)
+            files = self.walk_directory(path, inventory=inventory)
         else:
             supported_exts = set()
             for config in SUPPORTED_LANGS.values():
@@ -1637,6 +1669,8 @@ class CodeAnalyzer:
         
         # Analyze files with progress logging
         for i, file_path in enumerate(files, 1):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             file_result = self.analyze_file(file_path)
             result.files.append(file_result)
             
@@ -5,7 +5,10 @@ from collections import Counter, defaultdict
 from datetime import datetime
 import re
 from pathlib import Path as _Path
-from typing import Set, List, Dict, Any
+from typing import TYPE_CHECKING, Set, List, Dict, Any, Optional
+
+if TYPE_CHECKING:
+    from services.cancellation import CancellationToken
 
 def _git(args, cwd: str) -> str:
     return check_output(["git", *args], cwd=cwd, text=True).strip()
@@ -447,7 +450,13 @@ def _analyze_branches(repo_dir: str) -> List[Dict[str, Any]]:
     return result
 
 
-def analyze_git_repo(repo_dir: str) -> dict:
+def _check_cancelled(cancel_token: Optional["CancellationToken"]) -> None:
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+
+def analyze_git_repo(repo_dir: str, cancel_token: Optional["CancellationToken"] = None) -> dict:
+    # cancel_token is checked between git invocations; raises ScanCancelled once triggered.
     repo_dir = str(repo_dir)
     path_obj = Path(repo_dir)
 
@@ -473,6 +482,7 @@ def analyze_git_repo(repo_dir: str) -> dict:
         }
 
     # ---------- contributors ----------
+    _check_cancelled(cancel_token)
     try:
         lines = _git(["shortlog", "-sne", "--all"], repo_dir).splitlines()
     except CalledProcessError:
@@ -502,6 +512,7 @@ def analyze_git_repo(repo_dir: str) -> dict:
     
     # Add detailed contributor info (first/last commit dates, active days)
     for contributor in contributors:
+        _check_cancelled(cancel_token)
         try:
             # Get author-specific commit dates
             author_name = contributor["name"]
@@ -546,6 +557,7 @@ def analyze_git_repo(repo_dir: str) -> dict:
             contributor.setdefault("active_days", 0)
 
     # ---------- lines changed per contributor ----------
+    _check_cancelled(cancel_token)
     lines_stats = _lines_changed_by_email(repo_dir)
     for contributor in contributors:
         emails = contributor.get("all_emails", [])
@@ -574,9 +586,11 @@ def analyze_git_repo(repo_dir: str) -> dict:
         last = None
 
     # ---------- branches ----------
+    _check_cancelled(cancel_token)
     branches = _analyze_branches(repo_dir)
 
     # ---------- timeline ----------
+    _check_cancelled(cancel_token)
     try:
         raw_log = _git(
             ["log", "--date=short", "--pretty=%ad\t%s\t%ae", "--name-only", "--all"],
@@ -6,6 +6,7 @@
 # - Run with: uvicorn src.main:app --reload
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 try:
@@ -33,7 +34,7 @@ from api.llm_routes import router as llm_router
 from api.portfolio_routes import router as portfolio_router
 from api.resume_routes import router as resume_router
 from api.user_resume_routes import router as user_resume_router
-from api.spec_routes import router as spec_router
+from api.spec_routes import router as spec_router, start_scan_dispatcher, stop_scan_dispatcher
 from api.project_routes import router as project_router
 from api.upload_routes import router as upload_router
 from api.selection_routes import router as selection_router
@@ -45,10 +46,19 @@ from security.rate_limit import limiter
 from api.linkedin_routes import router as linkedin_router
 from api.job_match_routes import router as job_match_router
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Resume scans left queued or running by a previous process (inline queue mode).
+    start_scan_dispatcher()
+    yield
+    stop_scan_dispatcher()
+
+
 app = FastAPI(
     title="Capstone Backend API",
     description="Backend service",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.state.limiter = limiter
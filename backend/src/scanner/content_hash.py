@@ -0,0 +1,126 @@
+"""Content hashing shared by the scanner, uploads and dedup.
+
+Every digest is written as ``"<algorithm>:<hex>"`` so stored hashes can be
+compared without knowing (or re-deriving) how they were produced. Untagged
+values from before tagging are read as MD5 (32 hex chars, the old parser
+digest) or SHA-256 (64 hex chars, the old upload digest).
+
+Cached scan files only keep their digests, not their contents, so stored
+hashes cannot be re-derived under a new algorithm. New scans therefore
+default to MD5, which still groups with every legacy parser digest;
+CONTENT_HASH_ALGORITHM opts into a faster algorithm (e.g. ``blake2b128``)
+for deployments without legacy rows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+try:  # Optional accelerator, selectable through CONTENT_HASH_ALGORITHM.
+    import xxhash  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    xxhash = None  # type: ignore
+
+DEFAULT_ALGORITHM = "md5"
+# hashlib releases the GIL for updates over 2 KiB, so large chunks keep
+# parallel parse workers hashing concurrently.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_ALGORITHMS: Dict[str, Callable[[], Any]] = {
+    "blake2b128": lambda: hashlib.blake2b(digest_size=16),
+    "sha256": hashlib.sha256,
+    "md5": lambda: hashlib.md5(usedforsecurity=False),
+}
+if xxhash is not None:
+    _ALGORITHMS["xxh3_128"] = xxhash.xxh3_128
+
+# Tags recognised when reading, even if the algorithm is not installed here.
+_KNOWN_TAGS = frozenset({"blake2b128", "sha256", "md5", "xxh3_128"})
+_LEGACY_BY_LENGTH = {32: "md5", 64: "sha256"}
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def available_algorithms() -> Tuple[str, ...]:
+    return tuple(_ALGORITHMS)
+
+
+def default_algorithm() -> str:
+    """CONTENT_HASH_ALGORITHM when it names an available algorithm, else MD5."""
+    configured = (os.getenv("CONTENT_HASH_ALGORITHM") or "").strip().lower()
+    return configured if configured in _ALGORITHMS else DEFAULT_ALGORITHM
+
+
+def _new_hasher(algorithm: Optional[str]) -> Tuple[str, Any]:
+    name = algorithm or default_algorithm()
+    try:
+        return name, _ALGORITHMS[name]()
+    except KeyError:
+        raise ValueError(f"Unsupported hash algorithm: {name}") from None
+
+
+def hash_bytes(data: bytes, algorithm: Optional[str] = None) -> str:
+    name, hasher = _new_hasher(algorithm)
+    hasher.update(data)
+    return f"{name}:{hasher.hexdigest()}"
+
+
+def hash_stream(file_obj: BinaryIO, algorithm: Optional[str] = None, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Hash a binary stream in fixed-size chunks without holding it in memory."""
+    name, hasher = _new_hasher(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    readinto = getattr(file_obj, "readinto", None)
+    if readinto is not None:
+        while True:
+            count = readinto(buffer)
+            if not count:
+                break
+            hasher.update(view[:count])
+    else:
+        while chunk := file_obj.read(chunk_size):
+            hasher.update(chunk)
+    return f"{name}:{hasher.hexdigest()}"
+
+
+def hash_file(path: Path | str, algorithm: Optional[str] = None) -> str:
+    with open(path, "rb") as file_obj:
+        return hash_stream(file_obj, algorithm)
+
+
+def split_hash(value: str) -> Tuple[Optional[str], str]:
+    """Return (algorithm, hex digest); algorithm is None for opaque legacy values."""
+    algorithm, sep, digest = value.partition(":")
+    if sep and algorithm in _KNOWN_TAGS:
+        return algorithm, digest
+    lowered = value.lower()
+    legacy = _LEGACY_BY_LENGTH.get(len(lowered))
+    if legacy and set(lowered) <= _HEX_DIGITS:
+        return legacy, lowered
+    return None, value
+
+
+def normalize_hash(value: Optional[str]) -> Optional[str]:
+    """Tag a legacy untagged digest; tagged and opaque values are returned unchanged."""
+    if not value:
+        return None
+    algorithm, digest = split_hash(value)
+    return f"{algorithm}:{digest}" if algorithm else value
+
+
+def same_content(left: Optional[str], right: Optional[str]) -> Optional[bool]:
+    """Compare two stored hashes.
+
+    Returns True or False when the values are comparable, and None when
+    either is missing or they were produced by different algorithms (only
+    rehashing could tell).
+    """
+    if not left or not right:
+        return None
+    left_algorithm, left_digest = split_hash(left)
+    right_algorithm, right_digest = split_hash(right)
+    if left_algorithm != right_algorithm:
+        return None
+    return left_digest == right_digest
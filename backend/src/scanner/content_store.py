@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional, Tuple, Union
+
+_DATACLASS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_LARGE_FILE_THRESHOLD = 1024 * 1024
+
+PathLike = Union[str, os.PathLike]
+
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(minimum, int(str(raw).strip()))
+    except ValueError:
+        return default
+
+
+@dataclass(**_DATACLASS_KWARGS)
+class _CachedContent:
+    fingerprint: Tuple[int, int]  # (st_size, st_mtime_ns) when the bytes were read
+    data: bytes
+    text: Optional[str] = None
+
+    @property
+    def cost(self) -> int:
+        # A decoded str costs roughly its length again (1 byte per char for ASCII source).
+        return len(self.data) + (len(self.text) if self.text is not None else 0)
+
+
+class SourceContentStore:
+    """
+    Bounded, read-once cache of source file contents shared by the analyzers of a scan.
+
+    Entries are keyed by resolved path and validated against the file's size
+    and mtime, so an edited file is re-read rather than served stale. Raw
+    bytes and the decoded text are both kept (the code analyzer needs the
+    former, the skills extractor and LLM summaries the latter) and counted
+    against ``max_bytes``; least recently used entries are evicted once the
+    budget is exceeded. Files at or above ``large_file_threshold`` are read
+    on every request and never retained, so one large file cannot flush the
+    cache.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        large_file_threshold: Optional[int] = None,
+    ):
+        self.max_bytes = (
+            max_bytes if max_bytes is not None
+            else _env_int("SOURCE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+        self.large_file_threshold = (
+            large_file_threshold if large_file_threshold is not None
+            else _env_int("SOURCE_CACHE_LARGE_FILE_THRESHOLD", DEFAULT_LARGE_FILE_THRESHOLD, minimum=1)
+        )
+        self._entries: "OrderedDict[str, _CachedContent]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_bytes(self, path: PathLike) -> bytes:
+        """Raw file contents; raises OSError like ``Path.read_bytes``."""
+        return self._load(path).data
+
+    def read_text(self, path: PathLike) -> str:
+        """UTF-8 decoded contents with undecodable bytes dropped (``errors='ignore'``)."""
+        key, fingerprint = self._stat(path)
+        with self._lock:
+            entry = self._lookup(key, fingerprint)
+            if entry is not None and entry.text is not None:
+                return entry.text
+        entry = entry or self._read(key, fingerprint)
+        text = entry.data.decode("utf-8", errors="ignore")
+        with self._lock:
+            if self._entries.get(key) is entry:
+                self._size -= entry.cost
+                entry.text = text
+                self._size += entry.cost
+                self._evict()
+        return text
+
+    def read(self, path: PathLike) -> Tuple[bytes, str]:
+        """(bytes, decoded text) for callers that need both."""
+        data = self.read_bytes(path)
+        return data, self.read_text(path)
+
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+
+    def discard(self, path: PathLike) -> None:
+        key = os.path.abspath(os.fspath(path))
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.cost
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _load(self, path: PathLike) -> _CachedContent:
+        key, fingerprint = self._stat(path)
+        with self._lock:
+            entry = self._lookup(key, fingerprint)
+        return entry if entry is not None else self._read(key, fingerprint)
+
+    @staticmethod
+    def _stat(path: PathLike) -> Tuple[str, Tuple[int, int]]:
+        key = os.path.abspath(os.fspath(path))
+        stat = os.stat(key)
+        return key, (stat.st_size, stat.st_mtime_ns)
+
+    def _lookup(self, key: str, fingerprint: Tuple[int, int]) -> Optional[_CachedContent]:
+        # Caller holds the lock.
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.fingerprint != fingerprint:
+            self._entries.pop(key)
+            self._size -= entry.cost
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _read(self, key: str, fingerprint: Tuple[int, int]) -> _CachedContent:
+        with open(key, "rb") as file_obj:
+            data = file_obj.read()
+
+        entry = _CachedContent(fingerprint, data)
+        # Large files, and anything that could take more than a quarter of
+        # the budget once decoded, are not worth keeping.
+        if (
+            self.max_bytes > 0
+            and len(data) < self.large_file_threshold
+            and len(data) * 2 <= self.max_bytes // 4
+        ):
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._size -= previous.cost
+                self._entries[key] = entry
+                self._size += entry.cost
+                self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        # Caller holds the lock.
+        while self._size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.cost
+
+
+class SourceTextMapping(Mapping[str, str]):
+    """
+    Read-only ``{relative path: text}`` view whose values are loaded on access.
+
+    Lets callers that expect a dict of file contents iterate a whole project
+    without holding every file as a str at once.
+    """
+
+    def __init__(self, paths: Dict[str, Path], store: Optional[SourceContentStore] = None):
+        self._paths = paths
+        self._store = store or get_shared_content_store()
+
+    def __getitem__(self, key: str) -> str:
+        return self._store.read_text(self._paths[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def items(self):
+        # Skip files that vanish or become unreadable between listing and reading.
+        for key, path in self._paths.items():
+            try:
+                yield key, self._store.read_text(path)
+            except OSError:
+                continue
+
+
+_shared_store: Optional[SourceContentStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_content_store() -> SourceContentStore:
+    """Process-wide store sized by SOURCE_CACHE_MAX_BYTES / SOURCE_CACHE_LARGE_FILE_THRESHOLD."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = SourceContentStore()
+        return _shared_store
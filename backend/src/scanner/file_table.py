@@ -0,0 +1,421 @@
+"""Columnar storage for large scan results.
+
+``FileTable`` keeps one column per ``FileMetadata`` field instead of one
+object per file:
+- Paths are split into a categorical directory and a file name, so each
+  directory string is stored once.
+- Extensions, MIME types and timezones are categorical codes.
+- Sizes and timestamps are int64 ``array`` columns (epoch microseconds).
+- Content hashes are packed digest bytes.
+- Media info and MinHash signatures, which only some files have, are kept sparse.
+
+A 200k-file scan is then a handful of flat arrays rather than 200k
+dataclasses, each with its own datetimes, ints and hash string. Filters
+and group-bys compare small integer codes instead of re-deriving
+``Path(meta.path).suffix`` for every row.
+
+Iterating or indexing a table yields ``FileRow`` views. They expose the
+same attributes as ``FileMetadata``, so code written against lists keeps
+working.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from itertools import compress
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, Union, overload
+
+from .media_types import MediaMetadata
+from .models import FileMetadata
+
+Rows = Optional[Iterable[int]]
+
+# Stored for timestamps that are missing (None).
+_MISSING = -(2**63)
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Hash algorithm categories: no hash, and a value stored verbatim (untagged or not hex).
+_NO_HASH: Optional[str] = None
+_RAW_HASH = ""
+
+GROUP_COLUMNS = ("extension", "mime_type", "file_hash")
+
+
+class _Categorical:
+    """Column of repeated values stored as integer codes into a value list."""
+
+    __slots__ = ("codes", "values", "_index")
+
+    def __init__(self) -> None:
+        self.codes = array("I")
+        self.values: List[Any] = []
+        self._index: Dict[Hashable, int] = {}
+
+    def append(self, value: Hashable) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+    def codes_where(self, predicate: Callable[[Any], bool]) -> Set[int]:
+        return {code for code, value in enumerate(self.values) if predicate(value)}
+
+
+class FileTable(Sequence):
+    """Column-oriented, append-only collection of scanned file metadata.
+
+    Filters (``where_*``) return row indices and accept ``rows`` to narrow
+    an earlier selection, so they chain. ``rows()`` turns indices back into
+    ``FileRow`` views.
+    """
+
+    def __init__(self, files: Iterable[Any] = ()) -> None:
+        self._directories = _Categorical()
+        self._names: List[str] = []
+        self._extensions = _Categorical()
+        self._mime_types = _Categorical()
+        self._sizes = array("q")
+        self._created = array("q")
+        self._created_zones = _Categorical()
+        self._modified = array("q")
+        self._modified_zones = _Categorical()
+        self._hash_algorithms = _Categorical()
+        self._digests = bytearray()
+        self._digest_offsets = array("q", [0])
+        self._media: Dict[int, MediaMetadata] = {}
+        self._signatures: Dict[int, str] = {}
+        self.extend(files)
+
+    @classmethod
+    def from_files(cls, files: Iterable[Any]) -> "FileTable":
+        return files if isinstance(files, FileTable) else cls(files)
+
+    # -- building -------------------------------------------------------
+
+    def append(self, meta: Any) -> None:
+        """Add one ``FileMetadata`` (or any object with the same attributes)."""
+        row = len(self._names)
+        directory, separator, name = meta.path.rpartition("/")
+        self._directories.append(directory + separator)
+        self._names.append(name)
+        self._extensions.append(_suffix(name).lower())
+        self._mime_types.append(meta.mime_type)
+        self._sizes.append(meta.size_bytes)
+        self._append_time(self._created, self._created_zones, getattr(meta, "created_at", None))
+        self._append_time(self._modified, self._modified_zones, getattr(meta, "modified_at", None))
+        self._append_hash(getattr(meta, "file_hash", None))
+        media_info = getattr(meta, "media_info", None)
+        if media_info:
+            self._media[row] = media_info
+        signature = getattr(meta, "content_signature", None)
+        if signature:
+            self._signatures[row] = signature
+
+    def extend(self, files: Iterable[Any]) -> None:
+        for meta in files:
+            self.append(meta)
+
+    @staticmethod
+    def _append_time(column: array, zones: _Categorical, value: Optional[datetime]) -> None:
+        if value is None:
+            column.append(_MISSING)
+            zones.append(None)
+            return
+        if value.utcoffset() is None:
+            value = value.replace(tzinfo=None)
+        zones.append(value.tzinfo)
+        column.append(_micros(value))
+
+    def _append_hash(self, value: Optional[str]) -> None:
+        if value is None:
+            self._hash_algorithms.append(_NO_HASH)
+            self._digest_offsets.append(len(self._digests))
+            return
+        algorithm, sep, hex_digest = value.partition(":")
+        digest: Optional[bytes] = None
+        if sep and algorithm:
+            try:
+                digest = bytes.fromhex(hex_digest)
+            except ValueError:
+                digest = None
+            # Only keep the packed form when it prints back to the same string.
+            if digest is not None and digest.hex() != hex_digest:
+                digest = None
+        if digest is None:
+            self._hash_algorithms.append(_RAW_HASH)
+            self._digests += value.encode("utf-8")
+        else:
+            self._hash_algorithms.append(algorithm)
+            self._digests += digest
+        self._digest_offsets.append(len(self._digests))
+
+    # -- sequence protocol ----------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @overload
+    def __getitem__(self, index: int) -> "FileRow": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List["FileRow"]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["FileRow", List["FileRow"]]:
+        if isinstance(index, slice):
+            return [FileRow(self, row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FileTable index out of range")
+        return FileRow(self, index)
+
+    def __iter__(self) -> Iterator["FileRow"]:
+        return (FileRow(self, row) for row in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"FileTable({len(self)} files)"
+
+    def rows(self, indices: Iterable[int]) -> List["FileRow"]:
+        return [FileRow(self, row) for row in indices]
+
+    def metadata(self, row: int) -> FileMetadata:
+        """Materialize one row as a standalone ``FileMetadata``."""
+        return FileMetadata(
+            path=self.path(row),
+            size_bytes=self._sizes[row],
+            mime_type=self._mime_types[row],
+            created_at=self.created_at(row),  # type: ignore[arg-type]
+            modified_at=self.modified_at(row),  # type: ignore[arg-type]
+            media_info=self._media.get(row),
+            file_hash=self.file_hash(row),
+            content_signature=self._signatures.get(row),
+        )
+
+    def to_files(self) -> List[FileMetadata]:
+        return [self.metadata(row) for row in range(len(self))]
+
+    # -- column access --------------------------------------------------
+
+    def path(self, row: int) -> str:
+        return self._directories[row] + self._names[row]
+
+    def name(self, row: int) -> str:
+        return self._names[row]
+
+    def extension(self, row: int) -> str:
+        """Lower-cased suffix of the path, e.g. ``".py"``; empty when there is none."""
+        return self._extensions[row]
+
+    def created_at(self, row: int) -> Optional[datetime]:
+        return _datetime(self._created[row], self._created_zones[row])
+
+    def modified_at(self, row: int) -> Optional[datetime]:
+        return _datetime(self._modified[row], self._modified_zones[row])
+
+    def file_hash(self, row: int) -> Optional[str]:
+        algorithm = self._hash_algorithms[row]
+        if algorithm is _NO_HASH:
+            return None
+        digest = self._digest(row)
+        if algorithm == _RAW_HASH:
+            return digest.decode("utf-8")
+        return f"{algorithm}:{digest.hex()}"
+
+    def _digest(self, row: int) -> bytes:
+        return bytes(self._digests[self._digest_offsets[row]:self._digest_offsets[row + 1]])
+
+    # -- filters --------------------------------------------------------
+
+    def where_extension(self, extensions: Iterable[str], rows: Rows = None) -> List[int]:
+        """Rows whose extension (lower-case, with the dot) is in ``extensions``."""
+        wanted = {ext.lower() for ext in extensions}
+        return self._where_codes(self._extensions, self._extensions.codes_where(wanted.__contains__), rows)
+
+    def where_not_extension(self, extensions: Iterable[str], rows: Rows = None) -> List[int]:
+        unwanted = {ext.lower() for ext in extensions}
+        codes = self._extensions.codes_where(lambda ext: ext not in unwanted)
+        return self._where_codes(self._extensions, codes, rows)
+
+    def where_mime_type(self, mime_types: Iterable[str], rows: Rows = None) -> List[int]:
+        """Rows whose MIME type is in ``mime_types``, ignoring case."""
+        wanted = {mime.lower() for mime in mime_types}
+        codes = self._mime_types.codes_where(lambda mime: (mime or "").lower() in wanted)
+        return self._where_codes(self._mime_types, codes, rows)
+
+    def where_size(self, min_size: Optional[int] = None, max_size: Optional[int] = None, rows: Rows = None) -> List[int]:
+        low = -(2**63) if min_size is None else min_size
+        high = 2**63 - 1 if max_size is None else max_size
+        return self._where_values(self._sizes, lambda size: low <= size <= high, rows)
+
+    def where_created(self, after: Optional[datetime] = None, before: Optional[datetime] = None, rows: Rows = None) -> List[int]:
+        """Rows created within ``[after, before]``; rows without a timestamp never match."""
+        return self._where_time(self._created, after, before, rows)
+
+    def where_modified(self, after: Optional[datetime] = None, before: Optional[datetime] = None, rows: Rows = None) -> List[int]:
+        """Rows modified within ``[after, before]``; rows without a timestamp never match."""
+        return self._where_time(self._modified, after, before, rows)
+
+    def where_path(self, predicate: Callable[[str], bool], rows: Rows = None) -> List[int]:
+        directories = self._directories.values
+        paths = map(str.__add__, map(directories.__getitem__, self._directories.codes), self._names)
+        if rows is None:
+            return list(compress(range(len(self)), map(predicate, paths)))
+        return [row for row in rows if predicate(self.path(row))]
+
+    def where_name(self, predicate: Callable[[str], bool], rows: Rows = None) -> List[int]:
+        """Rows whose file name (the last path component) satisfies ``predicate``."""
+        return self._where_values(self._names, predicate, rows)
+
+    def _where_time(self, column: array, after: Optional[datetime], before: Optional[datetime], rows: Rows) -> List[int]:
+        # Aware values are compared in UTC and naive values as wall-clock time.
+        low = _MISSING + 1 if after is None else max(_micros(after), _MISSING + 1)
+        high = 2**63 - 1 if before is None else _micros(before)
+        return self._where_values(column, lambda value: low <= value <= high, rows)
+
+    def _where_codes(self, column: _Categorical, codes: Set[int], rows: Rows) -> List[int]:
+        return self._where_values(column.codes, codes.__contains__, rows)
+
+    def _where_values(self, values: Any, predicate: Callable[[Any], bool], rows: Rows) -> List[int]:
+        if rows is None:
+            return list(compress(range(len(values)), map(predicate, values)))
+        return [row for row in rows if predicate(values[row])]
+
+    # -- aggregation ----------------------------------------------------
+
+    def total_size(self, rows: Rows = None) -> int:
+        if rows is None:
+            return sum(self._sizes)
+        sizes = self._sizes
+        return sum(sizes[row] for row in rows)
+
+    def group_by(self, column: str, rows: Rows = None) -> Dict[Any, List[int]]:
+        """Row indices per distinct value of ``column`` (one of ``GROUP_COLUMNS``).
+
+        Rows without a file hash are left out when grouping by ``"file_hash"``.
+        """
+        selected = range(len(self)) if rows is None else rows
+        if column == "file_hash":
+            algorithms = self._hash_algorithms
+            by_digest: Dict[Tuple[int, bytes], List[int]] = {}
+            for row in selected:
+                code = algorithms.codes[row]
+                if algorithms.values[code] is not _NO_HASH:
+                    by_digest.setdefault((code, self._digest(row)), []).append(row)
+            return {self.file_hash(members[0]): members for members in by_digest.values()}
+        categorical = self._categorical(column)
+        by_code: Dict[int, List[int]] = {}
+        codes = categorical.codes
+        for row in selected:
+            by_code.setdefault(codes[row], []).append(row)
+        return {categorical.values[code]: members for code, members in by_code.items()}
+
+    def size_by(self, column: str, rows: Rows = None) -> Dict[Any, Tuple[int, int]]:
+        """``(file count, total bytes)`` per distinct value of a categorical column."""
+        categorical = self._categorical(column)
+        counts = [0] * len(categorical.values)
+        totals = [0] * len(categorical.values)
+        codes, sizes = categorical.codes, self._sizes
+        for row in range(len(self)) if rows is None else rows:
+            code = codes[row]
+            counts[code] += 1
+            totals[code] += sizes[row]
+        return {
+            value: (count, total)
+            for value, count, total in zip(categorical.values, counts, totals)
+            if count
+        }
+
+    def _categorical(self, column: str) -> _Categorical:
+        if column == "extension":
+            return self._extensions
+        if column == "mime_type":
+            return self._mime_types
+        raise ValueError(f"Cannot group by {column!r}; expected one of {GROUP_COLUMNS}")
+
+
+class FileRow:
+    """Read-only view of one ``FileTable`` row with ``FileMetadata``'s attributes."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: FileTable, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def path(self) -> str:
+        return self._table.path(self._row)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._table._sizes[self._row]
+
+    @property
+    def mime_type(self) -> str:
+        return self._table._mime_types[self._row]
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return self._table.created_at(self._row)
+
+    @property
+    def modified_at(self) -> Optional[datetime]:
+        return self._table.modified_at(self._row)
+
+    @property
+    def media_info(self) -> Optional[MediaMetadata]:
+        return self._table._media.get(self._row)
+
+    @property
+    def file_hash(self) -> Optional[str]:
+        return self._table.file_hash(self._row)
+
+    @property
+    def content_signature(self) -> Optional[str]:
+        return self._table._signatures.get(self._row)
+
+    @property
+    def extension(self) -> str:
+        return self._table.extension(self._row)
+
+    def to_metadata(self) -> FileMetadata:
+        return self._table.metadata(self._row)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FileRow):
+            other = other.to_metadata()
+        if isinstance(other, FileMetadata):
+            return self.to_metadata() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"FileRow(path={self.path!r}, size_bytes={self.size_bytes})"
+
+
+def _suffix(name: str) -> str:
+    # Same rule as PurePath.suffix, without building a path object per row.
+    dot = name.rfind(".")
+    return name[dot:] if 0 < dot < len(name) - 1 else ""
+
+
+def _micros(value: datetime) -> int:
+    if value.tzinfo is not None and value.utcoffset() is None:
+        value = value.replace(tzinfo=None)
+    delta = value - (_EPOCH if value.tzinfo is None else _EPOCH_UTC)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _datetime(micros: int, zone: Any) -> Optional[datetime]:
+    if micros == _MISSING:
+        return None
+    if zone is None:
+        return _EPOCH + timedelta(microseconds=micros)
+    return (_EPOCH_UTC + timedelta(microseconds=micros)).astimezone(zone)
@@ -0,0 +1,436 @@
+# inference_service.py
+# Local inference service that owns the vision (ResNet50) and ASR (wav2vec2)
+# models for every scan worker on the host.
+# - Workers talk to it over a local socket (multiprocessing.connection)
+# - Image classifications from all workers are batched into one forward pass
+# - Memory stays flat as workers are added: only this process loads weights
+# - Run with: python -m scanner.inference_service --address 127.0.0.1:8765   (from backend/src)
+# Workers use it when MEDIA_INFERENCE_ADDRESS is set; with MEDIA_INFERENCE_AUTOSTART
+# (default on) the first worker that cannot connect starts it.
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import queue
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from . import vision
+from .media_types import ContentLabel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY_PATH = Path.home() / ".cache" / "capstone" / "media_inference.key"
+DEFAULT_BATCH_WINDOW_MS = 10.0
+DEFAULT_MAX_BATCH = 16
+DEFAULT_CONCURRENCY = 1
+DEFAULT_START_TIMEOUT_SEC = 30.0
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(value: str) -> Address:
+    """``host:port`` for TCP on the loopback interface, anything else is a Unix socket path."""
+    host, sep, port = value.rpartition(":")
+    if sep and host and port.isdigit():
+        return (host, int(port))
+    return value
+
+
+def load_authkey() -> bytes:
+    """MEDIA_INFERENCE_AUTHKEY, or a per-user key file shared by the service and its workers."""
+    configured = os.getenv("MEDIA_INFERENCE_AUTHKEY")
+    if configured:
+        return configured.encode("utf-8")
+    path = DEFAULT_KEY_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return path.read_bytes().strip()
+    with os.fdopen(fd, "w") as handle:
+        handle.write(secrets.token_hex(32))
+    return path.read_bytes().strip()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+
+class _ClassifyBatcher:
+    """Collects image classification requests for a short window and runs them as one batch."""
+
+    def __init__(
+        self,
+        classify_batch: Callable[[List[Any], int], List[List[ContentLabel]]],
+        slots: threading.BoundedSemaphore,
+        window_sec: float,
+        max_batch: int,
+    ):
+        self._classify_batch = classify_batch
+        self._slots = slots
+        self._window_sec = window_sec
+        self._max_batch = max_batch
+        self._pending: "queue.Queue[Tuple[List[Any], int, Future]]" = queue.Queue()
+        self.batch_sizes: List[int] = []
+        threading.Thread(target=self._run, name="inference-batcher", daemon=True).start()
+
+    def submit(self, images: List[Any], top_k: int) -> List[List[ContentLabel]]:
+        future: Future = Future()
+        self._pending.put((images, top_k, future))
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._pending.get()]
+            count = len(batch[0][0])
+            deadline = time.monotonic() + self._window_sec
+            while count < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                count += len(item[0])
+            self._execute(batch)
+
+    def _execute(self, batch: List[Tuple[List[Any], int, Future]]) -> None:
+        images = [image for item in batch for image in item[0]]
+        top_k = max(item[1] for item in batch)
+        try:
+            with self._slots:
+                results = self._classify_batch(images, top_k)
+        except Exception as exc:
+            for _, _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batch_sizes.append(len(images))
+        offset = 0
+        for item_images, item_top_k, future in batch:
+            rows = results[offset:offset + len(item_images)]
+            offset += len(item_images)
+            future.set_result([labels[:item_top_k] for labels in rows])
+
+
+class InferenceServer:
+    """Serves classify/video/audio requests from scan workers with one copy of each model."""
+
+    def __init__(
+        self,
+        address: Address,
+        authkey: bytes,
+        *,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        vision_engine: Optional[Callable[[], Any]] = None,
+        audio_engine: Optional[Callable[[], Any]] = None,
+    ):
+        self.address = address
+        self._authkey = authkey
+        self._vision_engine = vision_engine or vision._get_engine
+        self._audio_engine = audio_engine or vision._get_audio_engine
+        # Bounds concurrent model runs (batched classifies, videos, audio) across all workers.
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self.batcher = _ClassifyBatcher(self._classify, self._slots, batch_window_ms / 1000.0, max(1, max_batch))
+        self._stopping = threading.Event()
+        _remove_stale_socket(address, authkey)
+        self._listener = Listener(address, authkey=authkey)
+
+    def _classify(self, images: List[Any], top_k: int) -> List[List[ContentLabel]]:
+        engine = self._vision_engine()
+        if engine is None:
+            return [[] for _ in images]
+        return engine.classify_batch(images, top_k=top_k)
+
+    def _dispatch(self, op: str, args: Dict[str, Any]) -> Any:
+        if op == "ping":
+            return {"pid": os.getpid()}
+        if op == "classify":
+            return self.batcher.submit(list(args["images"]), int(args["top_k"]))
+        if op == "video":
+            with self._slots:
+                return vision._video_labels_with(
+                    self._vision_engine(),
+                    args["data"],
+                    args["suffix"],
+                    top_k=int(args["top_k"]),
+                    frame_samples=int(args["frame_samples"]),
+                )
+        if op == "audio":
+            with self._slots:
+                return vision._audio_insights_with(
+                    self._audio_engine(), args["data"], args["suffix"], top_k=int(args["top_k"])
+                )
+        raise ValueError(f"Unknown inference op: {op}")
+
+    def _serve_connection(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = ("ok", self._dispatch(op, args))
+                except Exception as exc:
+                    logger.exception("Inference request %s failed", op)
+                    reply = ("error", str(exc))
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+
+    def serve_forever(self) -> None:
+        logger.info("Inference service listening on %s", self.address)
+        while not self._stopping.is_set():
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._stopping.is_set():
+                    break
+                logger.exception("Failed to accept inference connection")
+                continue
+            if self._stopping.is_set():
+                conn.close()
+                break
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        self._listener.close()
+
+    def close(self) -> None:
+        self._stopping.set()
+        try:  # Wake the blocking accept().
+            Client(self.address, authkey=self._authkey).close()
+        except Exception:
+            pass
+
+
+def _remove_stale_socket(address: Address, authkey: bytes) -> None:
+    if not isinstance(address, str) or not os.path.exists(address):
+        return
+    try:
+        Client(address, authkey=authkey).close()
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(address)
+        return
+    except Exception:
+        return
+    raise OSError(f"An inference service is already listening on {address}")
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class InferenceClient:
+    """Engine-shaped proxy used by scanner.vision inside scan workers.
+
+    Each thread keeps its own connection. Failures are logged and answered
+    with empty results, like a missing local model, so scans never fail on
+    content insights.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        authkey: bytes,
+        *,
+        autostart: bool = True,
+        start_timeout: float = DEFAULT_START_TIMEOUT_SEC,
+    ):
+        self.address = address
+        self._authkey = authkey
+        self._autostart = autostart
+        self._start_timeout = start_timeout
+        self._local = threading.local()
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    def classify_batch(self, images: Sequence[Any], *, top_k: int) -> List[List[ContentLabel]]:
+        empty = [[] for _ in images]
+        if not images:
+            return empty
+        return self._call("classify", {"images": list(images), "top_k": top_k}, empty)
+
+    def classify(self, image: Any, *, top_k: int) -> List[ContentLabel]:
+        return self.classify_batch([image], top_k=top_k)[0]
+
+    def video_labels(self, data: bytes, suffix: str, *, top_k: int, frame_samples: int) -> List[ContentLabel]:
+        return self._call(
+            "video",
+            {"data": data, "suffix": suffix, "top_k": top_k, "frame_samples": frame_samples},
+            [],
+        )
+
+    def audio_insights(self, data: bytes, suffix: str, *, top_k: int) -> Dict[str, object]:
+        return self._call("audio", {"data": data, "suffix": suffix or ".wav", "top_k": top_k}, {})
+
+    def ping(self) -> bool:
+        return self._call("ping", {}, None) is not None
+
+    def _call(self, op: str, args: Dict[str, Any], default: Any) -> Any:
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send((op, args))
+                status, payload = conn.recv()
+            except (OSError, EOFError) as exc:
+                self._drop_connection()
+                if attempt:
+                    logger.warning("Inference service at %s unavailable: %s", self.address, exc)
+                    return default
+                continue
+            if status == "ok":
+                return payload
+            logger.warning("Inference service %s request failed: %s", op, payload)
+            return default
+        return default
+
+    def _connection(self) -> Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        try:
+            conn = Client(self.address, authkey=self._authkey)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if not self._autostart:
+                raise
+            conn = self._start_and_connect()
+        self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _start_and_connect(self) -> Connection:
+        with self._start_lock:
+            if not self._started:
+                # Several workers may race here; all but one fail to bind and exit.
+                start_service_process(self.address)
+                self._started = True
+        deadline = time.monotonic() + self._start_timeout
+        while True:
+            try:
+                return Client(self.address, authkey=self._authkey)
+            except (ConnectionRefusedError, FileNotFoundError):
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.2)
+
+
+def start_service_process(address: Address) -> subprocess.Popen:
+    """Start a detached inference service for ``address`` that outlives the calling worker."""
+    text = address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+    return subprocess.Popen(
+        [sys.executable, "-m", "scanner.inference_service", "--address", text],
+        cwd=str(Path(__file__).resolve().parents[1]),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+_clients: Dict[str, InferenceClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_inference_client(address: str) -> InferenceClient:
+    """Process-wide client for ``address`` (MEDIA_INFERENCE_ADDRESS)."""
+    with _clients_lock:
+        client = _clients.get(address)
+        if client is None:
+            client = InferenceClient(
+                parse_address(address),
+                load_authkey(),
+                autostart=(os.getenv("MEDIA_INFERENCE_AUTOSTART") or "1").strip().lower() not in {"0", "false", "no"},
+                start_timeout=_env_float("MEDIA_INFERENCE_START_TIMEOUT_SEC", DEFAULT_START_TIMEOUT_SEC),
+            )
+            _clients[address] = client
+        return client
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the shared media inference service")
+    parser.add_argument(
+        "--address",
+        default=os.getenv("MEDIA_INFERENCE_ADDRESS") or "127.0.0.1:8765",
+        help="host:port or Unix socket path",
+    )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=_env_float("MEDIA_INFERENCE_BATCH_WINDOW_MS", DEFAULT_BATCH_WINDOW_MS),
+    )
+    parser.add_argument("--max-batch", type=int, default=_env_int("MEDIA_INFERENCE_MAX_BATCH", DEFAULT_MAX_BATCH))
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=_env_int("MEDIA_INFERENCE_CONCURRENCY", DEFAULT_CONCURRENCY),
+        help="Model runs allowed at once",
+    )
+    parser.add_argument("--preload", action="store_true", help="Load the models before accepting requests")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+    # This process owns the models; it must never forward requests to itself.
+    vision._in_inference_service = True
+
+    try:
+        server = InferenceServer(
+            parse_address(args.address),
+            load_authkey(),
+            batch_window_ms=args.batch_window_ms,
+            max_batch=args.max_batch,
+            concurrency=args.concurrency,
+        )
+    except OSError as exc:
+        # Another worker's service won the race for the address.
+        logger.info("Not starting inference service on %s: %s", args.address, exc)
+        return
+    if args.preload:
+        vision._get_engine()
+        vision._get_audio_engine()
+    signal.signal(signal.SIGTERM, lambda *_: server.close())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+_DATACLASS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Directories no analyzer looks inside; pruned during the walk unless the caller overrides.
+DEFAULT_PRUNE_DIRS = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    "node_modules",
+    ".venv",
+    "venv",
+    ".tox",
+    ".tmp_archives",
+})
+
+
+@dataclass(**_DATACLASS_KWARGS)
+class InventoryEntry:
+    """One regular file discovered under the inventory root."""
+
+    rel_path: str  # POSIX path relative to the root
+    size_bytes: int
+    mtime: float
+    extension: str  # lower-cased suffix, "" when absent
+    dir_parts: Tuple[str, ...]  # parent directory names relative to the root
+    language: Optional[str] = None
+    file_hash: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.rel_path.rsplit("/", 1)[-1]
+
+
+class FileInventory:
+    """
+    Scan-wide listing of a directory tree built with a single walk.
+
+    Records every file's size, mtime, extension and (optionally) language,
+    plus each directory's child names, so analyzers can answer their own
+    questions (source files to read, project markers, nested git
+    repositories) without touching the filesystem again. Directories in
+    ``prune_dirs`` are listed by name but never descended into.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        entries: List[InventoryEntry],
+        directories: Dict[str, Tuple[List[str], List[str]]],
+        prune_dirs: Iterable[str],
+        follow_symlinks: bool,
+    ):
+        self.root = root
+        self.entries = entries
+        self.prune_dirs = frozenset(prune_dirs)
+        self.follow_symlinks = follow_symlinks
+        self._directories = directories
+        self._hash_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Inventories are shipped to analysis worker processes; locks don't pickle.
+        state = dict(self.__dict__)
+        state.pop("_hash_lock", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._hash_lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls,
+        root: Path,
+        *,
+        prune_dirs: Optional[Iterable[str]] = None,
+        follow_symlinks: bool = False,
+        languages: Optional[Mapping[str, str]] = None,
+    ) -> "FileInventory":
+        """Walk ``root`` once with os.scandir and capture everything analyzers need.
+
+        Args:
+            root: Directory to inventory
+            prune_dirs: Directory names not descended into (defaults to DEFAULT_PRUNE_DIRS)
+            follow_symlinks: Descend into symlinked directories
+            languages: Optional extension -> language name mapping
+        """
+        base = Path(root).expanduser().resolve()
+        pruned = frozenset(prune_dirs) if prune_dirs is not None else DEFAULT_PRUNE_DIRS
+        entries: List[InventoryEntry] = []
+        directories: Dict[str, Tuple[List[str], List[str]]] = {}
+        visited: set[Tuple[int, int]] = set()
+        stack: List[Tuple[str, str, Tuple[str, ...]]] = [(os.fspath(base), "", ())]
+
+        while stack:
+            directory, rel_dir, parts = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    children = sorted(iterator, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            dir_names: List[str] = []
+            file_names: List[str] = []
+            subdirs: List[Tuple[str, str, Tuple[str, ...]]] = []
+            for child in children:
+                rel_path = f"{rel_dir}/{child.name}" if rel_dir else child.name
+                try:
+                    if child.is_dir(follow_symlinks=True):
+                        dir_names.append(child.name)
+                        if child.name in pruned:
+                            continue
+                        if child.is_symlink():
+                            if not follow_symlinks:
+                                continue
+                            # Guard against symlink cycles.
+                            target_stat = child.stat()
+                            key = (target_stat.st_dev, target_stat.st_ino)
+                            if key in visited:
+                                continue
+                            visited.add(key)
+                        subdirs.append((child.path, rel_path, parts + (child.name,)))
+                    elif child.is_file(follow_symlinks=True):
+                        stat = child.stat()
+                        file_names.append(child.name)
+                        extension = os.path.splitext(child.name)[1].lower()
+                        entries.append(InventoryEntry(
+                            rel_path=rel_path,
+                            size_bytes=stat.st_size,
+                            mtime=stat.st_mtime,
+                            extension=extension,
+                            dir_parts=parts,
+                            language=languages.get(extension) if languages else None,
+                        ))
+                except OSError:
+                    # Skip entries that disappear or cannot be stat'ed mid-walk.
+                    continue
+            directories[rel_dir] = (dir_names, file_names)
+            # Reverse so directories are visited in sorted order off the stack.
+            stack.extend(reversed(subdirs))
+
+        return cls(base, entries, directories, pruned, follow_symlinks)
+
+    # ------------------------------------------------------------------
+    # Path helpers
+    # ------------------------------------------------------------------
+
+    def relative(self, path: Path) -> Optional[str]:
+        """Root-relative POSIX path for ``path``, or None when outside the inventory."""
+        candidate = Path(path).expanduser()
+        for resolved in (Path(os.path.abspath(candidate)), candidate.resolve()):
+            try:
+                rel = resolved.relative_to(self.root).as_posix()
+            except ValueError:
+                continue
+            return "" if rel == "." else rel
+        return None
+
+    def covers(self, path: Path) -> bool:
+        rel = self.relative(path)
+        return rel is not None and rel in self._directories
+
+    def path_of(self, entry: InventoryEntry) -> Path:
+        return self.root / entry.rel_path
+
+    def list_dir(self, path: Path) -> Optional[Tuple[List[str], List[str]]]:
+        """(directory names, file names) directly under ``path``; None if not inventoried."""
+        rel = self.relative(path)
+        if rel is None:
+            return None
+        return self._directories.get(rel)
+
+    def is_dir(self, path: Path) -> bool:
+        rel = self.relative(path)
+        if rel is None:
+            return False
+        if rel in self._directories:
+            return True
+        parent, _, name = rel.rpartition("/")
+        listing = self._directories.get(parent)
+        return bool(listing and name in listing[0])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def files(
+        self,
+        *,
+        under: Optional[Path] = None,
+        exclude_dirs: Optional[Iterable[str]] = None,
+        extensions: Optional[Iterable[str]] = None,
+        max_size: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> Iterator[InventoryEntry]:
+        """Iterate entries matching the given filters.
+
+        Args:
+            under: Only files beneath this directory (must be inside the root)
+            exclude_dirs: Skip files with any of these directory names in their path
+            extensions: Lower-cased suffixes to keep
+            max_size: Skip files larger than this many bytes
+            max_depth: Only files fewer than this many directories below ``under``
+        """
+        prefix_parts: Tuple[str, ...] = ()
+        if under is not None:
+            rel = self.relative(under)
+            if rel is None:
+                return
+            prefix_parts = tuple(rel.split("/")) if rel else ()
+        excluded = set(exclude_dirs) if exclude_dirs is not None else None
+        allowed = set(extensions) if extensions is not None else None
+        depth_offset = len(prefix_parts)
+
+        for entry in self.entries:
+            if prefix_parts and entry.dir_parts[:depth_offset] != prefix_parts:
+                continue
+            if allowed is not None and entry.extension not in allowed:
+                continue
+            if max_size is not None and entry.size_bytes > max_size:
+                continue
+            if max_depth is not None and len(entry.dir_parts) - depth_offset >= max_depth:
+                continue
+            if excluded and any(part in excluded for part in entry.dir_parts[depth_offset:]):
+                continue
+            yield entry
+
+    def git_roots(self, exclude_dirs: Optional[Iterable[str]] = None) -> List[Path]:
+        """Directories containing a ``.git`` directory, shallowest first."""
+        excluded = set(exclude_dirs) if exclude_dirs is not None else set()
+        roots: List[Path] = []
+        for rel_dir, (dir_names, _) in sorted(self._directories.items(), key=lambda item: (item[0].count("/"), item[0])):
+            if ".git" not in dir_names:
+                continue
+            if rel_dir and any(part in excluded for part in rel_dir.split("/")):
+                continue
+            roots.append(self.root / rel_dir if rel_dir else self.root)
+        return roots
+
+    def file_hash(self, entry: InventoryEntry) -> Optional[str]:
+        """Tagged content hash of the entry (same digest as parse_zip), computed once and cached."""
+        # Imported lazily; the parser itself builds inventories.
+        from .parser import _MAX_HASH_BYTES, _calculate_file_hash
+
+        if entry.file_hash is not None or entry.size_bytes > _MAX_HASH_BYTES:
+            return entry.file_hash
+
+        try:
+            with open(self.path_of(entry), "rb") as file_obj:
+                digest = _calculate_file_hash(file_obj)
+        except OSError:
+            return None
+        with self._hash_lock:
+            entry.file_hash = digest
+        return digest
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Optional, Tuple
 
 from .media_types import AudioMetadata, ImageMetadata, MediaMetadata, VideoMetadata
+from .perceptual_hash import dhash
 
 try:
     from .vision import (
@@ -76,6 +77,22 @@ def is_media_candidate(path: str) -> bool:
     return extension in IMAGE_EXTENSIONS + AUDIO_EXTENSIONS + VIDEO_EXTENSIONS
 
 
+def is_image_candidate(path: str) -> bool:
+    """Return True when the file extension suggests an image we can decode."""
+    return _normalized_extension(path) in IMAGE_EXTENSIONS
+
+
+def image_perceptual_hash(data: bytes) -> Optional[str]:
+    """dHash of an encoded image, or None when Pillow is missing or cannot decode it."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return dhash(image)
+    except Exception:  # pragma: no cover - PIL specific failures
+        return None
+
+
 def extract_media_metadata(path: str, mime_type: Optional[str], data: bytes) -> MediaExtractionResult:
     """
     Attempt to extract metadata for supported media formats.
@@ -121,6 +138,9 @@ def _extract_image_metadata(data: bytes) -> MediaExtractionResult:
             }
             if "dpi" in image.info:
                 metadata["dpi"] = image.info["dpi"]
+            perceptual_hash = dhash(image)
+            if perceptual_hash:
+                metadata["perceptual_hash"] = perceptual_hash
             labels = image_content_labels(data)
             if labels:
                 metadata["content_labels"] = labels
@@ -14,6 +14,7 @@ class ImageMetadata(TypedDict, total=False):
     mode: str
     format: str
     dpi: Tuple[float, float]
+    perceptual_hash: str  # "dhash:<hex>", see scanner.perceptual_hash
     content_labels: List[ContentLabel]
     content_summary: str
 
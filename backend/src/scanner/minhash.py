@@ -0,0 +1,230 @@
+"""MinHash signatures of source files and an LSH index for near-duplicates.
+
+Source text is tokenized with comments dropped and string/number literals
+collapsed, then split into overlapping ``SHINGLE_SIZE``-token shingles. The
+signature is a one-permutation MinHash: every shingle hash falls into one of
+``NUM_BINS`` bins, each bin keeps its minimum, and empty bins borrow from
+their neighbour. That is one pass over the file instead of one per
+permutation. The share of equal bins between two signatures estimates the
+Jaccard similarity of their shingle sets.
+
+Signatures are written as ``"minhash:<base64>"``, tagged like
+``scanner.content_hash`` digests.
+"""
+
+from __future__ import annotations
+
+import base64
+import re
+import struct
+import zlib
+from pathlib import PurePosixPath
+from typing import Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+NUM_BINS = 128
+SHINGLE_SIZE = 5
+# Files with fewer shingles than this are too small to compare meaningfully.
+MIN_SHINGLES = 20
+MAX_SOURCE_BYTES = 1024 * 1024
+MINHASH_TAG = "minhash"
+# Stored for source files too small to sign, so they are not re-read on every re-scan.
+NO_SIGNATURE = f"{MINHASH_TAG}:"
+# LSH banding: 32 bands of 4 bins finds pairs at ~0.8 similarity almost surely.
+DEFAULT_BANDS = 32
+DEFAULT_SIMILARITY = 0.8
+
+SOURCE_EXTENSIONS = frozenset({
+    ".py", ".pyi", ".js", ".mjs", ".cjs", ".jsx", ".ts", ".tsx", ".java", ".kt", ".kts",
+    ".cs", ".c", ".h", ".hpp", ".hh", ".cpp", ".cc", ".go", ".rs", ".rb", ".php", ".swift",
+    ".scala", ".sh", ".bash", ".zsh", ".ps1", ".sql", ".r", ".jl", ".lua", ".html", ".htm",
+    ".css", ".scss", ".sass", ".less", ".vue", ".svelte", ".dart", ".m", ".mm",
+})
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>\#[ \t!][^\n]*|//[^\n]*|/\*.*?\*/)
+    |(?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)
+    |(?P<number>\b\d[\w.]*)
+    |(?P<word>[A-Za-z_$][\w$]*)
+    |(?P<symbol>[^\s\w])
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+_MASK64 = (1 << 64) - 1
+_EMPTY = 0xFFFFFFFF
+_PACK = struct.Struct(f">{NUM_BINS}I")
+
+T = TypeVar("T", bound=Hashable)
+
+
+def is_source_candidate(path: str, size_bytes: int) -> bool:
+    return PurePosixPath(path).suffix.lower() in SOURCE_EXTENSIONS and 0 < size_bytes <= MAX_SOURCE_BYTES
+
+
+def normalized_tokens(text: str) -> List[str]:
+    """Tokens with comments removed and literals replaced by placeholders."""
+    tokens: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "comment":
+            continue
+        if kind == "string":
+            tokens.append("<s>")
+        elif kind == "number":
+            tokens.append("<n>")
+        else:
+            tokens.append(match.group())
+    return tokens
+
+
+def source_signature(data: bytes) -> Optional[str]:
+    """Tagged MinHash signature of a source file, or None when it is too small to compare."""
+    tokens = normalized_tokens(data.decode("utf-8", errors="replace"))
+    if len(tokens) < SHINGLE_SIZE + MIN_SHINGLES - 1:
+        return None
+    ids: Dict[str, int] = {}
+    token_ids = [ids.setdefault(token, zlib.crc32(token.encode("utf-8"))) for token in tokens]
+
+    bins = [_EMPTY] * NUM_BINS
+    for start in range(len(token_ids) - SHINGLE_SIZE + 1):
+        value = 0
+        for token_id in token_ids[start:start + SHINGLE_SIZE]:
+            value = ((value * 1000003) ^ token_id) & _MASK64
+        value = _mix64(value)
+        slot = value & (NUM_BINS - 1)
+        rank = value >> 32
+        if rank < bins[slot]:
+            bins[slot] = rank
+    _densify(bins)
+    return f"{MINHASH_TAG}:{base64.b64encode(_PACK.pack(*bins)).decode('ascii')}"
+
+
+def parse_signature(value: Optional[str]) -> Optional[bytes]:
+    """Packed signature bytes of a tagged MinHash signature, or None if missing or malformed."""
+    if not value:
+        return None
+    tag, sep, encoded = value.partition(":")
+    if not sep or tag != MINHASH_TAG:
+        return None
+    try:
+        raw = base64.b64decode(encoded, validate=True)
+    except ValueError:
+        return None
+    return raw if len(raw) == _PACK.size else None
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two packed signatures."""
+    equal = sum(1 for x, y in zip(_PACK.unpack(a), _PACK.unpack(b)) if x == y)
+    return equal / NUM_BINS
+
+
+def _mix64(value: int) -> int:
+    # splitmix64 finalizer: spreads the shingle hash over all 64 bits.
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def _densify(bins: List[int]) -> None:
+    """Fill empty bins from the next non-empty bin so every position is comparable."""
+    if all(value == _EMPTY for value in bins):
+        return
+    filled = list(bins)
+    for index, value in enumerate(bins):
+        if value != _EMPTY:
+            continue
+        offset = 1
+        while bins[(index + offset) % NUM_BINS] == _EMPTY:
+            offset += 1
+        # Mixing in the distance keeps borrowed values distinct from the donor bin.
+        filled[index] = _mix64(bins[(index + offset) % NUM_BINS] + offset * 0x9E3779B9) >> 32
+    bins[:] = filled
+
+
+class MinHashLSH(Generic[T]):
+    """Banded locality-sensitive hashing over MinHash signatures.
+
+    Each signature is split into ``bands`` slices; two signatures become a
+    candidate pair when any slice matches exactly. Candidates are verified
+    against ``threshold`` with the full signature, so finding all
+    near-duplicate pairs is roughly linear in the number of files.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY, bands: int = DEFAULT_BANDS) -> None:
+        if NUM_BINS % bands:
+            raise ValueError(f"bands must divide {NUM_BINS}")
+        self.threshold = threshold
+        self._band_bytes = _PACK.size // bands
+        self._buckets: List[Dict[bytes, Set[T]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[T, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._signatures
+
+    def add(self, key: T, signature: bytes) -> None:
+        self.remove(key)
+        self._signatures[key] = signature
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            bucket.setdefault(band, set()).add(key)
+
+    def remove(self, key: T) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            members = bucket.get(band)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del bucket[band]
+
+    def query(self, signature: bytes) -> Iterator[Tuple[T, float]]:
+        """Yield ``(key, similarity)`` for stored signatures at or above the threshold."""
+        seen: Set[T] = set()
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            for key in bucket.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(signature, self._signatures[key])
+                if score >= self.threshold:
+                    yield key, score
+
+    def clusters(self, keys: Optional[Iterable[T]] = None) -> List[Tuple[List[T], float]]:
+        """Groups of keys linked by near-duplicate pairs, with each group's lowest linking similarity.
+
+        ``keys`` limits clustering to a subset of the stored signatures.
+        """
+        allowed = set(self._signatures) if keys is None else {key for key in keys if key in self._signatures}
+        parent: Dict[T, T] = {}
+        weakest: Dict[T, float] = {}
+
+        def find(key: T) -> T:
+            root = parent.setdefault(key, key)
+            while root != parent[root]:
+                parent[root] = parent[parent[root]]
+                root = parent[root]
+            return root
+
+        for key in allowed:
+            for other, score in self.query(self._signatures[key]):
+                if other == key or other not in allowed:
+                    continue
+                root, other_root = find(key), find(other)
+                if root == other_root:
+                    continue
+                parent[other_root] = root
+                weakest[root] = min(score, weakest.pop(root, 1.0), weakest.pop(other_root, 1.0))
+
+        members: Dict[T, List[T]] = {}
+        for key in parent:
+            members.setdefault(find(key), []).append(key)
+        return [(group, weakest.get(root, 1.0)) for root, group in members.items() if len(group) > 1]
+
+    def _bands(self, signature: bytes) -> Iterator[bytes]:
+        width = self._band_bytes
+        return (signature[offset:offset + width] for offset in range(0, len(signature), width))
@@ -3,9 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 import sys
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from .media_types import MediaMetadata
+
+if TYPE_CHECKING:
+    from .file_table import FileTable
 _DATACLASS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
@@ -18,6 +21,7 @@ class FileMetadata:
     modified_at: datetime
     media_info: Optional[MediaMetadata] = None
     file_hash: Optional[str] = None  # MD5 hash for duplicate detection
+    content_signature: Optional[str] = None  # MinHash of source files (scanner.minhash)
 
 
 @dataclass(**_DATACLASS_KWARGS)
@@ -29,7 +33,8 @@ class ParseIssue:
 
 @dataclass(**_DATACLASS_KWARGS)
 class ParseResult:
-    files: List[FileMetadata] = field(default_factory=list)
+    # Large results kept in memory may hold a columnar FileTable instead of a list.
+    files: Union[List[FileMetadata], FileTable] = field(default_factory=list)
     issues: List[ParseIssue] = field(default_factory=list)
     summary: Dict[str, int] = field(default_factory=dict)
 
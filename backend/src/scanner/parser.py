@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-import hashlib
 import logging
 import mimetypes
 from datetime import datetime, timezone
 from pathlib import Path, PurePosixPath
 import zipfile
-from typing import Any, Callable, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable
 
+from .content_hash import default_algorithm, hash_bytes, hash_stream, split_hash
 from .errors import CorruptArchiveError, UnsupportedArchiveError
-from .media import MediaExtractionResult, extract_media_metadata, is_media_candidate
+from .inventory import FileInventory
+from .media import (
+    MediaExtractionResult,
+    extract_media_metadata,
+    image_perceptual_hash,
+    is_image_candidate,
+    is_media_candidate,
+)
+from .minhash import NO_SIGNATURE, is_source_candidate, source_signature
 from .models import FileMetadata, ParseIssue, ParseResult, ScanPreferences
 
+if TYPE_CHECKING:
+    from services.cancellation import CancellationToken
+
 
 _EXCLUDED_DIRS = {
     "__pycache__",
@@ -154,21 +165,139 @@ _ALLOWED_MIME_TYPES = {
 
 _MAX_MEDIA_BYTES = 20 * 1024 * 1024  # 20 MiB safeguard for media extraction.
 _MAX_HASH_BYTES = 50 * 1024 * 1024  # 50 MiB limit for hash calculation.
-_HASH_CHUNK_SIZE = 8192  # 8 KiB chunks for streaming hash calculation.
 
 logger = logging.getLogger(__name__)
 
 
 def _calculate_file_hash(file_obj) -> str:
-    """Calculate MD5 hash of file content using chunked streaming.
-    
-    Uses chunked reading to avoid loading entire file into memory,
-    making it more scalable for larger files.
+    """Algorithm-tagged content hash of a file, streamed in chunks (see scanner.content_hash)."""
+    return hash_stream(file_obj)
+
+class _ParseCollector:
+    """Applies filters, cache reuse and media extraction to parsed entries.
+
+    Shared by parse_zip and parse_directory so both sources yield the same
+    ParseResult for the same files.
     """
-    hasher = hashlib.md5()
-    while chunk := file_obj.read(_HASH_CHUNK_SIZE):
-        hasher.update(chunk)
-    return hasher.hexdigest()
+
+    def __init__(
+        self,
+        *,
+        relevant_only: bool,
+        preferences: ScanPreferences | None,
+        cached_files: Dict[str, Dict[str, Any]] | None,
+        cancel_token: CancellationToken | None = None,
+    ) -> None:
+        self.relevant_only = relevant_only
+        self.cancel_token = cancel_token
+        self.allowed_extensions = (
+            {ext.lower() for ext in preferences.allowed_extensions}
+            if preferences and preferences.allowed_extensions is not None
+            else None
+        )
+        self.excluded_dirs = (
+            {name for name in preferences.excluded_dirs}
+            if preferences and preferences.excluded_dirs is not None
+            else set(_EXCLUDED_DIRS)
+        )
+        self.max_file_size = (
+            preferences.max_file_size_bytes
+            if preferences and preferences.max_file_size_bytes is not None
+            else None
+        )
+        # When explicitly asking for relevant files, rely on the built-in relevance
+        # heuristics rather than user-configured extension filters.
+        if relevant_only:
+            self.allowed_extensions = None
+        self.cached_files = cached_files or {}
+
+        self.files: list[FileMetadata] = []
+        self.issues: list[ParseIssue] = []
+        self.total_bytes = 0
+        self.skipped_files = 0
+        self.filtered_out = 0
+        self.media_with_metadata = 0
+        self.media_metadata_errors = 0
+        self.media_read_errors = 0
+        self.media_too_large = 0
+
+    def add(
+        self,
+        metadata: FileMetadata,
+        *,
+        hash_content: Callable[[], str | None],
+        read_payload: Callable[[], bytes],
+    ) -> None:
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+        # Content is only hashed/read for files that survive the cache and filters.
+        cached_entry = self.cached_files.get(metadata.path)
+        if cached_entry and _cached_entry_matches(metadata, cached_entry):
+            _apply_cached_metadata(metadata, cached_entry.get("metadata"))
+            if metadata.content_signature is None:
+                metadata.content_signature = cached_entry.get("content_signature")
+            if metadata.file_hash is None or _needs_rehash(metadata.file_hash):
+                metadata.file_hash = hash_content()
+            _backfill_perceptual_hash(metadata, read_payload)
+            self.files.append(metadata)
+            self.total_bytes += metadata.size_bytes
+            self.skipped_files += 1
+            logger.debug(f"Cache hit: {metadata.path}")
+            return
+        if _should_skip(metadata, self.excluded_dirs, self.allowed_extensions, self.max_file_size):
+            self.filtered_out += 1
+            return
+        if self.relevant_only and not _is_relevant(metadata):
+            self.filtered_out += 1
+            return
+        metadata.file_hash = hash_content()
+        if is_media_candidate(metadata.path):
+            extracted, error_code = _attach_media_metadata(
+                read_payload=read_payload,
+                metadata=metadata,
+                issues=self.issues,
+            )
+            if extracted:
+                self.media_with_metadata += 1
+            if error_code == "MEDIA_METADATA_ERROR":
+                self.media_metadata_errors += 1
+            elif error_code == "MEDIA_READ_ERROR":
+                self.media_read_errors += 1
+            elif error_code == "MEDIA_TOO_LARGE":
+                self.media_too_large += 1
+        self.files.append(metadata)
+        self.total_bytes += metadata.size_bytes
+
+    def result(self) -> ParseResult:
+        summary = {
+            "files_processed": len(self.files),
+            "bytes_processed": self.total_bytes,
+            "issues_count": len(self.issues),
+        }
+        if self.skipped_files:
+            summary["files_skipped"] = self.skipped_files
+        if self.media_with_metadata:
+            summary["media_files_processed"] = self.media_with_metadata
+        if self.media_metadata_errors:
+            summary["media_metadata_errors"] = self.media_metadata_errors
+        if self.media_read_errors:
+            summary["media_read_errors"] = self.media_read_errors
+        if self.media_too_large:
+            summary["media_files_too_large"] = self.media_too_large
+        if self.relevant_only:
+            summary["filtered_out"] = self.filtered_out
+        return ParseResult(files=self.files, issues=self.issues, summary=summary)
+
+
+def _report_progress(
+    progress_callback: Callable[[int, int], None] | None, processed: int, total: int
+) -> None:
+    if progress_callback:
+        try:
+            progress_callback(processed, total)
+        except Exception:
+            pass
+
 
 def parse_zip(
     archive_path: Path,
@@ -177,6 +306,7 @@ def parse_zip(
     preferences: ScanPreferences | None = None,
     progress_callback: Callable[[int, int], None] | None = None,
     cached_files: Dict[str, Dict[str, Any]] | None = None,
+    cancel_token: CancellationToken | None = None,
 ) -> ParseResult:
     # Parse the given .zip archive into file metadata and capture parse issues.
     archive = Path(archive_path)
@@ -187,49 +317,19 @@ def parse_zip(
     if not zipfile.is_zipfile(archive):
         raise CorruptArchiveError("Zip is corrupted or unsafe.", "CORRUPT_OR_UNZIP_ERROR")
 
-    files: list[FileMetadata] = []
-    issues: list[ParseIssue] = []
-    total_bytes = 0
-    skipped_files = 0
-    filtered_out = 0
-    media_with_metadata = 0
-    media_metadata_errors = 0
-    media_read_errors = 0
-    media_too_large = 0
-
-    allowed_extensions = (
-        {ext.lower() for ext in preferences.allowed_extensions}
-        if preferences and preferences.allowed_extensions is not None
-        else None
-    )
-    excluded_dirs = (
-        {name for name in preferences.excluded_dirs}
-        if preferences and preferences.excluded_dirs is not None
-        else set(_EXCLUDED_DIRS)
+    collector = _ParseCollector(
+        relevant_only=relevant_only,
+        preferences=preferences,
+        cached_files=cached_files,
+        cancel_token=cancel_token,
     )
-    max_file_size = (
-        preferences.max_file_size_bytes
-        if preferences and preferences.max_file_size_bytes is not None
-        else None
-    )
-
-    # When explicitly asking for relevant files, rely on the built-in relevance
-    # heuristics rather than user-configured extension filters.
-    if relevant_only:
-        allowed_extensions = None
-
-    cached_files = cached_files or {}
 
     try:
         with zipfile.ZipFile(archive) as zf:
             entries = zf.infolist()
             total_entries = sum(0 if entry.is_dir() else 1 for entry in entries)
             processed_entries = 0
-            if progress_callback:
-                try:
-                    progress_callback(0, total_entries)
-                except Exception:
-                    pass
+            _report_progress(progress_callback, 0, total_entries)
             for info in entries:
                 normalized = _normalize_entry(info.filename)
                 if normalized is None:
@@ -238,65 +338,207 @@ def parse_zip(
                     continue
                 processed_entries += 1
                 try:
-                    metadata = _build_metadata(zf, info, normalized)
-                    cached_entry = cached_files.get(normalized)
-                    if cached_entry and _cached_entry_matches(metadata, cached_entry):
-                        _apply_cached_metadata(metadata, cached_entry.get("metadata"))
-                        files.append(metadata)
-                        total_bytes += metadata.size_bytes
-                        skipped_files += 1
-                        logger.debug(f"Cache hit: {normalized}")
-                        continue
-                    if _should_skip(metadata, excluded_dirs, allowed_extensions, max_file_size):
-                        filtered_out += 1
-                        continue
-                    if relevant_only and not _is_relevant(metadata):
-                        filtered_out += 1
-                        continue
-                    if is_media_candidate(metadata.path):
-                        extracted, error_code = _attach_media_metadata(
-                            archive_zip=zf,
-                            info=info,
-                            metadata=metadata,
-                            issues=issues,
-                        )
-                        if extracted:
-                            media_with_metadata += 1
-                        if error_code == "MEDIA_METADATA_ERROR":
-                            media_metadata_errors += 1
-                        elif error_code == "MEDIA_READ_ERROR":
-                            media_read_errors += 1
-                        elif error_code == "MEDIA_TOO_LARGE":
-                            media_too_large += 1
-                    files.append(metadata)
-                    total_bytes += metadata.size_bytes
+                    collector.add(
+                        _build_metadata(info, normalized),
+                        hash_content=lambda info=info: _hash_zip_member(zf, info),
+                        read_payload=lambda info=info: zf.read(info),
+                    )
                 finally:
-                    if progress_callback:
-                        try:
-                            progress_callback(processed_entries, total_entries)
-                        except Exception:
-                            pass
+                    _report_progress(progress_callback, processed_entries, total_entries)
     except zipfile.BadZipFile as exc:
         raise CorruptArchiveError("Zip is corrupted or unsafe.", "CORRUPT_OR_UNZIP_ERROR") from exc
 
-    summary = {
-        "files_processed": len(files),
-        "bytes_processed": total_bytes,
-        "issues_count": len(issues),
-    }
-    if skipped_files:
-        summary["files_skipped"] = skipped_files
-    if media_with_metadata:
-        summary["media_files_processed"] = media_with_metadata
-    if media_metadata_errors:
-        summary["media_metadata_errors"] = media_metadata_errors
-    if media_read_errors:
-        summary["media_read_errors"] = media_read_errors
-    if media_too_large:
-        summary["media_files_too_large"] = media_too_large
-    if relevant_only:
-        summary["filtered_out"] = filtered_out
-    return ParseResult(files=files, issues=issues, summary=summary)
+    return collector.result()
+
+
+def parse_directory(
+    root: Path,
+    *,
+    relevant_only: bool = False,
+    preferences: ScanPreferences | None = None,
+    progress_callback: Callable[[int, int], None] | None = None,
+    cached_files: Dict[str, Dict[str, Any]] | None = None,
+    prune_dirs: Iterable[str] | None = None,
+    skip_files: Iterable[str] = (),
+    inventory: FileInventory | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> ParseResult:
+    """Parse a local directory in place, without building an archive first.
+
+    Produces the same ParseResult parse_zip would for an archive of the
+    directory: paths are POSIX-style and prefixed with the directory name,
+    and files are hashed straight from disk.
+
+    Args:
+        root: Directory to scan
+        prune_dirs: Directory names never descended into (defaults to the
+            parser's excluded directories)
+        skip_files: File names ignored wherever they appear
+        inventory: Pre-built inventory of ``root``; walked here when omitted
+        cancel_token: Checked before each file; raises ScanCancelled once triggered
+    """
+    base = Path(root)
+    if not base.is_dir():
+        raise UnsupportedArchiveError(f"Directory not found: {base}", "FILE_MISSING")
+
+    if inventory is None or inventory.relative(base) != "":
+        inventory = FileInventory.build(
+            base,
+            prune_dirs=prune_dirs if prune_dirs is not None else _EXCLUDED_DIRS,
+            follow_symlinks=bool(preferences and preferences.follow_symlinks),
+        )
+    skipped = set(skip_files)
+    entries = [entry for entry in inventory.entries if entry.name not in skipped]
+    root_name = inventory.root.name
+
+    collector = _ParseCollector(
+        relevant_only=relevant_only,
+        preferences=preferences,
+        cached_files=cached_files,
+        cancel_token=cancel_token,
+    )
+    total_entries = len(entries)
+    _report_progress(progress_callback, 0, total_entries)
+    for index, entry in enumerate(entries, start=1):
+        try:
+            rel_path = f"{root_name}/{entry.rel_path}"
+            timestamp = datetime.fromtimestamp(entry.mtime, tz=timezone.utc)
+            mime_type, _ = mimetypes.guess_type(rel_path)
+            metadata = FileMetadata(
+                path=rel_path,
+                size_bytes=entry.size_bytes,
+                mime_type=mime_type or "application/octet-stream",
+                created_at=timestamp,
+                modified_at=timestamp,
+            )
+            collector.add(
+                metadata,
+                hash_content=lambda entry=entry: inventory.file_hash(entry),
+                read_payload=lambda entry=entry: inventory.path_of(entry).read_bytes(),
+            )
+        finally:
+            _report_progress(progress_callback, index, total_entries)
+
+    return collector.result()
+
+
+def attach_content_signatures(
+    files: Iterable[FileMetadata],
+    source: Path,
+    *,
+    cancel_token: CancellationToken | None = None,
+) -> int:
+    """MinHash the source files that have no signature yet (see scanner.minhash).
+
+    Signatures are only needed for near-duplicate detection, so they are
+    computed here rather than while parsing. Files too small to compare get
+    ``NO_SIGNATURE`` so a re-scan that reuses the cached entry skips them.
+
+    Args:
+        files: Parsed files, updated in place
+        source: The parsed .zip archive, or a directory holding the files
+            (the scanned directory itself or an extraction of the archive)
+        cancel_token: Checked before each file; raises ScanCancelled once triggered
+
+    Returns:
+        Number of files read and signed
+    """
+    pending = [
+        meta for meta in files
+        if meta.content_signature is None and is_source_candidate(meta.path, meta.size_bytes)
+    ]
+    if not pending:
+        return 0
+
+    source = Path(source)
+    if source.is_file():
+        with zipfile.ZipFile(source) as zf:
+            members = {
+                _normalize_entry(info.filename): info for info in zf.infolist() if not info.is_dir()
+            }
+            return _sign_files(
+                pending,
+                lambda meta: zf.read(members[meta.path]) if meta.path in members else None,
+                cancel_token,
+            )
+    return _sign_files(pending, lambda meta: _read_from_directory(source, meta.path), cancel_token)
+
+
+def hash_files(
+    files: Iterable[FileMetadata],
+    source: Path,
+    algorithm: str,
+) -> Dict[str, str]:
+    """Hash parsed files with ``algorithm``, e.g. to compare against hashes stored by an older scan.
+
+    Args:
+        files: Parsed files to hash (left unchanged)
+        source: The parsed .zip archive, or a directory holding the files
+        algorithm: A name from ``scanner.content_hash.available_algorithms()``
+
+    Returns:
+        path -> tagged hash for every file that could be read
+    """
+    hashes: Dict[str, str] = {}
+    source = Path(source)
+    if source.is_file():
+        with zipfile.ZipFile(source) as zf:
+            members = {
+                _normalize_entry(info.filename): info for info in zf.infolist() if not info.is_dir()
+            }
+            for meta in files:
+                info = members.get(meta.path)
+                if info is None or info.file_size > _MAX_HASH_BYTES:
+                    continue
+                with zf.open(info) as file_obj:
+                    hashes[meta.path] = hash_stream(file_obj, algorithm)
+        return hashes
+    for meta in files:
+        payload = _read_from_directory(source, meta.path)
+        if payload is not None:
+            hashes[meta.path] = hash_bytes(payload, algorithm)
+    return hashes
+
+
+def _sign_files(
+    files: list[FileMetadata],
+    read_payload: Callable[[FileMetadata], bytes | None],
+    cancel_token: CancellationToken | None,
+) -> int:
+    signed = 0
+    for meta in files:
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        try:
+            payload = read_payload(meta)
+        except Exception as exc:  # pragma: no cover - dependent on zipfile/filesystem internals
+            logger.debug("Content signature failed for %s: %s", meta.path, exc)
+            continue
+        if payload is None:
+            continue
+        meta.content_signature = source_signature(payload) or NO_SIGNATURE
+        signed += 1
+    return signed
+
+
+def _read_from_directory(root: Path, rel_path: str) -> bytes | None:
+    # Directory scans prefix paths with the directory name; extracted archives do not.
+    parts = PurePosixPath(rel_path).parts
+    if len(parts) > 1 and parts[0] == root.name and (root.parent / rel_path).is_file():
+        return (root.parent / rel_path).read_bytes()
+    candidate = root / rel_path
+    return candidate.read_bytes() if candidate.is_file() else None
+
+
+def _hash_zip_member(archive_zip: zipfile.ZipFile, info: zipfile.ZipInfo) -> str | None:
+    # Calculate file hash for duplicate detection using streaming (skip large files)
+    if info.file_size > _MAX_HASH_BYTES:
+        return None
+    try:
+        with archive_zip.open(info) as file_obj:
+            return _calculate_file_hash(file_obj)
+    except Exception:
+        return None  # Hash calculation is optional, continue without it
 
 
 def _normalize_entry(filename: str) -> str | None:
@@ -310,36 +552,22 @@ def _normalize_entry(filename: str) -> str | None:
     return cleaned
 
 
-def _build_metadata(
-    archive_zip: zipfile.ZipFile, info: zipfile.ZipInfo, path: str
-) -> FileMetadata:
-    # Translate ZipInfo into the FileMetadata domain model.
+def _build_metadata(info: zipfile.ZipInfo, path: str) -> FileMetadata:
+    # Translate ZipInfo into the FileMetadata domain model; the hash is filled in later.
     timestamp = _zip_datetime(info)
     mime_type, _ = mimetypes.guess_type(path)
-    
-    # Calculate file hash for duplicate detection using streaming (skip large files)
-    file_hash = None
-    if info.file_size <= _MAX_HASH_BYTES:
-        try:
-            with archive_zip.open(info) as file_obj:
-                file_hash = _calculate_file_hash(file_obj)
-        except Exception:
-            pass  # Hash calculation is optional, continue without it
-    
     return FileMetadata(
         path=path,
         size_bytes=info.file_size,
         mime_type=mime_type or "application/octet-stream",
         created_at=timestamp,
         modified_at=timestamp,
-        file_hash=file_hash,
     )
 
 
 def _attach_media_metadata(
     *,
-    archive_zip: zipfile.ZipFile,
-    info: zipfile.ZipInfo,
+    read_payload: Callable[[], bytes],
     metadata: FileMetadata,
     issues: list[ParseIssue],
 ) -> tuple[bool, str | None]:
@@ -348,23 +576,22 @@ def _attach_media_metadata(
 
     Returns a tuple tracking whether metadata was extracted and an optional error code for summary metrics.
     """
-    if info.file_size > _MAX_MEDIA_BYTES:
+    if metadata.size_bytes > _MAX_MEDIA_BYTES:
         issues.append(
             ParseIssue(
                 path=metadata.path,
                 code="MEDIA_TOO_LARGE",
                 message=(
                     f"Skipped media metadata extraction; file size "
-                    f"{info.file_size} bytes exceeds {_MAX_MEDIA_BYTES} byte limit."
+                    f"{metadata.size_bytes} bytes exceeds {_MAX_MEDIA_BYTES} byte limit."
                 ),
             )
         )
         return False, "MEDIA_TOO_LARGE"
 
     try:
-        with archive_zip.open(info) as file_obj:
-            payload = file_obj.read()
-    except Exception as exc:  # pragma: no cover - dependent on zipfile internals
+        payload = read_payload()
+    except Exception as exc:  # pragma: no cover - dependent on zipfile/filesystem internals
         issues.append(
             ParseIssue(
                 path=metadata.path,
@@ -443,6 +670,34 @@ def _zip_datetime(info: zipfile.ZipInfo) -> datetime:
         return datetime.now(timezone.utc)
 
 
+def _needs_rehash(file_hash: str) -> bool:
+    # Cached hashes from another algorithm (legacy MD5/SHA-256) cannot be compared with
+    # fresh ones, so they are replaced; opaque values are kept as they are.
+    algorithm, _ = split_hash(file_hash)
+    return algorithm is not None and algorithm != default_algorithm()
+
+
+def _backfill_perceptual_hash(metadata: FileMetadata, read_payload: Callable[[], bytes]) -> None:
+    """Add the dHash to cached image metadata recorded before perceptual hashing existed."""
+    media_info = metadata.media_info
+    if (
+        not isinstance(media_info, dict)
+        or "width" not in media_info
+        or media_info.get("perceptual_hash")
+        or not is_image_candidate(metadata.path)
+        or metadata.size_bytes > _MAX_MEDIA_BYTES
+    ):
+        return
+    try:
+        perceptual_hash = image_perceptual_hash(read_payload())
+    except Exception as exc:  # pragma: no cover - dependent on zipfile/filesystem internals
+        logger.debug(f"Could not read {metadata.path} for its perceptual hash: {exc}")
+        return
+    if perceptual_hash:
+        # Copy so the caller's cached payload is left as loaded.
+        metadata.media_info = {**media_info, "perceptual_hash": perceptual_hash}
+
+
 def _cached_entry_matches(metadata: FileMetadata, cached_entry: Dict[str, Any]) -> bool:
     cached_ts = cached_entry.get("last_seen_modified_at")
     cached_dt = _parse_cached_timestamp(cached_ts)
@@ -479,3 +734,6 @@ def _apply_cached_metadata(metadata: FileMetadata, cached_payload: Any) -> None:
     file_hash = cached_payload.get("file_hash")
     if file_hash is not None:
         metadata.file_hash = file_hash
+    content_signature = cached_payload.get("content_signature")
+    if content_signature is not None:
+        metadata.content_signature = content_signature
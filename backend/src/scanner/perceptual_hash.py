@@ -0,0 +1,118 @@
+"""Perceptual image hashes and a multi-index table for near-duplicate lookup.
+
+Hashes are written as ``"dhash:<16 hex>"`` (64-bit difference hash), tagged
+like ``scanner.content_hash`` digests. Resized or recompressed copies of an
+image land within a few bits of each other, so near-duplicates are found by
+Hamming distance rather than equality.
+"""
+
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Any, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None  # type: ignore[assignment]
+
+HASH_SIZE = 8  # 8x8 gradient bits -> 64-bit hash
+DHASH_TAG = "dhash"
+# Bits out of 64 that may differ for two images to count as near-duplicates.
+DEFAULT_MAX_DISTANCE = 6
+
+T = TypeVar("T")
+
+
+def dhash(image: Any) -> Optional[str]:
+    """Difference hash of a PIL image: one bit per horizontal gradient on a 9x8 thumbnail."""
+    if Image is None:
+        return None
+    try:
+        resample = getattr(Image, "Resampling", Image).BILINEAR
+        # reducing_gap lets Pillow shrink large images cheaply before the final resample.
+        small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), resample, reducing_gap=2.0)
+        pixels = small.tobytes()
+    except Exception:  # pragma: no cover - PIL specific failures
+        return None
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{DHASH_TAG}:{value:016x}"
+
+
+def parse_hash(value: Optional[str]) -> Optional[int]:
+    """Integer bits of a tagged perceptual hash, or None if it is missing or malformed."""
+    if not value:
+        return None
+    tag, sep, hex_value = value.partition(":")
+    if not sep or tag != DHASH_TAG:
+        return None
+    try:
+        return int(hex_value, 16)
+    except ValueError:
+        return None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class MultiIndexHash(Generic[T]):
+    """Multi-index hash table for Hamming-radius lookups over 64-bit hashes.
+
+    Each hash is split into ``m`` chunks, each indexed in its own table. Two
+    hashes within ``max_distance`` bits must agree to within
+    ``max_distance // m`` bits on at least one chunk (pigeonhole), so a query
+    only probes chunk buckets near its own chunks and verifies the few
+    candidates found there, instead of comparing against every hash.
+    """
+
+    __slots__ = ("max_distance", "_spans", "_chunk_radius", "_tables", "_values", "_items")
+
+    def __init__(self, max_distance: int, bits: int = HASH_SIZE * HASH_SIZE) -> None:
+        self.max_distance = max_distance
+        # ~16-bit chunks with a chunk radius of 0-1 keep both probes and buckets small.
+        chunks = max(1, min(bits // 8, max_distance // 2 + 1))
+        self._chunk_radius = max_distance // chunks
+        bounds = [round(i * bits / chunks) for i in range(chunks + 1)]
+        self._spans = [(low, high - low) for low, high in zip(bounds, bounds[1:])]
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in self._spans]
+        self._values: List[int] = []
+        self._items: List[T] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, hash_value: int, item: T) -> None:
+        index = len(self._items)
+        self._values.append(hash_value)
+        self._items.append(item)
+        for table, (shift, width) in zip(self._tables, self._spans):
+            table.setdefault((hash_value >> shift) & ((1 << width) - 1), []).append(index)
+
+    def search(self, hash_value: int) -> Iterator[Tuple[int, T]]:
+        """Yield ``(distance, item)`` for every stored item within ``max_distance``."""
+        seen: set = set()
+        for table, (shift, width) in zip(self._tables, self._spans):
+            chunk = (hash_value >> shift) & ((1 << width) - 1)
+            for probe in _neighbours(chunk, width, self._chunk_radius):
+                for index in table.get(probe, ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    distance = hamming_distance(hash_value, self._values[index])
+                    if distance <= self.max_distance:
+                        yield distance, self._items[index]
+
+
+def _neighbours(value: int, width: int, radius: int) -> Iterator[int]:
+    """``value`` and every ``width``-bit value within ``radius`` bit flips of it."""
+    for flips in range(radius + 1):
+        for positions in combinations(range(width), flips):
+            mask = 0
+            for position in positions:
+                mask |= 1 << position
+            yield value ^ mask
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import io
 import logging
+import os
 import re
 import tempfile
+import threading
 from collections import Counter
 from pathlib import Path
-from typing import List, Sequence
+from typing import Iterator, List, Sequence
 
 from .media_types import ContentLabel
 
@@ -17,41 +19,100 @@ try:  # Pillow is mandatory for image decoding
 except ImportError:  # pragma: no cover - optional dependency
     Image = None  # type: ignore[assignment]
 
-try:  # Core torch is needed for any vision/audio insights.
-    import torch
-    import torch.hub
-except Exception:  # pragma: no cover - torch missing entirely
-    torch = None  # type: ignore[assignment]
-
-try:  # TorchVision provides image/video classifiers.
-    from torchvision import transforms
-    from torchvision.io import read_video
-    from torchvision.models import resnet50, ResNet50_Weights
-except Exception:  # pragma: no cover - torchvision missing or incompatible
-    transforms = None  # type: ignore[assignment]
-    read_video = None  # type: ignore[assignment]
-    resnet50 = None  # type: ignore[assignment]
-    ResNet50_Weights = None  # type: ignore[assignment]
-
-try:  # Optional speech model for audio insights.
-    import torchaudio
-except Exception:  # pragma: no cover - torchaudio missing or incompatible
-    torchaudio = None  # type: ignore[assignment]
-
-try:
-    from torchaudio.pipelines import WAV2VEC2_ASR_BASE_960H
-except Exception:  # pragma: no cover - bundle unavailable
-    WAV2VEC2_ASR_BASE_960H = None  # type: ignore[assignment]
-
-try:  # Optional DSP helpers for tempo/genre heuristics.
-    import librosa
-except Exception:  # pragma: no cover - librosa missing
-    librosa = None  # type: ignore[assignment]
+# torch, torchvision, torchaudio and librosa take seconds and hundreds of MB
+# to import, so they are loaded on first use by _load_vision_stack /
+# _load_audio_stack rather than when the scanner is imported.
+torch = None  # type: ignore[assignment]
+transforms = None  # type: ignore[assignment]
+read_video = None  # type: ignore[assignment]
+resnet50 = None  # type: ignore[assignment]
+ResNet50_Weights = None  # type: ignore[assignment]
+torchaudio = None  # type: ignore[assignment]
+StreamReader = None  # type: ignore[assignment]
+WAV2VEC2_ASR_BASE_960H = None  # type: ignore[assignment]
+librosa = None  # type: ignore[assignment]
+
+_loaded_stacks: set[str] = set()
+_stack_lock = threading.Lock()
+
+# Set by the shared inference service so its own calls never go back over IPC.
+_in_inference_service = False
+
+
+def _load_torch() -> None:
+    global torch
+    with _stack_lock:
+        if "torch" in _loaded_stacks:
+            return
+        try:  # Core torch is needed for any vision/audio insights.
+            import torch
+            import torch.hub
+        except Exception:  # pragma: no cover - torch missing entirely
+            torch = None
+        _loaded_stacks.add("torch")
+
+
+def _load_vision_stack() -> None:
+    global transforms, read_video, resnet50, ResNet50_Weights
+    _load_torch()
+    with _stack_lock:
+        if "vision" in _loaded_stacks:
+            return
+        try:  # TorchVision provides image/video classifiers.
+            from torchvision import transforms as _transforms
+            from torchvision.io import read_video as _read_video
+            from torchvision.models import resnet50 as _resnet50, ResNet50_Weights as _ResNet50_Weights
+
+            transforms, read_video = _transforms, _read_video
+            resnet50, ResNet50_Weights = _resnet50, _ResNet50_Weights
+        except Exception:  # pragma: no cover - torchvision missing or incompatible
+            pass
+        _loaded_stacks.add("vision")
+
+
+def _load_audio_stack() -> None:
+    global torchaudio, StreamReader, WAV2VEC2_ASR_BASE_960H, librosa
+    _load_torch()
+    with _stack_lock:
+        if "audio" in _loaded_stacks:
+            return
+        try:  # Optional speech model for audio insights.
+            import torchaudio as _torchaudio
+
+            torchaudio = _torchaudio
+        except Exception:  # pragma: no cover - torchaudio missing or incompatible
+            pass
+        try:  # FFmpeg-backed decoder that streams audio straight from bytes.
+            from torchaudio.io import StreamReader as _StreamReader
+
+            StreamReader = _StreamReader
+        except Exception:  # pragma: no cover - FFmpeg libraries unavailable
+            pass
+        try:
+            from torchaudio.pipelines import WAV2VEC2_ASR_BASE_960H as _bundle
+
+            WAV2VEC2_ASR_BASE_960H = _bundle
+        except Exception:  # pragma: no cover - bundle unavailable
+            pass
+        try:  # Optional DSP helpers for tempo/genre heuristics.
+            import librosa as _librosa
+
+            librosa = _librosa
+        except Exception:  # pragma: no cover - librosa missing
+            pass
+        _loaded_stacks.add("audio")
 
 
 DEFAULT_TOP_K = 3
 MAX_VIDEO_FRAME_SAMPLES = 8
 
+# Long audio is transcribed in overlapping windows so memory stays bounded by
+# the window size rather than the clip length.
+AUDIO_WINDOW_SEC = 20.0
+AUDIO_WINDOW_OVERLAP_SEC = 1.0
+# Content words after which the top transcript labels are considered settled.
+AUDIO_LABEL_WORD_BUDGET = 200
+
 _WORD_PATTERN = re.compile(r"[a-zA-Z']+")
 _STOP_WORDS = {
     "the",
@@ -83,6 +144,7 @@ _STOP_WORDS = {
 
 
 def _checkpoint_path(filename: str) -> Path | None:
+    _load_torch()
     if torch is None:
         return None
     try:
@@ -115,7 +177,20 @@ def video_content_labels(
     frame_samples: int = MAX_VIDEO_FRAME_SAMPLES,
 ) -> List[ContentLabel]:
     """Detect recurring concepts in a video by sampling frames and classifying them."""
-    engine = _get_engine()
+    remote = _remote_engine()
+    if remote is not None:
+        return remote.video_labels(data, suffix, top_k=top_k, frame_samples=frame_samples)
+    return _video_labels_with(_get_engine(), data, suffix, top_k=top_k, frame_samples=frame_samples)
+
+
+def _video_labels_with(
+    engine: "_TorchVisionEngine | None",
+    data: bytes,
+    suffix: str,
+    *,
+    top_k: int,
+    frame_samples: int,
+) -> List[ContentLabel]:
     if engine is None or read_video is None or torch is None or Image is None:
         return []
 
@@ -143,17 +218,17 @@ def video_content_labels(
 
     # Evenly distributed frame indices to get a quick overview of the clip.
     indices = _linspace_indices(num_frames, samples)
-    aggregated: dict[str, float] = {}
-
+    images = []
     for idx in indices:
         frame = frames[int(idx)]
         try:
-            image = Image.fromarray(frame.to("cpu").byte().numpy())
+            images.append(Image.fromarray(frame.to("cpu").byte().numpy()))
         except Exception:  # pragma: no cover - numpy/PIL edge cases
             continue
-        labels = engine.classify(image, top_k=top_k)
-        if not labels:
-            continue
+
+    # All sampled frames go through the classifier as one batch.
+    aggregated: dict[str, float] = {}
+    for labels in engine.classify_batch(images, top_k=top_k):
         for entry in labels:
             aggregated[entry["label"]] = aggregated.get(entry["label"], 0.0) + entry["confidence"]
 
@@ -175,7 +250,19 @@ def audio_content_insights(
     top_k: int = DEFAULT_TOP_K,
 ) -> dict[str, object]:
     """Transcribe audio locally and surface tempo/genre heuristics."""
-    engine = _get_audio_engine()
+    remote = _remote_engine()
+    if remote is not None:
+        return remote.audio_insights(data, suffix, top_k=top_k)
+    return _audio_insights_with(_get_audio_engine(), data, suffix, top_k=top_k)
+
+
+def _audio_insights_with(
+    engine: "_AudioInsightEngine | None",
+    data: bytes,
+    suffix: str,
+    *,
+    top_k: int,
+) -> dict[str, object]:
     if engine is None:
         return {}
     insights = engine.analyze(data, suffix=suffix or ".wav", top_k=top_k)
@@ -194,6 +281,9 @@ def summarize_labels(labels: Sequence[ContentLabel], *, prefix: str = "Likely co
 
 
 def _classify_image(image: "Image.Image", *, top_k: int) -> List[ContentLabel]:
+    remote = _remote_engine()
+    if remote is not None:
+        return remote.classify_batch([image], top_k=top_k)[0]
     engine = _get_engine()
     if engine is None:
         return []
@@ -207,10 +297,27 @@ def _linspace_indices(size: int, samples: int) -> List[int]:
     return [min(int(round(i * step)), size - 1) for i in range(samples)]
 
 
+def _remote_engine():
+    """Client for the shared inference service when MEDIA_INFERENCE_ADDRESS is set.
+
+    Scan workers then never load the models themselves; the service process
+    owns one copy and batches requests from every worker.
+    """
+    if _in_inference_service:
+        return None
+    address = (os.getenv("MEDIA_INFERENCE_ADDRESS") or "").strip()
+    if not address:
+        return None
+    from .inference_service import get_inference_client
+
+    return get_inference_client(address)
+
+
 def _get_engine() -> "_TorchVisionEngine | None":
     # Lazy import keeps heavy torch weights out of memory when unavailable.
     if getattr(_get_engine, "_initialized", False):
         return getattr(_get_engine, "_cached", None)
+    _load_vision_stack()
     if torch is None or resnet50 is None:
         logger.debug("PyTorch/Torchvision not available; content insights disabled.")
         _get_engine._cached = None  # type: ignore[attr-defined]
@@ -229,6 +336,7 @@ def _get_engine() -> "_TorchVisionEngine | None":
 def _get_audio_engine() -> "_AudioInsightEngine | None":
     if getattr(_get_audio_engine, "_initialized", False):
         return getattr(_get_audio_engine, "_cached", None)
+    _load_audio_stack()
     if torch is None or torchaudio is None or WAV2VEC2_ASR_BASE_960H is None:
         logger.debug("Torchaudio not available; audio insights disabled.")
         _get_audio_engine._cached = None  # type: ignore[attr-defined]
@@ -303,9 +411,13 @@ class _TorchVisionEngine:
         self.model.eval()
 
     def classify(self, image: "Image.Image", *, top_k: int) -> List[ContentLabel]:
-        if torch is None:
-            return []
-        tensor = self.preprocess(image).unsqueeze(0)
+        return self.classify_batch([image], top_k=top_k)[0]
+
+    def classify_batch(self, images: Sequence["Image.Image"], *, top_k: int) -> List[List[ContentLabel]]:
+        """Classify several images in one forward pass."""
+        if torch is None or not images:
+            return [[] for _ in images]
+        tensor = torch.stack([self.preprocess(image) for image in images])
         inference_ctx = getattr(torch, "inference_mode", torch.no_grad)
         with inference_ctx():  # type: ignore[misc]
             logits = self.model(tensor)
@@ -313,12 +425,15 @@ class _TorchVisionEngine:
             limit = max(1, min(int(top_k), probabilities.shape[1]))
             scores, indices = torch.topk(probabilities, limit, dim=1)
 
-        labels: List[ContentLabel] = []
-        for score, index in zip(scores[0], indices[0]):
-            idx = int(index.cpu().item())
-            label = self.labels[idx] if idx < len(self.labels) else f"class_{idx}"
-            labels.append({"label": label, "confidence": float(score.cpu().item())})
-        return labels
+        results: List[List[ContentLabel]] = []
+        for row_scores, row_indices in zip(scores, indices):
+            labels: List[ContentLabel] = []
+            for score, index in zip(row_scores, row_indices):
+                idx = int(index.cpu().item())
+                label = self.labels[idx] if idx < len(self.labels) else f"class_{idx}"
+                labels.append({"label": label, "confidence": float(score.cpu().item())})
+            results.append(labels)
+        return results
 
 
 class _AudioInsightEngine:
@@ -342,21 +457,34 @@ class _AudioInsightEngine:
         self.model.eval()
 
     def analyze(self, data: bytes, *, suffix: str, top_k: int) -> dict[str, object]:
-        waveform, sample_rate = self._load_waveform(data, suffix)
-        if waveform is None:
-            return {}
-        if waveform.dim() == 1:
-            waveform = waveform.unsqueeze(0)
-        if waveform.size(0) > 1:
-            waveform = waveform.mean(dim=0, keepdim=True)
-        if sample_rate != self.sample_rate:
-            waveform = torchaudio.functional.resample(waveform, sample_rate, self.sample_rate)
+        window = max(1, int(AUDIO_WINDOW_SEC * self.sample_rate))
+        overlap = min(int(AUDIO_WINDOW_OVERLAP_SEC * self.sample_rate), window // 2)
+        features = _StreamingAudioFeatures(self.sample_rate)
+        indices: list[int] = []
+        content_words = 0
+        decoded = False
         inference_ctx = getattr(torch, "inference_mode", torch.no_grad)
         with inference_ctx():  # type: ignore[misc]
-            emissions, _ = self.model(waveform)
-        transcript = self._greedy_decode(emissions[0])
+            chunks = self._stream_chunks(data, suffix, window - overlap)
+            for samples, first, last in self._windows(chunks, window, overlap):
+                decoded = True
+                emission = self.model(samples.unsqueeze(0))[0][0]
+                # Each side of an overlap is decoded by the window it is closer to.
+                frames = emission.size(0)
+                trim = int(round(frames * (overlap / 2) / max(samples.numel(), 1)))
+                window_indices = torch.argmax(
+                    emission[(0 if first else trim):(frames if last else frames - trim)], dim=-1
+                ).tolist()
+                indices.extend(window_indices)
+                features.update(samples if first else samples[overlap:])
+                content_words += self._count_content_words(self._decode_indices(window_indices))
+                if content_words >= AUDIO_LABEL_WORD_BUDGET:
+                    break
+        if not decoded:
+            return {}
+        transcript = self._decode_indices(indices)
         labels = self._labels_from_transcript(transcript, top_k)
-        tempo_bpm, centroid = self._tempo_and_centroid(waveform)
+        tempo_bpm, centroid = features.tempo_and_centroid()
         genre_tags = self._infer_genre_tags(tempo_bpm, centroid)
         return {
             "labels": labels,
@@ -365,6 +493,60 @@ class _AudioInsightEngine:
             "transcript": transcript,
         }
 
+    def _stream_chunks(self, data: bytes, suffix: str, chunk_size: int) -> Iterator["torch.Tensor"]:
+        """Yield mono float chunks at the model sample rate, decoded straight from ``data``."""
+        yielded = False
+        if StreamReader is not None:
+            try:
+                reader = StreamReader(io.BytesIO(data))
+                reader.add_basic_audio_stream(frames_per_chunk=chunk_size, sample_rate=self.sample_rate)
+                for (chunk,) in reader.stream():
+                    if chunk is None or chunk.numel() == 0:
+                        continue
+                    yielded = True
+                    yield chunk.mean(dim=1)
+                return
+            except Exception as exc:  # pragma: no cover - FFmpeg codec errors
+                if yielded:
+                    logger.debug("Audio stream ended early for content insights: %s", exc)
+                    return
+                logger.debug("Streaming audio decode failed, loading whole clip: %s", exc)
+
+        waveform, sample_rate = self._load_waveform(data, suffix)
+        if waveform is None:
+            return
+        if waveform.dim() == 1:
+            waveform = waveform.unsqueeze(0)
+        waveform = waveform.mean(dim=0)
+        if sample_rate != self.sample_rate:
+            waveform = torchaudio.functional.resample(waveform, sample_rate, self.sample_rate)
+        for offset in range(0, waveform.numel(), chunk_size):
+            yield waveform[offset:offset + chunk_size]
+
+    @staticmethod
+    def _windows(
+        chunks: Iterator["torch.Tensor"], window: int, overlap: int
+    ) -> Iterator[tuple["torch.Tensor", bool, bool]]:
+        """Regroup ``chunks`` into ``(samples, first, last)`` windows overlapping by ``overlap`` samples."""
+        pending: "torch.Tensor | None" = None
+        first = True
+        buffer: "torch.Tensor | None" = None
+        for chunk in chunks:
+            buffer = chunk if buffer is None else torch.cat([buffer, chunk])
+            while buffer.numel() >= window:
+                if pending is not None:
+                    yield pending, first, False
+                    first = False
+                pending = buffer[:window].clone()
+                buffer = buffer[window - overlap:]
+        if buffer is not None and (pending is None or buffer.numel() > overlap):
+            if pending is not None:
+                yield pending, first, False
+                first = False
+            pending = buffer
+        if pending is not None:
+            yield pending, first, True
+
     def _load_waveform(self, data: bytes, suffix: str) -> tuple["torch.Tensor", int] | tuple[None, None]:
         if torchaudio is None:
             return (None, None)
@@ -383,8 +565,8 @@ class _AudioInsightEngine:
             if temp_file and temp_file.exists():
                 temp_file.unlink(missing_ok=True)
 
-    def _greedy_decode(self, emission: "torch.Tensor") -> str:
-        indices = torch.argmax(emission, dim=-1).tolist()
+    def _decode_indices(self, indices: Sequence[int]) -> str:
+        """Greedy CTC decode of per-frame argmax indices."""
         transcript: list[str] = []
         prev_symbol: str | None = None
         for idx in indices:
@@ -404,6 +586,10 @@ class _AudioInsightEngine:
             prev_symbol = symbol
         return "".join(transcript).strip()
 
+    @staticmethod
+    def _count_content_words(text: str) -> int:
+        return sum(1 for word in _WORD_PATTERN.findall(text) if word not in _STOP_WORDS)
+
     def _labels_from_transcript(self, transcript: str, top_k: int) -> List[ContentLabel]:
         if not transcript:
             return []
@@ -422,25 +608,6 @@ class _AudioInsightEngine:
             for word, count in top
         ]
 
-    def _tempo_and_centroid(self, waveform: "torch.Tensor") -> tuple[float | None, float | None]:
-        if librosa is None:
-            return (None, None)
-        try:
-            samples = waveform.squeeze(0).cpu().numpy()
-        except Exception:
-            return (None, None)
-        if samples.size == 0:
-            return (None, None)
-        try:
-            tempo, _ = librosa.beat.beat_track(y=samples, sr=self.sample_rate)
-            centroid = librosa.feature.spectral_centroid(y=samples, sr=self.sample_rate)
-            centroid_mean = float(centroid.mean()) if centroid.size else None
-            tempo_value = float(tempo) if tempo else None
-            return (tempo_value, centroid_mean)
-        except Exception as exc:  # pragma: no cover - librosa backend
-            logger.debug("Tempo/centroid extraction failed: %s", exc)
-            return (None, None)
-
     def _infer_genre_tags(
         self, tempo_bpm: float | None, centroid: float | None, limit: int = 3
     ) -> List[str]:
@@ -470,3 +637,42 @@ class _AudioInsightEngine:
             if len(ordered) >= limit:
                 break
         return ordered
+
+
+class _StreamingAudioFeatures:
+    """Tempo and spectral centroid accumulated window by window.
+
+    Only the onset envelope (one value per hop) and a running centroid sum
+    are kept, so the full waveform never needs to be in memory.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+        self._onsets: list["torch.Tensor"] = []
+        self._centroid_sum = 0.0
+        self._centroid_frames = 0
+
+    def update(self, samples: "torch.Tensor") -> None:
+        if librosa is None or samples.numel() == 0:
+            return
+        try:
+            y = samples.cpu().numpy()
+            self._onsets.append(torch.from_numpy(librosa.onset.onset_strength(y=y, sr=self.sample_rate)))
+            centroid = librosa.feature.spectral_centroid(y=y, sr=self.sample_rate)
+            self._centroid_sum += float(centroid.sum())
+            self._centroid_frames += int(centroid.size)
+        except Exception as exc:  # pragma: no cover - librosa backend
+            logger.debug("Tempo/centroid extraction failed: %s", exc)
+
+    def tempo_and_centroid(self) -> tuple[float | None, float | None]:
+        centroid_mean = self._centroid_sum / self._centroid_frames if self._centroid_frames else None
+        if not self._onsets:
+            return (None, centroid_mean)
+        try:
+            envelope = torch.cat(self._onsets).numpy()
+            tempo, _ = librosa.beat.beat_track(onset_envelope=envelope, sr=self.sample_rate)
+            tempo_value = float(tempo) if tempo else None
+        except Exception as exc:  # pragma: no cover - librosa backend
+            logger.debug("Tempo extraction failed: %s", exc)
+            tempo_value = None
+        return (tempo_value, centroid_mean)
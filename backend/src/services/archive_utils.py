@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import copy
 import json
 import os
+import struct
 import zipfile
+import zlib
 from pathlib import Path
-from typing import Any, Dict, Iterator, Set, Tuple
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
 
+from scanner.inventory import FileInventory
 from scanner.models import ScanPreferences
 
 _ZIP_EXCLUDE_DIRS = {
@@ -34,8 +38,33 @@ def _derive_excluded_dirs(preferences: ScanPreferences | None) -> Set[str]:
     return set(_ZIP_EXCLUDE_DIRS)
 
 
-def ensure_zip(target: Path, *, preferences: ScanPreferences | None = None) -> Path:
-    """Return a zip path, archiving directories into .tmp_archives/ when needed."""
+# Formats that are already compressed; deflating them again costs CPU for no gain.
+_STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".heic", ".avif",
+    ".mp3", ".m4a", ".aac", ".ogg", ".opus", ".flac",
+    ".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst", ".jar", ".whl",
+    ".pdf", ".docx", ".xlsx", ".pptx", ".woff", ".woff2",
+}
+
+_MANIFEST_VERSION = 2
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def ensure_zip(
+    target: Path,
+    *,
+    preferences: ScanPreferences | None = None,
+    inventory: FileInventory | None = None,
+) -> Path:
+    """Return a zip path, archiving directories into .tmp_archives/ when needed.
+
+    The cached archive keeps a per-member manifest (size, mtime, CRC-32).
+    When files change, only the changed members are read and compressed
+    again; unchanged members are copied across as raw compressed bytes.
+    A FileInventory of ``target`` (built with the same or narrower pruning)
+    is used instead of walking the directory again.
+    """
     resolved = target.expanduser().resolve()
     if resolved.suffix.lower() == ".zip" and resolved.is_file():
         return resolved
@@ -59,26 +88,65 @@ def ensure_zip(target: Path, *, preferences: ScanPreferences | None = None) -> P
         else False
     )
 
+    if inventory is not None and not _inventory_usable(inventory, resolved, exclude_dirs, follow_symlinks):
+        inventory = None
+
+    current = _list_members(resolved, exclude_dirs, follow_symlinks, inventory)
+    settings = _archive_settings(resolved, exclude_dirs, follow_symlinks)
     cached_metadata = _load_cached_metadata(metadata_path)
-    if archive_path.exists() and cached_metadata:
-        snapshot = _compute_snapshot(resolved, exclude_dirs, follow_symlinks)
-        if _snapshot_matches(snapshot, cached_metadata):
+    previous: Dict[str, Dict[str, Any]] | None = None
+    if archive_path.exists() and cached_metadata and _settings_match(settings, cached_metadata):
+        members = cached_metadata.get("members")
+        if cached_metadata.get("version") == _MANIFEST_VERSION and isinstance(members, dict):
+            previous = members
+
+    if previous is not None:
+        if _manifest_unchanged(current, previous):
+            return archive_path
+        try:
+            manifest = _rewrite_archive(archive_path, current, previous)
+        except (OSError, zipfile.BadZipFile, struct.error, KeyError, ValueError):
+            # A damaged cache is rebuilt from scratch below.
+            manifest = None
+        if manifest is not None:
+            _write_cached_metadata(metadata_path, {**settings, "version": _MANIFEST_VERSION, "members": manifest})
             return archive_path
 
     if archive_path.exists():
         archive_path.unlink()
 
-    snapshot = _zip_directory(resolved, archive_path, exclude_dirs, follow_symlinks)
-    _write_cached_metadata(metadata_path, snapshot)
+    manifest = _rewrite_archive(archive_path, current, {})
+    _write_cached_metadata(metadata_path, {**settings, "version": _MANIFEST_VERSION, "members": manifest})
     return archive_path
 
 
+def _inventory_usable(
+    inventory: FileInventory,
+    root: Path,
+    exclude_dirs: Set[str],
+    follow_symlinks: bool,
+) -> bool:
+    # The inventory may prune less than we exclude (we filter the rest), never more.
+    return (
+        inventory.relative(root) == ""
+        and inventory.prune_dirs <= exclude_dirs
+        and inventory.follow_symlinks == follow_symlinks
+    )
+
+
 def _iter_project_files(
     root: Path,
     exclude_dirs: Set[str],
     follow_symlinks: bool,
+    inventory: Optional[FileInventory] = None,
 ) -> Iterator[Tuple[Path, Path]]:
     root_name = root.name
+    if inventory is not None:
+        for entry in inventory.files(exclude_dirs=exclude_dirs):
+            if entry.name in _ZIP_EXCLUDE_FILES:
+                continue
+            yield inventory.path_of(entry), Path(root_name) / entry.rel_path
+        return
     for current_root, dirs, files in os.walk(root, followlinks=follow_symlinks):
         dirs[:] = [d for d in dirs if d not in exclude_dirs]
         current_path = Path(current_root)
@@ -91,76 +159,174 @@ def _iter_project_files(
             yield full_path, archive_rel
 
 
-def _compute_snapshot(
+def _list_members(
     root: Path,
     exclude_dirs: Set[str],
     follow_symlinks: bool,
-) -> Dict[str, Any]:
-    total_files = 0
-    total_bytes = 0
-    latest_mtime = 0.0
-    for full_path, _ in _iter_project_files(root, exclude_dirs, follow_symlinks):
+    inventory: Optional[FileInventory] = None,
+) -> Dict[str, Tuple[Path, int, float]]:
+    """Map archive names to (path, size, mtime) for every file that belongs in the archive."""
+    members: Dict[str, Tuple[Path, int, float]] = {}
+    if inventory is not None:
+        # Sizes and mtimes were captured by the inventory walk; no need to stat again.
+        root_name = root.name
+        for entry in inventory.files(exclude_dirs=exclude_dirs):
+            if entry.name in _ZIP_EXCLUDE_FILES:
+                continue
+            arcname = (Path(root_name) / entry.rel_path).as_posix()
+            members[arcname] = (inventory.path_of(entry), entry.size_bytes, entry.mtime)
+        return members
+
+    for full_path, archive_rel in _iter_project_files(root, exclude_dirs, follow_symlinks):
         try:
             stat = full_path.stat()
         except OSError:
             continue
-        total_files += 1
-        total_bytes += stat.st_size
-        if stat.st_mtime > latest_mtime:
-            latest_mtime = stat.st_mtime
-    return _build_snapshot_dict(root, total_files, total_bytes, latest_mtime, exclude_dirs, follow_symlinks)
+        members[archive_rel.as_posix()] = (full_path, stat.st_size, stat.st_mtime)
+    return members
+
+
+def _manifest_unchanged(
+    current: Dict[str, Tuple[Path, int, float]],
+    previous: Dict[str, Dict[str, Any]],
+) -> bool:
+    if current.keys() != previous.keys():
+        return False
+    for arcname, (_, size, mtime) in current.items():
+        cached = previous[arcname]
+        if cached.get("size") != size or cached.get("mtime") != mtime:
+            return False
+    return True
 
 
-def _zip_directory(
-    root: Path,
+def _compress_type(arcname: str) -> int:
+    return zipfile.ZIP_STORED if Path(arcname).suffix.lower() in _STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+
+def _file_crc32(path: Path) -> int:
+    crc = 0
+    with path.open("rb") as fp:
+        for chunk in iter(lambda: fp.read(_COPY_CHUNK_BYTES), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _rewrite_archive(
     archive_path: Path,
-    exclude_dirs: Set[str],
-    follow_symlinks: bool,
-) -> Dict[str, Any]:
-    total_files = 0
-    total_bytes = 0
-    latest_mtime = 0.0
-
-    with zipfile.ZipFile(
-        archive_path,
-        mode="w",
-        compression=zipfile.ZIP_DEFLATED,
-        allowZip64=True,
-    ) as zf:
-        for full_path, archive_rel in _iter_project_files(root, exclude_dirs, follow_symlinks):
-            try:
-                stat = full_path.stat()
-            except OSError:
-                # Skip files that disappear during archive creation.
-                continue
-            # Persist the relative path inside the archive so parse_zip sees the project structure.
-            zf.write(full_path, archive_rel.as_posix())
-            total_files += 1
-            total_bytes += stat.st_size
-            if stat.st_mtime > latest_mtime:
-                latest_mtime = stat.st_mtime
+    current: Dict[str, Tuple[Path, int, float]],
+    previous: Dict[str, Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """Write the archive for ``current`` and return its manifest.
+
+    Members whose size and mtime match ``previous`` (or whose content still
+    has the recorded CRC-32 after a touch) are copied from the existing
+    archive without recompressing; everything else is compressed afresh.
+    The new archive replaces the old one atomically.
+    """
+    manifest: Dict[str, Dict[str, Any]] = {}
+    old_zip = zipfile.ZipFile(archive_path) if previous and archive_path.exists() else None
+    temp_path = archive_path.with_name(archive_path.name + ".tmp")
+    try:
+        with zipfile.ZipFile(temp_path, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+            for arcname, (full_path, size, mtime) in current.items():
+                cached = previous.get(arcname)
+                old_info = _zip_member(old_zip, arcname) if cached else None
+                if old_info is not None and old_info.file_size == size:
+                    reusable = cached.get("mtime") == mtime and cached.get("size") == size
+                    if not reusable:
+                        try:
+                            reusable = _file_crc32(full_path) == old_info.CRC
+                        except OSError:
+                            continue
+                    if reusable:
+                        try:
+                            _copy_member_raw(old_zip, zf, old_info)
+                        except AttributeError:
+                            # zipfile internals differ on this Python; compress afresh below.
+                            pass
+                        else:
+                            manifest[arcname] = {"size": size, "mtime": mtime, "crc32": old_info.CRC}
+                            continue
+                try:
+                    # Persist the relative path inside the archive so parse_zip sees the project structure.
+                    zf.write(full_path, arcname, compress_type=_compress_type(arcname))
+                except OSError:
+                    # Skip files that disappear during archive creation.
+                    continue
+                info = zf.getinfo(arcname)
+                manifest[arcname] = {"size": info.file_size, "mtime": mtime, "crc32": info.CRC}
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if old_zip is not None:
+            old_zip.close()
+    os.replace(temp_path, archive_path)
+    return manifest
+
+
+def _zip_member(archive: Optional[zipfile.ZipFile], arcname: str) -> Optional[zipfile.ZipInfo]:
+    if archive is None:
+        return None
+    try:
+        return archive.getinfo(arcname)
+    except KeyError:
+        return None
 
-    return _build_snapshot_dict(root, total_files, total_bytes, latest_mtime, exclude_dirs, follow_symlinks)
 
+def _copy_member_raw(source: zipfile.ZipFile, target: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+    """Append ``info`` from ``source`` to ``target`` as-is, without decompressing.
 
-def _build_snapshot_dict(
-    root: Path,
-    total_files: int,
-    total_bytes: int,
-    latest_mtime: float,
-    exclude_dirs: Set[str],
-    follow_symlinks: bool,
-) -> Dict[str, Any]:
+    zipfile has no public API for this, so the local header is re-emitted
+    from the ZipInfo and the compressed payload is copied byte for byte.
+    Every private zipfile name used is looked up before ``target`` is
+    written, so a Python without them raises AttributeError with the
+    archive untouched and the caller can recompress the member instead.
+    """
+    header_format, header_size, header_magic = (
+        zipfile.structFileHeader, zipfile.sizeFileHeader, zipfile.stringFileHeader,
+    )
+    name_length_field, extra_length_field = zipfile._FH_FILENAME_LENGTH, zipfile._FH_EXTRA_FIELD_LENGTH
+    filelist, name_to_info, _ = target.filelist, target.NameToInfo, target.start_dir
+    copied = copy.copy(info)
+    build_header = copied.FileHeader
+
+    source.fp.seek(info.header_offset)
+    header = struct.unpack(header_format, source.fp.read(header_size))
+    if header[0] != header_magic:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    source.fp.seek(header[name_length_field] + header[extra_length_field], os.SEEK_CUR)
+    data_offset = source.fp.tell()
+
+    # Sizes are known up front, so no trailing data descriptor is needed.
+    copied.flag_bits &= ~0x08
+    copied.header_offset = target.fp.tell()
+    target.fp.write(build_header())
+    source.fp.seek(data_offset)
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = source.fp.read(min(_COPY_CHUNK_BYTES, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        target.fp.write(chunk)
+        remaining -= len(chunk)
+    filelist.append(copied)
+    name_to_info[copied.filename] = copied
+    target.start_dir = target.fp.tell()
+
+
+def _archive_settings(root: Path, exclude_dirs: Set[str], follow_symlinks: bool) -> Dict[str, Any]:
     return {
         "source": str(root),
-        "files": total_files,
-        "bytes": total_bytes,
-        "latest_mtime": latest_mtime,
         "excluded_dirs": sorted(exclude_dirs),
         "follow_symlinks": follow_symlinks,
     }
 
 
+def _settings_match(settings: Dict[str, Any], metadata: Dict[str, Any]) -> bool:
+    return all(metadata.get(key) == value for key, value in settings.items())
+
+
 def _load_cached_metadata(metadata_path: Path) -> Dict[str, Any] | None:
     try:
         with metadata_path.open("r", encoding="utf-8") as fp:
@@ -180,14 +346,6 @@ def _write_cached_metadata(metadata_path: Path, payload: Dict[str, Any]) -> None
         pass
 
 
-def _snapshot_matches(snapshot: Dict[str, Any], metadata: Dict[str, Any]) -> bool:
-    required_keys = ("source", "files", "bytes", "latest_mtime", "excluded_dirs", "follow_symlinks")
-    for key in required_keys:
-        if metadata.get(key) != snapshot.get(key):
-            return False
-    return True
-
-
 def _project_root() -> Path:
     """Best-effort project root detection for placing cached archives."""
     here = Path(__file__).resolve()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting parent checks its token while a worker process runs.
+_POLL_INTERVAL_SEC = 0.1
+# Grace period between SIGTERM and SIGKILL for a worker that is being stopped.
+_TERMINATE_GRACE_SEC = 2.0
+
+
+class ScanCancelled(Exception):
+    """Raised inside a job once its cancellation token has been triggered."""
+
+
+class WorkerProcessError(RuntimeError):
+    """An exception raised inside a worker process, re-raised in the parent."""
+
+    def __init__(self, message: str, remote_traceback: str = ""):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+
+class CancellationToken(threading.Event):
+    """
+    Cooperative cancellation flag shared by every stage of one job.
+
+    Long-running loops call ``raise_if_cancelled()`` at safe points (per file,
+    per repository, per queued LLM request). Being an Event, the token can
+    also be handed to anything that waits on or polls one, such as
+    TaskGraph.run(cancel_event=...).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self.is_set():
+            self.reason = reason
+        self.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self.is_set():
+            raise ScanCancelled(self.reason or "cancelled")
+
+
+def raise_if_cancelled(token: Optional[CancellationToken]) -> None:
+    """No-op when no token was supplied; lets callers keep the argument optional."""
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def _worker_entry(conn, func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as exc:  # noqa: BLE001 - shipped back to the parent
+        try:
+            conn.send(("error", f"{type(exc).__name__}: {exc}", traceback.format_exc()))
+        except Exception:
+            pass
+    else:
+        try:
+            conn.send(("ok", result, ""))
+        except Exception as exc:
+            conn.send(("error", f"Unable to return worker result: {exc}", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _stop_process(process) -> None:
+    process.terminate()
+    process.join(_TERMINATE_GRACE_SEC)
+    if process.is_alive():
+        process.kill()
+        process.join(_TERMINATE_GRACE_SEC)
+
+
+def _start_method() -> str:
+    method = (os.getenv("SCAN_WORKER_START_METHOD") or "spawn").strip().lower()
+    if method not in multiprocessing.get_all_start_methods():
+        return "spawn"
+    return method
+
+
+def run_in_worker_process(
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    **kwargs: Any,
+) -> Any:
+    """Run ``func(*args, **kwargs)`` in a child process that can actually be stopped.
+
+    Unlike a thread, the worker is terminated (then killed) when ``timeout``
+    expires or ``cancel_token`` is triggered, so abandoned CPU-heavy stages
+    do not keep running after the caller gives up. ``func``, its arguments
+    and its return value must be picklable; ``func`` must be importable by
+    module path (SCAN_WORKER_START_METHOD defaults to "spawn").
+
+    Raises:
+        TimeoutError: The worker exceeded ``timeout`` and was stopped
+        ScanCancelled: The token was triggered and the worker was stopped
+        WorkerProcessError: ``func`` raised, or the worker died without a result
+    """
+    raise_if_cancelled(cancel_token)
+    context = multiprocessing.get_context(_start_method())
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_worker_entry,
+        args=(child_conn, func, args, kwargs),
+        name=f"scan-worker-{getattr(func, '__name__', 'task')}",
+        daemon=True,
+    )
+    process.start()
+    child_conn.close()
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    try:
+        while True:
+            # Read before joining so a large result cannot block the child on a full pipe.
+            if parent_conn.poll(_POLL_INTERVAL_SEC):
+                try:
+                    status, payload, remote_traceback = parent_conn.recv()
+                except EOFError:
+                    raise WorkerProcessError(f"Worker exited with code {process.exitcode} without a result")
+                if status == "ok":
+                    return payload
+                raise WorkerProcessError(payload, remote_traceback)
+            if not process.is_alive() and not parent_conn.poll():
+                raise WorkerProcessError(f"Worker exited with code {process.exitcode} without a result")
+            if cancel_token is not None and cancel_token.is_set():
+                logger.info("Stopping worker %s: %s", process.name, cancel_token.reason)
+                raise ScanCancelled(cancel_token.reason or "cancelled")
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning("Stopping worker %s after %ss timeout", process.name, timeout)
+                raise TimeoutError(f"Worker exceeded {timeout}s")
+    finally:
+        if process.is_alive():
+            _stop_process(process)
+        else:
+            process.join()
+        parent_conn.close()
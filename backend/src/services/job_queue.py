@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_QUEUE_PATH = Path.home() / ".cache" / "capstone" / "scan_jobs.sqlite3"
+DEFAULT_LEASE_SEC = 60
+DEFAULT_MAX_ATTEMPTS = 3
+# Finished jobs (and their status documents, results included) are kept this long.
+DEFAULT_RETENTION_SEC = 7 * 24 * 3600
+
+# Queue-side lifecycle; the job's own status document (progress, result, ...) is opaque here.
+QUEUED = "queued"
+CLAIMED = "claimed"
+DONE = "done"
+
+
+@dataclass
+class ClaimedJob:
+    job_id: str
+    user_id: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobQueue(ABC):
+    """
+    Durable queue of background jobs plus each job's status document.
+
+    Jobs are claimed by workers under a lease that they renew with
+    ``heartbeat``; a job whose lease lapses (its worker died or the server
+    restarted) is handed out again by ``requeue_expired``. Claims are fair
+    across users: the next job comes from the user with the fewest claimed
+    jobs, oldest first, and no user holds more than ``max_per_user`` claims.
+
+    Status documents may also be written for ids that were never enqueued
+    (they are then never claimed), so the same store backs job polling.
+    """
+
+    @abstractmethod
+    def enqueue(self, job_id: str, user_id: str, payload: Dict[str, Any], status: Dict[str, Any]) -> bool:
+        """Add a job; returns False when ``job_id`` already exists."""
+
+    @abstractmethod
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def put_status(self, job_id: str, user_id: str, status: Dict[str, Any], *, finished: bool = False) -> None:
+        """Create or replace a status document; ``finished`` retires the job from the queue."""
+
+    @abstractmethod
+    def update_status(
+        self,
+        job_id: str,
+        mutate: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+        *,
+        finished: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically read-modify-write a status; ``mutate`` returning None leaves it unchanged."""
+
+    @abstractmethod
+    def delete(self, job_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def job_ids(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def claim(self, worker_id: str, *, lease_sec: float, max_per_user: int = 0) -> Optional[ClaimedJob]:
+        """Claim the next job fairly; ``max_per_user`` of 0 means unlimited."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, *, lease_sec: float) -> bool:
+        """Extend the lease; False when the job is no longer held by ``worker_id``."""
+
+    @abstractmethod
+    def finish(self, job_id: str, worker_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def requeue_expired(self, *, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Dict[str, List[str]]:
+        """Return lapsed claims to the queue; jobs out of attempts are retired.
+
+        Returns ``{"requeued": [...ids], "abandoned": [...ids]}``.
+        """
+
+    @abstractmethod
+    def depth(self, user_id: Optional[str] = None) -> Dict[str, int]:
+        """Queued and claimed job counts, overall or for one user."""
+
+    @abstractmethod
+    def prune_finished(self, older_than_sec: float = DEFAULT_RETENTION_SEC) -> int:
+        """Delete finished jobs not updated for ``older_than_sec``; returns how many were removed."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """JobQueue on a SQLite file shared by the API and worker processes (``:memory:`` for a private queue)."""
+
+    def __init__(self, path: str | Path = DEFAULT_QUEUE_PATH):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        # One connection guarded by a lock per process; SQLite serialises writers across processes.
+        self._conn = sqlite3.connect(
+            self.path if self.path == ":memory:" else str(Path(self.path).expanduser()),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    payload TEXT,
+                    status TEXT NOT NULL,
+                    queue_state TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    claimed_by TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue_idx ON jobs (queue_state, created_at)")
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    @staticmethod
+    def _claimed(row: sqlite3.Row, attempts: int) -> ClaimedJob:
+        return ClaimedJob(
+            job_id=row["job_id"],
+            user_id=row["user_id"],
+            payload=json.loads(row["payload"]) if row["payload"] else {},
+            attempts=attempts,
+        )
+
+    # ------------------------------------------------------------------
+    # Status documents
+    # ------------------------------------------------------------------
+
+    def enqueue(self, job_id: str, user_id: str, payload: Dict[str, Any], status: Dict[str, Any]) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, user_id, payload, status, queue_state, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, json.dumps(payload), json.dumps(status), QUEUED, now, now),
+            )
+            return cursor.rowcount == 1
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row["status"]) if row else None
+
+    def put_status(self, job_id: str, user_id: str, status: Dict[str, Any], *, finished: bool = False) -> None:
+        now = time.time()
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?,"
+                " queue_state = CASE WHEN ? THEN ? ELSE queue_state END WHERE job_id = ?",
+                (json.dumps(status), now, finished, DONE, job_id),
+            ).rowcount
+            if not updated:
+                # Status-only records have no payload and are never claimed.
+                conn.execute(
+                    "INSERT INTO jobs (job_id, user_id, payload, status, queue_state, created_at, updated_at)"
+                    " VALUES (?, ?, NULL, ?, ?, ?, ?)",
+                    (job_id, user_id, json.dumps(status), DONE, now, now),
+                )
+
+    def update_status(
+        self,
+        job_id: str,
+        mutate: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+        *,
+        finished: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            updated = mutate(json.loads(row["status"]))
+            if updated is None:
+                return None
+            done = bool(finished and finished(updated))
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?,"
+                " queue_state = CASE WHEN ? THEN ? ELSE queue_state END WHERE job_id = ?",
+                (json.dumps(updated), time.time(), done, DONE, job_id),
+            )
+            return updated
+
+    def delete(self, job_id: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount == 1
+
+    def job_ids(self) -> List[str]:
+        with self._lock:
+            return [row["job_id"] for row in self._conn.execute("SELECT job_id FROM jobs ORDER BY created_at")]
+
+    # ------------------------------------------------------------------
+    # Claims
+    # ------------------------------------------------------------------
+
+    def claim(self, worker_id: str, *, lease_sec: float, max_per_user: int = 0) -> Optional[ClaimedJob]:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                """
+                SELECT j.job_id, j.user_id, j.payload, j.attempts
+                FROM jobs j
+                LEFT JOIN (
+                    SELECT user_id, COUNT(*) AS held FROM jobs WHERE queue_state = ? GROUP BY user_id
+                ) c ON c.user_id = j.user_id
+                WHERE j.queue_state = ? AND j.payload IS NOT NULL
+                  AND (? <= 0 OR COALESCE(c.held, 0) < ?)
+                ORDER BY COALESCE(c.held, 0), j.created_at
+                LIMIT 1
+                """,
+                (CLAIMED, QUEUED, max_per_user, max_per_user),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET queue_state = ?, claimed_by = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                (CLAIMED, worker_id, now + lease_sec, now, row["job_id"]),
+            )
+            return self._claimed(row, row["attempts"] + 1)
+
+    def heartbeat(self, job_id: str, worker_id: str, *, lease_sec: float) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ?"
+                " WHERE job_id = ? AND claimed_by = ? AND queue_state = ?",
+                (now + lease_sec, now, job_id, worker_id, CLAIMED),
+            ).rowcount == 1
+
+    def finish(self, job_id: str, worker_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET queue_state = ?, lease_expires = NULL, updated_at = ?"
+                " WHERE job_id = ? AND claimed_by = ?",
+                (DONE, time.time(), job_id, worker_id),
+            )
+
+    def requeue_expired(self, *, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Dict[str, List[str]]:
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT job_id, attempts FROM jobs WHERE queue_state = ? AND lease_expires < ?",
+                (CLAIMED, now),
+            ).fetchall()
+            requeued = [row["job_id"] for row in rows if row["attempts"] < max_attempts]
+            abandoned = [row["job_id"] for row in rows if row["attempts"] >= max_attempts]
+            for job_id in requeued:
+                conn.execute(
+                    "UPDATE jobs SET queue_state = ?, claimed_by = NULL, lease_expires = NULL, updated_at = ?"
+                    " WHERE job_id = ?",
+                    (QUEUED, now, job_id),
+                )
+            for job_id in abandoned:
+                conn.execute(
+                    "UPDATE jobs SET queue_state = ?, lease_expires = NULL, updated_at = ? WHERE job_id = ?",
+                    (DONE, now, job_id),
+                )
+        return {"requeued": requeued, "abandoned": abandoned}
+
+    def depth(self, user_id: Optional[str] = None) -> Dict[str, int]:
+        query = "SELECT queue_state, COUNT(*) AS n FROM jobs WHERE queue_state IN (?, ?)"
+        params: list = [QUEUED, CLAIMED]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        query += " GROUP BY queue_state"
+        with self._lock:
+            counts = {row["queue_state"]: row["n"] for row in self._conn.execute(query, params)}
+        return {"queued": counts.get(QUEUED, 0), "running": counts.get(CLAIMED, 0)}
+
+    def prune_finished(self, older_than_sec: float = DEFAULT_RETENTION_SEC) -> int:
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM jobs WHERE queue_state = ? AND updated_at < ?",
+                (DONE, time.time() - older_than_sec),
+            ).rowcount
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT under the connection lock, so read-modify-writes are atomic across processes."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+_shared_queue: Optional[JobQueue] = None
+_shared_lock = threading.Lock()
+
+
+def create_job_queue(url: Optional[str] = None) -> JobQueue:
+    """Build a queue from a URL: ``sqlite:///path/to/file`` or ``memory://``.
+
+    Other backends plug in here; anything unrecognised is rejected rather
+    than silently falling back to a queue other processes can't see.
+    """
+    return SQLiteJobQueue(queue_sqlite_path(url))
+
+
+def queue_sqlite_path(url: Optional[str] = None) -> str:
+    """SQLite file behind a queue URL (``:memory:`` for ``memory://``).
+
+    Other process-shared state (e.g. revoked access tokens) keeps its
+    tables in the same file.
+    """
+    url = (url or "").strip()
+    if not url:
+        return str(DEFAULT_QUEUE_PATH)
+    if url == "memory://":
+        return ":memory:"
+    if url.startswith("sqlite:///"):
+        return url[len("sqlite:///"):]
+    raise ValueError(f"Unsupported SCAN_QUEUE_URL: {url}")
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide queue configured by SCAN_QUEUE_URL (defaults to a SQLite file under ~/.cache/capstone)."""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = create_job_queue(os.getenv("SCAN_QUEUE_URL"))
+        return _shared_queue
@@ -4,6 +4,7 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Iterable, TypedDict
 
+from scanner.file_table import FileTable
 from scanner.models import FileMetadata
 
 
@@ -69,15 +70,22 @@ def summarize_languages(files: Iterable[FileMetadata]) -> list[dict[str, object]
     """Aggregate language statistics (files, bytes, percentages) for the given metadata."""
     totals: dict[str, dict[str, float]] = defaultdict(lambda: {"files": 0, "bytes": 0})
 
-    for meta in files:
-        extension = Path(meta.path).suffix.lower()
+    if isinstance(files, FileTable):
+        # One entry per distinct extension instead of one per file.
+        by_extension = (
+            (extension, count, size) for extension, (count, size) in files.size_by("extension").items()
+        )
+    else:
+        by_extension = ((Path(meta.path).suffix.lower(), 1, meta.size_bytes) for meta in files)
+
+    for extension, count, size in by_extension:
         # Only keep files we can confidently map; binary/artifact assets are ignored.
         language = LANGUAGE_EXTENSIONS.get(extension)
         if language is None:
             continue
         stats = totals[language]
-        stats["files"] += 1
-        stats["bytes"] += meta.size_bytes
+        stats["files"] += count
+        stats["bytes"] += size
 
     total_files = sum(stats["files"] for stats in totals.values())
     total_bytes = sum(stats["bytes"] for stats in totals.values())
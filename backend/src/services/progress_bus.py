@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_RATE_HZ = 4.0
+
+
+@dataclass
+class ProgressEvent:
+    """Latest known progress of one job; ``seq`` increases with every publish."""
+
+    job_id: str
+    seq: int
+    data: Dict[str, Any]
+    final: bool = False
+    at: float = field(default_factory=time.time)
+
+
+class ProgressBus:
+    """
+    In-process fan-out of job progress with latest-value coalescing.
+
+    Publishers (scan threads) overwrite a per-job snapshot, merging new
+    fields into the previous ones, and wake any async subscribers. A
+    subscriber that falls behind simply sees the newest snapshot, so bursts
+    of per-file updates collapse into one event. ``due`` throttles the more
+    expensive durable writes to ``max_rate_hz`` per job.
+    """
+
+    def __init__(self, max_rate_hz: float = DEFAULT_MAX_RATE_HZ):
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self._lock = threading.Lock()
+        self._latest: Dict[str, ProgressEvent] = {}
+        self._last_due: Dict[str, float] = {}
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+    def publish(self, job_id: str, data: Dict[str, Any], *, final: bool = False) -> ProgressEvent:
+        with self._lock:
+            previous = self._latest.get(job_id)
+            if previous is not None and previous.final and not final:
+                # Late updates after a terminal state (e.g. cancel) are dropped.
+                return previous
+            event = ProgressEvent(
+                job_id=job_id,
+                seq=previous.seq + 1 if previous else 1,
+                data={**previous.data, **data} if previous else dict(data),
+                final=final,
+            )
+            self._latest[job_id] = event
+            waiters = list(self._waiters.get(job_id, ()))
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                # The subscriber's loop has closed; it unregisters itself.
+                pass
+        return event
+
+    def due(self, job_id: str) -> bool:
+        """True at most ``max_rate_hz`` times per second per job (and on the first call)."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_due.get(job_id)
+            if last is not None and now - last < self.min_interval:
+                return False
+            self._last_due[job_id] = now
+            return True
+
+    def latest(self, job_id: str) -> Optional[ProgressEvent]:
+        with self._lock:
+            return self._latest.get(job_id)
+
+    def discard(self, job_id: str) -> None:
+        with self._lock:
+            self._latest.pop(job_id, None)
+            self._last_due.pop(job_id, None)
+
+    async def wait(self, job_id: str, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[ProgressEvent]:
+        """Return the first snapshot newer than ``after_seq``, or None on timeout."""
+        loop = asyncio.get_running_loop()
+        waiter = asyncio.Event()
+        entry = (loop, waiter)
+        with self._lock:
+            current = self._latest.get(job_id)
+            if current is not None and current.seq > after_seq:
+                return current
+            self._waiters.setdefault(job_id, []).append(entry)
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(job_id, [])
+                if entry in waiters:
+                    waiters.remove(entry)
+                if not waiters:
+                    self._waiters.pop(job_id, None)
+        current = self.latest(job_id)
+        return current if current is not None and current.seq > after_seq else None
+
+
+_shared_bus: Optional[ProgressBus] = None
+_shared_bus_lock = threading.Lock()
+
+
+def get_shared_progress_bus() -> ProgressBus:
+    """Process-wide bus; SCAN_PROGRESS_MAX_HZ sets the per-job durable update rate."""
+    global _shared_bus
+    with _shared_bus_lock:
+        if _shared_bus is None:
+            try:
+                rate = float(os.getenv("SCAN_PROGRESS_MAX_HZ", str(DEFAULT_MAX_RATE_HZ)))
+            except ValueError:
+                rate = DEFAULT_MAX_RATE_HZ
+            _shared_bus = ProgressBus(max_rate_hz=rate)
+        return _shared_bus
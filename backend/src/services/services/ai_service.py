@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Callable, Optional, List, Dict, Any
 import difflib
 from scanner.models import ParseResult
+from scanner.inventory import FileInventory
 from scanner.media import AUDIO_EXTENSIONS, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
 
 class AIDependencyError(RuntimeError):
@@ -142,6 +143,7 @@ class AIService:
         git_repos: Sequence[Any],
         progress_callback: Optional[Any] = None,
         include_media: bool = False,
+        inventory: Optional[FileInventory] = None,
     ) -> Dict[str, Any]:
        
         
@@ -181,7 +183,7 @@ class AIService:
             })
         
         # Ensure on-disk media files are included even if parser skipped them
-        relevant_files = self._ensure_media_candidates(target_path, relevant_files)
+        relevant_files = self._ensure_media_candidates(target_path, relevant_files, inventory=inventory)
         
         media_exts = set(AUDIO_EXTENSIONS + IMAGE_EXTENSIONS + VIDEO_EXTENSIONS)
         media_candidates = [
@@ -226,7 +228,12 @@ class AIService:
             self.logger.error(f"[AI Service] Error during analysis: {exc}")
             raise AIProviderError(str(exc)) from exc
 
-    def _ensure_media_candidates(self, base_dir: Optional[str], existing: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _ensure_media_candidates(
+        self,
+        base_dir: Optional[str],
+        existing: List[Dict[str, Any]],
+        inventory: Optional[FileInventory] = None,
+    ) -> List[Dict[str, Any]]:
         """Augment relevant_files with media present on disk (guarded)."""
         if not base_dir:
             return existing
@@ -240,20 +247,15 @@ class AIService:
             seen = {item["path"] for item in existing}
             media_exts = set(AUDIO_EXTENSIONS + IMAGE_EXTENSIONS + VIDEO_EXTENSIONS)
             added = 0
-            for path in base.rglob("*"):
+            for rel_path, size in self._iter_media_on_disk(base, media_exts, inventory):
                 if added >= 30:
                     break
-                if not path.is_file():
-                    continue
-                if path.suffix.lower() not in media_exts:
-                    continue
-                rel_path = str(path.relative_to(base))
                 if rel_path in seen:
                     continue
                 existing.append({
                     "path": rel_path,
-                    "size": path.stat().st_size,
-                    "mime_type": mimetypes.guess_type(path.name)[0] or "",
+                    "size": size,
+                    "mime_type": mimetypes.guess_type(rel_path)[0] or "",
                     "media_info": None,
                 })
                 seen.add(rel_path)
@@ -262,6 +264,20 @@ class AIService:
             pass
         return existing
 
+    @staticmethod
+    def _iter_media_on_disk(base: Path, media_exts: set, inventory: Optional[FileInventory]):
+        """Yield (path relative to base, size) for media files, from the inventory when it covers base."""
+        if inventory is not None and inventory.covers(base):
+            prefix = inventory.relative(base)
+            strip = len(prefix) + 1 if prefix else 0
+            for entry in inventory.files(under=base, extensions=media_exts):
+                yield entry.rel_path[strip:], entry.size_bytes
+            return
+        for path in base.rglob("*"):
+            if not path.is_file() or path.suffix.lower() not in media_exts:
+                continue
+            yield str(path.relative_to(base)), path.stat().st_size
+
     def collect_media_insights(
         self,
         client: Any,
@@ -271,6 +287,7 @@ class AIService:
         archive_path: Optional[str],
         max_items: int = 12,
         progress_callback: Optional[Any] = None,
+        inventory: Optional[FileInventory] = None,
     ) -> Dict[str, Any]:
         """Run media-only summarization on demand."""
         import logging
@@ -299,7 +316,7 @@ class AIService:
                 "media_info": getattr(meta, "media_info", None),
             })
 
-        relevant_files = self._ensure_media_candidates(target_path, relevant_files)
+        relevant_files = self._ensure_media_candidates(target_path, relevant_files, inventory=inventory)
 
         try:
             logger.info(f"[AI Service] Collecting media insights for {len(relevant_files)} files, scan path: {scan_path}")
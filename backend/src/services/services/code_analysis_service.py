@@ -3,7 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from scanner.inventory import FileInventory
 from scanner.models import FileMetadata, ParseResult, ScanPreferences
+from ..cancellation import CancellationToken, ScanCancelled
 
 try:  # tree-sitter / parser extras are optional
     from local_analysis.code_parser import (
@@ -93,12 +95,25 @@ class CodeAnalysisService:
         self,
         target: Path,
         preferences: Optional[ScanPreferences] = None,
+        inventory: Optional[FileInventory] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> DirectoryResult:
-        """Analyze the provided directory and return the raw DirectoryResult."""
+        """Analyze the provided directory and return the raw DirectoryResult.
+
+        When the scan's FileInventory is supplied the analyzer selects files
+        from it instead of walking the directory again. ``cancel_token`` is
+        checked before each file and raises ScanCancelled once triggered.
+        """
         analyzer = self._create_analyzer(preferences)
+        # Custom analyzer builders may not accept the optional arguments.
+        kwargs: Dict[str, Any] = {}
+        if inventory is not None:
+            kwargs["inventory"] = inventory
+        if cancel_token is not None:
+            kwargs["cancel_token"] = cancel_token
         try:
-            return analyzer.analyze_directory(target)
-        except CodeAnalysisError:
+            return analyzer.analyze_directory(target, **kwargs)
+        except (CodeAnalysisError, ScanCancelled):
             raise
         except Exception as exc:  # pragma: no cover - analyzer specific failures
             raise CodeAnalysisError(f"Code analysis failed: {exc}") from exc
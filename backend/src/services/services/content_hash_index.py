@@ -0,0 +1,190 @@
+"""User-wide content-hash index over cached scan files.
+
+Maps each content hash to the (project, path, size) entries carrying it so
+the portfolio refresh can report cross-project duplicates without loading
+and decrypting every project's cached file metadata. ``ProjectsService``
+builds an index from one owner-scoped ``scan_files`` query and keeps the
+process-wide copy current as cached files are upserted or deleted; the TTL
+bounds how long writes made by other processes can go unseen.
+
+Rows that carry a MinHash ``content_signature`` are also kept in an LSH
+index, so near-duplicate source files (within a project or across
+projects) come from the same load.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from scanner.content_hash import normalize_hash
+from scanner.minhash import MinHashLSH, parse_signature
+
+DEFAULT_INDEX_TTL_SEC = 300.0
+
+_FileKey = Tuple[str, str]
+
+
+class ContentHashIndex:
+    """Content hash -> files index for one user's cached scan files."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (project_id, path) -> (normalized hash, stored hash, size)
+        self._files: Dict[_FileKey, Tuple[Optional[str], Optional[str], int]] = {}
+        # Dict values keep insertion order so duplicate groups list files stably.
+        self._by_hash: Dict[str, Dict[_FileKey, None]] = {}
+        self._signatures: MinHashLSH[_FileKey] = MinHashLSH()
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def upsert(self, project_id: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace files; rows carry ``relative_path``, ``size_bytes``, ``sha256``
+        and optionally ``content_signature``."""
+        with self._lock:
+            for row in rows:
+                path = row.get("relative_path")
+                if not path:
+                    continue
+                key = (str(project_id), str(path).replace("\\", "/"))
+                self._discard(key)
+                stored = row.get("sha256") or None
+                digest = normalize_hash(stored)
+                self._files[key] = (digest, stored, int(row.get("size_bytes") or 0))
+                if digest:
+                    self._by_hash.setdefault(digest, {})[key] = None
+                signature = parse_signature(row.get("content_signature"))
+                if signature is not None:
+                    self._signatures.add(key, signature)
+
+    def remove(self, project_id: str, relative_paths: Iterable[str]) -> None:
+        with self._lock:
+            for path in relative_paths:
+                self._discard((str(project_id), str(path).replace("\\", "/")))
+
+    def remove_project(self, project_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._files if key[0] == str(project_id)]:
+                self._discard(key)
+
+    def totals(self, project_ids: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+        """(file count, total bytes), optionally limited to the given projects."""
+        allowed = _id_set(project_ids)
+        with self._lock:
+            sizes = [
+                size
+                for (project_id, _), (_, _, size) in self._files.items()
+                if allowed is None or project_id in allowed
+            ]
+        return len(sizes), sum(sizes)
+
+    def duplicate_groups(self, project_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Hashes shared by files in more than one project, most wasted bytes first.
+
+        Each group is ``{"hash", "files": [(project_id, path, size_bytes)],
+        "wasted_bytes"}``, with the hash as stored for the group's first file;
+        keeping one copy is not counted as wasted. Hashes only group with
+        hashes of the same algorithm; the default algorithm matches legacy
+        parser digests (see ``scanner.content_hash``), so older projects
+        still group with new scans.
+        """
+        allowed = _id_set(project_ids)
+        groups: List[Dict[str, Any]] = []
+        with self._lock:
+            for keys in self._by_hash.values():
+                members = [key for key in keys if allowed is None or key[0] in allowed]
+                if len({project_id for project_id, _ in members}) < 2:
+                    continue
+                files = [(project_id, path, self._files[(project_id, path)][2]) for project_id, path in members]
+                groups.append({
+                    "hash": self._files[members[0]][1],
+                    "files": files,
+                    "wasted_bytes": (len(files) - 1) * files[0][2],
+                })
+        groups.sort(key=lambda group: group["wasted_bytes"], reverse=True)
+        return groups
+
+    def similar_file_groups(self, project_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Near-duplicate source files by MinHash, within and across projects.
+
+        Each group is ``{"files": [(project_id, path, size_bytes)],
+        "project_count", "similarity"}`` where similarity is the lowest
+        estimated Jaccard similarity linking the group. Groups whose files are
+        all byte-identical are left to ``duplicate_groups``.
+        """
+        allowed = _id_set(project_ids)
+        groups: List[Dict[str, Any]] = []
+        with self._lock:
+            keys = [key for key in self._files if allowed is None or key[0] in allowed]
+            for members, score in self._signatures.clusters(keys):
+                digests = {self._files[key][0] for key in members}
+                if len(digests) == 1 and None not in digests:
+                    continue
+                members.sort()
+                groups.append({
+                    "files": [(project_id, path, self._files[(project_id, path)][2]) for project_id, path in members],
+                    "project_count": len({project_id for project_id, _ in members}),
+                    "similarity": score,
+                })
+        groups.sort(key=lambda group: (group["project_count"], len(group["files"])), reverse=True)
+        return groups
+
+    def _discard(self, key: _FileKey) -> None:
+        self._signatures.remove(key)
+        previous = self._files.pop(key, None)
+        if previous is None or not previous[0]:
+            return
+        keys = self._by_hash.get(previous[0])
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self._by_hash[previous[0]]
+
+
+def _id_set(project_ids: Optional[Iterable[str]]) -> Optional[set]:
+    return None if project_ids is None else {str(project_id) for project_id in project_ids}
+
+
+# --- Process-wide per-user indexes ------------------------------------------------
+
+_indexes: Dict[str, ContentHashIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def index_ttl_sec() -> float:
+    try:
+        return float(os.getenv("CONTENT_HASH_INDEX_TTL_SEC", DEFAULT_INDEX_TTL_SEC))
+    except ValueError:
+        return DEFAULT_INDEX_TTL_SEC
+
+
+def _sweep_expired_locked(ttl_sec: float) -> None:
+    """Drop every expired index (hold _indexes_lock), so users who never return do not pin theirs."""
+    now = time.monotonic()
+    for user_id in [user_id for user_id, index in _indexes.items() if now - index.loaded_at > ttl_sec]:
+        del _indexes[user_id]
+
+
+def get_index(user_id: str) -> Optional[ContentHashIndex]:
+    """The user's loaded index, or None when it was never built or has expired."""
+    with _indexes_lock:
+        _sweep_expired_locked(index_ttl_sec())
+        return _indexes.get(user_id)
+
+
+def store_index(user_id: str, index: ContentHashIndex) -> None:
+    with _indexes_lock:
+        _sweep_expired_locked(index_ttl_sec())
+        _indexes[user_id] = index
+
+
+def invalidate(user_id: Optional[str] = None) -> None:
+    with _indexes_lock:
+        if user_id is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(user_id, None)
@@ -1,25 +1,44 @@
-"""Service for detecting and managing duplicate files based on content hash."""
+"""Service for detecting and managing duplicate files.
+
+Exact duplicates share a content hash. Near-duplicate images (resized or
+recompressed copies) are matched on the perceptual hash recorded during
+media extraction, using a multi-index hash table so lookups stay sub-quadratic.
+Near-duplicate source files are matched on their MinHash signatures through
+an LSH index.
+"""
 
 from __future__ import annotations
 
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from scanner.file_table import FileTable
 from scanner.models import FileMetadata, ParseResult
+from scanner.minhash import DEFAULT_SIMILARITY, MinHashLSH, parse_signature
+from scanner.perceptual_hash import DEFAULT_MAX_DISTANCE, MultiIndexHash, parse_hash
 
 _DATACLASS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 @dataclass(**_DATACLASS_KWARGS)
 class DuplicateGroup:
-    """A group of files that share the same content hash."""
+    """A group of files that share the same content hash.
+
+    Near-duplicate groups (``match == "near"``) carry the perceptual hash of
+    their largest file in ``file_hash`` and list files largest first.
+    Similar source groups (``match == "similar"``) carry the first file's
+    content hash and the lowest MinHash similarity linking the group.
+    """
 
     file_hash: str
     files: List[FileMetadata] = field(default_factory=list)
     total_size_bytes: int = 0
     wasted_bytes: int = 0  # Size that could be saved by deduplication
+    match: str = "exact"
+    max_distance: int = 0  # Largest Hamming distance joining a near-duplicate group
+    similarity: float = 1.0
 
     @property
     def count(self) -> int:
@@ -39,6 +58,10 @@ class DuplicateAnalysisResult:
     duplicate_groups: List[DuplicateGroup] = field(default_factory=list)
     total_duplicate_files: int = 0
     total_wasted_bytes: int = 0
+    near_duplicate_groups: List[DuplicateGroup] = field(default_factory=list)
+    total_near_duplicate_files: int = 0
+    near_duplicate_wasted_bytes: int = 0
+    similar_source_groups: List[DuplicateGroup] = field(default_factory=list)
 
     @property
     def unique_files_duplicated(self) -> int:
@@ -66,6 +89,8 @@ class DuplicateDetectionService:
         min_size_bytes: int = 0,
         include_extensions: Optional[List[str]] = None,
         exclude_extensions: Optional[List[str]] = None,
+        near_duplicate_distance: Optional[int] = DEFAULT_MAX_DISTANCE,
+        source_similarity: Optional[float] = DEFAULT_SIMILARITY,
     ) -> DuplicateAnalysisResult:
         """
         Analyze files for duplicates based on their content hash.
@@ -75,6 +100,10 @@ class DuplicateDetectionService:
             min_size_bytes: Minimum file size to consider (default: 0)
             include_extensions: Only include files with these extensions
             exclude_extensions: Exclude files with these extensions
+            near_duplicate_distance: Max differing perceptual-hash bits for
+                near-duplicate images; None disables near-duplicate matching
+            source_similarity: Min estimated Jaccard similarity for
+                near-duplicate source files; None disables MinHash matching
 
         Returns:
             DuplicateAnalysisResult with grouped duplicates and statistics
@@ -88,23 +117,27 @@ class DuplicateDetectionService:
 
         # Group files by hash
         hash_groups: Dict[str, List[FileMetadata]] = {}
+        # One file per distinct content that has a perceptual hash
+        perceptual: Dict[str, Tuple[int, FileMetadata]] = {}
+        # Likewise for source files with a MinHash signature
+        signatures: Dict[str, Tuple[bytes, FileMetadata]] = {}
+
+        for file_meta in self._candidate_files(
+            parse_result.files, min_size_bytes, include_extensions, exclude_extensions
+        ):
+            if near_duplicate_distance is not None and file_meta.media_info:
+                bits = parse_hash(file_meta.media_info.get("perceptual_hash"))  # type: ignore[union-attr]
+                if bits is not None:
+                    perceptual.setdefault(file_meta.file_hash or file_meta.path, (bits, file_meta))
+            if source_similarity is not None and file_meta.content_signature:
+                signature = parse_signature(file_meta.content_signature)
+                if signature is not None:
+                    signatures.setdefault(file_meta.file_hash or file_meta.path, (signature, file_meta))
 
-        for file_meta in parse_result.files:
             # Skip files without hash
             if not file_meta.file_hash:
                 continue
 
-            # Apply size filter
-            if file_meta.size_bytes < min_size_bytes:
-                continue
-
-            # Apply extension filters
-            ext = Path(file_meta.path).suffix.lower()
-            if include_extensions and ext not in include_extensions:
-                continue
-            if exclude_extensions and ext in exclude_extensions:
-                continue
-
             result.files_with_hash += 1
 
             if file_meta.file_hash not in hash_groups:
@@ -127,8 +160,133 @@ class DuplicateDetectionService:
         # Sort by wasted bytes (most impactful first)
         result.duplicate_groups.sort(key=lambda g: g.wasted_bytes, reverse=True)
 
+        if near_duplicate_distance is not None and len(perceptual) > 1:
+            result.near_duplicate_groups = self._near_duplicate_groups(
+                list(perceptual.values()), near_duplicate_distance
+            )
+            for group in result.near_duplicate_groups:
+                result.total_near_duplicate_files += group.count
+                result.near_duplicate_wasted_bytes += group.wasted_bytes
+
+        if source_similarity is not None and len(signatures) > 1:
+            result.similar_source_groups = self._similar_source_groups(
+                list(signatures.values()), source_similarity
+            )
+
         return result
 
+    @staticmethod
+    def _similar_source_groups(
+        entries: List[Tuple[bytes, FileMetadata]], threshold: float
+    ) -> List[DuplicateGroup]:
+        """Cluster source files whose MinHash signatures are at least ``threshold`` similar."""
+        index: MinHashLSH[int] = MinHashLSH(threshold)
+        for position, (signature, _) in enumerate(entries):
+            index.add(position, signature)
+
+        groups: List[DuplicateGroup] = []
+        for members, score in index.clusters():
+            files = [entries[position][1] for position in sorted(members)]
+            groups.append(
+                DuplicateGroup(
+                    file_hash=files[0].file_hash or "",
+                    files=files,
+                    total_size_bytes=sum(f.size_bytes for f in files),
+                    match="similar",
+                    similarity=score,
+                )
+            )
+        groups.sort(key=lambda g: (g.count, g.total_size_bytes), reverse=True)
+        return groups
+
+    @staticmethod
+    def _candidate_files(
+        files: Sequence[FileMetadata],
+        min_size_bytes: int,
+        include_extensions: Optional[List[str]],
+        exclude_extensions: Optional[List[str]],
+    ) -> Sequence[FileMetadata]:
+        """Files passing the size and extension filters, in scan order."""
+        if isinstance(files, FileTable):
+            rows = files.where_size(min_size=min_size_bytes)
+            if include_extensions:
+                rows = files.where_extension(include_extensions, rows)
+            if exclude_extensions:
+                rows = files.where_not_extension(exclude_extensions, rows)
+            return files.rows(rows)
+
+        candidates = []
+        for file_meta in files:
+            # Apply size filter
+            if file_meta.size_bytes < min_size_bytes:
+                continue
+
+            # Apply extension filters
+            ext = Path(file_meta.path).suffix.lower()
+            if include_extensions and ext not in include_extensions:
+                continue
+            if exclude_extensions and ext in exclude_extensions:
+                continue
+            candidates.append(file_meta)
+        return candidates
+
+    @staticmethod
+    def _near_duplicate_groups(
+        entries: List[Tuple[int, FileMetadata]], max_distance: int
+    ) -> List[DuplicateGroup]:
+        """Cluster perceptual hashes within ``max_distance`` bits of each other.
+
+        Each hash is looked up once in a multi-index table of all hashes;
+        matches are merged with union-find, so a group is every file
+        reachable through near-duplicate links.
+        """
+        table: MultiIndexHash[int] = MultiIndexHash(max_distance)
+        for index, (bits, _) in enumerate(entries):
+            table.add(bits, index)
+
+        parent = list(range(len(entries)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        edge_distance: Dict[int, int] = {}
+        for index, (bits, _) in enumerate(entries):
+            for distance, other in table.search(bits):
+                if other <= index:
+                    continue
+                root, other_root = find(index), find(other)
+                merged = max(distance, edge_distance.pop(root, 0), edge_distance.pop(other_root, 0))
+                if root != other_root:
+                    parent[other_root] = root
+                edge_distance[root] = merged
+
+        members: Dict[int, List[FileMetadata]] = {}
+        for index, (_, file_meta) in enumerate(entries):
+            members.setdefault(find(index), []).append(file_meta)
+
+        groups: List[DuplicateGroup] = []
+        for root, files in members.items():
+            if len(files) < 2:
+                continue
+            # Keep the largest copy; the rest are the likely resized/recompressed versions.
+            files.sort(key=lambda f: f.size_bytes, reverse=True)
+            total = sum(f.size_bytes for f in files)
+            groups.append(
+                DuplicateGroup(
+                    file_hash=files[0].media_info["perceptual_hash"],  # type: ignore[index]
+                    files=files,
+                    total_size_bytes=total,
+                    wasted_bytes=total - files[0].size_bytes,
+                    match="near",
+                    max_distance=edge_distance.get(root, 0),
+                )
+            )
+        groups.sort(key=lambda g: g.wasted_bytes, reverse=True)
+        return groups
+
     def format_duplicate_summary(self, result: DuplicateAnalysisResult) -> str:
         """Format a human-readable summary of duplicate analysis."""
         lines = ["[b]Duplicate File Analysis[/b]", ""]
@@ -141,14 +299,27 @@ class DuplicateDetectionService:
         lines.append(f"Files with hash: {result.files_with_hash}")
         lines.append("")
 
-        if not result.duplicate_groups:
+        if not (result.duplicate_groups or result.near_duplicate_groups or result.similar_source_groups):
             lines.append("[green]✓ No duplicate files found![/green]")
             return "\n".join(lines)
 
-        lines.append(f"[yellow]⚠ Found {result.unique_files_duplicated} sets of duplicate files[/yellow]")
-        lines.append(f"Total duplicate files: {result.total_duplicate_files}")
-        lines.append(f"Potential space savings: {self._format_size(result.total_wasted_bytes)}")
-        lines.append(f"Space savings: {result.space_savings_percent:.1f}%")
+        if result.duplicate_groups:
+            lines.append(f"[yellow]⚠ Found {result.unique_files_duplicated} sets of duplicate files[/yellow]")
+            lines.append(f"Total duplicate files: {result.total_duplicate_files}")
+            lines.append(f"Potential space savings: {self._format_size(result.total_wasted_bytes)}")
+            lines.append(f"Space savings: {result.space_savings_percent:.1f}%")
+
+        if result.near_duplicate_groups:
+            lines.append(
+                f"[yellow]⚠ Found {len(result.near_duplicate_groups)} sets of near-duplicate images[/yellow]"
+            )
+            lines.append(f"Near-duplicate files: {result.total_near_duplicate_files}")
+            lines.append(f"Near-duplicate savings: {self._format_size(result.near_duplicate_wasted_bytes)}")
+
+        if result.similar_source_groups:
+            lines.append(
+                f"[yellow]⚠ Found {len(result.similar_source_groups)} sets of near-duplicate source files[/yellow]"
+            )
 
         return "\n".join(lines)
 
@@ -162,21 +333,39 @@ class DuplicateDetectionService:
         """Format detailed duplicate file listing."""
         lines = [self.format_duplicate_summary(result)]
 
-        if not result.duplicate_groups:
-            return "\n".join(lines)
+        for title, groups in (
+            ("Duplicate Groups", result.duplicate_groups),
+            ("Near-Duplicate Images", result.near_duplicate_groups),
+            ("Similar Source Files", result.similar_source_groups),
+        ):
+            if groups:
+                lines.extend(self._format_groups(title, groups, max_groups, max_files_per_group))
 
-        lines.append("")
-        lines.append("[b]Duplicate Groups[/b]")
-        lines.append("")
+        return "\n".join(lines)
 
-        displayed_groups = result.duplicate_groups[:max_groups]
+    def _format_groups(
+        self,
+        title: str,
+        groups: List[DuplicateGroup],
+        max_groups: int,
+        max_files_per_group: int,
+    ) -> List[str]:
+        lines = ["", f"[b]{title}[/b]", ""]
+
+        displayed_groups = groups[:max_groups]
 
         for idx, group in enumerate(displayed_groups, 1):
-            lines.append(
-                f"[b]Group {idx}[/b] — {group.count} files, "
-                f"wasted: {self._format_size(group.wasted_bytes)}"
-            )
-            lines.append(f"  Hash: {group.file_hash[:12]}...")
+            if group.match == "similar":
+                lines.append(f"[b]Group {idx}[/b] — {group.count} files, ~{group.similarity:.0%} similar")
+            else:
+                lines.append(
+                    f"[b]Group {idx}[/b] — {group.count} files, "
+                    f"wasted: {self._format_size(group.wasted_bytes)}"
+                )
+                if group.match == "near":
+                    lines.append(f"  Perceptual hash: {group.file_hash} (within {group.max_distance} bits)")
+                else:
+                    lines.append(f"  Hash: {group.file_hash[:12]}...")
 
             displayed_files = group.files[:max_files_per_group]
             for file_meta in displayed_files:
@@ -187,11 +376,11 @@ class DuplicateDetectionService:
                 lines.append(f"  ...and {remaining} more files")
             lines.append("")
 
-        if len(result.duplicate_groups) > max_groups:
-            remaining_groups = len(result.duplicate_groups) - max_groups
+        if len(groups) > max_groups:
+            remaining_groups = len(groups) - max_groups
             lines.append(f"...and {remaining_groups} more duplicate groups")
 
-        return "\n".join(lines)
+        return lines
 
     def get_duplicate_paths(self, result: DuplicateAnalysisResult) -> List[List[str]]:
         """Get list of duplicate file paths grouped together."""
@@ -207,23 +396,36 @@ class DuplicateDetectionService:
                 "total_duplicate_files": result.total_duplicate_files,
                 "total_wasted_bytes": result.total_wasted_bytes,
                 "space_savings_percent": round(result.space_savings_percent, 2),
+                "near_duplicate_groups_count": len(result.near_duplicate_groups),
+                "total_near_duplicate_files": result.total_near_duplicate_files,
+                "near_duplicate_wasted_bytes": result.near_duplicate_wasted_bytes,
+                "similar_source_groups_count": len(result.similar_source_groups),
             },
-            "duplicate_groups": [
+            "duplicate_groups": [self._group_json(group) for group in result.duplicate_groups],
+            "near_duplicate_groups": [
+                {**self._group_json(group), "max_distance": group.max_distance}
+                for group in result.near_duplicate_groups
+            ],
+            "similar_source_groups": [
+                {**self._group_json(group), "similarity": round(group.similarity, 3)}
+                for group in result.similar_source_groups
+            ],
+        }
+
+    @staticmethod
+    def _group_json(group: DuplicateGroup) -> Dict[str, Any]:
+        return {
+            "hash": group.file_hash,
+            "file_count": group.count,
+            "total_size_bytes": group.total_size_bytes,
+            "wasted_bytes": group.wasted_bytes,
+            "files": [
                 {
-                    "hash": group.file_hash,
-                    "file_count": group.count,
-                    "total_size_bytes": group.total_size_bytes,
-                    "wasted_bytes": group.wasted_bytes,
-                    "files": [
-                        {
-                            "path": f.path,
-                            "size_bytes": f.size_bytes,
-                            "mime_type": f.mime_type,
-                        }
-                        for f in group.files
-                    ],
+                    "path": f.path,
+                    "size_bytes": f.size_bytes,
+                    "mime_type": f.mime_type,
                 }
-                for group in result.duplicate_groups
+                for f in group.files
             ],
         }
 
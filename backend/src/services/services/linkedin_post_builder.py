@@ -27,12 +27,30 @@ def _extract_commit_count(scan_data: Dict[str, Any]) -> int:
     return 0
 
 
+def _project_languages(project: Dict[str, Any]) -> List[str]:
+    """Languages from a project summary row, falling back to its scan_data."""
+    languages = project.get("languages")
+    if isinstance(languages, list) and "scan_data" not in project:
+        return [str(lang) for lang in languages[:6]]
+    return _extract_languages(project.get("scan_data") or {})
+
+
+def _project_commit_count(project: Dict[str, Any]) -> int:
+    if "commit_count" in project and "scan_data" not in project:
+        return int(project.get("commit_count") or 0)
+    return _extract_commit_count(project.get("scan_data") or {})
+
+
 def build_portfolio_post(
     projects: List[Dict[str, Any]],
     skills: List[str],
     share_url: Optional[str] = None,
 ) -> str:
-    """Generate a LinkedIn post summarising the user's portfolio."""
+    """Generate a LinkedIn post summarising the user's portfolio.
+
+    ``projects`` are full project records (with ``scan_data``) or the slim
+    rows of the portfolio aggregate's ``projects`` view.
+    """
     lines: List[str] = []
     lines.append("I just updated my developer portfolio!\n")
 
@@ -46,9 +64,8 @@ def build_portfolio_post(
         )[:3]
         for p in ranked:
             name = p.get("project_name") or "Unnamed"
-            sd = p.get("scan_data") or {}
-            langs = _extract_languages(sd)
-            commits = _extract_commit_count(sd)
+            langs = _project_languages(p)
+            commits = _project_commit_count(p)
             detail_parts = []
             if langs:
                 detail_parts.append(", ".join(langs[:3]))
@@ -74,8 +91,7 @@ def build_portfolio_post(
     # Add language hashtags
     all_langs: List[str] = []
     for p in projects[:5]:
-        sd = p.get("scan_data") or {}
-        all_langs.extend(_extract_languages(sd))
+        all_langs.extend(_project_languages(p))
     seen: set = set()
     for lang in all_langs:
         tag = f"#{lang.replace(' ', '').replace('.', '')}"
@@ -1,10 +1,75 @@
+"""Local (non-Supabase) storage for projects, overrides, portfolio items and jobs.
+
+Used when ``CAPSTONE_LOCAL_STORE=1`` and as the Supabase fallback. Records
+live in process memory by default; ``CAPSTONE_LOCAL_STORE_URL`` set to
+``sqlite:///path/to/file`` persists them in a SQLite file instead (see
+``local_store_sqlite``), which is what the offline desktop app uses.
+"""
+
 from __future__ import annotations
 
 from datetime import datetime
 from threading import Lock
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+import functools
+import os
 import uuid
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_backend: Any = None
+_backend_configured = False
+_backend_lock = Lock()
+
+
+def create_backend(url: Optional[str]) -> Any:
+    """Backend for a URL: ``memory://`` (or empty) for process memory, ``sqlite:///path`` for a file.
+
+    Returns None for the in-memory store, which is implemented in this module.
+    """
+    url = (url or "").strip()
+    if not url or url == "memory://":
+        return None
+    if url.startswith("sqlite:///"):
+        from .local_store_sqlite import SQLiteLocalStore
+
+        return SQLiteLocalStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported CAPSTONE_LOCAL_STORE_URL: {url}")
+
+
+def configure(url: Optional[str]) -> None:
+    """Switch the process to the backend for ``url``, closing the previous one."""
+    global _backend, _backend_configured
+    with _backend_lock:
+        previous = _backend
+        _backend = create_backend(url)
+        _backend_configured = True
+    if previous is not None:
+        previous.close()
+
+
+def _get_backend() -> Any:
+    global _backend, _backend_configured
+    if not _backend_configured:
+        with _backend_lock:
+            if not _backend_configured:
+                _backend = create_backend(os.getenv("CAPSTONE_LOCAL_STORE_URL"))
+                _backend_configured = True
+    return _backend
+
+
+def _durable(func: _F) -> _F:
+    """Route a store function to the configured backend's method of the same name."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        backend = _get_backend()
+        if backend is not None:
+            return getattr(backend, func.__name__)(*args, **kwargs)
+        return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
 
 _lock = Lock()
 _projects: Dict[str, Dict[str, Dict[str, Any]]] = {}
@@ -12,12 +77,16 @@ _project_name_index: Dict[Tuple[str, str], str] = {}
 _portfolio_items: Dict[str, Dict[str, Dict[str, Any]]] = {}
 _selection: Dict[str, Dict[str, Any]] = {}
 _project_overrides: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_scan_segments: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+_scan_segment_seq = 0
+_portfolio_aggregates: Dict[str, Dict[str, Any]] = {}
 
 
 def now_iso() -> str:
     return datetime.now().isoformat()
 
 
+@_durable
 def upsert_project(user_id: str, project_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     with _lock:
         key = (user_id, project_name)
@@ -39,19 +108,33 @@ def upsert_project(user_id: str, project_name: str, payload: Dict[str, Any]) ->
         return dict(record)
 
 
-def list_projects(user_id: str) -> List[Dict[str, Any]]:
+@_durable
+def list_projects(user_id: str, *, include_scan_data: bool = True) -> List[Dict[str, Any]]:
+    """A user's projects, most recently scanned first; ``include_scan_data=False`` leaves out the blobs."""
     with _lock:
         items = list(_projects.get(user_id, {}).values())
     items.sort(key=lambda x: x.get("scan_timestamp") or "", reverse=True)
-    return [dict(i) for i in items]
+    if include_scan_data:
+        return [dict(i) for i in items]
+    return [{key: value for key, value in i.items() if key != "scan_data"} for i in items]
 
 
+@_durable
 def get_project(user_id: str, project_id: str) -> Optional[Dict[str, Any]]:
     with _lock:
         item = _projects.get(user_id, {}).get(project_id)
         return dict(item) if item else None
 
 
+@_durable
+def get_project_by_name(user_id: str, project_name: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        project_id = _project_name_index.get((user_id, project_name))
+        item = _projects.get(user_id, {}).get(project_id) if project_id else None
+        return dict(item) if item else None
+
+
+@_durable
 def delete_project(user_id: str, project_id: str) -> bool:
     with _lock:
         projects = _projects.get(user_id, {})
@@ -60,9 +143,102 @@ def delete_project(user_id: str, project_id: str) -> bool:
             return False
         _project_name_index.pop((user_id, item.get("project_name", "")), None)
         _project_overrides.pop((user_id, project_id), None)
+        _scan_segments.pop((user_id, project_id), None)
         return True
 
 
+@_durable
+def append_scan_segment(user_id: str, project_id: str, payload: Any, entry_count: int) -> Dict[str, Any]:
+    global _scan_segment_seq
+    with _lock:
+        _scan_segment_seq += 1
+        row = {
+            "id": str(uuid.uuid4()),
+            "owner": user_id,
+            "project_id": project_id,
+            "seq": _scan_segment_seq,
+            "entry_count": entry_count,
+            "payload": payload,
+            "created_at": now_iso(),
+        }
+        _scan_segments.setdefault((user_id, project_id), []).append(row)
+        return dict(row)
+
+
+@_durable
+def list_scan_segments(user_id: str, project_id: str) -> List[Dict[str, Any]]:
+    with _lock:
+        return [dict(row) for row in _scan_segments.get((user_id, project_id), [])]
+
+
+@_durable
+def delete_scan_segments(user_id: str, project_id: str, segment_ids: Optional[Iterable[str]] = None) -> int:
+    """Delete the given segments of a project (all when None)."""
+    with _lock:
+        rows = _scan_segments.get((user_id, project_id), [])
+        ids = set(segment_ids) if segment_ids is not None else None
+        kept = [row for row in rows if ids is not None and row["id"] not in ids]
+        if kept:
+            _scan_segments[(user_id, project_id)] = kept
+        else:
+            _scan_segments.pop((user_id, project_id), None)
+        return len(rows) - len(kept)
+
+
+@_durable
+def compact_scan_segments(
+    user_id: str,
+    project_id: str,
+    scan_data: Any,
+    scan_timestamp: Optional[str],
+    segment_ids: Iterable[str],
+) -> bool:
+    """Store merged ``scan_data`` and delete the merged segments, unless the project was rescanned."""
+    with _lock:
+        item = _projects.get(user_id, {}).get(project_id)
+        if item is None or item.get("scan_timestamp") != scan_timestamp:
+            return False
+        _projects[user_id][project_id] = {**item, "scan_data": scan_data}
+        ids = set(segment_ids)
+        kept = [row for row in _scan_segments.get((user_id, project_id), []) if row["id"] not in ids]
+        if kept:
+            _scan_segments[(user_id, project_id)] = kept
+        else:
+            _scan_segments.pop((user_id, project_id), None)
+    return True
+
+
+@_durable
+def get_portfolio_aggregate(user_id: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        row = _portfolio_aggregates.get(user_id)
+        return dict(row) if row else None
+
+
+@_durable
+def put_portfolio_aggregate(user_id: str, payload: Any, version: int) -> bool:
+    """Store ``version`` only if it directly follows the stored one (compare-and-set)."""
+    with _lock:
+        current = _portfolio_aggregates.get(user_id)
+        current_version = int(current["version"]) if current else 0
+        if version != current_version + 1:
+            return False
+        _portfolio_aggregates[user_id] = {
+            "user_id": user_id,
+            "version": version,
+            "payload": payload,
+            "updated_at": now_iso(),
+        }
+        return True
+
+
+@_durable
+def delete_portfolio_aggregate(user_id: str) -> None:
+    with _lock:
+        _portfolio_aggregates.pop(user_id, None)
+
+
+@_durable
 def upsert_portfolio_item(user_id: str, payload: Dict[str, Any], item_id: Optional[str] = None) -> Dict[str, Any]:
     with _lock:
         if item_id is None:
@@ -81,57 +257,68 @@ def upsert_portfolio_item(user_id: str, payload: Dict[str, Any], item_id: Option
         return dict(record)
 
 
+@_durable
 def list_portfolio_items(user_id: str) -> List[Dict[str, Any]]:
     with _lock:
         return [dict(i) for i in _portfolio_items.get(user_id, {}).values()]
 
 
+@_durable
 def get_portfolio_item(user_id: str, item_id: str) -> Optional[Dict[str, Any]]:
     with _lock:
         item = _portfolio_items.get(user_id, {}).get(item_id)
         return dict(item) if item else None
 
 
+@_durable
 def delete_portfolio_item(user_id: str, item_id: str) -> bool:
     with _lock:
         return _portfolio_items.get(user_id, {}).pop(item_id, None) is not None
 
 
+@_durable
 def get_selection(user_id: str) -> Optional[Dict[str, Any]]:
     with _lock:
         row = _selection.get(user_id)
         return dict(row) if row else None
 
 
+@_durable
 def upsert_selection(user_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     with _lock:
-        existing = _selection.get(user_id, {})
-        now = now_iso()
-        row = {
-            "user_id": user_id,
-            "project_order": payload.get("project_order", existing.get("project_order", [])),
-            "skill_order": payload.get("skill_order", existing.get("skill_order", [])),
-            "selected_project_ids": payload.get("selected_project_ids", existing.get("selected_project_ids", [])),
-            "selected_skill_ids": payload.get("selected_skill_ids", existing.get("selected_skill_ids", [])),
-            "sort_mode": payload.get("sort_mode", existing.get("sort_mode", "recency")),
-            "created_at": existing.get("created_at", now),
-            "updated_at": now,
-        }
+        row = selection_record(user_id, payload, _selection.get(user_id, {}))
         _selection[user_id] = row
         return dict(row)
 
 
+def selection_record(user_id: str, payload: Dict[str, Any], existing: Dict[str, Any]) -> Dict[str, Any]:
+    now = now_iso()
+    return {
+        "user_id": user_id,
+        "project_order": payload.get("project_order", existing.get("project_order", [])),
+        "skill_order": payload.get("skill_order", existing.get("skill_order", [])),
+        "selected_project_ids": payload.get("selected_project_ids", existing.get("selected_project_ids", [])),
+        "selected_skill_ids": payload.get("selected_skill_ids", existing.get("selected_skill_ids", [])),
+        "sort_mode": payload.get("sort_mode", existing.get("sort_mode", "recency")),
+        "created_at": existing.get("created_at", now),
+        "updated_at": now,
+    }
+
+
+@_durable
 def delete_selection(user_id: str) -> bool:
     with _lock:
         return _selection.pop(user_id, None) is not None
 
 
+@_durable
 def get_project_override(user_id: str, project_id: str) -> Optional[Dict[str, Any]]:
     with _lock:
         row = _project_overrides.get((user_id, project_id))
         return dict(row) if row else None
 
 
+@_durable
 def get_project_overrides_for_projects(user_id: str, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
     with _lock:
         return {
@@ -141,6 +328,7 @@ def get_project_overrides_for_projects(user_id: str, project_ids: List[str]) ->
         }
 
 
+@_durable
 def upsert_project_override(user_id: str, project_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     with _lock:
         existing = _project_overrides.get((user_id, project_id), {})
@@ -157,6 +345,7 @@ def upsert_project_override(user_id: str, project_id: str, payload: Dict[str, An
         return dict(row)
 
 
+@_durable
 def delete_project_override(user_id: str, project_id: str) -> bool:
     with _lock:
         return _project_overrides.pop((user_id, project_id), None) is not None
@@ -167,6 +356,7 @@ def delete_project_override(user_id: str, project_id: str) -> bool:
 _saved_jobs: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
 
+@_durable
 def save_job(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
     """Save a job posting for a user. Uses job's `id` field as key."""
     with _lock:
@@ -183,6 +373,7 @@ def save_job(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
         return dict(record)
 
 
+@_durable
 def list_saved_jobs(user_id: str) -> List[Dict[str, Any]]:
     with _lock:
         items = list(_saved_jobs.get(user_id, {}).values())
@@ -190,11 +381,13 @@ def list_saved_jobs(user_id: str) -> List[Dict[str, Any]]:
     return [dict(i) for i in items]
 
 
+@_durable
 def delete_saved_job(user_id: str, job_id: str) -> bool:
     with _lock:
         return _saved_jobs.get(user_id, {}).pop(job_id, None) is not None
 
 
+@_durable
 def is_job_saved(user_id: str, job_id: str) -> bool:
     with _lock:
         return job_id in _saved_jobs.get(user_id, {})
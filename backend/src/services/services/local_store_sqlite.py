@@ -0,0 +1,498 @@
+"""Durable SQLite backend for ``local_store``.
+
+Same functions and record shapes as the in-memory store, persisted to one
+SQLite file in WAL mode so the offline desktop app keeps its data across
+restarts. Each thread gets its own connection (readers never wait on each
+other or on a writer); read-modify-write operations run in ``BEGIN
+IMMEDIATE`` transactions. ``scan_data`` lives in its own table so project
+listings that do not need it never read the blobs.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .local_store import now_iso, selection_record
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    scan_timestamp TEXT NOT NULL DEFAULT '',
+    record TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS projects_user_name_idx ON projects (user_id, project_name);
+CREATE INDEX IF NOT EXISTS projects_user_scan_ts_idx ON projects (user_id, scan_timestamp);
+
+CREATE TABLE IF NOT EXISTS project_scan_data (
+    project_id TEXT PRIMARY KEY REFERENCES projects (id) ON DELETE CASCADE,
+    scan_data TEXT
+);
+
+CREATE TABLE IF NOT EXISTS project_overrides (
+    user_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (user_id, project_id)
+);
+
+CREATE TABLE IF NOT EXISTS scan_segments (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    entry_count INTEGER NOT NULL,
+    payload TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scan_segments_project_idx ON scan_segments (owner, project_id, seq);
+
+CREATE TABLE IF NOT EXISTS portfolio_aggregates (
+    user_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    payload TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS portfolio_items (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS portfolio_items_user_idx ON portfolio_items (user_id);
+
+CREATE TABLE IF NOT EXISTS selections (
+    user_id TEXT PRIMARY KEY,
+    record TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS saved_jobs (
+    user_id TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    saved_at TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (user_id, job_id)
+);
+CREATE INDEX IF NOT EXISTS saved_jobs_user_saved_idx ON saved_jobs (user_id, saved_at);
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def _loads(text: Optional[str]) -> Any:
+    return json.loads(text) if text is not None else None
+
+
+class SQLiteLocalStore:
+    """The ``local_store`` functions over a SQLite file."""
+
+    def __init__(self, path: str | Path):
+        self.path = str(Path(path).expanduser())
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close every thread's connection; the store must not be used afterwards."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Closing from another thread; the connection is released with that thread.
+                pass
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Projects
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _project(row: sqlite3.Row, scan_data: Any = None, include_scan_data: bool = True) -> Dict[str, Any]:
+        record = _loads(row["record"])
+        if include_scan_data:
+            record["scan_data"] = scan_data
+        return record
+
+    def upsert_project(self, user_id: str, project_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT p.id, p.record, s.scan_data FROM projects p"
+                " LEFT JOIN project_scan_data s ON s.project_id = p.id"
+                " WHERE p.user_id = ? AND p.project_name = ?",
+                (user_id, project_name),
+            ).fetchone()
+            if row is None:
+                project_id = str(uuid.uuid4())
+                existing: Dict[str, Any] = {}
+                scan_data = None
+            else:
+                project_id = row["id"]
+                existing = _loads(row["record"])
+                scan_data = _loads(row["scan_data"])
+
+            fields = dict(payload)
+            if "scan_data" in fields:
+                scan_data = fields.pop("scan_data")
+            record = {
+                **existing,
+                **fields,
+                "id": project_id,
+                "user_id": user_id,
+                "project_name": project_name,
+                "created_at": existing.get("created_at", now_iso()),
+            }
+            conn.execute(
+                "INSERT INTO projects (id, user_id, project_name, scan_timestamp, record)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET scan_timestamp = excluded.scan_timestamp, record = excluded.record",
+                (project_id, user_id, project_name, record.get("scan_timestamp") or "", _dumps(record)),
+            )
+            if "scan_data" in payload or row is None:
+                conn.execute(
+                    "INSERT INTO project_scan_data (project_id, scan_data) VALUES (?, ?)"
+                    " ON CONFLICT (project_id) DO UPDATE SET scan_data = excluded.scan_data",
+                    (project_id, _dumps(scan_data)),
+                )
+        return {**record, "scan_data": scan_data}
+
+    def list_projects(self, user_id: str, *, include_scan_data: bool = True) -> List[Dict[str, Any]]:
+        if include_scan_data:
+            rows = self._conn().execute(
+                "SELECT p.record, s.scan_data FROM projects p"
+                " LEFT JOIN project_scan_data s ON s.project_id = p.id"
+                " WHERE p.user_id = ? ORDER BY p.scan_timestamp DESC",
+                (user_id,),
+            ).fetchall()
+            return [self._project(row, _loads(row["scan_data"])) for row in rows]
+        rows = self._conn().execute(
+            "SELECT record FROM projects WHERE user_id = ? ORDER BY scan_timestamp DESC",
+            (user_id,),
+        ).fetchall()
+        return [self._project(row, include_scan_data=False) for row in rows]
+
+    def get_project(self, user_id: str, project_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT p.record, s.scan_data FROM projects p"
+            " LEFT JOIN project_scan_data s ON s.project_id = p.id"
+            " WHERE p.user_id = ? AND p.id = ?",
+            (user_id, project_id),
+        ).fetchone()
+        return self._project(row, _loads(row["scan_data"])) if row else None
+
+    def get_project_by_name(self, user_id: str, project_name: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT p.record, s.scan_data FROM projects p"
+            " LEFT JOIN project_scan_data s ON s.project_id = p.id"
+            " WHERE p.user_id = ? AND p.project_name = ?",
+            (user_id, project_name),
+        ).fetchone()
+        return self._project(row, _loads(row["scan_data"])) if row else None
+
+    def delete_project(self, user_id: str, project_id: str) -> bool:
+        with self._transaction() as conn:
+            deleted = conn.execute(
+                "DELETE FROM projects WHERE user_id = ? AND id = ?", (user_id, project_id)
+            ).rowcount
+            if not deleted:
+                return False
+            conn.execute(
+                "DELETE FROM project_overrides WHERE user_id = ? AND project_id = ?", (user_id, project_id)
+            )
+            conn.execute("DELETE FROM scan_segments WHERE owner = ? AND project_id = ?", (user_id, project_id))
+        return True
+
+    # ------------------------------------------------------------------
+    # Scan segments
+    # ------------------------------------------------------------------
+
+    def append_scan_segment(self, user_id: str, project_id: str, payload: Any, entry_count: int) -> Dict[str, Any]:
+        row = {
+            "id": str(uuid.uuid4()),
+            "owner": user_id,
+            "project_id": project_id,
+            "entry_count": entry_count,
+            "payload": payload,
+            "created_at": now_iso(),
+        }
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO scan_segments (id, owner, project_id, entry_count, payload, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (row["id"], user_id, project_id, entry_count, _dumps(payload), row["created_at"]),
+            )
+        return {**row, "seq": cursor.lastrowid}
+
+    def list_scan_segments(self, user_id: str, project_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT id, owner, project_id, seq, entry_count, payload, created_at FROM scan_segments"
+            " WHERE owner = ? AND project_id = ? ORDER BY seq",
+            (user_id, project_id),
+        ).fetchall()
+        return [{**dict(row), "payload": _loads(row["payload"])} for row in rows]
+
+    def delete_scan_segments(
+        self, user_id: str, project_id: str, segment_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        with self._transaction() as conn:
+            return self._delete_scan_segments(conn, user_id, project_id, segment_ids)
+
+    def compact_scan_segments(
+        self,
+        user_id: str,
+        project_id: str,
+        scan_data: Any,
+        scan_timestamp: Optional[str],
+        segment_ids: Iterable[str],
+    ) -> bool:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT scan_timestamp FROM projects WHERE user_id = ? AND id = ?", (user_id, project_id)
+            ).fetchone()
+            if row is None or row["scan_timestamp"] != (scan_timestamp or ""):
+                return False
+            conn.execute(
+                "UPDATE project_scan_data SET scan_data = ? WHERE project_id = ?",
+                (_dumps(scan_data), project_id),
+            )
+            self._delete_scan_segments(conn, user_id, project_id, segment_ids)
+        return True
+
+    @staticmethod
+    def _delete_scan_segments(
+        conn: sqlite3.Connection, user_id: str, project_id: str, segment_ids: Optional[Iterable[str]]
+    ) -> int:
+        query = "DELETE FROM scan_segments WHERE owner = ? AND project_id = ?"
+        params: List[Any] = [user_id, project_id]
+        if segment_ids is not None:
+            ids = list(segment_ids)
+            if not ids:
+                return 0
+            query += f" AND id IN ({', '.join('?' for _ in ids)})"
+            params.extend(ids)
+        return conn.execute(query, params).rowcount
+
+    # ------------------------------------------------------------------
+    # Portfolio aggregates
+    # ------------------------------------------------------------------
+
+    def get_portfolio_aggregate(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT user_id, version, payload, updated_at FROM portfolio_aggregates WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        return {**dict(row), "payload": _loads(row["payload"])} if row else None
+
+    def put_portfolio_aggregate(self, user_id: str, payload: Any, version: int) -> bool:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT version FROM portfolio_aggregates WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            current_version = int(row["version"]) if row else 0
+            if version != current_version + 1:
+                return False
+            conn.execute(
+                "INSERT INTO portfolio_aggregates (user_id, version, payload, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (user_id) DO UPDATE SET"
+                " version = excluded.version, payload = excluded.payload, updated_at = excluded.updated_at",
+                (user_id, version, _dumps(payload), now_iso()),
+            )
+        return True
+
+    def delete_portfolio_aggregate(self, user_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM portfolio_aggregates WHERE user_id = ?", (user_id,))
+
+    # ------------------------------------------------------------------
+    # Portfolio items
+    # ------------------------------------------------------------------
+
+    def upsert_portfolio_item(
+        self, user_id: str, payload: Dict[str, Any], item_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if item_id is None:
+            item_id = str(uuid.uuid4())
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT record FROM portfolio_items WHERE id = ? AND user_id = ?", (item_id, user_id)
+            ).fetchone()
+            existing = _loads(row["record"]) if row else {}
+            now = now_iso()
+            record = {
+                **existing,
+                **payload,
+                "id": item_id,
+                "user_id": user_id,
+                "created_at": existing.get("created_at", now),
+                "updated_at": now,
+            }
+            conn.execute(
+                "INSERT INTO portfolio_items (id, user_id, record) VALUES (?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET record = excluded.record",
+                (item_id, user_id, _dumps(record)),
+            )
+        return record
+
+    def list_portfolio_items(self, user_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT record FROM portfolio_items WHERE user_id = ? ORDER BY rowid", (user_id,)
+        ).fetchall()
+        return [_loads(row["record"]) for row in rows]
+
+    def get_portfolio_item(self, user_id: str, item_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT record FROM portfolio_items WHERE id = ? AND user_id = ?", (item_id, user_id)
+        ).fetchone()
+        return _loads(row["record"]) if row else None
+
+    def delete_portfolio_item(self, user_id: str, item_id: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM portfolio_items WHERE id = ? AND user_id = ?", (item_id, user_id)
+            ).rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Selections
+    # ------------------------------------------------------------------
+
+    def get_selection(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT record FROM selections WHERE user_id = ?", (user_id,)).fetchone()
+        return _loads(row["record"]) if row else None
+
+    def upsert_selection(self, user_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT record FROM selections WHERE user_id = ?", (user_id,)).fetchone()
+            record = selection_record(user_id, payload, _loads(row["record"]) if row else {})
+            conn.execute(
+                "INSERT INTO selections (user_id, record) VALUES (?, ?)"
+                " ON CONFLICT (user_id) DO UPDATE SET record = excluded.record",
+                (user_id, _dumps(record)),
+            )
+        return record
+
+    def delete_selection(self, user_id: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM selections WHERE user_id = ?", (user_id,)).rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Project overrides
+    # ------------------------------------------------------------------
+
+    def get_project_override(self, user_id: str, project_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT record FROM project_overrides WHERE user_id = ? AND project_id = ?", (user_id, project_id)
+        ).fetchone()
+        return _loads(row["record"]) if row else None
+
+    def get_project_overrides_for_projects(self, user_id: str, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not project_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in project_ids)
+        rows = self._conn().execute(
+            f"SELECT project_id, record FROM project_overrides WHERE user_id = ? AND project_id IN ({placeholders})",
+            [user_id, *project_ids],
+        ).fetchall()
+        return {row["project_id"]: _loads(row["record"]) for row in rows}
+
+    def upsert_project_override(self, user_id: str, project_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT record FROM project_overrides WHERE user_id = ? AND project_id = ?", (user_id, project_id)
+            ).fetchone()
+            existing = _loads(row["record"]) if row else {}
+            now = now_iso()
+            record = {
+                **existing,
+                **payload,
+                "user_id": user_id,
+                "project_id": project_id,
+                "created_at": existing.get("created_at", now),
+                "updated_at": now,
+            }
+            conn.execute(
+                "INSERT INTO project_overrides (user_id, project_id, record) VALUES (?, ?, ?)"
+                " ON CONFLICT (user_id, project_id) DO UPDATE SET record = excluded.record",
+                (user_id, project_id, _dumps(record)),
+            )
+        return record
+
+    def delete_project_override(self, user_id: str, project_id: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM project_overrides WHERE user_id = ? AND project_id = ?", (user_id, project_id)
+            ).rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Saved jobs
+    # ------------------------------------------------------------------
+
+    def save_job(self, user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        raw_id = job_data.get("id")
+        job_id = str(raw_id) if raw_id is not None else str(uuid.uuid4())
+        record = {**job_data, "id": job_id, "user_id": user_id, "saved_at": now_iso()}
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO saved_jobs (user_id, job_id, saved_at, record) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (user_id, job_id) DO UPDATE SET saved_at = excluded.saved_at, record = excluded.record",
+                (user_id, job_id, record["saved_at"], _dumps(record)),
+            )
+        return record
+
+    def list_saved_jobs(self, user_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT record FROM saved_jobs WHERE user_id = ? ORDER BY saved_at DESC", (user_id,)
+        ).fetchall()
+        return [_loads(row["record"]) for row in rows]
+
+    def delete_saved_job(self, user_id: str, job_id: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM saved_jobs WHERE user_id = ? AND job_id = ?", (user_id, job_id)
+            ).rowcount > 0
+
+    def is_job_saved(self, user_id: str, job_id: str) -> bool:
+        row = self._conn().execute(
+            "SELECT 1 FROM saved_jobs WHERE user_id = ? AND job_id = ?", (user_id, job_id)
+        ).fetchone()
+        return row is not None
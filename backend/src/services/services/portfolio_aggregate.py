@@ -0,0 +1,250 @@
+"""Materialized per-user portfolio aggregate.
+
+The aggregate keeps one small contribution per project (skills with tiers,
+skill timeline entries, the few fields the LinkedIn post uses) plus views
+derived from them, so portfolio-wide endpoints read one record instead of
+decrypting every project's scan payload. ``ProjectsService`` applies a
+project's contribution whenever it saves, patches or deletes the project;
+``version`` increases with every project write and guards concurrent
+writers, and ``schema_version`` marks aggregates built by older code as
+stale so they are rebuilt. A write that finds no current aggregate stores a
+``stale_marker`` instead, so a rebuild that read the projects before that
+write cannot store its snapshot.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+AGGREGATE_SCHEMA_VERSION = 1
+
+
+def extract_skill_timeline_entries(scan_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract skill timeline from scan data.
+
+    Preference order:
+    1) skills_progress.timeline (month-level progression with commits)
+    2) skills_analysis.chronological_overview (derived from evidence timestamps)
+    """
+    skills_progress = scan_data.get("skills_progress")
+    if isinstance(skills_progress, dict):
+        timeline = skills_progress.get("timeline")
+        if isinstance(timeline, list):
+            return [
+                {
+                    "period_label": entry.get("period_label"),
+                    "skills": entry.get("top_skills") or entry.get("skills") or [],
+                    "commits": entry.get("commits") or 0,
+                }
+                for entry in timeline
+                if isinstance(entry, dict)
+            ]
+
+    skills_analysis = scan_data.get("skills_analysis")
+    if isinstance(skills_analysis, dict):
+        overview = skills_analysis.get("chronological_overview")
+        if isinstance(overview, list):
+            return [
+                {
+                    "period_label": entry.get("period"),
+                    "skills": entry.get("skills_exercised") or [],
+                    "commits": 0,
+                }
+                for entry in overview
+                if isinstance(entry, dict)
+            ]
+
+    return []
+
+
+def parse_period_label(label: str) -> Tuple[int, int, int, str]:
+    if not label:
+        return (9999, 12, 31, "")
+    for fmt in ("%Y-%m-%d", "%Y-%m", "%Y/%m/%d", "%Y/%m"):
+        try:
+            dt = datetime.strptime(label, fmt)
+            return (dt.year, dt.month, dt.day, label)
+        except ValueError:
+            continue
+    return (9999, 12, 31, label)
+
+
+def skills_sort_key(item: Dict[str, Any]) -> Tuple[Any, ...]:
+    period = item.get("period_label") or ""
+    return (parse_period_label(period), str(period))
+
+
+def merge_skill_timelines(per_project: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """Bucket (project name, timeline entries) pairs by period, ordered by period."""
+    timeline: Dict[str, Dict[str, Any]] = {}
+    for project_name, entries in per_project:
+        for entry in entries:
+            period = entry.get("period_label")
+            if not period:
+                continue
+            slot = timeline.setdefault(
+                period,
+                {"skills": set(), "commits": 0, "projects": set()},
+            )
+            slot["skills"].update(entry.get("skills") or [])
+            slot["projects"].add(project_name)
+            slot["commits"] += int(entry.get("commits") or 0)
+
+    items = [
+        {
+            "period_label": period,
+            "skills": sorted(data["skills"]),
+            "commits": data["commits"],
+            "projects": sorted(data["projects"]),
+        }
+        for period, data in timeline.items()
+    ]
+    items.sort(key=skills_sort_key)
+    return items
+
+
+def scan_fields(scan_data: Any) -> Dict[str, Any]:
+    """The parts of a contribution derived from a project's scan payload."""
+    from .linkedin_post_builder import _extract_commit_count, _extract_languages
+    from .resource_suggestions_service import _aggregate_user_skills, collect_skill_names
+
+    if not isinstance(scan_data, dict):
+        scan_data = {}
+    return {
+        "skill_tiers": _aggregate_user_skills([{"scan_data": scan_data}]),
+        "skill_names": collect_skill_names([{"scan_data": scan_data}]),
+        "timeline": [
+            {key: entry.get(key) for key in ("period_label", "skills", "commits")}
+            for entry in extract_skill_timeline_entries(scan_data)
+        ],
+        "languages": _extract_languages(scan_data),
+        "commit_count": _extract_commit_count(scan_data),
+    }
+
+
+def project_contribution(project: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce one project record (with decrypted ``scan_data``) to its aggregate contribution."""
+    scan_data = project.get("scan_data")
+    contribution_score = project.get("contribution_score")
+    project_end_date = project.get("project_end_date")
+    if isinstance(scan_data, dict):
+        if contribution_score is None:
+            contribution_score = (scan_data.get("contribution_ranking") or {}).get("score")
+        if project_end_date is None:
+            project_end_date = (scan_data.get("contribution_metrics") or {}).get("project_end_date")
+    return {
+        "project_id": project.get("id"),
+        "project_name": project.get("project_name") or project.get("id") or "unknown",
+        "scan_timestamp": project.get("scan_timestamp"),
+        "created_at": project.get("created_at"),
+        "project_end_date": project_end_date,
+        "contribution_score": contribution_score,
+        **scan_fields(scan_data),
+    }
+
+
+def build_views(contributions: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Portfolio-wide views over the per-project contributions."""
+    from .resource_suggestions_service import _tier_index
+
+    # Most recently scanned first, matching ProjectsService.get_user_projects.
+    ordered = sorted(
+        contributions.values(),
+        key=lambda item: str(item.get("scan_timestamp") or ""),
+        reverse=True,
+    )
+    skill_tiers: Dict[str, str] = {}
+    skill_names: List[str] = []
+    seen: set = set()
+    for contribution in ordered:
+        for name, tier in (contribution.get("skill_tiers") or {}).items():
+            if name not in skill_tiers or _tier_index(tier) > _tier_index(skill_tiers[name]):
+                skill_tiers[name] = tier
+        for name in contribution.get("skill_names") or []:
+            if name not in seen:
+                seen.add(name)
+                skill_names.append(name)
+
+    return {
+        "skill_tiers": skill_tiers,
+        "skill_names": skill_names,
+        "skills_timeline": merge_skill_timelines(
+            (item.get("project_name") or "unknown", item.get("timeline") or [])
+            for item in ordered
+        ),
+        "projects": [
+            {
+                "id": item.get("project_id"),
+                "project_name": item.get("project_name"),
+                "scan_timestamp": item.get("scan_timestamp"),
+                "created_at": item.get("created_at"),
+                "project_end_date": item.get("project_end_date"),
+                "contribution_score": item.get("contribution_score"),
+                "languages": item.get("languages") or [],
+                "commit_count": item.get("commit_count") or 0,
+            }
+            for item in ordered
+        ],
+    }
+
+
+def build_aggregate(projects: Iterable[Dict[str, Any]], version: int = 1) -> Dict[str, Any]:
+    contributions = {
+        str(project.get("id")): project_contribution(project)
+        for project in projects
+        if project.get("id")
+    }
+    return _with_views(contributions, version)
+
+
+def apply_contribution(
+    aggregate: Dict[str, Any],
+    project_id: str,
+    contribution: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Next aggregate version with one project's contribution replaced (or removed when None)."""
+    contributions = dict(aggregate.get("projects") or {})
+    if contribution is None:
+        contributions.pop(str(project_id), None)
+    else:
+        contributions[str(project_id)] = contribution
+    return _with_views(contributions, int(aggregate.get("version") or 0) + 1)
+
+
+def update_contribution(
+    aggregate: Dict[str, Any],
+    project_id: str,
+    fields: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Next aggregate version with fields of one contribution replaced; None if nothing changes.
+
+    Raises KeyError when the aggregate has no contribution for the project.
+    """
+    current = (aggregate.get("projects") or {}).get(str(project_id))
+    if current is None:
+        raise KeyError(project_id)
+    updated = {**current, **fields}
+    if updated == current:
+        return None
+    return apply_contribution(aggregate, project_id, updated)
+
+
+def stale_marker(aggregate: Any) -> Dict[str, Any]:
+    """Next version with no content: not current, so the next read rebuilds."""
+    version = int(aggregate.get("version") or 0) if isinstance(aggregate, dict) else 0
+    return {"version": version + 1, "stale": True}
+
+
+def is_current(aggregate: Any) -> bool:
+    return isinstance(aggregate, dict) and aggregate.get("schema_version") == AGGREGATE_SCHEMA_VERSION
+
+
+def _with_views(contributions: Dict[str, Dict[str, Any]], version: int) -> Dict[str, Any]:
+    return {
+        "schema_version": AGGREGATE_SCHEMA_VERSION,
+        "version": version,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "projects": contributions,
+        "views": build_views(contributions),
+    }
@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from .portfolio_aggregate import parse_period_label as _parse_period_label
 from .projects_service import ProjectsService, ProjectsServiceError
 
 
@@ -20,7 +21,7 @@ class PortfolioTimelineService:
 
     def get_projects_timeline(self, user_id: str) -> List[Dict[str, Any]]:
         try:
-            projects = self._projects_service.get_user_projects_with_roles(user_id)
+            projects = self._projects_service.get_project_summaries_with_roles(user_id)
         except ProjectsServiceError as exc:
             raise PortfolioTimelineServiceError(str(exc)) from exc
 
@@ -45,39 +46,11 @@ class PortfolioTimelineService:
 
     def get_skills_timeline(self, user_id: str) -> List[Dict[str, Any]]:
         try:
-            projects = self._projects_service.get_user_projects_with_scan_data(user_id)
+            # Materialized view: one record instead of every project's scan payload.
+            aggregate = self._projects_service.get_portfolio_aggregate(user_id)
         except ProjectsServiceError as exc:
             raise PortfolioTimelineServiceError(str(exc)) from exc
-
-        timeline: Dict[str, Dict[str, Any]] = {}
-        for project in projects:
-            project_name = project.get("project_name") or project.get("id") or "unknown"
-            scan_data = project.get("scan_data") or {}
-            for entry in _extract_skill_timeline_entries(scan_data):
-                period = entry.get("period_label")
-                if not period:
-                    continue
-                slot = timeline.setdefault(
-                    period,
-                    {"skills": set(), "commits": 0, "projects": set()},
-                )
-                slot["skills"].update(entry.get("skills") or [])
-                slot["projects"].add(project_name)
-                slot["commits"] += int(entry.get("commits") or 0)
-
-        items: List[Dict[str, Any]] = []
-        for period, data in timeline.items():
-            items.append(
-                {
-                    "period_label": period,
-                    "skills": sorted(data["skills"]),
-                    "commits": data["commits"],
-                    "projects": sorted(data["projects"]),
-                }
-            )
-
-        items.sort(key=_skills_sort_key)
-        return items
+        return list(aggregate["views"]["skills_timeline"])
 
     def get_portfolio_chronology(self, user_id: str) -> Dict[str, List[Dict[str, Any]]]:
         return {
@@ -141,23 +114,6 @@ def _project_sort_key(item: Dict[str, Any]) -> Tuple[Any, ...]:
     return (date_key, str(start_date), str(name), str(project_id))
 
 
-def _skills_sort_key(item: Dict[str, Any]) -> Tuple[Any, ...]:
-    period = item.get("period_label") or ""
-    return (_parse_period_label(period), str(period))
-
-
-def _parse_period_label(label: str) -> Tuple[int, int, int, str]:
-    if not label:
-        return (9999, 12, 31, "")
-    for fmt in ("%Y-%m-%d", "%Y-%m", "%Y/%m/%d", "%Y/%m"):
-        try:
-            dt = datetime.strptime(label, fmt)
-            return (dt.year, dt.month, dt.day, label)
-        except ValueError:
-            continue
-    return (9999, 12, 31, label)
-
-
 def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
     if not value:
         return None
@@ -225,41 +181,3 @@ def _extract_project_evolution_periods(scan_data: Dict[str, Any]) -> List[Dict[s
 
     periods.sort(key=lambda p: _parse_period_label(p.get("period_label", "")))
     return periods
-
-
-def _extract_skill_timeline_entries(scan_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Extract skill timeline from scan data.
-
-    Preference order:
-    1) skills_progress.timeline (month-level progression with commits)
-    2) skills_analysis.chronological_overview (derived from evidence timestamps)
-    """
-    skills_progress = scan_data.get("skills_progress")
-    if isinstance(skills_progress, dict):
-        timeline = skills_progress.get("timeline")
-        if isinstance(timeline, list):
-            return [
-                {
-                    "period_label": entry.get("period_label"),
-                    "skills": entry.get("top_skills") or entry.get("skills") or [],
-                    "commits": entry.get("commits") or 0,
-                }
-                for entry in timeline
-                if isinstance(entry, dict)
-            ]
-
-    skills_analysis = scan_data.get("skills_analysis")
-    if isinstance(skills_analysis, dict):
-        overview = skills_analysis.get("chronological_overview")
-        if isinstance(overview, list):
-            return [
-                {
-                    "period_label": entry.get("period"),
-                    "skills": entry.get("skills_exercised") or [],
-                    "commits": 0,
-                }
-                for entry in overview
-                if isinstance(entry, dict)
-            ]
-
-    return []
@@ -1,7 +1,7 @@
 """Service for managing project scan storage and retrieval."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple, cast
 import json
@@ -16,7 +16,9 @@ from .supabase_keys import (
     is_jwt_like,
     resolve_supabase_api_key,
 )
+from . import content_hash_index
 from . import local_store
+from . import portfolio_aggregate
 
 try:
     from supabase.client import create_client
@@ -31,6 +33,14 @@ class ProjectsServiceError(Exception):
     """Base error for projects service."""
 
 
+# Fold scan_data delta segments back into projects.scan_data once a project has this many.
+DEFAULT_SEGMENT_COMPACT_THRESHOLD = 16
+# Compare-and-set attempts when applying a change to the portfolio aggregate.
+AGGREGATE_UPDATE_ATTEMPTS = 3
+
+_NOT_LOADED = object()
+
+
 class ProjectsService:
     """Manage project scan storage in Supabase."""
     
@@ -157,6 +167,15 @@ class ProjectsService:
             or "relation \"scan_files\" does not exist" in text
         )
 
+    @staticmethod
+    def _is_missing_scan_segments_error(exc: Exception) -> bool:
+        text = str(exc).lower()
+        return (
+            ("pgrst205" in text and "project_scan_segments" in text)
+            or "could not find the table 'public.project_scan_segments'" in text
+            or "relation \"project_scan_segments\" does not exist" in text
+        )
+
     def _save_scan_local(
         self,
         user_id: str,
@@ -198,6 +217,14 @@ class ProjectsService:
         }
         saved_project = local_store.upsert_project(user_id, project_name, record)
         project_id = saved_project.get("id")
+        if project_id:
+            # A fresh scan supersedes files appended since the previous one.
+            local_store.delete_scan_segments(user_id, project_id)
+            contribution = portfolio_aggregate.project_contribution({**saved_project, "scan_data": scan_data})
+            self._apply_to_portfolio_aggregate(
+                user_id,
+                lambda current: portfolio_aggregate.apply_contribution(current, project_id, contribution),
+            )
         if role is not None and project_id:
             local_store.upsert_project_override(user_id, project_id, {"role": role})
             saved_project["role"] = role
@@ -313,6 +340,10 @@ class ProjectsService:
                 "has_skills_progress": bool(scan_data.get("skills_progress")),
             }
             
+            # Read the aggregate before the write so the change can be
+            # applied with a compare-and-set on its version afterwards.
+            aggregate = self._load_portfolio_aggregate(user_id)
+
             # Upsert (insert or update if exists)
             try:
                 response = self.client.table("projects").upsert(
@@ -335,6 +366,17 @@ class ProjectsService:
             
             saved_project = response.data[0]
             project_id = saved_project.get("id")
+            # Segments appended before this scan are dropped by the
+            # projects_clear_scan_segments trigger when scan_timestamp changes.
+            if project_id:
+                self._apply_to_portfolio_aggregate(
+                    user_id,
+                    lambda current: portfolio_aggregate.apply_contribution(
+                        current, project_id,
+                        portfolio_aggregate.project_contribution({**saved_project, "scan_data": scan_data}),
+                    ),
+                    aggregate,
+                )
             
             # Auto-infer and save role to project_overrides if not already set
             if project_id:
@@ -469,6 +511,7 @@ class ProjectsService:
         Returns:
             Updated project record
         """
+        aggregate = self._load_portfolio_aggregate(user_id)
         try:
             response = self.client.table("projects").update({
                 "contribution_score": contribution_score,
@@ -478,10 +521,17 @@ class ProjectsService:
             if not response.data:
                 raise ProjectsServiceError(f"Project {project_id} not found or not owned by user")
             
-            return response.data[0]
-            
         except Exception as exc:
             raise ProjectsServiceError(f"Failed to update project score: {exc}") from exc
+
+        self._apply_to_portfolio_aggregate(
+            user_id,
+            lambda current: portfolio_aggregate.update_contribution(
+                current, project_id, {"contribution_score": contribution_score}
+            ),
+            aggregate,
+        )
+        return response.data[0]
     
     def get_user_projects(self, user_id: str) -> List[Dict[str, Any]]:
         """
@@ -495,6 +545,7 @@ class ProjectsService:
             projects = local_store.list_projects(user_id)
             for project in projects:
                 project["scan_data"] = self._decrypt_scan_data(project.get("scan_data"))
+            self._apply_scan_segments(user_id, projects)
             return projects
 
         try:
@@ -511,6 +562,7 @@ class ProjectsService:
             # Decrypt scan_data for each project
             for project in projects:
                 project["scan_data"] = self._decrypt_scan_data(project.get("scan_data"))
+            self._apply_scan_segments(user_id, projects)
             return projects
             
         except Exception as exc:
@@ -549,7 +601,19 @@ class ProjectsService:
         Returns:
             List of project records including 'role' field from project_overrides
         """
-        projects = self.get_user_projects(user_id)
+        return self._attach_roles(user_id, self.get_user_projects(user_id))
+
+    def get_project_summaries_with_roles(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Like get_user_projects_with_roles, but from the portfolio aggregate.
+
+        Rows carry id, project_name, scan_timestamp, created_at,
+        project_end_date and the aggregate's summary fields, not scan_data.
+        """
+        projects = [dict(row) for row in self.get_portfolio_aggregate(user_id)["views"]["projects"]]
+        return self._attach_roles(user_id, projects)
+
+    def _attach_roles(self, user_id: str, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not projects:
             return projects
         
@@ -605,6 +669,7 @@ class ProjectsService:
         projects = response.data or []
         for project in projects:
             project["scan_data"] = self._decrypt_scan_data(project.get("scan_data"))
+        self._apply_scan_segments(user_id, projects)
         return projects
     
     def get_project_scan(self, user_id: str, project_id: str) -> Optional[Dict[str, Any]]:
@@ -623,6 +688,7 @@ class ProjectsService:
             if not record:
                 return None
             record["scan_data"] = self._decrypt_scan_data(record.get("scan_data"))
+            self._apply_scan_segments(user_id, [record])
             override = local_store.get_project_override(user_id, project_id)
             record["role"] = override.get("role") if override else None
             return record
@@ -637,6 +703,7 @@ class ProjectsService:
             
             record = response.data[0]
             record["scan_data"] = self._decrypt_scan_data(record.get("scan_data"))
+            self._apply_scan_segments(user_id, [record])
             
             # Fetch role from overrides
             overrides_service = self._get_overrides_service()
@@ -676,9 +743,14 @@ class ProjectsService:
         Returns:
             True if deleted successfully
         """
+        remove = lambda current: portfolio_aggregate.apply_contribution(current, project_id, None)
         if self._use_local_store:
-            return local_store.delete_project(user_id, project_id)
+            deleted = local_store.delete_project(user_id, project_id)
+            if deleted:
+                self._apply_to_portfolio_aggregate(user_id, remove)
+            return deleted
 
+        aggregate = self._load_portfolio_aggregate(user_id)
         try:
             response = (
                 self.client.table("projects")
@@ -690,7 +762,12 @@ class ProjectsService:
         except Exception as exc:
             raise ProjectsServiceError(f"Failed to delete project: {exc}") from exc
 
-        return len(response.data) > 0
+        deleted = len(response.data) > 0
+        if deleted:
+            self._apply_to_portfolio_aggregate(user_id, remove, aggregate)
+            # scan_files rows go with the project (ON DELETE CASCADE).
+            self._update_content_hash_index(user_id, lambda index: index.remove_project(project_id))
+        return deleted
 
     def delete_project_insights(self, user_id: str, project_id: str) -> bool:
         """
@@ -699,6 +776,10 @@ class ProjectsService:
         This clears `scan_data` and all cached per-file metadata so the user can
         re-run analysis later without losing shared artifacts.
         """
+        clear_insights = lambda current: portfolio_aggregate.update_contribution(
+            current, project_id,
+            {**portfolio_aggregate.scan_fields({}), "scan_timestamp": None, "project_end_date": None},
+        )
         if self._use_local_store:
             project = local_store.get_project(user_id, project_id)
             if not project:
@@ -726,8 +807,10 @@ class ProjectsService:
                 "has_skills_progress": False,
                 "insights_deleted_at": datetime.now().isoformat(),
             })
+            self._apply_to_portfolio_aggregate(user_id, clear_insights)
             return True
 
+        aggregate = self._load_portfolio_aggregate(user_id)
         try:
             timestamp = datetime.now().isoformat()
             update_fields = {
@@ -777,6 +860,8 @@ class ProjectsService:
         if not response.data:
             return False
 
+        self._apply_to_portfolio_aggregate(user_id, clear_insights, aggregate)
+
         try:
             (
                 self.client.table("scan_files")
@@ -789,6 +874,8 @@ class ProjectsService:
             # scan_files table may not exist in all environments (e.g., test database)
             # Log and continue rather than failing the whole operation
             logging.warning("Could not prune cached files (table may not exist): %s", exc)
+        else:
+            self._update_content_hash_index(user_id, lambda index: index.remove_project(project_id))
 
         return True
 
@@ -799,12 +886,10 @@ class ProjectsService:
         Returns the project record or None if not found.
         """
         if self._use_local_store:
-            projects = local_store.list_projects(user_id)
-            for record in projects:
-                if record.get("project_name") == project_name:
-                    record["scan_data"] = self._decrypt_scan_data(record.get("scan_data"))
-                    return record
-            return None
+            record = local_store.get_project_by_name(user_id, project_name)
+            if record:
+                record["scan_data"] = self._decrypt_scan_data(record.get("scan_data"))
+            return record
 
         try:
             response = (
@@ -844,7 +929,7 @@ class ProjectsService:
                 response = (
                     self.client.table("scan_files")
                     .select(
-                        "relative_path, size_bytes, mime_type, sha256, metadata,"
+                        "relative_path, size_bytes, mime_type, sha256, content_signature, metadata,"
                         " last_seen_modified_at, last_scanned_at"
                     )
                     .eq("owner", user_id)
@@ -868,6 +953,7 @@ class ProjectsService:
                     "size_bytes": row.get("size_bytes"),
                     "mime_type": row.get("mime_type"),
                     "sha256": row.get("sha256"),
+                    "content_signature": row.get("content_signature"),
                     "metadata": self._decrypt_cached_metadata(row.get("metadata")),
                     "last_seen_modified_at": row.get("last_seen_modified_at"),
                     "last_scanned_at": row.get("last_scanned_at"),
@@ -896,6 +982,7 @@ class ProjectsService:
                 - size_bytes (int)
                 - mime_type (str)
                 - sha256 (str | None)
+                - content_signature (str | None, MinHash of source files)
                 - metadata (dict)
                 - last_seen_modified_at (datetime ISO string)
                 - last_scanned_at (datetime ISO string)
@@ -918,6 +1005,7 @@ class ProjectsService:
                     "size_bytes": entry.get("size_bytes"),
                     "mime_type": entry.get("mime_type"),
                     "sha256": entry.get("sha256"),
+                    "content_signature": entry.get("content_signature"),
                     "metadata": self._encrypt_cached_metadata(entry.get("metadata")),
                     "last_seen_modified_at": modified,
                     "last_scanned_at": scanned,
@@ -938,6 +1026,8 @@ class ProjectsService:
                 return
             raise ProjectsServiceError(f"Failed to upsert cached files: {exc}") from exc
 
+        self._update_content_hash_index(user_id, lambda index: index.upsert(project_id, payload))
+
     def delete_cached_files(
         self,
         user_id: str,
@@ -962,6 +1052,202 @@ class ProjectsService:
                 return
             raise ProjectsServiceError(f"Failed to delete cached files: {exc}") from exc
 
+        self._update_content_hash_index(user_id, lambda index: index.remove(project_id, relative_paths))
+
+    def get_content_hash_index(self, user_id: str) -> content_hash_index.ContentHashIndex:
+        """
+        Content hash -> files index across all of a user's cached scan files.
+
+        Built from one owner-scoped query over the hash and MinHash signature
+        columns (no metadata decryption) and reused until it expires; upsert_cached_files and
+        delete_cached_files keep the loaded index current.
+        """
+        index = content_hash_index.get_index(user_id)
+        if index is not None:
+            return index
+
+        index = content_hash_index.ContentHashIndex()
+        if self._use_local_store:
+            # The local store has no scan_files table.
+            return index
+
+        page_size = 1000
+        offset = 0
+        rows_by_project: Dict[str, List[Dict[str, Any]]] = {}
+        while True:
+            try:
+                response = (
+                    self.client.table("scan_files")
+                    .select("project_id, relative_path, size_bytes, sha256, content_signature")
+                    .eq("owner", user_id)
+                    .order("sha256")
+                    .order("project_id")
+                    .order("relative_path")
+                    .range(offset, offset + page_size - 1)
+                    .execute()
+                )
+            except Exception as exc:
+                if self._is_missing_scan_files_error(exc):
+                    logging.warning("scan_files table unavailable; returning empty content hash index: %s", exc)
+                    return index
+                raise ProjectsServiceError(f"Failed to load content hash index: {exc}") from exc
+
+            rows = response.data or []
+            for row in rows:
+                if row.get("project_id"):
+                    rows_by_project.setdefault(str(row["project_id"]), []).append(row)
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+        for project_id, rows in rows_by_project.items():
+            index.upsert(project_id, rows)
+        content_hash_index.store_index(user_id, index)
+        return index
+
+    @staticmethod
+    def _update_content_hash_index(user_id: str, change: Any) -> None:
+        """Apply a cached-file change to the user's index if one is loaded."""
+        index = content_hash_index.get_index(user_id)
+        if index is not None:
+            change(index)
+
+    def get_project_file_hashes(self, user_id: str, project_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Path -> content hash of every file in a project, including appended files.
+
+        Once scan_files mirrors the project's latest scan (projects.scan_files_synced_at
+        equals its scan_timestamp) only the path and hash columns are read, so
+        no scan payload is decrypted. Otherwise the files come from scan_data
+        and its segments and are written to scan_files for the next call.
+        Returns None when the project does not exist.
+        """
+        if self._use_local_store:
+            record = self.get_project_scan(user_id, project_id)
+            if not record:
+                return None
+            return {path: entry.get("file_hash") for path, entry in self._scan_file_entries(record).items()}
+
+        try:
+            response = (
+                self.client.table("projects")
+                .select("id, scan_timestamp, scan_files_synced_at")
+                .eq("user_id", user_id)
+                .eq("id", project_id)
+                .execute()
+            )
+        except Exception as exc:
+            if "scan_files_synced_at" not in str(exc):
+                raise ProjectsServiceError(f"Failed to load project {project_id}: {exc}") from exc
+            # Databases without the migration always read the scan payload.
+            record = self.get_project_scan(user_id, project_id)
+            if not record:
+                return None
+            return {path: entry.get("file_hash") for path, entry in self._scan_file_entries(record).items()}
+        if not response.data:
+            return None
+
+        scan_timestamp = response.data[0].get("scan_timestamp")
+        if scan_timestamp and response.data[0].get("scan_files_synced_at") == scan_timestamp:
+            hashes = self._select_scan_file_hashes(user_id, project_id)
+            if hashes is not None:
+                return hashes
+        return self._sync_scan_file_hashes(user_id, project_id, scan_timestamp)
+
+    def _select_scan_file_hashes(self, user_id: str, project_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """Path -> sha256 from scan_files, or None when the table is unavailable."""
+        hashes: Dict[str, Optional[str]] = {}
+        page_size = 1000
+        offset = 0
+        while True:
+            try:
+                response = (
+                    self.client.table("scan_files")
+                    .select("relative_path, sha256")
+                    .eq("owner", user_id)
+                    .eq("project_id", project_id)
+                    .order("relative_path")
+                    .range(offset, offset + page_size - 1)
+                    .execute()
+                )
+            except Exception as exc:
+                if self._is_missing_scan_files_error(exc):
+                    logging.warning("scan_files table unavailable; reading file hashes from scan_data: %s", exc)
+                    return None
+                raise ProjectsServiceError(f"Failed to load file hashes: {exc}") from exc
+            rows = response.data or []
+            for row in rows:
+                if row.get("relative_path"):
+                    hashes[str(row["relative_path"]).replace("\\", "/")] = row.get("sha256")
+            if len(rows) < page_size:
+                return hashes
+            offset += page_size
+
+    def _sync_scan_file_hashes(
+        self,
+        user_id: str,
+        project_id: str,
+        scan_timestamp: Optional[str],
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """Mirror a project's scan_data files into scan_files and mark it synced."""
+        # scan_files is read before scan_data: appends write their segment
+        # first, so every row seen here is also in the scan_data read below.
+        cached = self._select_scan_file_hashes(user_id, project_id)
+        record = self.get_project_scan(user_id, project_id)
+        if not record:
+            return None
+        entries = self._scan_file_entries(record)
+        hashes = {path: entry.get("file_hash") for path, entry in entries.items()}
+        if cached is None:
+            return hashes
+
+        now = datetime.now(timezone.utc).isoformat()
+        missing = [
+            {
+                "relative_path": path,
+                "size_bytes": entry.get("size_bytes"),
+                "mime_type": entry.get("mime_type"),
+                "sha256": entry.get("file_hash"),
+                "content_signature": entry.get("content_signature"),
+                "last_seen_modified_at": entry.get("modified_at") or scan_timestamp or now,
+                "last_scanned_at": now,
+            }
+            for path, entry in entries.items()
+            if path not in cached or cached[path] != entry.get("file_hash")
+        ]
+        stale = [path for path in cached if path not in entries]
+        try:
+            self._upsert_file_hashes(user_id, project_id, missing)
+            self.delete_cached_files(user_id, project_id, stale)
+            if scan_timestamp:
+                # Only for the scan that was read; a rescan in between leaves it unsynced.
+                self.client.table("projects").update(
+                    {"scan_files_synced_at": scan_timestamp}
+                ).eq("user_id", user_id).eq("id", project_id).eq("scan_timestamp", scan_timestamp).execute()
+        except Exception as exc:
+            logging.warning("Failed to mirror files of project %s into scan_files: %s", project_id, exc)
+        return hashes
+
+    def _upsert_file_hashes(self, user_id: str, project_id: str, files: List[Dict[str, Any]]) -> None:
+        """Write path/hash columns only, leaving cached metadata of existing rows untouched."""
+        batch_size = 500
+        for start in range(0, len(files), batch_size):
+            payload = [
+                {"owner": user_id, "project_id": project_id, **entry}
+                for entry in files[start:start + batch_size]
+            ]
+            self.client.table("scan_files").upsert(payload, on_conflict="project_id,relative_path").execute()
+            self._update_content_hash_index(user_id, lambda index, rows=payload: index.upsert(project_id, rows))
+
+    @staticmethod
+    def _scan_file_entries(record: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Normalized path -> file entry of a project's merged scan_data."""
+        entries: Dict[str, Dict[str, Any]] = {}
+        for entry in (record.get("scan_data") or {}).get("files") or []:
+            if isinstance(entry, dict) and entry.get("path"):
+                entries[str(entry["path"]).replace("\\", "/")] = entry
+        return entries
+
     def backfill_cached_file_hashes(
         self,
         user_id: str,
@@ -1046,6 +1332,8 @@ class ProjectsService:
                     "Failed to backfill sha256 for %s: %s", path, exc
                 )
 
+        if updated_count:
+            content_hash_index.invalidate(user_id)
         return updated_count
 
     def update_project_scan_data(
@@ -1055,11 +1343,12 @@ class ProjectsService:
         scan_data: Dict[str, Any],
     ) -> None:
         """
-        Encrypt and persist updated scan_data for a project.
+        Encrypt and persist a project's full scan_data.
 
-        Used by the append-upload flow after merging new files into the
-        existing scan payload.
+        Rewrites the whole blob; to add file entries use append_scan_files,
+        which only writes the new entries.
         """
+        aggregate = self._load_portfolio_aggregate(user_id)
         try:
             encrypted = self._encrypt_scan_data(scan_data)
             self.client.table("projects").update(
@@ -1070,6 +1359,369 @@ class ProjectsService:
                 f"Failed to update scan_data for project {project_id}: {exc}"
             ) from exc
 
+        self._apply_to_portfolio_aggregate(
+            user_id,
+            lambda current: portfolio_aggregate.update_contribution(
+                current, project_id, portfolio_aggregate.scan_fields(scan_data)
+            ),
+            aggregate,
+        )
+
+    # --- Portfolio aggregate ----------------------------------------------------
+
+    def get_portfolio_aggregate(self, user_id: str) -> Dict[str, Any]:
+        """
+        Materialized skills, timeline and project summary views for a user.
+
+        Built from every project on first use, or when the stored aggregate
+        comes from an older schema; after that the write methods of this
+        service keep it current, so reads cost one record. See
+        portfolio_aggregate for the layout.
+        """
+        stored = self._load_portfolio_aggregate(user_id)
+        if portfolio_aggregate.is_current(stored):
+            return stored
+        previous_version = int(stored.get("version") or 0) if isinstance(stored, dict) else 0
+        aggregate = portfolio_aggregate.build_aggregate(
+            self.get_user_projects_with_scan_data(user_id),
+            version=previous_version + 1,
+        )
+        # Every project write moves the version on (see _apply_to_portfolio_aggregate),
+        # so this fails if one landed while the projects were being read.
+        try:
+            if not self._store_portfolio_aggregate(user_id, aggregate):
+                logging.debug("Projects of %s changed during the aggregate rebuild; not storing it", user_id)
+        except Exception as exc:
+            logging.debug("Failed to store portfolio aggregate for %s: %s", user_id, exc)
+        return aggregate
+
+    def _apply_to_portfolio_aggregate(
+        self,
+        user_id: str,
+        change: Any,
+        aggregate: Any = _NOT_LOADED,
+    ) -> None:
+        """
+        Apply ``change`` (aggregate -> next aggregate, or None for no-op) with compare-and-set.
+
+        Users without a current aggregate get a stale marker at the next
+        version instead; their next read rebuilds the aggregate, and a
+        rebuild already reading their projects fails to store. When the
+        change cannot be applied the aggregate is invalidated the same way
+        rather than left stale.
+        """
+        try:
+            for attempt in range(AGGREGATE_UPDATE_ATTEMPTS):
+                if aggregate is _NOT_LOADED or attempt:
+                    aggregate = self._load_portfolio_aggregate(user_id)
+                if portfolio_aggregate.is_current(aggregate):
+                    updated = change(aggregate)
+                else:
+                    updated = portfolio_aggregate.stale_marker(aggregate)
+                if updated is None or self._store_portfolio_aggregate(user_id, updated):
+                    return
+            logging.warning("Portfolio aggregate for %s kept changing; invalidating it", user_id)
+        except KeyError as exc:
+            logging.debug("Portfolio aggregate for %s is missing project %s; invalidating it", user_id, exc)
+        except Exception as exc:
+            logging.warning("Failed to update portfolio aggregate for %s: %s", user_id, exc)
+        self._invalidate_portfolio_aggregate(user_id)
+
+    def _invalidate_portfolio_aggregate(self, user_id: str) -> None:
+        """Replace the aggregate with a stale marker, falling back to deleting it."""
+        for _ in range(AGGREGATE_UPDATE_ATTEMPTS):
+            try:
+                current = self._load_portfolio_aggregate(user_id)
+                if self._store_portfolio_aggregate(user_id, portfolio_aggregate.stale_marker(current)):
+                    return
+            except Exception as exc:
+                logging.debug("Failed to invalidate portfolio aggregate for %s: %s", user_id, exc)
+                break
+        self._drop_portfolio_aggregate(user_id)
+
+    def _load_portfolio_aggregate(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if self._use_local_store:
+            row = local_store.get_portfolio_aggregate(user_id)
+        else:
+            try:
+                response = (
+                    self.client.table("portfolio_aggregates")
+                    .select("version, payload")
+                    .match({"user_id": user_id})
+                    .limit(1)
+                    .execute()
+                )
+            except Exception as exc:
+                # Databases without the migration have no aggregate to maintain.
+                logging.debug("Portfolio aggregate unavailable for %s: %s", user_id, exc)
+                return None
+            rows = response.data if isinstance(response.data, list) else []
+            row = rows[0] if rows else None
+        if not row:
+            return None
+        payload = self._decrypt_scan_data(row.get("payload"))
+        if not isinstance(payload, dict):
+            return None
+        # The row's version is authoritative for compare-and-set.
+        return {**payload, "version": int(row.get("version") or 0)}
+
+    def _store_portfolio_aggregate(self, user_id: str, aggregate: Dict[str, Any]) -> bool:
+        """Write ``aggregate`` if its version directly follows the stored one."""
+        version = int(aggregate["version"])
+        payload = self._encrypt_scan_data(aggregate)
+        if self._use_local_store:
+            return local_store.put_portfolio_aggregate(user_id, payload, version)
+
+        row = {
+            "user_id": user_id,
+            "version": version,
+            "payload": payload,
+            "updated_at": datetime.now().isoformat(),
+        }
+        if version == 1:
+            try:
+                response = self.client.table("portfolio_aggregates").insert(row).execute()
+            except Exception as exc:
+                # Duplicate key: another writer created it first.
+                logging.debug("Portfolio aggregate insert for %s lost: %s", user_id, exc)
+                return False
+        else:
+            response = (
+                self.client.table("portfolio_aggregates")
+                .update(row)
+                .eq("user_id", user_id)
+                .eq("version", version - 1)
+                .execute()
+            )
+        return bool(response.data)
+
+    def _drop_portfolio_aggregate(self, user_id: str) -> None:
+        try:
+            if self._use_local_store:
+                local_store.delete_portfolio_aggregate(user_id)
+            else:
+                self.client.table("portfolio_aggregates").delete().eq("user_id", user_id).execute()
+        except Exception as exc:
+            logging.warning("Failed to drop portfolio aggregate for %s: %s", user_id, exc)
+
+    # --- scan_data delta segments --------------------------------------------
+
+    def append_scan_files(
+        self,
+        user_id: str,
+        project_id: str,
+        entries: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Append file entries to a project's scan_data without rewriting it.
+
+        Entries are stored as one encrypted, append-only segment in
+        project_scan_segments; readers merge segments over scan_data["files"]
+        (later entries win per path). Concurrent appends therefore never
+        overwrite each other, and the cost is proportional to the new
+        entries. Once SCAN_SEGMENT_COMPACT_THRESHOLD segments accumulate
+        they are folded back into scan_data.
+        """
+        if not entries:
+            return
+        payload = self._encrypt_scan_data({"files": entries})
+        if self._use_local_store:
+            local_store.append_scan_segment(user_id, project_id, payload, len(entries))
+            segment_count = len(local_store.list_scan_segments(user_id, project_id))
+        else:
+            try:
+                self.client.table("project_scan_segments").insert({
+                    "owner": user_id,
+                    "project_id": project_id,
+                    "entry_count": len(entries),
+                    "payload": payload,
+                }).execute()
+            except Exception as exc:
+                if not self._is_missing_scan_segments_error(exc):
+                    raise ProjectsServiceError(
+                        f"Failed to append scan files for project {project_id}: {exc}"
+                    ) from exc
+                logging.warning("project_scan_segments table unavailable; rewriting scan_data: %s", exc)
+                self._append_scan_files_to_scan_data(user_id, project_id, payload)
+                return
+            try:
+                response = (
+                    self.client.table("project_scan_segments")
+                    .select("seq")
+                    .eq("owner", user_id)
+                    .eq("project_id", project_id)
+                    .execute()
+                )
+                segment_count = len(response.data or [])
+            except Exception as exc:
+                raise ProjectsServiceError(
+                    f"Failed to append scan files for project {project_id}: {exc}"
+                ) from exc
+
+        if segment_count >= self._segment_compact_threshold():
+            try:
+                self.compact_scan_segments(user_id, project_id)
+            except ProjectsServiceError as exc:
+                # Segments stay readable; the next append retries compaction.
+                logging.warning("Scan segment compaction failed for %s: %s", project_id, exc)
+
+    def _append_scan_files_to_scan_data(self, user_id: str, project_id: str, payload: Any) -> None:
+        """Merge an encrypted segment payload straight into scan_data (databases without segments)."""
+        record = self.get_project_scan(user_id, project_id)
+        if not record:
+            raise ProjectsServiceError(f"Project {project_id} not found")
+        merged = self._merge_scan_segments(record.get("scan_data"), [{"seq": 0, "payload": payload}])
+        self.update_project_scan_data(user_id, project_id, merged)
+
+    def compact_scan_segments(self, user_id: str, project_id: str) -> int:
+        """
+        Fold a project's segments into scan_data and delete them.
+
+        The write only lands if the project was not rescanned since it was
+        read (a rescan supersedes the segments anyway), and only the
+        segments read here are deleted, by id: appends racing with
+        compaction are kept for the next merge even when their seq is lower.
+        Returns the number of segments compacted.
+        """
+        if self._use_local_store:
+            record = local_store.get_project(user_id, project_id)
+        else:
+            try:
+                response = (
+                    self.client.table("projects")
+                    .select("id, project_name, scan_timestamp, scan_data")
+                    .eq("user_id", user_id)
+                    .eq("id", project_id)
+                    .execute()
+                )
+            except Exception as exc:
+                raise ProjectsServiceError(f"Failed to load project {project_id} for compaction: {exc}") from exc
+            record = response.data[0] if response.data else None
+        if not record:
+            return 0
+
+        segments = self._fetch_scan_segments(user_id, [project_id]).get(project_id, [])
+        if not segments:
+            return 0
+        scan_data = self._decrypt_scan_data(record.get("scan_data"))
+        merged = self._merge_scan_segments(scan_data, segments)
+        segment_ids = [str(segment["id"]) for segment in segments]
+        scan_timestamp = record.get("scan_timestamp")
+
+        if self._use_local_store:
+            compacted = local_store.compact_scan_segments(
+                user_id, project_id, self._encrypt_scan_data(merged), scan_timestamp, segment_ids
+            )
+            return len(segments) if compacted else 0
+
+        aggregate = self._load_portfolio_aggregate(user_id)
+        try:
+            query = (
+                self.client.table("projects")
+                .update({"scan_data": self._encrypt_scan_data(merged)})
+                .eq("id", project_id)
+                .eq("user_id", user_id)
+            )
+            query = query.eq("scan_timestamp", scan_timestamp) if scan_timestamp else query.is_("scan_timestamp", "null")
+            response = query.execute()
+        except Exception as exc:
+            raise ProjectsServiceError(f"Failed to update scan_data for project {project_id}: {exc}") from exc
+        if not response.data:
+            logging.debug("Project %s was rescanned during compaction; leaving it", project_id)
+            return 0
+        self._apply_to_portfolio_aggregate(
+            user_id,
+            lambda current: portfolio_aggregate.update_contribution(
+                current, project_id, portfolio_aggregate.scan_fields(merged)
+            ),
+            aggregate,
+        )
+        self._delete_scan_segments(user_id, project_id, segment_ids)
+        return len(segments)
+
+    @staticmethod
+    def _segment_compact_threshold() -> int:
+        try:
+            value = int(os.getenv("SCAN_SEGMENT_COMPACT_THRESHOLD", str(DEFAULT_SEGMENT_COMPACT_THRESHOLD)))
+        except ValueError:
+            return DEFAULT_SEGMENT_COMPACT_THRESHOLD
+        return max(1, value)
+
+    def _fetch_scan_segments(self, user_id: str, project_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Segments per project in seq order; empty when the table is unavailable."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        ids = [project_id for project_id in project_ids if project_id]
+        if not ids:
+            return grouped
+        if self._use_local_store:
+            for project_id in ids:
+                rows = local_store.list_scan_segments(user_id, project_id)
+                if rows:
+                    grouped[project_id] = rows
+            return grouped
+        try:
+            response = (
+                self.client.table("project_scan_segments")
+                .select("id, project_id, seq, payload")
+                .eq("owner", user_id)
+                .in_("project_id", ids)
+                .order("seq")
+                .execute()
+            )
+        except Exception as exc:
+            # Databases without the delta-log migration simply have no segments.
+            logging.debug("Skipping scan segments for user %s: %s", user_id, exc)
+            return grouped
+        rows = response.data if isinstance(response.data, list) else []
+        for row in rows:
+            grouped.setdefault(str(row.get("project_id")), []).append(row)
+        return grouped
+
+    def _merge_scan_segments(self, scan_data: Any, segments: List[Dict[str, Any]]) -> Any:
+        if not isinstance(scan_data, dict):
+            scan_data = {}
+        files = list(scan_data.get("files") or [])
+        positions = {
+            str(entry.get("path") or "").replace("\\", "/"): index
+            for index, entry in enumerate(files)
+            if isinstance(entry, dict)
+        }
+        for segment in sorted(segments, key=lambda row: int(row.get("seq") or 0)):
+            payload = self._decrypt_scan_data(segment.get("payload"))
+            for entry in (payload or {}).get("files") or []:
+                path = str(entry.get("path") or "").replace("\\", "/")
+                if path in positions:
+                    files[positions[path]] = entry
+                else:
+                    positions[path] = len(files)
+                    files.append(entry)
+        return {**scan_data, "files": files}
+
+    def _apply_scan_segments(self, user_id: str, projects: List[Dict[str, Any]]) -> None:
+        """Merge pending segments into each project's decrypted scan_data in place."""
+        segments = self._fetch_scan_segments(user_id, [str(project.get("id") or "") for project in projects])
+        for project in projects:
+            project_segments = segments.get(str(project.get("id") or ""))
+            if project_segments:
+                project["scan_data"] = self._merge_scan_segments(project.get("scan_data"), project_segments)
+
+    def _delete_scan_segments(self, user_id: str, project_id: str, segment_ids: Optional[List[str]] = None) -> None:
+        if self._use_local_store:
+            local_store.delete_scan_segments(user_id, project_id, segment_ids)
+            return
+        try:
+            query = (
+                self.client.table("project_scan_segments")
+                .delete()
+                .eq("owner", user_id)
+                .eq("project_id", project_id)
+            )
+            if segment_ids is not None:
+                query = query.in_("id", segment_ids)
+            query.execute()
+        except Exception as exc:
+            logging.debug("Failed to delete scan segments for %s: %s", project_id, exc)
+
     # --- Encryption helpers -------------------------------------------------
 
     def _encrypt_scan_data(self, scan_data: Dict[str, Any]) -> Any:
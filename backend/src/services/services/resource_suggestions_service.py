@@ -86,6 +86,8 @@ def get_suggestions(
     user_id: str,
     projects: List[Dict[str, Any]],
     role: Optional[str] = None,
+    *,
+    skills: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
     """Build resource suggestions for a user.
 
@@ -94,13 +96,15 @@ def get_suggestions(
         projects: List of project dicts (each with ``scan_data``).
         role: Optional role key (e.g. ``"backend_developer"``) to weight
               suggestions by role importance.
+        skills: Pre-aggregated {skill_name: highest_tier}; when given,
+                ``projects`` is not scanned.
 
     Returns:
         Dict with *suggestions* list, *role*, and *role_label*.
     """
     from analyzer.resource_map import get_next_tier, get_resources_for_skill
 
-    aggregated = _aggregate_user_skills(projects)
+    aggregated = skills if skills is not None else _aggregate_user_skills(projects)
     if not aggregated:
         return {"suggestions": [], "role": role, "role_label": None}
 
@@ -7,11 +7,13 @@ from pathlib import Path
 import time
 from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Any
 
-from ..archive_utils import ensure_zip
-from ..language_stats import summarize_languages
+from ..archive_utils import _ZIP_EXCLUDE_FILES, _derive_excluded_dirs, ensure_zip
+from ..language_stats import LANGUAGE_EXTENSIONS, summarize_languages
 from ..state import ScanState
+from scanner.inventory import FileInventory
 from scanner.models import FileMetadata, ParseResult, ScanPreferences
-from scanner.parser import parse_zip
+from scanner.parser import parse_directory, parse_zip
+from ..cancellation import CancellationToken, raise_if_cancelled
 from .upload_api_service import UploadAPIService, UploadAPIError, AuthenticationError
 
 T = TypeVar("T")
@@ -25,6 +27,7 @@ _DATACLASS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
 class ScanRunResult:
     """Artifacts returned after a successful scan."""
 
+    # The prepared zip, or the scanned directory itself for direct scans.
     archive_path: Path
     parse_result: ParseResult
     languages: List[Dict[str, object]]
@@ -33,6 +36,8 @@ class ScanRunResult:
     pdf_candidates: List[FileMetadata]
     document_candidates: List[FileMetadata]
     timings: List[Tuple[str, float]]
+    # Single walk of a directory target, shared with downstream analyzers.
+    inventory: Optional[FileInventory] = None
 
 
 class ScanService:
@@ -61,8 +66,15 @@ class ScanService:
         progress_callback: Callable[[str | Dict[str, object]], None] | None = None,
         *,
         cached_files: Dict[str, Dict[str, Any]] | None = None,
+        direct: bool | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> ScanRunResult:
-        """Execute the scan pipeline (zip preparation + parsing + metadata)."""
+        """Execute the scan pipeline (zip preparation + parsing + metadata).
+
+        Local directories are parsed in place unless ``direct`` is False (or
+        SCAN_DIRECT_FS=0), skipping the archive round-trip entirely.
+        ``cancel_token`` is checked between steps and before each parsed file.
+        """
         
         # Use API mode if configured
         if self.use_api:
@@ -82,40 +94,65 @@ class ScanService:
             _emit_progress(message)
 
         def _run_step(message: str, label: str, func: Callable[[], T]) -> T:
+            raise_if_cancelled(cancel_token)
             _report_progress(message)
             start = time.perf_counter()
             result = func()
             timings.append((label, time.perf_counter() - start))
             return result
 
-        archive_path = _run_step(
-            "Preparing archive…",
-            "Archive preparation",
-            lambda: self._perform_scan(target, relevant_only, preferences),
-        )
-        def _parse_archive() -> ParseResult:
-            def _file_progress(processed: int, total: int) -> None:
-                _emit_progress(
-                    {
-                        "type": "files",
-                        "processed": processed,
-                        "total": total,
-                    }
-                )
+        def _file_progress(processed: int, total: int) -> None:
+            _emit_progress(
+                {
+                    "type": "files",
+                    "processed": processed,
+                    "total": total,
+                }
+            )
 
-            return parse_zip(
-                archive_path,
-                relevant_only=relevant_only,
-                preferences=preferences,
-                progress_callback=_file_progress,
-                cached_files=cached_files,
+        inventory: Optional[FileInventory] = None
+        if target.expanduser().is_dir():
+            inventory = _run_step(
+                "Indexing files…",
+                "File inventory",
+                lambda: self.build_inventory(target, preferences),
             )
 
-        parse_result = _run_step(
-            "Parsing files from archive…",
-            "Archive parsing",
-            _parse_archive,
-        )
+        if self._use_direct_scan(target, direct):
+            archive_path = target.expanduser().resolve()
+            parse_result = _run_step(
+                "Scanning files…",
+                "Directory scan",
+                lambda: parse_directory(
+                    archive_path,
+                    relevant_only=relevant_only,
+                    preferences=preferences,
+                    progress_callback=_file_progress,
+                    cached_files=cached_files,
+                    prune_dirs=_derive_excluded_dirs(preferences),
+                    skip_files=_ZIP_EXCLUDE_FILES,
+                    inventory=inventory,
+                    cancel_token=cancel_token,
+                ),
+            )
+        else:
+            archive_path = _run_step(
+                "Preparing archive…",
+                "Archive preparation",
+                lambda: self._perform_scan(target, relevant_only, preferences, inventory),
+            )
+            parse_result = _run_step(
+                "Parsing files from archive…",
+                "Archive parsing",
+                lambda: parse_zip(
+                    archive_path,
+                    relevant_only=relevant_only,
+                    preferences=preferences,
+                    progress_callback=_file_progress,
+                    cached_files=cached_files,
+                    cancel_token=cancel_token,
+                ),
+            )
         languages: List[Dict[str, object]] = []
         has_media_files = False
         pdf_candidates: List[FileMetadata] = []
@@ -141,7 +178,7 @@ class ScanService:
         git_repos = _run_step(
             "Detecting git repositories…",
             "Git discovery",
-            lambda: self._detect_git_repositories(target),
+            lambda: self._detect_git_repositories(target, inventory),
         )
         if timings:
             total_duration = sum(duration for _, duration in timings)
@@ -155,6 +192,17 @@ class ScanService:
             pdf_candidates=pdf_candidates,
             document_candidates=document_candidates,
             timings=timings,
+            inventory=inventory,
+        )
+
+    @staticmethod
+    def build_inventory(target: Path, preferences: ScanPreferences | None = None) -> FileInventory:
+        """Walk a directory target once using the scan's exclusion rules."""
+        return FileInventory.build(
+            target,
+            prune_dirs=_derive_excluded_dirs(preferences),
+            follow_symlinks=bool(preferences and preferences.follow_symlinks),
+            languages=LANGUAGE_EXTENSIONS,
         )
 
     def format_scan_overview(self, state: ScanState) -> str:
@@ -257,20 +305,36 @@ class ScanService:
             value /= 1024
         return "unknown size"  # Fallback, though loop should always return
 
+    @staticmethod
+    def _use_direct_scan(target: Path, direct: bool | None) -> bool:
+        if not target.expanduser().is_dir():
+            return False
+        if direct is not None:
+            return direct
+        return os.getenv("SCAN_DIRECT_FS", "1").strip().lower() not in {"0", "false", "no", "off"}
+
     def _perform_scan(
         self,
         target: Path,
         relevant_only: bool,
         preferences: ScanPreferences,
+        inventory: Optional[FileInventory] = None,
     ) -> Path:
         try:
-            return ensure_zip(target, preferences=preferences)
+            return ensure_zip(target, preferences=preferences, inventory=inventory)
         except PermissionError as exc:
             raise PermissionError(f"Permission denied while preparing archive: {exc}") from exc
         except OSError as exc:
             raise OSError(f"Unable to prepare archive for scan: {exc}") from exc
 
-    def _detect_git_repositories(self, target: Path) -> List[Path]:
+    def _detect_git_repositories(
+        self,
+        target: Path,
+        inventory: Optional[FileInventory] = None,
+    ) -> List[Path]:
+        if inventory is not None and inventory.relative(target) == "":
+            return inventory.git_roots()
+
         repos: List[Path] = []
         seen: set[Path] = set()
 
@@ -3,6 +3,7 @@ Search and Filter Service Module
 
 Provides advanced search and filtering capabilities for scan results.
 Supports filtering by filename, file type, size, date range, and language.
+Results held as a columnar ``FileTable`` are filtered column by column.
 """
 
 from __future__ import annotations
@@ -14,6 +15,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Set
 
+from scanner.file_table import FileTable
 from scanner.models import FileMetadata, ParseResult
 
 _DATACLASS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -121,14 +123,17 @@ class SearchService:
                 search_time_ms=0.0,
             )
         
-        # Build filter predicates
-        predicates = self._build_predicates(filters)
-        
-        # Apply filters
-        matching_files = []
-        for file_meta in parse_result.files:
-            if all(pred(file_meta) for pred in predicates):
-                matching_files.append(file_meta)
+        if isinstance(parse_result.files, FileTable):
+            matching_files = self._search_table(parse_result.files, filters)
+        else:
+            # Build filter predicates
+            predicates = self._build_predicates(filters)
+            
+            # Apply filters
+            matching_files = []
+            for file_meta in parse_result.files:
+                if all(pred(file_meta) for pred in predicates):
+                    matching_files.append(file_meta)
         
         elapsed_ms = (time.perf_counter() - start_time) * 1000
         
@@ -140,6 +145,52 @@ class SearchService:
             search_time_ms=elapsed_ms,
         )
     
+    def _search_table(self, table: FileTable, filters: SearchFilters) -> List[FileMetadata]:
+        """Apply the same filters as ``_build_predicates`` over a FileTable's columns."""
+        rows: Optional[List[int]] = None
+        
+        # Cheapest column filters first so later ones only see the survivors
+        if filters.min_size is not None or filters.max_size is not None:
+            rows = table.where_size(filters.min_size, filters.max_size, rows)
+        if filters.extensions:
+            exts = {e.lower() if e.startswith(".") else f".{e.lower()}" for e in filters.extensions}
+            rows = table.where_extension(exts, rows)
+        if filters.languages:
+            rows = table.where_extension(self._language_extensions(filters.languages), rows)
+        if filters.mime_types:
+            rows = table.where_mime_type(filters.mime_types, rows)
+        if filters.modified_after or filters.modified_before:
+            rows = table.where_modified(filters.modified_after, filters.modified_before, rows)
+        if filters.created_after or filters.created_before:
+            rows = table.where_created(filters.created_after, filters.created_before, rows)
+        
+        # Text filters
+        if filters.path_contains:
+            path_pattern = filters.path_contains.lower()
+            rows = table.where_path(lambda p: path_pattern in p.lower(), rows)
+        if filters.filename_pattern:
+            pattern = filters.filename_pattern.lower()
+            if "*" in pattern or "?" in pattern:
+                regex_pattern = pattern.replace(".", r"\.").replace("*", ".*").replace("?", ".")
+                regex = re.compile(regex_pattern, re.IGNORECASE)
+                rows = table.where_name(lambda n: bool(regex.match(n.lower())), rows)
+            else:
+                rows = table.where_name(lambda n: pattern in n.lower(), rows)
+        
+        return table.rows(range(len(table)) if rows is None else rows)  # type: ignore[return-value]
+    
+    def _language_extensions(self, languages: Set[str]) -> Set[str]:
+        """Extensions for the given language names, or the names themselves as extensions."""
+        lang_extensions: Set[str] = set()
+        for lang in languages:
+            lang_lower = lang.lower()
+            if lang_lower in self.LANGUAGE_EXTENSIONS:
+                lang_extensions.update(self.LANGUAGE_EXTENSIONS[lang_lower])
+            else:
+                # Try as extension directly
+                lang_extensions.add(f".{lang_lower}" if not lang_lower.startswith(".") else lang_lower)
+        return lang_extensions
+    
     def _build_predicates(
         self,
         filters: SearchFilters,
@@ -211,14 +262,7 @@ class SearchService:
         
         # Language filter
         if filters.languages:
-            lang_extensions: Set[str] = set()
-            for lang in filters.languages:
-                lang_lower = lang.lower()
-                if lang_lower in self.LANGUAGE_EXTENSIONS:
-                    lang_extensions.update(self.LANGUAGE_EXTENSIONS[lang_lower])
-                else:
-                    # Try as extension directly
-                    lang_extensions.add(f".{lang_lower}" if not lang_lower.startswith(".") else lang_lower)
+            lang_extensions = self._language_extensions(filters.languages)
             predicates.append(lambda f, e=lang_extensions: Path(f.path).suffix.lower() in e)
         
         return predicates
@@ -7,10 +7,12 @@ Wraps the SkillsExtractor module and formats results for display.
 
 import logging
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping
 from collections import defaultdict
 
 from analyzer.skills_extractor import SkillsExtractor, Skill, SkillEvidence
+from scanner.content_store import SourceTextMapping
+from scanner.inventory import FileInventory
 from analyzer.project_detector import ProjectDetector, ProjectInfo
 from analyzer.llm.skill_progress_summary import (
     SkillProgressSummary,
@@ -35,11 +37,18 @@ class SkillsAnalysisService:
     them for display.
     """
 
-    def __init__(self):
-        """Initialize the skills analysis service."""
+    def __init__(self, inventory: Optional[FileInventory] = None):
+        """Initialize the skills analysis service.
+        
+        Args:
+            inventory: Optional FileInventory from the scan; source files and
+                       project markers are looked up in it instead of
+                       re-walking the directory.
+        """
         self._extractor = SkillsExtractor()
         self._project_detector = ProjectDetector()
         self._detected_projects: List[ProjectInfo] = []
+        self._inventory = inventory
     
     def detect_projects(self, target_path: Path) -> List[ProjectInfo]:
         """Detect all projects within the target directory.
@@ -50,7 +59,7 @@ class SkillsAnalysisService:
         Returns:
             List of detected ProjectInfo objects
         """
-        self._detected_projects = self._project_detector.detect_projects(target_path)
+        self._detected_projects = self._project_detector.detect_projects(target_path, inventory=self._inventory)
         return self._detected_projects
     
     def extract_skills(
@@ -58,7 +67,7 @@ class SkillsAnalysisService:
         target_path: Path,
         code_analysis_result: Optional[Any] = None,
         git_analysis_result: Optional[Dict[str, Any]] = None,
-        file_contents: Optional[Dict[str, str]] = None,
+        file_contents: Optional[Mapping[str, str]] = None,
         include_chronological: bool = True,
     ) -> List[Skill]:
         """
@@ -168,18 +177,19 @@ class SkillsAnalysisService:
         
         return results
 
-    def _read_source_files(self, target_path: Path, max_file_size: int = 500 * 1024) -> Dict[str, str]:
+    def _read_source_files(self, target_path: Path, max_file_size: int = 500 * 1024) -> SourceTextMapping:
         """
-        Read source code files from the target directory.
+        Collect source code files from the target directory.
         
         Args:
             target_path: Directory to scan for source files
             max_file_size: Maximum file size to read (default 500KB)
             
         Returns:
-            Dictionary mapping relative file paths to content
+            Mapping of relative file paths to content; each file is read through
+            the shared content store when accessed rather than held up front
         """
-        file_contents = {}
+        source_paths: Dict[str, Path] = {}
         
         # Source code extensions to include
         extensions = {'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h', '.hpp'}
@@ -189,7 +199,22 @@ class SkillsAnalysisService:
         
         if not target_path.is_dir():
             logger.warning(f"Target path is not a directory: {target_path}")
-            return file_contents
+            return SourceTextMapping(source_paths)
+
+        if self._inventory is not None and self._inventory.covers(target_path):
+            prefix = self._inventory.relative(target_path)
+            for entry in self._inventory.files(
+                under=target_path,
+                exclude_dirs=excluded_dirs,
+                max_size=max_file_size,
+            ):
+                # Extension match is case-sensitive, as in the filesystem walk below.
+                if Path(entry.rel_path).suffix not in extensions:
+                    continue
+                relative_path = entry.rel_path[len(prefix) + 1:] if prefix else entry.rel_path
+                source_paths[str(Path(relative_path))] = self._inventory.path_of(entry)
+            logger.info(f"Found {len(source_paths)} source files in {target_path}")
+            return SourceTextMapping(source_paths)
         
         try:
             for file_path in target_path.rglob('*'):
@@ -206,20 +231,13 @@ class SkillsAnalysisService:
                     logger.debug(f"Skipping large file: {file_path.name} ({file_path.stat().st_size} bytes)")
                     continue
                 
-                try:
-                    # Read file content
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    relative_path = str(file_path.relative_to(target_path))
-                    file_contents[relative_path] = content
-                except Exception as exc:
-                    logger.debug(f"Failed to read {file_path}: {exc}")
-                    continue
+                source_paths[str(file_path.relative_to(target_path))] = file_path
         
         except Exception as exc:
             logger.error(f"Error reading source files: {exc}")
         
-        logger.info(f"Read {len(file_contents)} source files from {target_path}")
-        return file_contents
+        logger.info(f"Found {len(source_paths)} source files in {target_path}")
+        return SourceTextMapping(source_paths)
 
     def format_summary(self, skills: List[Skill]) -> str:
         """
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How often the scheduler wakes up to check for cancellation while nodes run.
+_POLL_INTERVAL_SEC = 0.1
+
+
+class TaskGraphError(ValueError):
+    """Raised when a graph is declared with unknown or cyclic dependencies."""
+
+
+@dataclass
+class TaskNode:
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+
+@dataclass
+class TaskOutcome:
+    """
+    Result of one node.
+
+    ``status`` is one of ``"ok"``, ``"failed"``, ``"timeout"`` or
+    ``"cancelled"``; ``value`` is None unless the node succeeded.
+    """
+
+    name: str
+    status: str
+    value: Any = None
+    error: Optional[BaseException] = None
+    started_at: Optional[float] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+@dataclass
+class _Running:
+    node: TaskNode
+    started_at: float
+    deadline: Optional[float]
+
+
+class TaskGraph:
+    """
+    Small dependency-driven executor for the analysis pipeline.
+
+    Each node is declared with the names of the nodes it consumes and is
+    started, on its own daemon thread, as soon as all of them have settled.
+    A node's function receives its dependencies' values as keyword
+    arguments; a dependency that failed, timed out or returned nothing is
+    passed as None so best-effort consumers still run. A node that
+    outlives its timeout is abandoned (Python threads cannot be killed) and
+    its dependents proceed without it.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, TaskNode] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *,
+        deps: Sequence[str] = (),
+        timeout: Optional[float] = None,
+    ) -> "TaskGraph":
+        if name in self._nodes:
+            raise TaskGraphError(f"Duplicate task: {name}")
+        self._nodes[name] = TaskNode(name=name, func=func, deps=tuple(deps), timeout=timeout)
+        return self
+
+    def _validate(self) -> None:
+        for node in self._nodes.values():
+            missing = [dep for dep in node.deps if dep not in self._nodes]
+            if missing:
+                raise TaskGraphError(f"Task {node.name} depends on unknown task(s): {', '.join(missing)}")
+        # Kahn's algorithm; anything left over sits on a cycle.
+        remaining = {name: set(node.deps) for name, node in self._nodes.items()}
+        while True:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                break
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        if remaining:
+            raise TaskGraphError(f"Dependency cycle between: {', '.join(sorted(remaining))}")
+
+    def run(
+        self,
+        *,
+        cancel_event: Optional[threading.Event] = None,
+        on_complete: Optional[Callable[[TaskOutcome, int, int], None]] = None,
+    ) -> Dict[str, TaskOutcome]:
+        """Execute every node and return outcomes keyed by node name.
+
+        Args:
+            cancel_event: When set, no further nodes start; pending and running
+                nodes are reported as cancelled and run() returns promptly
+            on_complete: Called with (outcome, settled count, total) as each node settles
+        """
+        self._validate()
+        total = len(self._nodes)
+        outcomes: Dict[str, TaskOutcome] = {}
+        running: Dict[str, _Running] = {}
+        finished: "queue.Queue[Tuple[str, str, Any, Optional[BaseException]]]" = queue.Queue()
+
+        def settle(outcome: TaskOutcome) -> None:
+            outcomes[outcome.name] = outcome
+            if on_complete is not None:
+                try:
+                    on_complete(outcome, len(outcomes), total)
+                except Exception:
+                    logger.debug("Task graph completion callback failed", exc_info=True)
+
+        def start(node: TaskNode) -> None:
+            kwargs = {
+                dep: outcomes[dep].value if outcomes[dep].ok else None
+                for dep in node.deps
+            }
+
+            def target() -> None:
+                try:
+                    finished.put((node.name, "ok", node.func(**kwargs), None))
+                except BaseException as exc:  # noqa: BLE001 - reported through the outcome
+                    finished.put((node.name, "failed", None, exc))
+
+            started_at = time.monotonic()
+            deadline = started_at + node.timeout if node.timeout is not None else None
+            thread = threading.Thread(target=target, name=f"task-{node.name}", daemon=True)
+            running[node.name] = _Running(node=node, started_at=started_at, deadline=deadline)
+            thread.start()
+
+        while len(outcomes) < total:
+            if cancel_event is not None and cancel_event.is_set():
+                now = time.monotonic()
+                for name in self._nodes:
+                    if name in outcomes:
+                        continue
+                    entry = running.pop(name, None)
+                    settle(TaskOutcome(
+                        name=name,
+                        status="cancelled",
+                        started_at=entry.started_at if entry else None,
+                        duration=now - entry.started_at if entry else 0.0,
+                    ))
+                break
+
+            for name, node in self._nodes.items():
+                if name in outcomes or name in running:
+                    continue
+                if all(dep in outcomes for dep in node.deps):
+                    start(node)
+
+            now = time.monotonic()
+            deadlines = [entry.deadline for entry in running.values() if entry.deadline is not None]
+            wait = _POLL_INTERVAL_SEC
+            if deadlines:
+                wait = max(0.0, min(wait, min(deadlines) - now))
+            try:
+                name, status, value, error = finished.get(timeout=wait)
+            except queue.Empty:
+                name = None
+
+            if name is not None and name in running:
+                entry = running.pop(name)
+                settle(TaskOutcome(
+                    name=name,
+                    status=status,
+                    value=value,
+                    error=error,
+                    started_at=entry.started_at,
+                    duration=time.monotonic() - entry.started_at,
+                ))
+            # Late results from nodes that already timed out are dropped above.
+
+            now = time.monotonic()
+            for name in [n for n, e in running.items() if e.deadline is not None and now >= e.deadline]:
+                entry = running.pop(name)
+                settle(TaskOutcome(
+                    name=name,
+                    status="timeout",
+                    error=TimeoutError(f"{name} exceeded {entry.node.timeout}s"),
+                    started_at=entry.started_at,
+                    duration=now - entry.started_at,
+                ))
+
+        return outcomes
+
+
+def outcome_timings(outcomes: Dict[str, TaskOutcome], prefix: str = "") -> List[Tuple[str, float]]:
+    """(label, seconds) pairs in start order, matching ScanRunResult.timings."""
+    ordered = sorted(
+        outcomes.values(),
+        key=lambda outcome: outcome.started_at if outcome.started_at is not None else float("inf"),
+    )
+    return [(f"{prefix}{outcome.name}", outcome.duration) for outcome in ordered if outcome.started_at is not None]
@@ -0,0 +1,442 @@
+"""Local verification of Supabase access tokens.
+
+Supabase access tokens are JWTs signed either with the project's shared
+secret (HS256) or with an asymmetric key published at
+``/auth/v1/.well-known/jwks.json``. Verifying them here avoids a round-trip
+to ``/auth/v1/user`` on every request; the remote call remains the fallback
+whenever no usable key is available locally.
+
+Because a signed-out token would otherwise stay valid until it expires,
+logout records the token (and its session) in a revocation list kept in
+the job queue's SQLite file, which every API and worker process checks
+before trusting a token.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import jwt
+
+from .job_queue import queue_sqlite_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIENCE = "authenticated"
+DEFAULT_CACHE_TTL_SEC = 60.0
+DEFAULT_CACHE_SIZE = 2048
+DEFAULT_JWKS_TTL_SEC = 600.0
+# An unknown ``kid`` triggers a JWKS refetch (key rotation) at most this often.
+JWKS_REFRESH_MIN_INTERVAL_SEC = 30.0
+DEFAULT_LEEWAY_SEC = 5
+DEFAULT_METRICS_LOG_EVERY = 1000
+
+_ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "EdDSA")
+# Failures that prove the token is bad; anything else falls back to Supabase.
+_DEFINITIVE_ERRORS = (
+    jwt.ExpiredSignatureError,
+    jwt.ImmatureSignatureError,
+    jwt.InvalidAudienceError,
+    jwt.InvalidSignatureError,
+)
+
+
+class TokenRejected(Exception):
+    """The token was verified locally and is invalid (bad signature, expired, wrong audience)."""
+
+
+class AuthLatencyMetrics:
+    """Counts and latency of token verification, split by the path that answered.
+
+    A snapshot is logged every ``log_every`` verifications (0 disables it).
+    """
+
+    PATHS = ("cache", "local", "remote", "rejected")
+
+    def __init__(self, log_every: int = DEFAULT_METRICS_LOG_EVERY) -> None:
+        self.log_every = log_every
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {path: 0 for path in self.PATHS}
+        self._total_ms: Dict[str, float] = {path: 0.0 for path in self.PATHS}
+        self._max_ms: Dict[str, float] = {path: 0.0 for path in self.PATHS}
+
+    def record(self, path: str, elapsed_sec: float) -> None:
+        elapsed_ms = elapsed_sec * 1000.0
+        with self._lock:
+            self._counts[path] += 1
+            self._total_ms[path] += elapsed_ms
+            self._max_ms[path] = max(self._max_ms[path], elapsed_ms)
+            total = sum(self._counts.values())
+        if self.log_every > 0 and total % self.log_every == 0:
+            logger.info("Auth token verification metrics: %s", self.snapshot())
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                path: {
+                    "count": self._counts[path],
+                    "avg_ms": round(self._total_ms[path] / self._counts[path], 3) if self._counts[path] else 0.0,
+                    "max_ms": round(self._max_ms[path], 3),
+                }
+                for path in self.PATHS
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            for path in self.PATHS:
+                self._counts[path] = 0
+                self._total_ms[path] = 0.0
+                self._max_ms[path] = 0.0
+
+
+class TokenRevocations:
+    """
+    Revoked access tokens and sessions, shared across processes through SQLite.
+
+    Entries are keyed by token digest (``token:<sha256>``) or session id
+    (``session:<id>``) and kept until the revoked token would have expired.
+    ``:memory:`` gives a private list for a single process.
+    """
+
+    def __init__(self, path: str | Path = ":memory:"):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path if self.path == ":memory:" else str(Path(self.path).expanduser()),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_tokens (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+
+    def revoke(self, keys: List[str], expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+            self._conn.executemany(
+                "INSERT INTO revoked_tokens (key, expires_at) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET expires_at = MAX(expires_at, excluded.expires_at)",
+                [(key, expires_at) for key in keys],
+            )
+
+    def is_revoked(self, keys: List[str]) -> bool:
+        if not keys:
+            return False
+        placeholders = ", ".join("?" for _ in keys)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM revoked_tokens WHERE expires_at > ? AND key IN ({placeholders}) LIMIT 1",
+                (time.time(), *keys),
+            ).fetchone()
+        return row is not None
+
+
+@dataclass
+class _CachedUser:
+    user: Dict[str, Any]
+    expires_at: float
+
+
+def _user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape verified claims like the ``/auth/v1/user`` fields the API relies on."""
+    return {
+        "id": claims.get("sub"),
+        "email": claims.get("email"),
+        "role": claims.get("role"),
+        "aud": claims.get("aud"),
+        "app_metadata": claims.get("app_metadata") or {},
+        "user_metadata": claims.get("user_metadata") or {},
+    }
+
+
+def _token_key(access_token: str) -> str:
+    # Cache by digest so raw bearer tokens are not kept in memory longer than needed.
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+
+def _unverified_claims(access_token: str) -> Dict[str, Any]:
+    try:
+        return jwt.decode(access_token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return {}
+
+
+def _unverified_expiry(access_token: str) -> Optional[float]:
+    exp = _unverified_claims(access_token).get("exp")
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _revocation_keys(access_token: str) -> List[str]:
+    """The token's own revocation key plus its session's, when it names one."""
+    keys = [f"token:{_token_key(access_token)}"]
+    session_id = _unverified_claims(access_token).get("session_id")
+    if session_id:
+        keys.append(f"session:{session_id}")
+    return keys
+
+
+class TokenVerifier:
+    """
+    Verify access tokens locally with a short-TTL cache of verified users.
+
+    ``verify`` resolves a token to a user dict through, in order: the cache
+    (entries never outlive the token's ``exp``), local JWT verification
+    against ``jwt_secret`` or the cached JWKS, and finally the ``remote``
+    coroutine (Supabase ``/auth/v1/user``). Tokens proven invalid locally,
+    and tokens revoked with ``revoke`` (by any process sharing
+    ``revocations``), raise ``TokenRejected`` without a remote call.
+    """
+
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        *,
+        jwt_secret: Optional[str] = None,
+        audience: Optional[str] = DEFAULT_AUDIENCE,
+        cache_ttl_sec: float = DEFAULT_CACHE_TTL_SEC,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        jwks_ttl_sec: float = DEFAULT_JWKS_TTL_SEC,
+        leeway_sec: int = DEFAULT_LEEWAY_SEC,
+        local_enabled: bool = True,
+        jwks_fetcher: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None,
+        metrics: Optional[AuthLatencyMetrics] = None,
+        revocations: Optional[TokenRevocations] = None,
+    ) -> None:
+        self.supabase_url = (supabase_url or "").rstrip("/")
+        self.jwt_secret = jwt_secret or None
+        self.audience = audience or None
+        self.cache_ttl_sec = cache_ttl_sec
+        self.cache_size = cache_size
+        self.jwks_ttl_sec = jwks_ttl_sec
+        self.leeway_sec = leeway_sec
+        self.local_enabled = local_enabled
+        self.metrics = metrics or AuthLatencyMetrics()
+        self.revocations = revocations or TokenRevocations()
+        self._jwks_fetcher = jwks_fetcher or self._fetch_jwks
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, _CachedUser]" = OrderedDict()
+        self._jwks: Dict[str, jwt.PyJWK] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_attempted_at = 0.0
+
+    @property
+    def jwks_url(self) -> Optional[str]:
+        return f"{self.supabase_url}/auth/v1/.well-known/jwks.json" if self.supabase_url else None
+
+    async def verify(
+        self,
+        access_token: str,
+        remote: Callable[[str], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        key = _token_key(access_token)
+        if self.revocations.is_revoked(_revocation_keys(access_token)):
+            self.metrics.record("rejected", time.perf_counter() - started)
+            raise TokenRejected("Token has been revoked")
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.metrics.record("cache", time.perf_counter() - started)
+            return cached
+
+        if self.local_enabled:
+            try:
+                claims = await self._verify_locally(access_token)
+            except TokenRejected:
+                self.metrics.record("rejected", time.perf_counter() - started)
+                raise
+            if claims is not None:
+                user = _user_from_claims(claims)
+                self._cache_put(key, user, claims.get("exp"))
+                self.metrics.record("local", time.perf_counter() - started)
+                return user
+
+        user = await remote(access_token)
+        self._cache_put(key, user, _unverified_expiry(access_token))
+        self.metrics.record("remote", time.perf_counter() - started)
+        return user
+
+    def revoke(self, access_token: str) -> None:
+        """Reject the token, and its session, until the token expires (e.g. after logout)."""
+        expires_at = _unverified_expiry(access_token) or time.time() + self.cache_ttl_sec
+        self.revocations.revoke(_revocation_keys(access_token), expires_at + self.leeway_sec)
+        with self._lock:
+            self._cache.pop(_token_key(access_token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._jwks = {}
+            self._jwks_fetched_at = 0.0
+            self._jwks_attempted_at = 0.0
+
+    # --- Cache ---------------------------------------------------------------
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return dict(entry.user)
+
+    def _cache_put(self, key: str, user: Dict[str, Any], token_exp: Any) -> None:
+        if self.cache_ttl_sec <= 0 or not user.get("id"):
+            return
+        expires_at = time.time() + self.cache_ttl_sec
+        if isinstance(token_exp, (int, float)):
+            expires_at = min(expires_at, float(token_exp))
+        with self._lock:
+            self._cache[key] = _CachedUser(user=dict(user), expires_at=expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # --- Local verification --------------------------------------------------
+
+    async def _verify_locally(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """Verified claims, None when no local key applies, TokenRejected when invalid."""
+        try:
+            header = jwt.get_unverified_header(access_token)
+        except jwt.InvalidTokenError:
+            return None
+        algorithm = header.get("alg")
+        resolved = await self._resolve_key(algorithm, header.get("kid"))
+        if resolved is None:
+            return None
+        key, algorithms = resolved
+        try:
+            claims = jwt.decode(
+                access_token,
+                key=key,
+                algorithms=algorithms,
+                audience=self.audience,
+                leeway=self.leeway_sec,
+                options={"require": ["exp", "sub"], "verify_aud": self.audience is not None},
+            )
+        except _DEFINITIVE_ERRORS as exc:
+            raise TokenRejected(str(exc)) from exc
+        except jwt.InvalidTokenError as exc:
+            logger.debug("Local token verification inconclusive: %s", exc)
+            return None
+        return claims
+
+    async def _resolve_key(self, algorithm: Optional[str], kid: Optional[str]) -> Optional[Tuple[Any, List[str]]]:
+        if algorithm == "HS256":
+            return (self.jwt_secret, ["HS256"]) if self.jwt_secret else None
+        if algorithm not in _ASYMMETRIC_ALGORITHMS or not self.jwks_url:
+            return None
+        jwk = await self._jwk_for(kid)
+        if jwk is None:
+            return None
+        if jwk.algorithm_name and jwk.algorithm_name != algorithm:
+            raise TokenRejected(f"Token algorithm {algorithm} does not match key {kid}")
+        return jwk.key, [algorithm]
+
+    async def _jwk_for(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        now = time.monotonic()
+        with self._lock:
+            keys = self._jwks
+            stale = not keys or now - self._jwks_fetched_at > self.jwks_ttl_sec
+            unknown = kid not in keys if kid else len(keys) != 1
+            may_fetch = now - self._jwks_attempted_at > JWKS_REFRESH_MIN_INTERVAL_SEC or not self._jwks_attempted_at
+            if (stale or unknown) and may_fetch:
+                self._jwks_attempted_at = now
+            else:
+                may_fetch = False
+        if may_fetch:
+            keys = await self._refresh_jwks() or keys
+        if kid:
+            return keys.get(kid)
+        return next(iter(keys.values())) if len(keys) == 1 else None
+
+    async def _refresh_jwks(self) -> Optional[Dict[str, jwt.PyJWK]]:
+        url = self.jwks_url
+        if not url:
+            return None
+        try:
+            document = await self._jwks_fetcher(url)
+            keys: Dict[str, jwt.PyJWK] = {}
+            for raw in document.get("keys") or []:
+                try:
+                    jwk = jwt.PyJWK(raw)
+                except (jwt.PyJWKError, jwt.InvalidKeyError) as exc:
+                    logger.debug("Skipping unusable JWKS key %s: %s", raw.get("kid"), exc)
+                    continue
+                keys[str(raw.get("kid") or "")] = jwk
+        except Exception as exc:
+            logger.warning("Failed to fetch Supabase JWKS from %s: %s", url, exc)
+            return None
+        with self._lock:
+            self._jwks = keys
+            self._jwks_fetched_at = time.monotonic()
+        return keys
+
+    @staticmethod
+    async def _fetch_jwks(url: str) -> Dict[str, Any]:
+        async with httpx.AsyncClient(timeout=5) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.json()
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+_token_verifier: Optional[TokenVerifier] = None
+_token_verifier_lock = threading.Lock()
+
+
+def get_token_verifier() -> TokenVerifier:
+    """
+    Process-wide verifier configured from the environment.
+
+    SUPABASE_JWT_SECRET enables HS256 verification; asymmetric tokens use
+    the project's JWKS. SUPABASE_JWT_AUDIENCE (default ``authenticated``),
+    AUTH_TOKEN_CACHE_TTL_SEC, AUTH_JWKS_TTL_SEC and AUTH_LOCAL_VERIFY=0
+    (always ask Supabase) tune it. Revocations live in the SCAN_QUEUE_URL
+    SQLite file so every process sees a logout.
+    """
+    global _token_verifier
+    with _token_verifier_lock:
+        if _token_verifier is None:
+            _token_verifier = TokenVerifier(
+                os.getenv("SUPABASE_URL"),
+                jwt_secret=os.getenv("SUPABASE_JWT_SECRET"),
+                audience=os.getenv("SUPABASE_JWT_AUDIENCE", DEFAULT_AUDIENCE),
+                cache_ttl_sec=_float_env("AUTH_TOKEN_CACHE_TTL_SEC", DEFAULT_CACHE_TTL_SEC),
+                jwks_ttl_sec=_float_env("AUTH_JWKS_TTL_SEC", DEFAULT_JWKS_TTL_SEC),
+                local_enabled=os.getenv("AUTH_LOCAL_VERIFY", "1") != "0",
+                revocations=TokenRevocations(queue_sqlite_path(os.getenv("SCAN_QUEUE_URL"))),
+            )
+        return _token_verifier
+
+
+def reset_token_verifier() -> None:
+    """Drop the shared verifier so the next call re-reads the environment."""
+    global _token_verifier
+    with _token_verifier_lock:
+        _token_verifier = None
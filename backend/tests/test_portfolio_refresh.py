@@ -10,6 +10,7 @@ from fastapi.testclient import TestClient
 
 import api.portfolio_routes as portfolio_mod
 from api.dependencies import AuthContext, get_auth_context
+from services.services.content_hash_index import ContentHashIndex
 from services.services.projects_service import ProjectsServiceError
 
 
@@ -19,8 +20,29 @@ from services.services.projects_service import ProjectsServiceError
 
 @pytest.fixture()
 def mock_projects_service():
-    """Return a mock ProjectsService."""
-    return MagicMock()
+    """Return a mock ProjectsService.
+
+    Tests stub get_user_projects and get_cached_files; the portfolio aggregate
+    and the content-hash index the route reads are built from those stubs.
+    """
+    service = MagicMock()
+
+    def get_portfolio_aggregate(user_id):
+        return {"views": {"projects": service.get_user_projects(user_id)}}
+
+    def get_content_hash_index(user_id):
+        index = ContentHashIndex()
+        for project in service.get_user_projects(user_id):
+            cached_files = service.get_cached_files(user_id, project["id"])
+            index.upsert(
+                project["id"],
+                ({"relative_path": path, **meta} for path, meta in cached_files.items()),
+            )
+        return index
+
+    service.get_portfolio_aggregate.side_effect = get_portfolio_aggregate
+    service.get_content_hash_index.side_effect = get_content_hash_index
+    return service
 
 
 @pytest.fixture()
@@ -260,19 +282,12 @@ class TestDeduplication:
 # ---------------------------------------------------------------------------
 
 class TestRefreshResilience:
-    def test_continues_when_one_project_cached_files_fails(self, client, mock_projects_service):
-        """A single project failing to load cached files should not abort the whole refresh."""
-        mock_projects_service.get_user_projects.return_value = [
-            _make_project("p1"), _make_project("p2"),
-        ]
-        mock_projects_service.get_cached_files.side_effect = [
-            Exception("storage unavailable"),
-            _make_cached_files(("ok.py", "abc123", 512)),
-        ]
-        data = client.post("/api/portfolio/refresh").json()
-        assert data["status"] == "completed"
-        assert data["projects_scanned"] == 2
-        assert data["total_files"] == 1
+    def test_returns_500_when_content_hash_index_fails(self, client, mock_projects_service):
+        mock_projects_service.get_user_projects.return_value = [_make_project("p1")]
+        mock_projects_service.get_content_hash_index.side_effect = ProjectsServiceError("storage unavailable")
+        resp = client.post("/api/portfolio/refresh")
+        assert resp.status_code == 500
+        assert "storage unavailable" in resp.json()["detail"]["message"]
 
     def test_returns_500_on_projects_service_error(self, client, mock_projects_service):
         mock_projects_service.get_user_projects.side_effect = ProjectsServiceError("DB down")
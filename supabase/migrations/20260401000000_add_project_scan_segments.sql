@@ -0,0 +1,57 @@
+BEGIN;
+
+-- Append-only delta log of scan_data file entries. Each row holds one
+-- encrypted batch of entries; readers merge segments (in seq order) over
+-- projects.scan_data, and compaction folds them back in and deletes them.
+CREATE TABLE IF NOT EXISTS public.project_scan_segments (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    owner uuid NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    project_id uuid NOT NULL REFERENCES public.projects(id) ON DELETE CASCADE,
+    seq bigserial NOT NULL,
+    entry_count integer NOT NULL DEFAULT 0,
+    payload jsonb NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_project_scan_segments_owner ON public.project_scan_segments(owner);
+CREATE INDEX IF NOT EXISTS idx_project_scan_segments_project_seq ON public.project_scan_segments(project_id, seq);
+
+ALTER TABLE public.project_scan_segments ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS project_scan_segments_select_own ON public.project_scan_segments;
+CREATE POLICY project_scan_segments_select_own
+    ON public.project_scan_segments
+    FOR SELECT
+    USING (owner = auth.uid());
+
+DROP POLICY IF EXISTS project_scan_segments_insert_own ON public.project_scan_segments;
+CREATE POLICY project_scan_segments_insert_own
+    ON public.project_scan_segments
+    FOR INSERT
+    WITH CHECK (owner = auth.uid());
+
+DROP POLICY IF EXISTS project_scan_segments_delete_own ON public.project_scan_segments;
+CREATE POLICY project_scan_segments_delete_own
+    ON public.project_scan_segments
+    FOR DELETE
+    USING (owner = auth.uid());
+
+-- A rescan (new scan_timestamp) supersedes every file appended before it.
+CREATE OR REPLACE FUNCTION public.clear_project_scan_segments()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM public.project_scan_segments WHERE project_id = NEW.id;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS projects_clear_scan_segments ON public.projects;
+CREATE TRIGGER projects_clear_scan_segments
+    AFTER UPDATE OF scan_timestamp ON public.projects
+    FOR EACH ROW
+    WHEN (OLD.scan_timestamp IS DISTINCT FROM NEW.scan_timestamp)
+    EXECUTE FUNCTION public.clear_project_scan_segments();
+
+COMMIT;
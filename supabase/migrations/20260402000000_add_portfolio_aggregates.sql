@@ -0,0 +1,42 @@
+BEGIN;
+
+-- Materialized per-user portfolio aggregate (skills with tiers, skills
+-- timeline, per-project summaries). payload is encrypted like
+-- projects.scan_data. The backend applies each project save/patch/delete
+-- with a compare-and-set on version; rows may be deleted at any time and
+-- are rebuilt from projects on the next read.
+CREATE TABLE IF NOT EXISTS public.portfolio_aggregates (
+    user_id uuid PRIMARY KEY REFERENCES public.profiles(id) ON DELETE CASCADE,
+    version bigint NOT NULL DEFAULT 1,
+    payload jsonb NOT NULL,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+ALTER TABLE public.portfolio_aggregates ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS portfolio_aggregates_select_own ON public.portfolio_aggregates;
+CREATE POLICY portfolio_aggregates_select_own
+    ON public.portfolio_aggregates
+    FOR SELECT
+    USING (user_id = auth.uid());
+
+DROP POLICY IF EXISTS portfolio_aggregates_insert_own ON public.portfolio_aggregates;
+CREATE POLICY portfolio_aggregates_insert_own
+    ON public.portfolio_aggregates
+    FOR INSERT
+    WITH CHECK (user_id = auth.uid());
+
+DROP POLICY IF EXISTS portfolio_aggregates_update_own ON public.portfolio_aggregates;
+CREATE POLICY portfolio_aggregates_update_own
+    ON public.portfolio_aggregates
+    FOR UPDATE
+    USING (user_id = auth.uid())
+    WITH CHECK (user_id = auth.uid());
+
+DROP POLICY IF EXISTS portfolio_aggregates_delete_own ON public.portfolio_aggregates;
+CREATE POLICY portfolio_aggregates_delete_own
+    ON public.portfolio_aggregates
+    FOR DELETE
+    USING (user_id = auth.uid());
+
+COMMIT;
@@ -0,0 +1,9 @@
+BEGIN;
+
+-- Serves the user-wide content-hash index read by the portfolio refresh
+-- (owner filter, ordered by hash) as an index-only scan.
+CREATE INDEX IF NOT EXISTS idx_scan_files_owner_sha256
+    ON public.scan_files(owner, sha256, project_id, relative_path)
+    INCLUDE (size_bytes);
+
+COMMIT;
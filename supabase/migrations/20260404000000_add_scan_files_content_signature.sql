@@ -0,0 +1,10 @@
+BEGIN;
+
+-- MinHash signature of source files ("minhash:<base64>", see
+-- backend/src/scanner/minhash.py). Kept in plain text next to sha256 so the
+-- user-wide index can load it without decrypting metadata, and so re-scans
+-- reuse it for unchanged files.
+ALTER TABLE public.scan_files
+    ADD COLUMN IF NOT EXISTS content_signature text;
+
+COMMIT;
@@ -0,0 +1,10 @@
+BEGIN;
+
+-- scan_timestamp of the scan whose files (plus later appends) are mirrored
+-- in scan_files, so append-upload can read path -> hash from scan_files
+-- instead of decrypting scan_data. A rescan changes scan_timestamp, which
+-- marks the mirror out of date until the next append re-syncs it.
+ALTER TABLE public.projects
+    ADD COLUMN IF NOT EXISTS scan_files_synced_at timestamptz;
+
+COMMIT;
@@ -41,6 +41,10 @@ if str(LOCAL_ANALYSIS_DIR) not in sys.path:
 
 os.environ.setdefault("ALLOWED_HOSTS", "localhost,127.0.0.1,testserver")
 os.environ.setdefault("CAPSTONE_LOCAL_STORE", "1")
+# Keep LLM calls hermetic; tests that exercise the cache build their own instance.
+os.environ.setdefault("LLM_RESPONSE_CACHE", "0")
+# Scan jobs go to a private in-memory queue instead of ~/.cache/capstone.
+os.environ.setdefault("SCAN_QUEUE_URL", "memory://")
 os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
 os.environ.setdefault("SUPABASE_KEY", "test-service-role-key")
 
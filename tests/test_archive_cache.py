@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import types
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner.models import ScanPreferences
+from services import archive_utils
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    root = tmp_path / "demo-project"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "app.py").write_text("print('hello')\n" * 50)
+    (root / "src" / "util.js").write_text("export const x = 1;\n" * 50)
+    (root / "logo.png").write_bytes(b"\x89PNG" + bytes(range(256)) * 4)
+    return root
+
+
+@pytest.fixture(autouse=True)
+def archive_cache(tmp_path, monkeypatch):
+    cache_root = tmp_path / "cache-root"
+    cache_root.mkdir()
+    monkeypatch.setattr(archive_utils, "_project_root", lambda: cache_root)
+    return cache_root
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Names of members compressed from disk (as opposed to copied raw)."""
+    written = []
+    original = zipfile.ZipFile.write
+
+    def tracking_write(self, filename, arcname=None, *args, **kwargs):
+        written.append(arcname)
+        return original(self, filename, arcname, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "write", tracking_write)
+    return written
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+def _contents(archive: Path):
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.testzip() is None
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+class TestEnsureZipManifest:
+    def test_unchanged_tree_reuses_archive(self, project_dir, writes):
+        archive = archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+        first_write = archive.stat().st_mtime_ns
+        writes.clear()
+
+        assert archive_utils.ensure_zip(project_dir, preferences=ScanPreferences()) == archive
+        assert writes == []
+        assert archive.stat().st_mtime_ns == first_write
+
+        manifest = json.loads(archive.with_suffix(".json").read_text())["members"]
+        assert set(manifest) == {"demo-project/src/app.py", "demo-project/src/util.js", "demo-project/logo.png"}
+        assert all({"size", "mtime", "crc32"} <= set(entry) for entry in manifest.values())
+
+    def test_only_changed_members_are_recompressed(self, project_dir, writes):
+        archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+        writes.clear()
+
+        (project_dir / "src" / "app.py").write_text("print('changed')\n")
+        _bump_mtime(project_dir / "src" / "app.py")
+        (project_dir / "src" / "util.js").unlink()
+        (project_dir / "NEW.md").write_text("# New\n")
+        archive = archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+
+        assert sorted(writes) == ["demo-project/NEW.md", "demo-project/src/app.py"]
+        contents = _contents(archive)
+        assert contents["demo-project/src/app.py"] == b"print('changed')\n"
+        assert "demo-project/src/util.js" not in contents
+        assert contents["demo-project/logo.png"] == (project_dir / "logo.png").read_bytes()
+
+    def test_touched_but_identical_file_is_copied(self, project_dir, writes):
+        archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+        writes.clear()
+
+        _bump_mtime(project_dir / "src" / "util.js")
+        archive = archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+
+        assert writes == []
+        manifest = json.loads(archive.with_suffix(".json").read_text())["members"]
+        assert manifest["demo-project/src/util.js"]["mtime"] == (project_dir / "src" / "util.js").stat().st_mtime
+        # The next call is a pure manifest hit.
+        assert archive_utils.ensure_zip(project_dir, preferences=ScanPreferences()) == archive
+        assert writes == []
+
+    def test_compressed_media_is_stored(self, project_dir):
+        archive = archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.getinfo("demo-project/logo.png").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo("demo-project/src/app.py").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_damaged_archive_is_rebuilt(self, project_dir):
+        archive = archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+        archive.write_bytes(b"not a zip")
+        _bump_mtime(project_dir / "src" / "app.py")
+
+        archive = archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+
+        assert _contents(archive)["demo-project/src/app.py"] == (project_dir / "src" / "app.py").read_bytes()
+
+    def test_raw_copy_falls_back_to_recompressing(self, project_dir, writes, monkeypatch):
+        archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+        writes.clear()
+        # Simulate a Python whose zipfile lacks the private names the raw copy relies on.
+        stripped = types.ModuleType("zipfile")
+        stripped.__dict__.update(
+            (name, value) for name, value in vars(zipfile).items() if not name.startswith("_FH_")
+        )
+        monkeypatch.setattr(archive_utils, "zipfile", stripped)
+
+        _bump_mtime(project_dir / "src" / "app.py")
+        archive = archive_utils.ensure_zip(project_dir, preferences=ScanPreferences())
+
+        assert sorted(writes) == ["demo-project/logo.png", "demo-project/src/app.py", "demo-project/src/util.js"]
+        contents = _contents(archive)
+        assert contents["demo-project/src/app.py"] == (project_dir / "src" / "app.py").read_bytes()
+        assert contents["demo-project/logo.png"] == (project_dir / "logo.png").read_bytes()
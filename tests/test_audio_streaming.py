@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+torch = pytest.importorskip("torch")
+
+from scanner import vision
+
+LABELS = ["-", "|"] + list("abcdefghijklmnopqrstuvwxyz'")
+
+
+class OneHotModel:
+    """Emits one frame per sample whose argmax is the sample value."""
+
+    def __init__(self):
+        self.window_sizes = []
+
+    def __call__(self, waveform):
+        self.window_sizes.append(waveform.size(1))
+        emission = torch.nn.functional.one_hot(waveform.long(), len(LABELS)).float()
+        return emission, None
+
+
+def _encode(text: str) -> torch.Tensor:
+    ids = []
+    for char in text:
+        symbol = "|" if char == " " else char
+        ids.extend([LABELS.index(symbol), 0])
+    return torch.tensor(ids, dtype=torch.float32)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(vision, "torch", torch)
+    monkeypatch.setattr(vision, "librosa", None)
+    monkeypatch.setattr(vision, "AUDIO_WINDOW_SEC", 2.0)
+    monkeypatch.setattr(vision, "AUDIO_WINDOW_OVERLAP_SEC", 0.4)
+    engine = object.__new__(vision._AudioInsightEngine)
+    engine.model = OneHotModel()
+    engine.labels = LABELS
+    engine.sample_rate = 10
+    engine.blank_symbol = "-"
+    return engine
+
+
+def _stream(engine, waveform):
+    def chunks(data, suffix, chunk_size):
+        for offset in range(0, waveform.numel(), chunk_size):
+            yield waveform[offset:offset + chunk_size]
+
+    engine._stream_chunks = chunks
+
+
+def test_windows_are_bounded_and_transcripts_stitched(engine):
+    text = "streaming speech recognition keeps memory flat"
+    _stream(engine, _encode(text))
+
+    insights = engine.analyze(b"", suffix=".wav", top_k=2)
+
+    assert insights["transcript"] == text
+    assert len(engine.model.window_sizes) > 1
+    assert max(engine.model.window_sizes) <= 20
+
+
+def test_stops_once_enough_words_are_transcribed(engine, monkeypatch):
+    monkeypatch.setattr(vision, "AUDIO_LABEL_WORD_BUDGET", 4)
+    _stream(engine, _encode("podcast about python " * 20))
+
+    insights = engine.analyze(b"", suffix=".wav", top_k=2)
+
+    assert {label["label"] for label in insights["labels"]} <= {"podcast", "about", "python"}
+    assert len(engine.model.window_sizes) < 10
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner import content_hash
+from scanner.parser import hash_files, parse_directory, parse_zip
+
+
+class TestContentHash:
+    def test_digests_are_tagged_with_their_algorithm(self):
+        digest = content_hash.hash_bytes(b"hello")
+
+        assert digest == "md5:" + hashlib.md5(b"hello").hexdigest()
+        assert content_hash.hash_bytes(b"hello", "sha256") == "sha256:" + hashlib.sha256(b"hello").hexdigest()
+
+    def test_streaming_matches_in_memory_hash(self, tmp_path):
+        data = bytes(range(256)) * 5000
+        path = tmp_path / "blob.bin"
+        path.write_bytes(data)
+
+        assert content_hash.hash_file(path) == content_hash.hash_bytes(data)
+        assert content_hash.hash_stream(io.BytesIO(data), chunk_size=1000) == content_hash.hash_bytes(data)
+
+    def test_algorithm_is_configurable(self, monkeypatch):
+        monkeypatch.setenv("CONTENT_HASH_ALGORITHM", "blake2b128")
+        assert content_hash.hash_bytes(b"x") == "blake2b128:" + hashlib.blake2b(b"x", digest_size=16).hexdigest()
+
+        monkeypatch.setenv("CONTENT_HASH_ALGORITHM", "no-such-hash")
+        assert content_hash.hash_bytes(b"x").startswith("md5:")
+        with pytest.raises(ValueError):
+            content_hash.hash_bytes(b"x", "no-such-hash")
+
+    def test_legacy_digests_are_recognised(self):
+        md5 = hashlib.md5(b"hello").hexdigest()
+        sha = hashlib.sha256(b"hello").hexdigest()
+
+        assert content_hash.normalize_hash(md5) == f"md5:{md5}"
+        assert content_hash.normalize_hash(sha.upper()) == f"sha256:{sha}"
+        assert content_hash.normalize_hash("opaque-value") == "opaque-value"
+        assert content_hash.normalize_hash(None) is None
+
+    def test_same_content_only_compares_like_with_like(self):
+        md5 = hashlib.md5(b"hello").hexdigest()
+        tagged = content_hash.hash_bytes(b"hello", "blake2b128")
+
+        assert content_hash.same_content(md5, f"md5:{md5}") is True
+        assert content_hash.same_content(tagged, content_hash.hash_bytes(b"other", "blake2b128")) is False
+        assert content_hash.same_content(md5, tagged) is None
+        assert content_hash.same_content(None, tagged) is None
+
+    def test_parser_records_tagged_hashes(self, tmp_path):
+        archive = tmp_path / "project.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("project/app.py", "print('hi')\n")
+
+        result = parse_zip(archive)
+
+        (meta,) = [m for m in result.files if m.path == "project/app.py"]
+        assert meta.file_hash == content_hash.hash_bytes(b"print('hi')\n")
+
+    def test_rescan_replaces_cached_hashes_of_other_algorithms(self, tmp_path):
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "app.py").write_text("print('hi')\n")
+        (meta,) = parse_directory(project).files
+
+        def rescan(cached_hash):
+            cached = {
+                meta.path: {
+                    "last_seen_modified_at": meta.modified_at.isoformat(),
+                    "size_bytes": meta.size_bytes,
+                    "metadata": {"file_hash": cached_hash},
+                }
+            }
+            (rescanned,) = parse_directory(project, cached_files=cached).files
+            return rescanned.file_hash
+
+        legacy_md5 = hashlib.md5(b"print('hi')\n").hexdigest()
+        legacy_sha = hashlib.sha256(b"print('hi')\n").hexdigest()
+
+        # Legacy parser digests already match the default algorithm and are kept.
+        assert rescan(legacy_md5) == legacy_md5
+        assert rescan(legacy_sha) == content_hash.hash_bytes(b"print('hi')\n")
+        assert hash_files([meta], project, "sha256") == {meta.path: f"sha256:{legacy_sha}"}
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner.content_hash import hash_bytes
+from services.projects_service import ProjectsService
+from services.services import content_hash_index
+from services.services.content_hash_index import ContentHashIndex
+
+USER = "hash-index-user"
+SHA = "ab" * 32
+
+
+class FakeQuery:
+    def __init__(self, table):
+        self.table = table
+        self.action = None
+        self.payload = None
+        self.filters = []
+
+    def select(self, columns):
+        self.action = ("select", columns)
+        return self
+
+    def upsert(self, payload, on_conflict=None):
+        self.action = ("upsert", on_conflict)
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.action = ("delete", None)
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, tuple(values)))
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.filters.append(("range", (start, end)))
+        return self
+
+    def execute(self):
+        self.table.calls.append(self)
+        if self.action[0] == "select":
+            start, end = dict(self.filters)["range"]
+            return SimpleNamespace(data=self.table.rows[start:end + 1])
+        return SimpleNamespace(data=[])
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.scan_files = FakeTable(rows)
+
+    def table(self, name):
+        assert name == "scan_files"
+        return FakeQuery(self.scan_files)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("CAPSTONE_LOCAL_STORE", "1")
+    monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "test-key-123")
+    content_hash_index.invalidate()
+    svc = ProjectsService(encryption_service=None)
+    svc._use_local_store = False
+    svc.client = FakeClient([
+        {"project_id": "p1", "relative_path": "src/a.py", "size_bytes": 10, "sha256": SHA},
+        {"project_id": "p2", "relative_path": "lib/a.py", "size_bytes": 10, "sha256": f"sha256:{SHA}"},
+        {"project_id": "p2", "relative_path": "lib/b.py", "size_bytes": 5, "sha256": None},
+    ])
+    yield svc
+    content_hash_index.invalidate()
+
+
+class TestContentHashIndex:
+    def test_groups_only_cross_project_duplicates(self):
+        index = ContentHashIndex()
+        index.upsert("p1", [
+            {"relative_path": "a.txt", "size_bytes": 100, "sha256": "h1"},
+            {"relative_path": "copy/a.txt", "size_bytes": 100, "sha256": "h1"},
+            {"relative_path": "b.txt", "size_bytes": 7, "sha256": "h2"},
+        ])
+        index.upsert("p2", [{"relative_path": "a.txt", "size_bytes": 100, "sha256": "h1"}])
+
+        (group,) = index.duplicate_groups()
+        assert group["hash"] == "h1"
+        assert group["wasted_bytes"] == 200
+        assert [f[:2] for f in group["files"]] == [("p1", "a.txt"), ("p1", "copy/a.txt"), ("p2", "a.txt")]
+        assert index.totals() == (4, 307)
+        assert index.duplicate_groups(["p1"]) == []
+        assert index.totals(["p2"]) == (1, 100)
+
+    def test_incremental_updates_move_files_between_hashes(self):
+        index = ContentHashIndex()
+        index.upsert("p1", [{"relative_path": "a.txt", "size_bytes": 1, "sha256": "h1"}])
+        index.upsert("p2", [{"relative_path": "a.txt", "size_bytes": 1, "sha256": "h1"}])
+        assert len(index.duplicate_groups()) == 1
+
+        index.upsert("p2", [{"relative_path": "a.txt", "size_bytes": 1, "sha256": "h2"}])
+        assert index.duplicate_groups() == []
+
+        index.upsert("p3", [{"relative_path": "x", "size_bytes": 1, "sha256": "h2"}])
+        assert [g["hash"] for g in index.duplicate_groups()] == ["h2"]
+
+        index.remove("p3", ["x"])
+        index.remove_project("p2")
+        assert index.duplicate_groups() == []
+        assert index.totals() == (1, 1)
+
+    def test_new_scans_group_with_legacy_parser_hashes(self):
+        content = b"print('hi')\n"
+        index = ContentHashIndex()
+        index.upsert("old", [{"relative_path": "app.py", "size_bytes": 12, "sha256": hashlib.md5(content).hexdigest()}])
+        index.upsert("new", [{"relative_path": "app.py", "size_bytes": 12, "sha256": hash_bytes(content)}])
+
+        (group,) = index.duplicate_groups()
+        assert [f[0] for f in group["files"]] == ["old", "new"]
+
+
+class TestProjectsServiceContentHashIndex:
+    def test_index_is_built_from_one_user_wide_query(self, service):
+        index = service.get_content_hash_index(USER)
+
+        (group,) = index.duplicate_groups()
+        assert group["hash"] == SHA
+        assert index.totals() == (3, 25)
+
+        (call,) = service.client.scan_files.calls
+        assert call.action == ("select", "project_id, relative_path, size_bytes, sha256, content_signature")
+        assert ("owner", USER) in call.filters
+        assert service.get_content_hash_index(USER) is index
+        assert len(service.client.scan_files.calls) == 1
+
+    def test_cached_file_writes_update_the_loaded_index(self, service):
+        index = service.get_content_hash_index(USER)
+
+        service.upsert_cached_files(USER, "p3", [{
+            "relative_path": "vendor/a.py",
+            "size_bytes": 10,
+            "sha256": SHA,
+            "last_seen_modified_at": "2026-01-01T00:00:00",
+            "last_scanned_at": "2026-01-01T00:00:00",
+        }])
+        assert index.duplicate_groups()[0]["wasted_bytes"] == 20
+
+        service.delete_cached_files(USER, "p1", ["src/a.py"])
+        service.delete_cached_files(USER, "p2", ["lib/a.py"])
+        assert index.duplicate_groups() == []
+        assert index.totals() == (2, 15)
+
+    def test_expired_index_is_reloaded(self, service, monkeypatch):
+        service.get_content_hash_index(USER)
+        monkeypatch.setenv("CONTENT_HASH_INDEX_TTL_SEC", "-1")
+
+        service.get_content_hash_index(USER)
+        assert len(service.client.scan_files.calls) == 2
+
+    def test_storing_an_index_sweeps_other_users_expired_indexes(self, service, monkeypatch):
+        content_hash_index.store_index("gone-user", ContentHashIndex())
+        monkeypatch.setenv("CONTENT_HASH_INDEX_TTL_SEC", "-1")
+
+        content_hash_index.store_index(USER, ContentHashIndex())
+        assert "gone-user" not in content_hash_index._indexes
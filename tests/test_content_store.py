@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner.content_store import SourceContentStore, SourceTextMapping
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_text("def main():\n    return 'héllo'\n", encoding="utf-8")
+    return path
+
+
+class TestSourceContentStore:
+    def test_reads_each_file_once(self, source_file):
+        store = SourceContentStore(max_bytes=1024 * 1024)
+
+        data, text = store.read(source_file)
+        assert data == source_file.read_bytes()
+        assert text == source_file.read_text(encoding="utf-8")
+        assert store.read_text(source_file) is text
+        assert store.hits >= 2
+        assert len(store) == 1
+
+    def test_changed_file_is_reread(self, source_file):
+        store = SourceContentStore(max_bytes=1024 * 1024)
+        store.read_text(source_file)
+
+        source_file.write_text("print('changed, and longer')\n")
+        stat = source_file.stat()
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert store.read_text(source_file) == "print('changed, and longer')\n"
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        paths = []
+        for index in range(8):
+            path = tmp_path / f"mod{index}.py"
+            path.write_text("x" * 50)
+            paths.append(path)
+        store = SourceContentStore(max_bytes=500)
+
+        for path in paths:
+            store.read_text(path)
+
+        assert store.size_bytes <= 500
+        assert len(store) < len(paths)
+        # The most recent file survives eviction.
+        store.hits = 0
+        store.read_text(paths[-1])
+        assert store.hits == 1
+
+    def test_large_files_are_not_retained(self, tmp_path):
+        path = tmp_path / "big.js"
+        path.write_bytes(b"a" * 4096)
+        store = SourceContentStore(max_bytes=1024 * 1024, large_file_threshold=1024)
+
+        assert store.read_bytes(path) == b"a" * 4096
+        assert len(store) == 0
+
+    def test_text_mapping_loads_lazily(self, tmp_path, source_file):
+        store = SourceContentStore(max_bytes=1024 * 1024)
+        missing = tmp_path / "gone.py"
+        mapping = SourceTextMapping({"app.py": source_file, "gone.py": missing}, store)
+
+        assert len(mapping) == 2
+        assert len(store) == 0
+        assert dict(mapping.items()) == {"app.py": source_file.read_text(encoding="utf-8")}
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner.models import ScanPreferences
+from scanner.parser import parse_directory, parse_zip
+from services import archive_utils
+from services.services.scan_service import ScanService
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    root = tmp_path / "demo-project"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "app.py").write_text("print('hello')\n")
+    (root / "src" / "util.js").write_text("export const x = 1;\n")
+    (root / "README.md").write_text("# Demo\n")
+    (root / "notes.bin").write_bytes(b"\x00\x01\x02")
+    (root / "node_modules" / "lib").mkdir(parents=True)
+    (root / "node_modules" / "lib" / "index.js").write_text("module.exports = {};\n")
+    (root / ".DS_Store").write_bytes(b"junk")
+    return root
+
+
+@pytest.fixture
+def archive_cache(tmp_path, monkeypatch):
+    cache_root = tmp_path / "cache-root"
+    cache_root.mkdir()
+    monkeypatch.setattr(archive_utils, "_project_root", lambda: cache_root)
+    return cache_root
+
+
+def _by_path(result):
+    return {meta.path: meta for meta in result.files}
+
+
+class TestParseDirectory:
+    def test_matches_zip_round_trip(self, project_dir, archive_cache):
+        """Parsing in place yields the same paths, sizes and hashes as the archive path."""
+        prefs = ScanPreferences()
+        archive = archive_utils.ensure_zip(project_dir, preferences=prefs)
+
+        from_zip = parse_zip(archive, preferences=prefs)
+        direct = parse_directory(
+            project_dir,
+            preferences=prefs,
+            prune_dirs=archive_utils._derive_excluded_dirs(prefs),
+            skip_files=archive_utils._ZIP_EXCLUDE_FILES,
+        )
+
+        zip_files = _by_path(from_zip)
+        direct_files = _by_path(direct)
+        assert set(direct_files) == set(zip_files)
+        assert "demo-project/src/app.py" in direct_files
+        for path, meta in direct_files.items():
+            assert meta.size_bytes == zip_files[path].size_bytes
+            assert meta.file_hash == zip_files[path].file_hash
+            assert meta.mime_type == zip_files[path].mime_type
+        assert direct.summary["files_processed"] == from_zip.summary["files_processed"]
+
+    def test_relevant_only_and_progress(self, project_dir):
+        """Relevance filtering and progress reporting behave like parse_zip."""
+        progress = []
+        result = parse_directory(
+            project_dir,
+            relevant_only=True,
+            progress_callback=lambda processed, total: progress.append((processed, total)),
+        )
+
+        paths = {meta.path for meta in result.files}
+        assert "demo-project/notes.bin" not in paths
+        assert not any("node_modules" in path for path in paths)
+        assert result.summary["filtered_out"] >= 1
+        assert progress[0][0] == 0
+        assert progress[-1][0] == progress[-1][1]
+
+    def test_cached_entries_skip_rehashing(self, project_dir):
+        """Unchanged files reuse cached metadata instead of being hashed again."""
+        first = parse_directory(project_dir)
+        app = _by_path(first)["demo-project/src/app.py"]
+        cached_files = {
+            app.path: {
+                "last_seen_modified_at": app.modified_at.isoformat(),
+                "size_bytes": app.size_bytes,
+                "metadata": {"file_hash": "cached-hash"},
+            }
+        }
+
+        second = parse_directory(project_dir, cached_files=cached_files)
+
+        assert _by_path(second)[app.path].file_hash == "cached-hash"
+        assert second.summary["files_skipped"] == 1
+
+
+class TestScanServiceDirectMode:
+    def test_directory_scan_skips_archive(self, project_dir, archive_cache):
+        """run_scan parses local directories in place and never builds a zip."""
+        result = ScanService().run_scan(project_dir, relevant_only=False, preferences=ScanPreferences())
+
+        assert result.archive_path == project_dir.resolve()
+        assert not (archive_cache / ".tmp_archives").exists()
+        assert any(label == "Directory scan" for label, _ in result.timings)
+        assert "demo-project/README.md" in {meta.path for meta in result.parse_result.files}
+
+    def test_archive_mode_can_be_forced(self, project_dir, archive_cache):
+        result = ScanService().run_scan(
+            project_dir, relevant_only=False, preferences=ScanPreferences(), direct=False
+        )
+
+        assert result.archive_path.suffix == ".zip"
+        assert any(label == "Archive parsing" for label, _ in result.timings)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from analyzer.project_detector import ProjectDetector
+from scanner.inventory import FileInventory
+from scanner.models import ScanPreferences
+from services import archive_utils
+from services.services.scan_service import ScanService
+from services.services.skills_analysis_service import SkillsAnalysisService
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    (root / ".git").mkdir(parents=True)
+    (root / "api" / "src").mkdir(parents=True)
+    (root / "api" / "package.json").write_text('{"name": "api"}\n')
+    (root / "api" / "src" / "index.js").write_text("console.log('hi');\n")
+    (root / "tool" / ".git").mkdir(parents=True)
+    (root / "tool" / "pyproject.toml").write_text("[project]\nname = 'tool'\n")
+    (root / "tool" / "main.py").write_text("def main():\n    return 1\n")
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "node_modules" / "dep" / "index.js").write_text("module.exports = {};\n")
+    (root / "big.py").write_text("x = 1\n" * 2000)
+    return root
+
+
+class TestFileInventory:
+    def test_build_prunes_and_records_listing(self, workspace):
+        inventory = FileInventory.build(workspace)
+
+        paths = {entry.rel_path for entry in inventory.files()}
+        assert "api/src/index.js" in paths
+        assert not any(path.startswith("node_modules/") for path in paths)
+        # Pruned directories are still visible in their parent's listing.
+        dir_names, file_names = inventory.list_dir(workspace)
+        assert "node_modules" in dir_names and ".git" in dir_names
+        assert "big.py" in file_names
+        assert inventory.is_dir(workspace / "node_modules")
+
+    def test_file_filters(self, workspace):
+        inventory = FileInventory.build(workspace)
+
+        under_api = {entry.rel_path for entry in inventory.files(under=workspace / "api")}
+        assert under_api == {"api/package.json", "api/src/index.js"}
+        python = {entry.rel_path for entry in inventory.files(extensions={".py"}, max_size=1024)}
+        assert python == {"tool/main.py"}
+        shallow = {entry.rel_path for entry in inventory.files(under=workspace / "api", max_depth=1)}
+        assert shallow == {"api/package.json"}
+        assert not list(inventory.files(exclude_dirs={"api", "tool"}, extensions={".js"}))
+
+    def test_git_roots_and_hash(self, workspace):
+        inventory = FileInventory.build(workspace)
+
+        assert inventory.git_roots() == [workspace.resolve(), (workspace / "tool").resolve()]
+        entry = next(inventory.files(extensions={".py"}, max_size=1024))
+        digest = inventory.file_hash(entry)
+        assert digest and entry.file_hash == digest
+
+
+class TestInventoryConsumers:
+    def test_project_detector_matches_walk(self, workspace):
+        detector = ProjectDetector()
+        inventory = FileInventory.build(workspace)
+
+        walked = detector.detect_projects(workspace)
+        listed = detector.detect_projects(workspace, inventory=inventory)
+
+        assert [(p.name, p.project_type) for p in listed] == [(p.name, p.project_type) for p in walked]
+
+    def test_skills_source_reads_match_walk(self, workspace):
+        inventory = FileInventory.build(workspace)
+
+        walked = SkillsAnalysisService()._read_source_files(workspace)
+        listed = SkillsAnalysisService(inventory=inventory)._read_source_files(workspace)
+
+        assert listed == walked
+
+    def test_scan_result_carries_inventory(self, workspace, tmp_path, monkeypatch):
+        monkeypatch.setattr(archive_utils, "_project_root", lambda: tmp_path)
+        result = ScanService().run_scan(workspace, relevant_only=False, preferences=ScanPreferences())
+
+        assert isinstance(result.inventory, FileInventory)
+        assert result.inventory.root == workspace.resolve()
+        assert any(label == "File inventory" for label, _ in result.timings)
+        assert result.git_repos == result.inventory.git_roots()
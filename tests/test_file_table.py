@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner.file_table import FileRow, FileTable
+from scanner.models import FileMetadata, ParseResult
+from services.language_stats import summarize_languages
+from services.services.duplicate_detection_service import DuplicateDetectionService
+from services.services.search_service import SearchFilters, SearchService
+
+NOW = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def _files() -> list[FileMetadata]:
+    return [
+        FileMetadata(
+            path="src/main.py",
+            size_bytes=1024,
+            mime_type="text/x-python",
+            created_at=NOW - timedelta(days=30),
+            modified_at=NOW - timedelta(days=7),
+            file_hash="blake2b128:" + "ab" * 16,
+            content_signature="minhash:abc",
+        ),
+        FileMetadata(
+            path="vendor/main.py",
+            size_bytes=1024,
+            mime_type="text/x-python",
+            created_at=NOW - timedelta(days=30),
+            modified_at=NOW,
+            file_hash="blake2b128:" + "ab" * 16,
+        ),
+        FileMetadata(
+            path="web/App.TSX",
+            size_bytes=2048,
+            mime_type="text/plain",
+            created_at=datetime(2025, 12, 24, 9, 15),  # naive timestamps keep their wall-clock time
+            modified_at=datetime(2026, 1, 2, 18, 0),
+            file_hash="d41d8cd98f00b204e9800998ecf8427e",  # untagged legacy MD5
+        ),
+        FileMetadata(
+            path="assets/logo.png",
+            size_bytes=9000,
+            mime_type="image/png",
+            created_at=NOW - timedelta(days=1),
+            modified_at=NOW - timedelta(days=1),
+            media_info={"media_type": "image", "width": 64, "height": 64},
+        ),
+        FileMetadata(
+            path="README",
+            size_bytes=10,
+            mime_type="text/plain",
+            created_at=NOW.astimezone(timezone(timedelta(hours=-7))),
+            modified_at=NOW,
+            file_hash="sha256:not-hex",
+        ),
+    ]
+
+
+def test_rows_round_trip_every_field():
+    files = _files()
+    table = FileTable(files)
+
+    assert len(table) == len(files)
+    assert table.to_files() == files
+    assert [row.extension for row in table] == [".py", ".py", ".tsx", ".png", ""]
+    assert table[-1].created_at.utcoffset() == timedelta(hours=-7)
+    assert isinstance(table[0], FileRow) and table[0] == files[0]
+    assert [row.path for row in table[1:3]] == ["vendor/main.py", "web/App.TSX"]
+    assert FileTable.from_files(table) is table
+
+
+def test_missing_timestamps_never_match_date_filters():
+    table = FileTable([FileMetadata("a.txt", 1, "text/plain", None, NOW)])  # type: ignore[arg-type]
+
+    assert table[0].created_at is None
+    assert table.where_created(after=NOW - timedelta(days=365)) == []
+    assert table.where_modified(before=NOW) == [0]
+
+
+def test_filters_chain_and_group_by():
+    table = FileTable(_files())
+
+    python = table.where_extension({".py"})
+    assert python == [0, 1]
+    assert table.where_size(min_size=2000, rows=python) == []
+    assert table.where_mime_type({"TEXT/PLAIN"}) == [2, 4]
+    assert table.where_modified(after=NOW - timedelta(days=2)) == [1, 3, 4]
+    assert table.size_by("extension")[".py"] == (2, 2048)
+    assert table.group_by("file_hash")["blake2b128:" + "ab" * 16] == [0, 1]
+    assert table.total_size(python) == 2048
+
+
+def test_search_over_table_matches_list_search():
+    service = SearchService()
+    # The list search cannot compare naive and aware timestamps, so leave the naive file out.
+    files = [f for f in _files() if f.created_at.tzinfo is not None]
+    table = FileTable(files)
+    cases = [
+        SearchFilters(extensions={"py", ".tsx"}),
+        SearchFilters(languages={"python"}, path_contains="SRC"),
+        SearchFilters(filename_pattern="*.py", min_size=1000, max_size=1024),
+        SearchFilters(filename_pattern="main"),
+        SearchFilters(mime_types={"text/plain"}, modified_after=NOW - timedelta(days=1)),
+        SearchFilters(created_before=NOW - timedelta(days=2)),
+    ]
+
+    for filters in cases:
+        expected = service.search(ParseResult(files=files), filters)
+        actual = service.search(ParseResult(files=table), filters)
+        assert [f.path for f in actual.files] == [f.path for f in expected.files], filters
+        assert actual.total_size_bytes == expected.total_size_bytes
+
+
+def test_language_summary_and_duplicates_accept_tables():
+    files = _files()
+    table = FileTable(files)
+
+    assert summarize_languages(table) == summarize_languages(files)
+
+    service = DuplicateDetectionService()
+    from_table = service.analyze_duplicates(ParseResult(files=table), exclude_extensions=[".png"])
+    from_list = service.analyze_duplicates(ParseResult(files=files), exclude_extensions=[".png"])
+    assert [[f.path for f in g.files] for g in from_table.duplicate_groups] == [["src/main.py", "vendor/main.py"]]
+    assert from_table.files_with_hash == from_list.files_with_hash == 4
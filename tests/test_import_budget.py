@@ -0,0 +1,64 @@
+"""Cold-start guards: importing the scanner must not pull in the ML stack."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+
+HEAVY_MODULES = ("torch", "torchvision", "torchaudio", "librosa")
+# Cumulative -X importtime budget for scanner.parser, in milliseconds.
+IMPORT_BUDGET_MS = int(os.getenv("SCANNER_IMPORT_BUDGET_MS", "1500"))
+
+# Records every attempt to import a heavy module, whether or not it is installed.
+_PROBE = """
+import json, sys
+
+HEAVY = set(sys.argv[1].split(","))
+attempted = []
+
+class Recorder:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in HEAVY:
+            attempted.append(name)
+        return None
+
+sys.meta_path.insert(0, Recorder())
+import scanner.parser
+import scanner.media
+print(json.dumps(attempted))
+"""
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=str(backend_src),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_scanner_import_does_not_load_ml_stack():
+    result = _run("-c", _PROBE, ",".join(HEAVY_MODULES))
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_scanner_import_time_budget():
+    result = _run("-X", "importtime", "-c", "import scanner.parser")
+    assert result.returncode == 0, result.stderr
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| scanner\.parser$", line)
+        if match:
+            cumulative_us = int(match.group(1))
+    assert cumulative_us is not None, result.stderr[-2000:]
+    assert cumulative_us / 1000 < IMPORT_BUDGET_MS
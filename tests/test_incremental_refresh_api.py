@@ -39,6 +39,7 @@ from backend.src.main import app
 from api.dependencies import AuthContext, get_auth_context
 from api.portfolio_routes import get_projects_service
 from api.project_routes import _to_pg_timestamptz
+from services.services.content_hash_index import ContentHashIndex
 
 client = TestClient(app)
 
@@ -129,6 +130,21 @@ class FakeProjectsService:
             }
         return self._cached_files.get(project_id, {})
 
+    def get_portfolio_aggregate(self, user_id):
+        """Return the aggregate's project summaries."""
+        return {"views": {"projects": self.get_user_projects(user_id)}}
+
+    def get_content_hash_index(self, user_id):
+        """Return a content-hash index over every project's cached files."""
+        index = ContentHashIndex()
+        for project in self.get_user_projects(user_id):
+            cached_files = self.get_cached_files(user_id, project["id"])
+            index.upsert(
+                project["id"],
+                ({"relative_path": path, **meta} for path, meta in cached_files.items()),
+            )
+        return index
+
     def get_project_scan(self, user_id, project_id):
         """Return mock project scan data."""
         if project_id in ["project-1", "project-2"]:
@@ -139,6 +155,12 @@ class FakeProjectsService:
             }
         return self._projects.get(project_id)
 
+    def get_project_file_hashes(self, user_id, project_id):
+        """Return path -> hash of the project's files, or None when missing."""
+        if self.get_project_scan(user_id, project_id) is None:
+            return None
+        return {path: meta.get("sha256") for path, meta in self.get_cached_files(user_id, project_id).items()}
+
     def upsert_cached_files(self, user_id, project_id, files):
         """Mock upsert cached files."""
         if project_id not in self._cached_files:
@@ -311,6 +333,80 @@ class TestAppendUpload:
         assert response.status_code in [401, 404]
 
 
+class TestAppendLegacyHashes:
+    """Append compares uploads against files stored with legacy (untagged MD5) hashes."""
+
+    def test_unchanged_and_moved_files_match_legacy_hashes(self, tmp_path, monkeypatch):
+        import asyncio
+        import api.project_routes as project_routes
+        import api.upload_routes as upload_routes
+
+        same, moved, edited = b"print('same')\n", b"print('moved')\n", b"print('edited')\n"
+        stored = {
+            "src/same.py": hashlib.md5(same).hexdigest(),
+            "src/old_name.py": hashlib.md5(moved).hexdigest(),
+            "src/edited.py": hashlib.md5(b"print('before')\n").hexdigest(),
+        }
+        archive = tmp_path / "upload.zip"
+        archive.write_bytes(create_test_zip({
+            "src/same.py": same,
+            "src/new_name.py": moved,
+            "src/edited.py": edited,
+        }))
+        service = MagicMock()
+        service.get_project_file_hashes.return_value = stored
+        monkeypatch.setattr(project_routes, "get_projects_service", lambda: service)
+        monkeypatch.setitem(
+            upload_routes.uploads_store,
+            "upl_legacy",
+            {"user_id": VALID_USER_ID, "storage_path": str(archive)},
+        )
+
+        response = asyncio.run(project_routes.append_upload_to_project(
+            "project-1",
+            "upl_legacy",
+            project_routes.AppendUploadRequest(),
+            user_id=VALID_USER_ID,
+        ))
+
+        statuses = {entry.path: entry.status for entry in response.files}
+        assert statuses == {
+            "src/same.py": "skipped_duplicate",
+            "src/new_name.py": "skipped_duplicate",
+            "src/edited.py": "updated",
+        }
+        (upserted,) = service.upsert_cached_files.call_args.args[2]
+        assert upserted["relative_path"] == "src/edited.py"
+
+    def test_file_without_stored_hash_is_updated(self, tmp_path, monkeypatch):
+        import asyncio
+        import api.project_routes as project_routes
+        import api.upload_routes as upload_routes
+
+        archive = tmp_path / "upload.zip"
+        archive.write_bytes(create_test_zip({"data/big.bin": b"new contents"}))
+        service = MagicMock()
+        # Stored hashes are None for files too large to hash or whose hashing failed
+        service.get_project_file_hashes.return_value = {"data/big.bin": None}
+        monkeypatch.setattr(project_routes, "get_projects_service", lambda: service)
+        monkeypatch.setitem(
+            upload_routes.uploads_store,
+            "upl_unhashed",
+            {"user_id": VALID_USER_ID, "storage_path": str(archive)},
+        )
+
+        response = asyncio.run(project_routes.append_upload_to_project(
+            "project-1",
+            "upl_unhashed",
+            project_routes.AppendUploadRequest(),
+            user_id=VALID_USER_ID,
+        ))
+
+        assert [(entry.path, entry.status) for entry in response.files] == [("data/big.bin", "updated")]
+        (upserted,) = service.upsert_cached_files.call_args.args[2]
+        assert upserted["relative_path"] == "data/big.bin"
+
+
 class TestAppendTimestampFormatting:
     """Regression tests for scan_files timestamptz formatting in append flow."""
 
@@ -514,6 +610,21 @@ class FakeTUIProjectsService:
                 }
         return self._cached_files.get(project_id, {})
 
+    def get_portfolio_aggregate(self, user_id):
+        """Return the aggregate's project summaries."""
+        return {"views": {"projects": self.get_user_projects(user_id)}}
+
+    def get_content_hash_index(self, user_id):
+        """Return a content-hash index over every project's cached files."""
+        index = ContentHashIndex()
+        for project in self.get_user_projects(user_id):
+            cached_files = self.get_cached_files(user_id, project["id"])
+            index.upsert(
+                project["id"],
+                ({"relative_path": path, **meta} for path, meta in cached_files.items()),
+            )
+        return index
+
     def get_project_scan(self, user_id, project_id):
         """Return mock project scan data with file_hash in files."""
         if project_id == "tui-project-1":
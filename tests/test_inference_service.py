@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from PIL import Image
+
+from scanner import inference_service, vision
+from scanner.inference_service import InferenceClient, InferenceServer
+
+AUTHKEY = b"test-key"
+
+
+class FakeVisionEngine:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def classify_batch(self, images, *, top_k):
+        with self.lock:
+            self.batches.append(len(images))
+        return [[{"label": f"size-{image.size[0]}", "confidence": 0.9}][:top_k] for image in images]
+
+
+class FakeAudioEngine:
+    def analyze(self, data, *, suffix, top_k):
+        return {"transcript": data.decode(), "labels": [{"label": "speech", "confidence": 0.8}]}
+
+
+@pytest.fixture
+def server(tmp_path):
+    vision_engine = FakeVisionEngine()
+    server = InferenceServer(
+        str(tmp_path / "inference.sock"),
+        AUTHKEY,
+        batch_window_ms=200,
+        max_batch=16,
+        vision_engine=lambda: vision_engine,
+        audio_engine=FakeAudioEngine,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.vision = vision_engine
+    yield server
+    server.close()
+    thread.join(timeout=5)
+
+
+def _png(width: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, 4), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_constructing_a_server_keeps_remote_routing_on(server):
+    # Only the service's own entry point marks its process as the inference service.
+    assert vision._in_inference_service is False
+
+
+def test_concurrent_classify_requests_are_batched(server):
+    client = InferenceClient(server.address, AUTHKEY, autostart=False)
+    results = {}
+
+    def classify(width):
+        results[width] = client.classify_batch([Image.new("RGB", (width, 4))], top_k=1)
+
+    threads = [threading.Thread(target=classify, args=(width,)) for width in range(1, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {width: [[{"label": f"size-{width}", "confidence": 0.9}]] for width in range(1, 9)}
+    assert sum(server.vision.batches) == 8
+    assert len(server.vision.batches) < 8
+
+
+def test_audio_insights_are_served_remotely(server):
+    client = InferenceClient(server.address, AUTHKEY, autostart=False)
+
+    insights = client.audio_insights(b"hello world", ".wav", top_k=3)
+
+    assert insights["transcript"] == "hello world"
+    assert insights["summary"] == "Likely mentions speech (80%)"
+
+
+def test_vision_routes_to_the_service_when_configured(server, monkeypatch):
+    monkeypatch.setenv("MEDIA_INFERENCE_ADDRESS", server.address)
+    monkeypatch.setenv("MEDIA_INFERENCE_AUTHKEY", AUTHKEY.decode())
+    monkeypatch.setattr(inference_service, "_clients", {})
+    monkeypatch.setattr(vision, "_get_engine", lambda: pytest.fail("worker loaded the model"))
+
+    assert vision.image_content_labels(_png(12)) == [{"label": "size-12", "confidence": 0.9}]
+
+
+def test_unreachable_service_degrades_to_empty_results(tmp_path):
+    client = InferenceClient(str(tmp_path / "missing.sock"), AUTHKEY, autostart=False)
+
+    assert client.classify_batch([Image.new("RGB", (2, 2))], top_k=1) == [[]]
+    assert client.audio_insights(b"", ".wav", top_k=1) == {}
+    assert client.ping() is False
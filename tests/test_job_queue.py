@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.job_queue import SQLiteJobQueue, create_job_queue
+
+
+def _enqueue(queue, job_id, user_id):
+    assert queue.enqueue(job_id, user_id, {"source_path": f"/src/{job_id}"}, {"state": "queued"})
+    # created_at orders claims; keep it strictly increasing.
+    time.sleep(0.002)
+
+
+class TestSQLiteJobQueue:
+    def test_claims_are_fair_across_users(self):
+        queue = SQLiteJobQueue(":memory:")
+        for job_id in ("a1", "a2", "a3"):
+            _enqueue(queue, job_id, "alice")
+        _enqueue(queue, "b1", "bob")
+
+        first = queue.claim("w1", lease_sec=30)
+        second = queue.claim("w2", lease_sec=30)
+
+        assert (first.job_id, second.job_id) == ("a1", "b1")
+        assert first.payload == {"source_path": "/src/a1"}
+        assert first.attempts == 1
+
+    def test_per_user_limit(self):
+        queue = SQLiteJobQueue(":memory:")
+        _enqueue(queue, "a1", "alice")
+        _enqueue(queue, "a2", "alice")
+
+        assert queue.claim("w1", lease_sec=30, max_per_user=1).job_id == "a1"
+        assert queue.claim("w2", lease_sec=30, max_per_user=1) is None
+        assert queue.depth() == {"queued": 1, "running": 1}
+
+        queue.finish("a1", "w1")
+        assert queue.claim("w2", lease_sec=30, max_per_user=1).job_id == "a2"
+
+    def test_expired_lease_is_requeued_then_abandoned(self):
+        queue = SQLiteJobQueue(":memory:")
+        _enqueue(queue, "a1", "alice")
+
+        queue.claim("w1", lease_sec=-1)
+        assert queue.requeue_expired(max_attempts=2) == {"requeued": ["a1"], "abandoned": []}
+        assert not queue.heartbeat("a1", "w1", lease_sec=30)
+
+        assert queue.claim("w2", lease_sec=-1).attempts == 2
+        assert queue.requeue_expired(max_attempts=2) == {"requeued": [], "abandoned": ["a1"]}
+        assert queue.depth() == {"queued": 0, "running": 0}
+
+    def test_status_updates_and_status_only_records(self):
+        queue = SQLiteJobQueue(":memory:")
+        _enqueue(queue, "a1", "alice")
+
+        queue.update_status("a1", lambda doc: {**doc, "state": "canceled"}, finished=lambda doc: True)
+        assert queue.get_status("a1") == {"state": "canceled"}
+        assert queue.claim("w1", lease_sec=30) is None
+        assert queue.update_status("a1", lambda doc: None) is None
+
+        queue.put_status("manual", "bob", {"state": "running"})
+        assert queue.get_status("manual") == {"state": "running"}
+        assert queue.claim("w1", lease_sec=30) is None
+        assert not queue.enqueue("manual", "bob", {}, {})
+
+    def test_jobs_survive_reopening_the_database(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'jobs.sqlite3'}"
+        _enqueue(create_job_queue(url), "a1", "alice")
+
+        reopened = create_job_queue(url)
+        assert reopened.get_status("a1") == {"state": "queued"}
+        assert reopened.claim("w1", lease_sec=30).job_id == "a1"
+
+    def test_prune_finished_keeps_live_and_recent_jobs(self):
+        queue = SQLiteJobQueue(":memory:")
+        for job_id in ("old", "new", "live"):
+            _enqueue(queue, job_id, "alice")
+        for job_id in ("old", "new"):
+            queue.put_status(job_id, "alice", {"state": "succeeded"}, finished=True)
+        queue._conn.execute("UPDATE jobs SET updated_at = updated_at - 3600 WHERE job_id IN ('old', 'live')")
+
+        assert queue.prune_finished(older_than_sec=60) == 1
+        assert queue.get_status("old") is None
+        assert queue.get_status("new") == {"state": "succeeded"}
+        assert queue.claim("w1", lease_sec=30).job_id == "live"
+
+    def test_rejects_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_job_queue("redis://localhost")
+
+
+class TestScanWorker:
+    def test_worker_runs_claimed_scan_and_retires_it(self, monkeypatch):
+        import api.scan_worker as worker
+        import api.spec_routes as spec
+
+        queue = SQLiteJobQueue(":memory:")
+        monkeypatch.setattr(spec, "get_job_queue", lambda: queue)
+        monkeypatch.setattr(worker, "get_job_queue", lambda: queue)
+        calls = []
+
+        def fake_run(scan_id, source_path, relevance_only, persist_project, profile_id, access_token=None):
+            calls.append((scan_id, source_path, profile_id))
+            spec._update_scan_status(scan_id, spec.JobState.succeeded, result={"ok": True})
+
+        monkeypatch.setattr(spec, "_run_scan_background", fake_run)
+        status = spec.ScanStatus(scan_id="s1", user_id="alice", state=spec.JobState.queued)
+        queue.enqueue(
+            "s1",
+            "alice",
+            {"source_path": "/src/s1", "relevance_only": False, "persist_project": False, "profile_id": "alice"},
+            status.model_dump(mode="json"),
+        )
+
+        assert worker.run_once("w1") is True
+        assert worker.run_once("w1") is False
+
+        assert calls == [("s1", "/src/s1", "alice")]
+        assert spec._scan_store["s1"].state == spec.JobState.succeeded
+        assert queue.depth() == {"queued": 0, "running": 0}
+
+    def test_inline_dispatcher_resumes_jobs_left_by_a_previous_process(self, monkeypatch):
+        import threading
+
+        import api.spec_routes as spec
+
+        queue = SQLiteJobQueue(":memory:")
+        monkeypatch.setattr(spec, "get_job_queue", lambda: queue)
+        monkeypatch.setenv("SCAN_MAX_CONCURRENT_PER_USER", "1")
+        release = threading.Event()
+        started = []
+
+        def fake_run(scan_id, source_path, relevance_only, persist_project, profile_id, access_token=None):
+            started.append(scan_id)
+            release.wait(5)
+            spec._update_scan_status(scan_id, spec.JobState.succeeded, result={"ok": True})
+
+        monkeypatch.setattr(spec, "_run_scan_background", fake_run)
+        for scan_id in ("s1", "s2"):
+            status = spec.ScanStatus(scan_id=scan_id, user_id="alice", state=spec.JobState.queued)
+            _enqueue(queue, scan_id, "alice")
+            queue.put_status(scan_id, "alice", status.model_dump(mode="json"))
+        # s1 was running in an API process that has since died.
+        queue.claim("api-dead", lease_sec=-1)
+
+        dispatcher = spec._InlineScanDispatcher()
+        dispatcher.start()
+        try:
+            deadline = time.time() + 5
+            while not started and time.time() < deadline:
+                time.sleep(0.01)
+            # The per-user cap holds s2 back while s1 runs.
+            assert started == ["s1"]
+            assert queue.depth() == {"queued": 1, "running": 1}
+
+            release.set()
+            while queue.depth() != {"queued": 0, "running": 0} and time.time() < deadline:
+                time.sleep(0.01)
+            assert started == ["s1", "s2"]
+            assert spec._scan_store["s2"].state == spec.JobState.succeeded
+        finally:
+            release.set()
+            dispatcher.stop()
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import Mock, patch
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 backend_src = Path(__file__).parent.parent / "backend" / "src"
 sys.path.insert(0, str(backend_src))
@@ -13,6 +14,20 @@ from analyzer.llm.client import (
     LLMError,
     InvalidAPIKeyError
 )
+from analyzer.llm.response_cache import LLMResponseCache
+from analyzer.llm.transport import TokenBucket, backoff_delay, retry_after_seconds
+
+
+@pytest.fixture(autouse=True)
+def offline_async_client(monkeypatch):
+    """Send async (packed) requests through each test's mocked sync client so no test reaches the network."""
+    def get_async_client(self):
+        async def create(**kwargs):
+            return self.client.chat.completions.create(**kwargs)
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    monkeypatch.setattr(LLMClient, "_get_async_client", get_async_client)
 
 
 class TestLLMClient:
@@ -41,7 +56,9 @@ class TestLLMClient:
             assert client.api_key == "test-key-123"
             assert client.client is not None
             assert client.is_configured()
-            mock_openai.assert_called_once_with(api_key="test-key-123")
+            mock_openai.assert_called_once()
+            assert mock_openai.call_args.kwargs["api_key"] == "test-key-123"
+            assert mock_openai.call_args.kwargs["max_retries"] == 0
     
     def test_client_initialization_failure(self):
         """Test LLM client initialization failure."""
@@ -290,6 +307,252 @@ class TestMakeLLMCall:
         assert "API error" in str(exc_info.value)
 
 
+class TestRetryAndRateLimit:
+    """Test cases for the retry layer and client-side rate limiting."""
+
+    @pytest.fixture
+    def client_with_key(self):
+        """Create a client with a test API key."""
+        with patch('analyzer.llm.client.OpenAI'):
+            client = LLMClient(api_key="test-key", response_cache=Mock(get=Mock(return_value=None)))
+        client.max_retries = 3
+        return client
+
+    @staticmethod
+    def _rate_limit_error(retry_after=None):
+        import httpx
+        import openai
+
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        response = httpx.Response(
+            429,
+            headers=headers,
+            request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+        )
+        return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+    def test_rate_limit_is_retried_honoring_retry_after(self, client_with_key):
+        """A 429 is retried after the server's Retry-After delay."""
+        mock_response = Mock()
+        mock_choice = Mock()
+        mock_choice.message.content = "Recovered"
+        mock_response.choices = [mock_choice]
+        client_with_key.client.chat.completions.create = Mock(
+            side_effect=[self._rate_limit_error("2"), mock_response]
+        )
+
+        with patch('analyzer.llm.client.time.sleep') as mock_sleep:
+            result = client_with_key._make_llm_call([{"role": "user", "content": "test"}])
+
+        assert result == "Recovered"
+        assert client_with_key.client.chat.completions.create.call_count == 2
+        assert mock_sleep.call_args.args[0] >= 2.0
+
+    def test_retries_are_bounded(self, client_with_key):
+        """Persistent rate limiting surfaces as an LLMError after max_retries."""
+        client_with_key.client.chat.completions.create = Mock(side_effect=self._rate_limit_error())
+
+        with patch('analyzer.llm.client.time.sleep'):
+            with pytest.raises(LLMError):
+                client_with_key._make_llm_call([{"role": "user", "content": "test"}])
+
+        assert client_with_key.client.chat.completions.create.call_count == 4
+
+    def test_authentication_error_is_not_retried(self, client_with_key):
+        """Non-transient errors fail immediately."""
+        import openai
+
+        client_with_key.client.chat.completions.create = Mock(
+            side_effect=openai.AuthenticationError(
+                message="Invalid key",
+                response=Mock(status_code=401),
+                body=None
+            )
+        )
+
+        with patch('analyzer.llm.client.time.sleep') as mock_sleep:
+            with pytest.raises(InvalidAPIKeyError):
+                client_with_key._make_llm_call([{"role": "user", "content": "test"}])
+
+        assert client_with_key.client.chat.completions.create.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_async_retries_use_the_injected_sleep(self):
+        """Async retries wait through the client's async_sleep instead of blocking on real backoff."""
+        import asyncio
+
+        delays = []
+
+        async def record_sleep(delay):
+            delays.append(delay)
+
+        with patch('analyzer.llm.client.OpenAI'):
+            client = LLMClient(
+                api_key="test-key",
+                response_cache=Mock(get=Mock(return_value=None)),
+                async_sleep=record_sleep,
+            )
+        client.max_retries = 3
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="Recovered"))]
+        client.client.chat.completions.create = Mock(
+            side_effect=[self._rate_limit_error("2"), mock_response]
+        )
+
+        result = asyncio.run(client._make_llm_call_async([{"role": "user", "content": "test"}]))
+
+        assert result == "Recovered"
+        assert len(delays) == 1 and delays[0] >= 2.0
+
+    def test_retry_after_parsing_and_backoff(self):
+        """Retry-After seconds are read from the response; backoff is capped."""
+        assert retry_after_seconds(self._rate_limit_error("3")) == 3.0
+        assert retry_after_seconds(self._rate_limit_error()) is None
+        assert 3.0 <= backoff_delay(0, retry_after=3.0) <= 3.5
+        assert 0.0 <= backoff_delay(10, cap=5.0) <= 5.0
+
+    def test_token_bucket_throttles_past_capacity(self):
+        """Reservations beyond the bucket return a wait proportional to the deficit."""
+        bucket = TokenBucket(rate_per_minute=60)
+
+        assert bucket.reserve(60) == 0.0
+        wait = bucket.reserve(30)
+        assert 29.0 <= wait <= 30.0
+
+
+class TestResponseCache:
+    """Test cases for the on-disk LLM response cache."""
+
+    @pytest.fixture
+    def cached_client(self, tmp_path):
+        """Create a client backed by a cache in a temp directory."""
+        with patch('analyzer.llm.client.OpenAI'):
+            client = LLMClient(
+                api_key="test-key",
+                response_cache=LLMResponseCache(cache_dir=tmp_path / "cache"),
+            )
+        mock_response = Mock()
+        mock_choice = Mock()
+        mock_choice.message.content = "Cached response"
+        mock_response.choices = [mock_choice]
+        client.client.chat.completions.create = Mock(return_value=mock_response)
+        return client
+
+    def test_repeat_call_is_served_from_cache(self, cached_client):
+        """Identical requests hit the API once."""
+        messages = [{"role": "user", "content": "Summarize this"}]
+
+        first = cached_client._make_llm_call(messages, max_tokens=100, temperature=0.5)
+        second = cached_client._make_llm_call(messages, max_tokens=100, temperature=0.5)
+
+        assert first == second == "Cached response"
+        assert cached_client.client.chat.completions.create.call_count == 1
+        stats = cached_client.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_async_cache_access_runs_off_the_scheduler_loop(self, cached_client):
+        """Cache reads and writes from async calls never run on the shared scheduler thread."""
+        import asyncio
+        import threading
+
+        cache = cached_client.response_cache
+        threads = []
+        original_get, original_set = cache.get, cache.set
+
+        def record_get(key):
+            threads.append(threading.current_thread().name)
+            return original_get(key)
+
+        def record_set(key, value):
+            threads.append(threading.current_thread().name)
+            return original_set(key, value)
+
+        messages = [{"role": "user", "content": "Summarize this"}]
+        with patch.object(cache, "get", side_effect=record_get), \
+                patch.object(cache, "set", side_effect=record_set):
+            first = asyncio.run(cached_client._make_llm_call_async(messages))
+            second = asyncio.run(cached_client._make_llm_call_async(messages))
+
+        assert first == second == "Cached response"
+        assert cached_client.client.chat.completions.create.call_count == 1
+        assert len(threads) == 3
+        assert "llm-summary-scheduler" not in threads
+
+    def test_key_covers_request_parameters(self, cached_client):
+        """Changing any request parameter is a cache miss."""
+        messages = [{"role": "user", "content": "Summarize this"}]
+
+        cached_client._make_llm_call(messages, max_tokens=100, temperature=0.5)
+        cached_client._make_llm_call(messages, max_tokens=200, temperature=0.5)
+        cached_client._make_llm_call(messages, max_tokens=100, temperature=0.6)
+        cached_client._make_llm_call(
+            messages, max_tokens=100, temperature=0.5, response_format={"type": "json_object"}
+        )
+
+        assert cached_client.client.chat.completions.create.call_count == 4
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Entries older than the TTL are ignored."""
+        cache = LLMResponseCache(cache_dir=tmp_path, ttl_seconds=60)
+        key = LLMResponseCache.make_key("m", [{"role": "user", "content": "x"}], 0.5, 10)
+        cache.set(key, "value")
+
+        with patch('analyzer.llm.response_cache.time.time', return_value=10**12):
+            assert cache.get(key) is None
+        assert cache.get(key) is None  # expired entry was removed
+
+    def test_eviction_keeps_cache_under_budget(self, tmp_path):
+        """Least recently used entries are evicted past max_bytes."""
+        import os
+
+        cache = LLMResponseCache(cache_dir=tmp_path, max_bytes=2000)
+        keys = [f"{i:064x}" for i in range(10)]
+        for index, key in enumerate(keys):
+            cache.set(key, "x" * 400)
+            entry = tmp_path / key[:2] / f"{key}.json"
+            os.utime(entry, (1_000 + index, 1_000 + index))
+
+        cache.evict()
+
+        assert cache.stats()["bytes"] <= 2000
+        assert cache.get(keys[-1]) == "x" * 400
+        assert cache.get(keys[0]) is None
+
+    def test_default_cache_is_opt_in(self, monkeypatch):
+        """The shared cache stays off unless LLM_RESPONSE_CACHE is enabled."""
+        from analyzer.llm.response_cache import get_default_response_cache
+
+        monkeypatch.delenv("LLM_RESPONSE_CACHE", raising=False)
+        assert get_default_response_cache() is None
+
+    def test_encrypted_entries_hold_no_plaintext(self, tmp_path):
+        """With a cipher the response is only stored encrypted."""
+        import os
+
+        pytest.importorskip("cryptography")
+        from services.services.encryption import EncryptionService
+
+        key = LLMResponseCache.make_key("m", [{"role": "user", "content": "x"}], 0.5, 10)
+        cipher = EncryptionService(key=os.urandom(32))
+        cache = LLMResponseCache(cache_dir=tmp_path, cipher=cipher)
+        cache.set(key, "secret summary")
+
+        assert cache.get(key) == "secret summary"
+        assert b"secret summary" not in (tmp_path / key[:2] / f"{key}.json").read_bytes()
+        other = EncryptionService(key=os.urandom(32))
+        assert LLMResponseCache(cache_dir=tmp_path, cipher=other).get(key) is None
+
+    def test_malformed_file_pack_response_is_not_replayed(self, cached_client):
+        """An unparseable packed response is evicted so a rerun asks again."""
+        cached_client.client.chat.completions.create.return_value.choices[0].message.content = "not json"
+        files = [("a.py", "print(1)", "python")]
+
+        assert cached_client.summarize_file_pack(files, fallback=False) == []
+        assert cached_client.summarize_file_pack(files, fallback=False) == []
+        assert cached_client.client.chat.completions.create.call_count == 2
+
+
 class TestChunkAndSummarize:
     """Test cases for chunk_and_summarize method."""
     
@@ -882,6 +1145,199 @@ class TestSummarizeScanWithAI:
         assert "file_summaries" in result
 
 
+    def test_summarize_scan_streams_summaries_without_batch_barrier(self, client_with_key, tmp_path, monkeypatch):
+        """A slow file must not hold back summaries of fast files."""
+        import asyncio
+
+        monkeypatch.setenv("AI_PACK_SMALL_FILES", "0")
+
+        for name in ("slow.py", "a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text(f"print('{name}')\n")
+        relevant_files = [
+            {"path": name, "size": 20, "mime_type": "text/x-python"}
+            for name in ("slow.py", "a.py", "b.py", "c.py")
+        ]
+
+        async def fake_summarize(file_path, content, file_type, **_kwargs):
+            if file_path == "slow.py":
+                await asyncio.sleep(0.5)
+            return {"file_path": file_path, "file_type": file_type, "analysis": "ok"}
+
+        streamed = []
+        with patch.object(client_with_key, "summarize_tagged_file_async", side_effect=fake_summarize), \
+             patch.object(client_with_key, "analyze_project", return_value={"analysis": "done"}):
+            result = client_with_key.summarize_scan_with_ai(
+                scan_summary={"total_files": 4},
+                relevant_files=relevant_files,
+                scan_base_path=str(tmp_path),
+                summary_callback=lambda summary: streamed.append(summary["file_path"]),
+            )
+
+        assert result["files_analyzed_count"] == 4
+        assert sorted(streamed) == ["a.py", "b.py", "c.py", "slow.py"]
+        assert streamed[-1] == "slow.py"
+
+    def test_concurrency_limit_follows_env_changes(self, client_with_key, tmp_path, monkeypatch):
+        """AI_MAX_CONCURRENT_SUMMARIES is re-applied to the shared scheduler on each scan."""
+        import asyncio
+
+        monkeypatch.setenv("AI_PACK_SMALL_FILES", "0")
+        names = ("a.py", "b.py", "c.py", "d.py")
+        for name in names:
+            (tmp_path / name).write_text(f"print('{name}')\n")
+        relevant_files = [{"path": name, "size": 20, "mime_type": "text/x-python"} for name in names]
+
+        in_flight = []
+        peaks = []
+
+        async def fake_summarize(file_path, content, file_type, **_kwargs):
+            in_flight.append(file_path)
+            peaks.append(len(in_flight))
+            await asyncio.sleep(0.05)
+            in_flight.remove(file_path)
+            return {"file_path": file_path, "file_type": file_type, "analysis": "ok"}
+
+        def run_scan(limit):
+            monkeypatch.setenv("AI_MAX_CONCURRENT_SUMMARIES", str(limit))
+            peaks.clear()
+            with patch.object(client_with_key, "summarize_tagged_file_async", side_effect=fake_summarize), \
+                 patch.object(client_with_key, "analyze_project", return_value={"analysis": "done"}):
+                client_with_key.summarize_scan_with_ai(
+                    scan_summary={"total_files": len(names)},
+                    relevant_files=relevant_files,
+                    scan_base_path=str(tmp_path),
+                )
+            return max(peaks)
+
+        assert run_scan(1) == 1
+        assert run_scan(4) == 4
+        assert run_scan(2) == 2
+
+    def test_single_file_timeout_cancels_the_request(self, client_with_key, tmp_path):
+        """A per-file timeout cancels the in-flight request rather than abandoning it."""
+        import asyncio
+
+        cancelled = []
+
+        async def hang(*_args, **_kwargs):
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        (tmp_path / "slow.py").write_text("x = 1\n")
+        skipped = []
+        with patch.object(client_with_key, "_make_llm_call_async", side_effect=hang):
+            summary = asyncio.run(client_with_key._summarize_single_file(
+                ("slow.py", tmp_path / "slow.py", ".py", 6),
+                per_file_timeout_sec=0.1,
+                skipped_files=skipped,
+            ))
+
+        assert summary is None
+        assert cancelled == [True]
+        assert "timed out" in skipped[0]["reason"]
+
+    def test_summarize_scan_respects_file_cap_and_token_budget(self, client_with_key, tmp_path, monkeypatch):
+        """Files beyond the cap or token budget are reported as skipped."""
+        for name in ("a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text("x = 1\n" * 100)
+        relevant_files = [
+            {"path": name, "size": 600, "mime_type": "text/x-python"}
+            for name in ("a.py", "b.py", "c.py")
+        ]
+        monkeypatch.setenv("AI_PACK_SMALL_FILES", "0")
+        monkeypatch.setenv("AI_MAX_SUMMARY_FILES", "2")
+        monkeypatch.setenv("AI_SUMMARY_TOKEN_BUDGET", "200")
+
+        def fake_summarize(file_path, content, file_type, **_kwargs):
+            return {"file_path": file_path, "file_type": file_type, "analysis": "ok"}
+
+        with patch.object(client_with_key, "summarize_tagged_file_async", side_effect=fake_summarize), \
+             patch.object(client_with_key, "analyze_project", return_value={"analysis": "done"}):
+            result = client_with_key.summarize_scan_with_ai(
+                scan_summary={"total_files": 3},
+                relevant_files=relevant_files,
+                scan_base_path=str(tmp_path),
+            )
+
+        reasons = [entry["reason"] for entry in result["skipped_files"]]
+        assert result["files_analyzed_count"] == 1
+        assert any("file smart ranking cap" in reason for reason in reasons)
+        assert any("token AI summary budget" in reason for reason in reasons)
+
+
+    def test_summarize_scan_packs_small_files_into_one_call(self, client_with_key, tmp_path):
+        """Small files share one prompt and are split back into per-file summaries."""
+        import json as _json
+
+        names = ("config.py", "utils.py", "constants.py")
+        for name in names:
+            (tmp_path / name).write_text(f"VALUE = '{name}'\n")
+        relevant_files = [{"path": name, "size": 20, "mime_type": "text/x-python"} for name in names]
+
+        packed_payload = _json.dumps({"files": [
+            {
+                "file_path": name,
+                "summary": f"Defines {name}.",
+                "key_functionality": ["Holds a constant"],
+                "notable_patterns": ["Module-level constant"],
+            }
+            for name in names
+        ]})
+        pack_calls = []
+
+        async def fake_call(messages, **kwargs):
+            pack_calls.append(kwargs)
+            return packed_payload
+
+        with patch.object(client_with_key, "_make_llm_call_async", side_effect=fake_call), \
+             patch.object(client_with_key, "summarize_tagged_file_async") as single_summary, \
+             patch.object(client_with_key, "analyze_project", return_value={"analysis": "done"}):
+            result = client_with_key.summarize_scan_with_ai(
+                scan_summary={"total_files": 3},
+                relevant_files=relevant_files,
+                scan_base_path=str(tmp_path),
+            )
+
+        assert len(pack_calls) == 1
+        assert pack_calls[0]["response_format"] == {"type": "json_object"}
+        single_summary.assert_not_called()
+        assert sorted(s["file_path"] for s in result["file_summaries"]) == sorted(names)
+        assert all(s["analysis"].startswith("SUMMARY: Defines") for s in result["file_summaries"])
+
+    def test_summarize_file_pack_falls_back_for_missing_entries(self, client_with_key):
+        """Files absent from the packed response are summarized individually."""
+        import json as _json
+
+        packed_payload = _json.dumps({"files": [
+            {"file_path": "a.py", "summary": "Does A.", "key_functionality": [], "notable_patterns": []},
+        ]})
+        fallback = {"file_path": "b.py", "file_type": ".py", "analysis": "single"}
+
+        with patch.object(client_with_key, "_make_llm_call", return_value=packed_payload), \
+             patch.object(client_with_key, "summarize_tagged_file", return_value=fallback) as single_summary:
+            results = client_with_key.summarize_file_pack([
+                ("a.py", "a = 1", ".py"),
+                ("b.py", "b = 2", ".py"),
+            ])
+
+        assert [r["file_path"] for r in results] == ["a.py", "b.py"]
+        assert results[1] is fallback
+        single_summary.assert_called_once()
+
+    def test_summarize_file_pack_malformed_response_without_fallback(self, client_with_key):
+        """Malformed packed output yields no summaries when fallback is disabled."""
+        with patch.object(client_with_key, "_make_llm_call", return_value="not json"):
+            results = client_with_key.summarize_file_pack(
+                [("a.py", "a = 1", ".py"), ("b.py", "b = 2", ".py")],
+                fallback=False,
+            )
+
+        assert results == []
+
+
 class TestMultiProjectAnalysis:
     """Test cases for multi-project analysis with unassigned files."""
     
@@ -1264,6 +1720,45 @@ class TestAnalyzeMultipleProjects:
         # Should NOT have unassigned_files key
         assert "unassigned_files" not in result
 
+    def test_budget_and_timeout_cover_the_whole_scan(self, client_with_key, tmp_path, monkeypatch):
+        """The token budget is shared across projects and the per-file timeout setting applies."""
+        relevant_files = []
+        project_dirs = []
+        for name in ("alpha", "beta"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "main.py").write_text("x = 1\n" * 100)
+            relevant_files.append({"path": f"{name}/main.py", "size": 600, "mime_type": "text/x-python"})
+            project_dirs.append(str(tmp_path / name))
+        monkeypatch.setenv("AI_PACK_SMALL_FILES", "0")
+        monkeypatch.setenv("AI_SUMMARY_TOKEN_BUDGET", "200")
+        monkeypatch.setenv("AI_FILE_SUMMARY_TIMEOUT_SEC", "45")
+
+        timeouts = []
+        scheduled = client_with_key._summarize_files_scheduled
+
+        def spy(*args, **kwargs):
+            timeouts.append(kwargs.get("per_file_timeout_sec"))
+            return scheduled(*args, **kwargs)
+
+        def fake_summarize(file_path, content, file_type, **_kwargs):
+            return {"file_path": file_path, "file_type": file_type, "analysis": "ok"}
+
+        with patch.object(client_with_key, "_summarize_files_scheduled", new=spy), \
+             patch.object(client_with_key, "summarize_tagged_file_async", side_effect=fake_summarize), \
+             patch.object(client_with_key, "analyze_project", return_value={"analysis": "done"}):
+            result = client_with_key._analyze_multiple_projects(
+                scan_summary={},
+                relevant_files=relevant_files,
+                scan_base_path=str(tmp_path),
+                project_dirs=project_dirs,
+                max_file_size_mb=10,
+            )
+
+        assert timeouts == [45, 45]
+        analyzed = sum(project["files_analyzed"] for project in result["projects"])
+        assert analyzed == 1
+        assert any("token AI summary budget" in entry["reason"] for entry in result["skipped_files"])
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.projects_service import ProjectsService
+from services.services import local_store
+
+USER = "sqlite-user"
+
+
+@pytest.fixture
+def store_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'store.sqlite3'}"
+    local_store.configure(url)
+    yield url
+    local_store.configure("memory://")
+
+
+class TestSQLiteLocalStore:
+    def test_records_survive_reopening_the_store(self, store_url):
+        project = local_store.upsert_project(USER, "alpha", {"scan_data": {"ct": "blob"}, "scan_timestamp": "2026-01-01"})
+        local_store.upsert_project_override(USER, project["id"], {"role": "author"})
+        local_store.save_job(USER, {"id": 7, "title": "Engineer"})
+        local_store.upsert_selection(USER, {"sort_mode": "contribution"})
+
+        local_store.configure(store_url)
+
+        reloaded = local_store.get_project(USER, project["id"])
+        assert reloaded["scan_data"] == {"ct": "blob"}
+        assert reloaded["created_at"] == project["created_at"]
+        assert local_store.get_project_override(USER, project["id"])["role"] == "author"
+        assert local_store.is_job_saved(USER, "7")
+        assert local_store.get_selection(USER)["sort_mode"] == "contribution"
+
+    def test_upsert_merges_fields_and_keeps_scan_data(self, store_url):
+        first = local_store.upsert_project(USER, "alpha", {"scan_data": {"v": 1}, "total_files": 3})
+        second = local_store.upsert_project(USER, "alpha", {"contribution_score": 0.5})
+
+        assert second["id"] == first["id"]
+        assert second["total_files"] == 3
+        assert second["scan_data"] == {"v": 1}
+        assert local_store.get_project_by_name(USER, "alpha")["contribution_score"] == 0.5
+
+    def test_listing_is_ordered_and_can_skip_scan_data(self, store_url):
+        local_store.upsert_project(USER, "old", {"scan_data": {}, "scan_timestamp": "2025-01-01"})
+        local_store.upsert_project(USER, "new", {"scan_data": {}, "scan_timestamp": "2026-01-01"})
+        local_store.upsert_project("someone-else", "other", {"scan_data": {}})
+
+        assert [p["project_name"] for p in local_store.list_projects(USER)] == ["new", "old"]
+        assert all("scan_data" not in p for p in local_store.list_projects(USER, include_scan_data=False))
+
+    def test_delete_project_removes_its_overrides_and_segments(self, store_url):
+        project_id = local_store.upsert_project(USER, "alpha", {"scan_data": {}})["id"]
+        local_store.upsert_project_override(USER, project_id, {"role": "author"})
+        first = local_store.append_scan_segment(USER, project_id, {"ct": "a"}, 1)
+        local_store.append_scan_segment(USER, project_id, {"ct": "b"}, 2)
+
+        assert local_store.delete_scan_segments(USER, project_id, [first["id"]]) == 1
+        assert [s["payload"] for s in local_store.list_scan_segments(USER, project_id)] == [{"ct": "b"}]
+
+        assert local_store.delete_project(USER, project_id) is True
+        assert local_store.get_project(USER, project_id) is None
+        assert local_store.get_project_override(USER, project_id) is None
+        assert local_store.list_scan_segments(USER, project_id) == []
+        assert local_store.delete_project(USER, project_id) is False
+
+    def test_portfolio_aggregate_compare_and_set(self, store_url):
+        assert local_store.put_portfolio_aggregate(USER, {"v": 1}, 1) is True
+        assert local_store.put_portfolio_aggregate(USER, {"v": 1}, 1) is False
+        assert local_store.put_portfolio_aggregate(USER, {"v": 2}, 2) is True
+        assert local_store.get_portfolio_aggregate(USER)["payload"] == {"v": 2}
+
+    def test_concurrent_writers_use_their_own_connections(self, store_url):
+        def write(n):
+            for i in range(10):
+                local_store.upsert_project(USER, f"p{n}-{i}", {"scan_data": {"n": n}})
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(local_store.list_projects(USER, include_scan_data=False)) == 40
+
+    def test_projects_service_runs_on_the_sqlite_store(self, store_url, monkeypatch):
+        monkeypatch.setenv("CAPSTONE_LOCAL_STORE", "1")
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+        monkeypatch.setenv("SUPABASE_KEY", "test-key-123")
+        service = ProjectsService(encryption_service=None)
+
+        saved = service.save_scan(USER, "alpha", "/tmp/alpha", {"summary": {"total_files": 2}, "languages": ["Python"]})
+        local_store.configure(store_url)
+
+        (project,) = service.get_user_projects(USER)
+        assert project["id"] == saved["id"]
+        assert project["scan_data"]["languages"] == ["Python"]
+        assert service.get_project_by_name(USER, "alpha")["id"] == saved["id"]
+        assert service.delete_project(USER, saved["id"]) is True
+        assert service.get_user_projects(USER) == []
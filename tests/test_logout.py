@@ -1,10 +1,14 @@
+import time
+
 from fastapi.testclient import TestClient
+import jwt
 import pytest
 
 from backend.src.main import app
 from api.dependencies import AuthContext, get_auth_context
 import api.auth_routes as auth_routes
 from auth.session import AuthError
+from services import token_verifier
 
 
 client = TestClient(app)
@@ -95,3 +99,31 @@ def test_logout_requires_authorization_header():
     payload = response.json()
     assert "detail" in payload
     assert payload["detail"]["code"] == "unauthorized"
+
+
+def test_logged_out_token_is_rejected_afterwards(monkeypatch):
+    """A token stays unusable after logout even though its signature and exp are still valid."""
+    secret = "test-jwt-secret-that-is-long-enough-for-hs256"
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": "user-123", "aud": "authenticated", "session_id": "session-1", "iat": now, "exp": now + 3600},
+        secret,
+        algorithm="HS256",
+    )
+
+    class DummyAuth:
+        def sign_out(self, access_token: str) -> None:
+            return None
+
+    app.dependency_overrides.clear()
+    monkeypatch.setattr(auth_routes, "SupabaseAuth", lambda: DummyAuth())
+    monkeypatch.setattr(
+        token_verifier,
+        "_token_verifier",
+        token_verifier.TokenVerifier("https://example.supabase.co", jwt_secret=secret),
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/auth/session", headers=headers).status_code == 200
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/auth/session", headers=headers).status_code == 401
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner.minhash import NO_SIGNATURE, MinHashLSH, normalized_tokens, parse_signature, similarity, source_signature
+from scanner.models import FileMetadata, ParseResult
+from scanner.parser import attach_content_signatures, parse_directory, parse_zip
+from services.services.content_hash_index import ContentHashIndex
+from services.services.duplicate_detection_service import DuplicateDetectionService
+
+ASSIGNMENT = '''
+def merge_sort(values):
+    """Sort a list with merge sort."""
+    if len(values) <= 1:
+        return values
+    middle = len(values) // 2
+    left = merge_sort(values[:middle])
+    right = merge_sort(values[middle:])
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[j])
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged
+
+
+def binary_search(values, target):
+    low, high = 0, len(values) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        if values[mid] == target:
+            return mid
+        if values[mid] < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return -1
+'''
+
+# Same code with comments, literals and one helper changed
+COPIED = ASSIGNMENT.replace('"""Sort a list with merge sort."""', "# my own implementation").replace(
+    "return -1", "return None  # not found"
+)
+
+UNRELATED = '''
+import json
+from pathlib import Path
+
+
+class Settings:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.values = {}
+
+    def load(self):
+        if self.path.exists():
+            self.values = json.loads(self.path.read_text())
+        return self.values
+
+    def save(self):
+        self.path.write_text(json.dumps(self.values, indent=2))
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+'''
+
+
+def _signature(text: str) -> bytes:
+    return parse_signature(source_signature(text.encode()))
+
+
+def _file(path: str, text: str, file_hash: str) -> FileMetadata:
+    now = datetime(2026, 1, 1)
+    return FileMetadata(
+        path=path,
+        size_bytes=len(text),
+        mime_type="text/x-python",
+        created_at=now,
+        modified_at=now,
+        file_hash=file_hash,
+        content_signature=source_signature(text.encode()),
+    )
+
+
+def test_normalization_drops_comments_and_literals():
+    assert normalized_tokens('x = "a" + 1  # note') == ["x", "=", "<s>", "+", "<n>"]
+
+
+def test_copies_score_high_and_unrelated_files_low():
+    assert similarity(_signature(ASSIGNMENT), _signature(COPIED)) >= 0.8
+    assert similarity(_signature(ASSIGNMENT), _signature(UNRELATED)) < 0.2
+    assert source_signature(b"x = 1") is None
+
+
+def test_lsh_clusters_near_duplicates_and_supports_removal():
+    index = MinHashLSH()
+    index.add("a", _signature(ASSIGNMENT))
+    index.add("b", _signature(COPIED))
+    index.add("c", _signature(UNRELATED))
+
+    ((members, score),) = index.clusters()
+    assert sorted(members) == ["a", "b"]
+    assert score >= 0.8
+
+    index.remove("b")
+    assert index.clusters() == []
+    assert len(index) == 2
+
+
+def test_duplicate_detection_reports_similar_source_files():
+    files = [
+        _file("hw1/sort.py", ASSIGNMENT, "h1"),
+        _file("hw1-copy/sort.py", COPIED, "h2"),
+        _file("app/settings.py", UNRELATED, "h3"),
+    ]
+
+    result = DuplicateDetectionService().analyze_duplicates(ParseResult(files=files))
+
+    (group,) = result.similar_source_groups
+    assert group.match == "similar"
+    assert [f.path for f in group.files] == ["hw1/sort.py", "hw1-copy/sort.py"]
+    exported = DuplicateDetectionService().export_duplicates_json(result)
+    assert exported["summary"]["similar_source_groups_count"] == 1
+
+
+def test_index_groups_similar_files_across_projects():
+    index = ContentHashIndex()
+    index.upsert("p1", [
+        {"relative_path": "sort.py", "size_bytes": 10, "sha256": "h1", "content_signature": source_signature(ASSIGNMENT.encode())},
+        {"relative_path": "settings.py", "size_bytes": 5, "sha256": "h3", "content_signature": source_signature(UNRELATED.encode())},
+    ])
+    index.upsert("p2", [
+        {"relative_path": "vendor/sort.py", "size_bytes": 11, "sha256": "h2", "content_signature": source_signature(COPIED.encode())},
+    ])
+
+    (group,) = index.similar_file_groups()
+    assert [f[:2] for f in group["files"]] == [("p1", "sort.py"), ("p2", "vendor/sort.py")]
+    assert group["project_count"] == 2
+    assert index.similar_file_groups(["p1"]) == []
+
+    index.remove("p2", ["vendor/sort.py"])
+    assert index.similar_file_groups() == []
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    root = tmp_path / "course"
+    (root / "hw1").mkdir(parents=True)
+    (root / "hw1" / "sort.py").write_text(ASSIGNMENT)
+    (root / "hw1" / "tiny.py").write_text("x = 1\n")
+    (root / "hw1" / "notes.md").write_text("# Notes\n")
+    return root
+
+
+def test_signatures_are_computed_on_demand_and_reused(project_dir):
+    files = parse_directory(project_dir).files
+    assert all(meta.content_signature is None for meta in files)
+
+    assert attach_content_signatures(files, project_dir) == 2
+    first = {meta.path: meta for meta in files}
+    sort_py = first["course/hw1/sort.py"]
+    assert parse_signature(sort_py.content_signature) is not None
+    assert first["course/hw1/tiny.py"].content_signature == NO_SIGNATURE
+    assert parse_signature(NO_SIGNATURE) is None
+    assert first["course/hw1/notes.md"].content_signature is None
+
+    cached_files = {
+        meta.path: {
+            "last_seen_modified_at": meta.modified_at.isoformat(),
+            "size_bytes": meta.size_bytes,
+            "content_signature": "minhash:cached" if meta is sort_py else meta.content_signature,
+            "metadata": {"file_hash": meta.file_hash},
+        }
+        for meta in files
+    }
+    rescanned = parse_directory(project_dir, cached_files=cached_files).files
+    second = {meta.path: meta for meta in rescanned}
+
+    assert second[sort_py.path].content_signature == "minhash:cached"
+    assert attach_content_signatures(rescanned, project_dir) == 0  # nothing re-read
+
+
+def test_signatures_read_from_archives(tmp_path):
+    import zipfile
+
+    archive = tmp_path / "upload.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("./src/sort.py", ASSIGNMENT)
+    files = parse_zip(archive).files
+
+    assert attach_content_signatures(files, archive) == 1
+    assert parse_signature(files[0].content_signature) == _signature(ASSIGNMENT)
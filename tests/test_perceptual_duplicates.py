@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import io
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from PIL import Image, ImageDraw
+
+from scanner.media import extract_media_metadata
+from scanner.models import FileMetadata, ParseResult
+from scanner.parser import parse_directory
+from scanner.perceptual_hash import MultiIndexHash, dhash, hamming_distance, parse_hash
+from services.services.duplicate_detection_service import DuplicateDetectionService
+
+
+def _artwork(seed: int, size=(256, 192)) -> Image.Image:
+    rng = random.Random(seed)
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        draw.ellipse(
+            (x, y, x + rng.randrange(20, 120), y + rng.randrange(20, 120)),
+            fill=tuple(rng.randrange(256) for _ in range(3)),
+        )
+    return image
+
+
+def _encode(image: Image.Image, fmt: str, **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def _file(path: str, size: int, file_hash: str, perceptual_hash=None) -> FileMetadata:
+    now = datetime(2026, 1, 1)
+    media_info = {"perceptual_hash": perceptual_hash} if perceptual_hash else None
+    return FileMetadata(
+        path=path,
+        size_bytes=size,
+        mime_type="image/png",
+        created_at=now,
+        modified_at=now,
+        media_info=media_info,
+        file_hash=file_hash,
+    )
+
+
+def test_resized_and_recompressed_copies_hash_close():
+    original = _artwork(1)
+    copy = Image.open(io.BytesIO(_encode(original.resize((128, 96)), "JPEG", quality=60)))
+
+    base = parse_hash(dhash(original))
+    assert hamming_distance(base, parse_hash(dhash(copy))) <= 6
+    assert hamming_distance(base, parse_hash(dhash(_artwork(2)))) > 6
+
+
+def test_image_metadata_records_perceptual_hash():
+    result = extract_media_metadata("art/cover.png", "image/png", _encode(_artwork(3), "PNG"))
+
+    assert parse_hash(result.metadata["perceptual_hash"]) is not None
+
+
+def test_cached_images_without_a_perceptual_hash_get_one(tmp_path):
+    (tmp_path / "art").mkdir()
+    (tmp_path / "art" / "cover.png").write_bytes(_encode(_artwork(4), "PNG"))
+    (first,) = parse_directory(tmp_path).files
+    assert first.media_info["perceptual_hash"]
+
+    # A cache entry written before perceptual hashing existed.
+    legacy_info = {key: value for key, value in first.media_info.items() if key != "perceptual_hash"}
+    cached_files = {
+        first.path: {
+            "last_seen_modified_at": first.modified_at.isoformat(),
+            "size_bytes": first.size_bytes,
+            "metadata": {"file_hash": first.file_hash, "media_info": legacy_info},
+        }
+    }
+    result = parse_directory(tmp_path, cached_files=cached_files)
+
+    assert result.summary["files_skipped"] == 1
+    assert result.files[0].media_info == first.media_info
+    assert "perceptual_hash" not in legacy_info
+
+
+def test_multi_index_hash_matches_brute_force():
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(500)]
+    # Near copies at every distance up to and just past the radius
+    for i, value in enumerate(hashes[:200]):
+        hashes.append(value ^ sum(1 << bit for bit in rng.sample(range(64), i % 12 + 1)))
+
+    for radius in (0, 3, 6, 10):
+        table = MultiIndexHash(radius)
+        for index, value in enumerate(hashes):
+            table.add(value, index)
+        for query in hashes[:60]:
+            expected = {i for i, value in enumerate(hashes) if hamming_distance(query, value) <= radius}
+            assert {item for _, item in table.search(query)} == expected
+        assert len(table) == len(hashes)
+
+
+def test_near_duplicates_reported_alongside_exact_groups():
+    original, other = _artwork(1), _artwork(2)
+    near_a = dhash(original)
+    near_b = dhash(original.resize((128, 96)))
+    files = [
+        _file("art/hero.png", 9000, "blake2b128:aa", near_a),
+        _file("art/hero-copy.png", 9000, "blake2b128:aa", near_a),
+        _file("art/hero-small.jpg", 2000, "blake2b128:bb", near_b),
+        _file("art/other.png", 5000, "blake2b128:cc", dhash(other)),
+        _file("src/main.py", 100, "blake2b128:dd"),
+    ]
+
+    result = DuplicateDetectionService().analyze_duplicates(ParseResult(files=files))
+
+    assert [g.count for g in result.duplicate_groups] == [2]
+    (group,) = result.near_duplicate_groups
+    assert group.match == "near"
+    assert [f.path for f in group.files] == ["art/hero.png", "art/hero-small.jpg"]
+    assert group.wasted_bytes == 2000
+    assert result.near_duplicate_wasted_bytes == 2000
+    assert "near-duplicate images" in DuplicateDetectionService().format_duplicate_summary(result)
+
+    exported = DuplicateDetectionService().export_duplicates_json(result)
+    assert exported["summary"]["near_duplicate_groups_count"] == 1
+    assert exported["near_duplicate_groups"][0]["max_distance"] == group.max_distance
+
+    disabled = DuplicateDetectionService().analyze_duplicates(
+        ParseResult(files=files), near_duplicate_distance=None
+    )
+    assert disabled.near_duplicate_groups == []
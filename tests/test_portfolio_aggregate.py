@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import base64
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.encryption import EncryptionEnvelope
+from services.portfolio_timeline_service import PortfolioTimelineService
+from services.projects_service import ProjectsService
+from services.services import local_store, portfolio_aggregate
+
+USER = "aggregate-user"
+
+
+class FakeEncryptionService:
+    def encrypt_json(self, payload):
+        raw = json.dumps(payload).encode("utf-8")
+        return EncryptionEnvelope(version="1", iv="iv", ciphertext=base64.b64encode(raw).decode("ascii"))
+
+    def decrypt_json(self, envelope):
+        return json.loads(base64.b64decode(envelope["ct"]).decode("utf-8"))
+
+
+def _scan(period, skills, tier="beginner"):
+    return {
+        "skills_analysis": {
+            "skills_by_category": {"languages": [{"name": name, "highest_tier": tier} for name in skills]},
+        },
+        "skills_progress": {"timeline": [{"period_label": period, "commits": 3, "top_skills": skills}]},
+        "languages": ["Python"],
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("CAPSTONE_LOCAL_STORE", "1")
+    monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "test-key-123")
+    yield ProjectsService(encryption_service=FakeEncryptionService())
+    for project in local_store.list_projects(USER):
+        local_store.delete_project(USER, project["id"])
+    local_store.delete_portfolio_aggregate(USER)
+
+
+class TestPortfolioAggregate:
+    def test_first_read_builds_from_projects(self, service):
+        service.save_scan(USER, "alpha", "/tmp/alpha", _scan("2024-01", ["Python"]))
+        service.save_scan(USER, "beta", "/tmp/beta", _scan("2024-02", ["Go", "Python"], tier="advanced"))
+
+        aggregate = service.get_portfolio_aggregate(USER)
+
+        # Each write before the first read left a stale marker at the next version.
+        assert aggregate["version"] == 3
+        assert aggregate["views"]["skill_tiers"] == {"Python": "advanced", "Go": "advanced"}
+        assert [item["period_label"] for item in aggregate["views"]["skills_timeline"]] == ["2024-01", "2024-02"]
+        assert service._load_portfolio_aggregate(USER)["version"] == 3
+
+    def test_writes_update_the_aggregate_incrementally(self, service, monkeypatch):
+        alpha = service.save_scan(USER, "alpha", "/tmp/alpha", _scan("2024-01", ["Python"]))
+        base = service.get_portfolio_aggregate(USER)["version"]
+
+        def fail_rebuild(user_id):
+            raise AssertionError("reads should not rebuild after the first")
+
+        monkeypatch.setattr(service, "get_user_projects_with_scan_data", fail_rebuild)
+
+        service.save_scan(USER, "beta", "/tmp/beta", _scan("2024-03", ["Rust"]))
+        aggregate = service.get_portfolio_aggregate(USER)
+        assert aggregate["version"] == base + 1
+        assert set(aggregate["views"]["skill_names"]) == {"Python", "Rust"}
+
+        service.delete_project_insights(USER, alpha["id"])
+        aggregate = service.get_portfolio_aggregate(USER)
+        assert aggregate["version"] == base + 2
+        assert aggregate["views"]["skill_names"] == ["Rust"]
+
+        service.delete_project(USER, alpha["id"])
+        aggregate = service.get_portfolio_aggregate(USER)
+        assert aggregate["version"] == base + 3
+        assert [row["project_name"] for row in aggregate["views"]["projects"]] == ["beta"]
+
+    def test_stale_schema_is_rebuilt(self, service, monkeypatch):
+        service.save_scan(USER, "alpha", "/tmp/alpha", _scan("2024-01", ["Python"]))
+        base = service.get_portfolio_aggregate(USER)["version"]
+
+        monkeypatch.setattr(portfolio_aggregate, "AGGREGATE_SCHEMA_VERSION", 99)
+        aggregate = service.get_portfolio_aggregate(USER)
+
+        assert aggregate["schema_version"] == 99
+        assert aggregate["version"] == base + 1
+
+    def test_concurrent_writer_is_detected(self, service):
+        service.save_scan(USER, "alpha", "/tmp/alpha", _scan("2024-01", ["Python"]))
+        stale = service.get_portfolio_aggregate(USER)
+        service.save_scan(USER, "beta", "/tmp/beta", _scan("2024-02", ["Go"]))
+
+        assert service._store_portfolio_aggregate(USER, {**stale, "version": stale["version"] + 1}) is False
+        assert "Go" in service.get_portfolio_aggregate(USER)["views"]["skill_names"]
+
+    def test_write_during_rebuild_is_not_lost(self, service, monkeypatch):
+        service.save_scan(USER, "alpha", "/tmp/alpha", _scan("2024-01", ["Python"]))
+        read_projects = service.get_user_projects_with_scan_data
+
+        def read_then_write(user_id):
+            projects = read_projects(user_id)
+            # Lands after the rebuild read the projects but before it stores.
+            service.save_scan(USER, "beta", "/tmp/beta", _scan("2024-02", ["Go"]))
+            return projects
+
+        monkeypatch.setattr(service, "get_user_projects_with_scan_data", read_then_write)
+        assert "Go" not in service.get_portfolio_aggregate(USER)["views"]["skill_names"]
+
+        monkeypatch.setattr(service, "get_user_projects_with_scan_data", read_projects)
+        assert "Go" in service.get_portfolio_aggregate(USER)["views"]["skill_names"]
+
+    def test_timeline_service_reads_the_aggregate(self, service):
+        service.save_scan(USER, "alpha", "/tmp/alpha", _scan("2024-01", ["Python"]))
+        timeline = PortfolioTimelineService(projects_service=service)
+
+        chronology = timeline.get_portfolio_chronology(USER)
+
+        assert chronology["skills"] == [
+            {"period_label": "2024-01", "skills": ["Python"], "commits": 3, "projects": ["alpha"]}
+        ]
+        (row,) = chronology["projects"]
+        assert row["name"] == "alpha"
+        assert row["role"] is not None
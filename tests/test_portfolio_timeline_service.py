@@ -1,3 +1,4 @@
+from services.services.portfolio_aggregate import build_aggregate
 from services.portfolio_timeline_service import PortfolioTimelineService
 
 
@@ -15,6 +16,12 @@ class FakeProjectsService:
     def get_user_projects_with_roles(self, user_id):
         return list(self._projects)
 
+    def get_project_summaries_with_roles(self, user_id):
+        return list(self._projects)
+
+    def get_portfolio_aggregate(self, user_id):
+        return build_aggregate(self._projects_with_scan)
+
 
 def test_projects_timeline_ordering_is_deterministic():
     projects = [
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+PROJECT_ROOT = Path(__file__).parent.parent
+backend_src = PROJECT_ROOT / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.progress_bus import ProgressBus
+
+
+class TestProgressBus:
+    def test_publishes_merge_into_latest_snapshot(self):
+        bus = ProgressBus(max_rate_hz=4)
+        bus.publish("job", {"state": "running", "percent": 10.0})
+        bus.publish("job", {"timings": {"Parsing": 0.5}})
+
+        latest = bus.latest("job")
+        assert latest.seq == 2
+        assert latest.data == {"state": "running", "percent": 10.0, "timings": {"Parsing": 0.5}}
+
+    def test_updates_after_final_are_dropped(self):
+        bus = ProgressBus()
+        bus.publish("job", {"state": "canceled"}, final=True)
+        bus.publish("job", {"state": "running", "percent": 50.0})
+
+        assert bus.latest("job").data == {"state": "canceled"}
+
+    def test_due_throttles_per_job(self):
+        bus = ProgressBus(max_rate_hz=10)
+
+        assert bus.due("a") is True
+        assert bus.due("a") is False
+        assert bus.due("b") is True
+        time.sleep(0.11)
+        assert bus.due("a") is True
+
+    def test_wait_wakes_on_publish_from_another_thread(self):
+        bus = ProgressBus()
+
+        async def scenario():
+            publisher = threading.Timer(0.05, lambda: bus.publish("job", {"percent": 42.0}))
+            publisher.start()
+            event = await bus.wait("job", after_seq=0, timeout=2)
+            timed_out = await bus.wait("job", after_seq=event.seq, timeout=0.05)
+            return event, timed_out
+
+        event, timed_out = asyncio.run(scenario())
+        assert event.data == {"percent": 42.0}
+        assert timed_out is None
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from backend.src.main import app
+    from api.dependencies import AuthContext, get_auth_context
+
+    async def _override_auth() -> AuthContext:
+        return AuthContext(user_id="stream-user", access_token="test-token")
+
+    app.dependency_overrides[get_auth_context] = _override_auth
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _read_events(response):
+    events = []
+    for line in response.iter_lines():
+        if line.startswith("data: "):
+            events.append(json.loads(line[len("data: "):]))
+    return events
+
+
+class TestScanEventStream:
+    def test_streams_progress_until_terminal_state(self, client):
+        import api.spec_routes as spec
+
+        spec._scan_store["stream-running"] = spec.ScanStatus(
+            scan_id="stream-running",
+            user_id="stream-user",
+            state=spec.JobState.running,
+            progress=spec.Progress(percent=40.0, message="Running analyses...", phase="analysis"),
+        )
+
+        def finish():
+            spec._report_progress("stream-running", 60.0, "Running analyses (4/9)...", phase="analysis",
+                                  timings={"Analysis: git": 0.25})
+            time.sleep(0.3)
+            spec._update_scan_status(
+                "stream-running",
+                spec.JobState.succeeded,
+                progress=spec.Progress(percent=100.0, message="Scan completed"),
+            )
+
+        threading.Timer(0.2, finish).start()
+        with client.stream("GET", "/api/scans/stream-running/events") as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = _read_events(response)
+
+        assert events[-1]["state"] == "succeeded"
+        assert any(event.get("timings") == {"Analysis: git": 0.25} for event in events)
+        assert [event["percent"] for event in events] == sorted(event["percent"] for event in events)
+        spec.get_shared_progress_bus().discard("stream-running")
+
+    def test_finished_scan_sends_one_event(self, client):
+        import api.spec_routes as spec
+
+        spec._scan_store["stream-done"] = spec.ScanStatus(
+            scan_id="stream-done",
+            user_id="stream-user",
+            state=spec.JobState.failed,
+            error=spec.ErrorResponse(code="SCAN_ERROR", message="boom"),
+        )
+
+        with client.stream("GET", "/api/scans/stream-done/events") as response:
+            events = _read_events(response)
+
+        assert len(events) == 1
+        assert events[0]["state"] == "failed"
+        assert events[0]["error"]["code"] == "SCAN_ERROR"
+
+    def test_other_users_scan_is_forbidden(self, client):
+        import api.spec_routes as spec
+
+        spec._scan_store["stream-foreign"] = spec.ScanStatus(
+            scan_id="stream-foreign",
+            user_id="someone-else",
+            state=spec.JobState.running,
+        )
+
+        assert client.get("/api/scans/stream-foreign/events").status_code == 403
+        assert client.get("/api/scans/stream-missing/events").status_code == 404
@@ -327,3 +327,55 @@ class TestScanRequestOptions:
             "profile_id": TEST_USER_ID  # Same as authenticated user
         })
         assert response.status_code == 202
+
+
+class TestDeleteApiScans:
+    """Tests for DELETE /api/scans/{scan_id} cancellation."""
+
+    @staticmethod
+    def _seed_scan(scan_id, state, user_id=TEST_USER_ID):
+        import api.spec_routes as spec
+        spec._scan_store[scan_id] = spec.ScanStatus(
+            scan_id=scan_id,
+            user_id=user_id,
+            state=state,
+            progress=spec.Progress(percent=40.0, message="Running analyses..."),
+        )
+        token = spec.CancellationToken()
+        spec._scan_tokens[scan_id] = token
+        return spec, token
+
+    def test_cancel_running_scan(self, client):
+        """DELETE marks a running scan canceled and triggers its token."""
+        spec, token = self._seed_scan("cancel-running", "running")
+        try:
+            response = client.delete("/api/scans/cancel-running")
+            assert response.status_code == 202
+            assert response.json()["state"] == "canceled"
+            assert token.cancelled
+
+            # Late progress from the background job must not revive the scan.
+            spec._update_scan_status("cancel-running", spec.JobState.running)
+            assert client.get("/api/scans/cancel-running").json()["state"] == "canceled"
+        finally:
+            spec._scan_tokens.pop("cancel-running", None)
+
+    def test_cancel_finished_scan_returns_409(self, client):
+        spec, token = self._seed_scan("cancel-finished", "succeeded")
+        try:
+            response = client.delete("/api/scans/cancel-finished")
+            assert response.status_code == 409
+            assert not token.cancelled
+        finally:
+            spec._scan_tokens.pop("cancel-finished", None)
+
+    def test_cancel_other_users_scan_returns_403(self, client):
+        spec, token = self._seed_scan("cancel-foreign", "running", user_id="someone-else")
+        try:
+            assert client.delete("/api/scans/cancel-foreign").status_code == 403
+            assert not token.cancelled
+        finally:
+            spec._scan_tokens.pop("cancel-foreign", None)
+
+    def test_cancel_nonexistent_scan_returns_404(self, client):
+        assert client.delete("/api/scans/missing-scan").status_code == 404
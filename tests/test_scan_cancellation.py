@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+import operator
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from scanner.parser import parse_directory
+from services.cancellation import (
+    CancellationToken,
+    ScanCancelled,
+    WorkerProcessError,
+    run_in_worker_process,
+)
+
+
+class TestCancellationToken:
+    def test_raise_if_cancelled_carries_reason(self):
+        token = CancellationToken()
+        token.raise_if_cancelled()
+
+        token.cancel("Canceled by user")
+        token.cancel("second reason is ignored")
+
+        with pytest.raises(ScanCancelled, match="Canceled by user"):
+            token.raise_if_cancelled()
+
+    def test_parse_directory_stops_when_cancelled(self, tmp_path):
+        (tmp_path / "a.py").write_text("a = 1\n")
+        (tmp_path / "b.py").write_text("b = 2\n")
+        token = CancellationToken()
+        token.cancel()
+
+        with pytest.raises(ScanCancelled):
+            parse_directory(tmp_path, cancel_token=token)
+
+
+class TestWorkerProcess:
+    def test_returns_result(self):
+        assert run_in_worker_process(operator.add, 2, 3) == 5
+
+    def test_reraises_worker_errors(self):
+        with pytest.raises(WorkerProcessError, match="ValueError"):
+            run_in_worker_process(math.sqrt, -1)
+
+    def test_timeout_kills_worker(self):
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            run_in_worker_process(time.sleep, 30, timeout=0.5)
+        assert time.monotonic() - started < 10
+
+    def test_cancel_kills_worker(self):
+        import threading
+
+        token = CancellationToken()
+        threading.Timer(0.3, token.cancel).start()
+        started = time.monotonic()
+        with pytest.raises(ScanCancelled):
+            run_in_worker_process(time.sleep, 30, cancel_token=token)
+        assert time.monotonic() - started < 10
+
+
+class TestScanBackgroundCancellation:
+    def test_scan_canceled_before_start_never_runs(self, tmp_path, monkeypatch):
+        import api.spec_routes as spec
+
+        scan_id = "pre-canceled-scan"
+        spec._scan_store[scan_id] = spec.ScanStatus(
+            scan_id=scan_id,
+            user_id="user-1",
+            state=spec.JobState.canceled,
+            progress=spec.Progress(percent=0.0, message="Scan canceled"),
+        )
+        token = CancellationToken()
+        token.cancel("Canceled by user")
+        spec._scan_tokens[scan_id] = token
+        scan_service = MagicMock()
+        monkeypatch.setattr(spec, "_get_scan_service", lambda: scan_service)
+
+        spec._run_scan_background(
+            scan_id=scan_id,
+            source_path=str(tmp_path),
+            relevance_only=False,
+            persist_project=False,
+            profile_id=None,
+        )
+
+        scan_service.run_scan.assert_not_called()
+        assert spec._scan_store[scan_id].state == spec.JobState.canceled
+        assert scan_id not in spec._scan_tokens
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import base64
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.encryption import EncryptionEnvelope
+from services.projects_service import ProjectsService
+from services.services import local_store
+
+
+class FakeEncryptionService:
+    def encrypt_json(self, payload):
+        raw = json.dumps(payload).encode("utf-8")
+        return EncryptionEnvelope(version="1", iv="iv", ciphertext=base64.b64encode(raw).decode("ascii"))
+
+    def decrypt_json(self, envelope):
+        return json.loads(base64.b64decode(envelope["ct"]).decode("utf-8"))
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("CAPSTONE_LOCAL_STORE", "1")
+    monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "test-key-123")
+    return ProjectsService(encryption_service=FakeEncryptionService())
+
+
+@pytest.fixture
+def project(service):
+    saved = service.save_scan(
+        "segment-user",
+        "segment-project",
+        "/tmp/segment-project",
+        {"summary": {"total_files": 1}, "files": [{"path": "a.py", "file_hash": "md5:1"}]},
+    )
+    yield saved["id"]
+    local_store.delete_project("segment-user", saved["id"])
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.action = None
+        self.payload = None
+        self.filters = {}
+
+    def select(self, columns):
+        self.action = "select"
+        return self
+
+    def update(self, payload):
+        self.action, self.payload = "update", payload
+        return self
+
+    def upsert(self, payload, on_conflict=None):
+        self.action, self.payload = "upsert", payload
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = list(values)
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.filters["range"] = (start, end)
+        return self
+
+    def execute(self):
+        self.db.calls.append((self.table, self.action))
+        if self.table == "projects":
+            if self.action == "update" and self.filters.get("scan_timestamp") == self.db.project["scan_timestamp"]:
+                self.db.project.update(self.payload)
+            return SimpleNamespace(data=[dict(self.db.project)])
+        if self.action == "select":
+            start, end = self.filters["range"]
+            return SimpleNamespace(data=[self.db.scan_files[path] for path in sorted(self.db.scan_files)][start:end + 1])
+        if self.action == "upsert":
+            for row in self.payload:
+                self.db.scan_files[row["relative_path"]] = row
+        if self.action == "delete":
+            for path in self.filters["relative_path"]:
+                self.db.scan_files.pop(path, None)
+        return SimpleNamespace(data=[])
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.project = {"id": "p1", "scan_timestamp": "2026-03-01T00:00:00+00:00", "scan_files_synced_at": None}
+        self.scan_files = {"gone.py": {"relative_path": "gone.py", "sha256": "md5:0"}}
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def _paths(service, project_id):
+    files = service.get_project_scan("segment-user", project_id)["scan_data"]["files"]
+    return {entry["path"]: entry.get("file_hash") for entry in files}
+
+
+class TestScanSegments:
+    def test_appended_files_are_merged_on_read(self, service, project):
+        service.append_scan_files("segment-user", project, [{"path": "b.py", "file_hash": "md5:2"}])
+        service.append_scan_files("segment-user", project, [{"path": "a.py", "file_hash": "md5:3"}])
+
+        assert _paths(service, project) == {"a.py": "md5:3", "b.py": "md5:2"}
+        # The stored blob itself is untouched until compaction.
+        stored = local_store.get_project("segment-user", project)["scan_data"]
+        assert len(service._decrypt_scan_data(stored)["files"]) == 1
+
+        listed = service.get_user_projects_with_scan_data("segment-user")
+        (entry,) = [p for p in listed if p["id"] == project]
+        assert {f["path"] for f in entry["scan_data"]["files"]} == {"a.py", "b.py"}
+
+    def test_compaction_folds_segments_into_scan_data(self, service, project):
+        service.append_scan_files("segment-user", project, [{"path": "b.py", "file_hash": "md5:2"}])
+
+        assert service.compact_scan_segments("segment-user", project) == 1
+        assert local_store.list_scan_segments("segment-user", project) == []
+        assert _paths(service, project) == {"a.py": "md5:1", "b.py": "md5:2"}
+        assert service.compact_scan_segments("segment-user", project) == 0
+
+    def test_threshold_triggers_compaction(self, service, project, monkeypatch):
+        monkeypatch.setenv("SCAN_SEGMENT_COMPACT_THRESHOLD", "2")
+        service.append_scan_files("segment-user", project, [{"path": "b.py"}])
+        assert len(local_store.list_scan_segments("segment-user", project)) == 1
+
+        service.append_scan_files("segment-user", project, [{"path": "c.py"}])
+
+        assert local_store.list_scan_segments("segment-user", project) == []
+        assert set(_paths(service, project)) == {"a.py", "b.py", "c.py"}
+
+    def test_rescan_discards_pending_segments(self, service, project):
+        service.append_scan_files("segment-user", project, [{"path": "b.py"}])
+
+        service.save_scan(
+            "segment-user",
+            "segment-project",
+            "/tmp/segment-project",
+            {"summary": {"total_files": 1}, "files": [{"path": "z.py"}]},
+        )
+
+        assert local_store.list_scan_segments("segment-user", project) == []
+        assert set(_paths(service, project)) == {"z.py"}
+
+    def test_file_hashes_include_appended_files(self, service, project):
+        service.append_scan_files("segment-user", project, [{"path": "b.py", "file_hash": "md5:2"}])
+
+        assert service.get_project_file_hashes("segment-user", project) == {"a.py": "md5:1", "b.py": "md5:2"}
+        assert service.get_project_file_hashes("segment-user", "missing") is None
+
+    def test_file_hashes_are_mirrored_into_scan_files_once(self, service, monkeypatch):
+        db = FakeSupabase()
+        service._use_local_store = False
+        service.client = db
+        scan_reads = []
+
+        def get_project_scan(user_id, project_id):
+            scan_reads.append(project_id)
+            files = [{"path": "a.py", "file_hash": "md5:1"}, {"path": "b.py", "file_hash": "md5:2"}]
+            return {"id": project_id, "scan_data": {"files": files}}
+
+        monkeypatch.setattr(service, "get_project_scan", get_project_scan)
+
+        first = service.get_project_file_hashes("segment-user", "p1")
+        assert first == {"a.py": "md5:1", "b.py": "md5:2"}
+        assert set(db.scan_files) == {"a.py", "b.py"}  # rows from before the scan are dropped
+        assert db.project["scan_files_synced_at"] == db.project["scan_timestamp"]
+
+        assert service.get_project_file_hashes("segment-user", "p1") == first
+        assert scan_reads == ["p1"]  # the second call read only scan_files
+
+        db.project["scan_timestamp"] = "2026-04-01T00:00:00+00:00"  # rescan
+        service.get_project_file_hashes("segment-user", "p1")
+        assert scan_reads == ["p1", "p1"]
+
+    def test_compaction_keeps_a_rescan_and_racing_appends(self, service, project, monkeypatch):
+        service.append_scan_files("segment-user", project, [{"path": "b.py"}])
+        fetch_segments = service._fetch_scan_segments
+
+        def fetch_then_append(user_id, project_ids):
+            segments = fetch_segments(user_id, project_ids)
+            service.append_scan_files("segment-user", project, [{"path": "c.py"}])
+            return segments
+
+        monkeypatch.setattr(service, "_fetch_scan_segments", fetch_then_append)
+        assert service.compact_scan_segments("segment-user", project) == 1
+        monkeypatch.setattr(service, "_fetch_scan_segments", fetch_segments)
+        # The append that landed after the read is not deleted unmerged.
+        assert set(_paths(service, project)) == {"a.py", "b.py", "c.py"}
+
+        def fetch_then_rescan(user_id, project_ids):
+            segments = fetch_segments(user_id, project_ids)
+            service.save_scan(
+                "segment-user",
+                "segment-project",
+                "/tmp/segment-project",
+                {"summary": {"total_files": 1}, "files": [{"path": "z.py"}]},
+            )
+            return segments
+
+        service.append_scan_files("segment-user", project, [{"path": "d.py"}])
+        monkeypatch.setattr(service, "_fetch_scan_segments", fetch_then_rescan)
+        assert service.compact_scan_segments("segment-user", project) == 0
+        monkeypatch.setattr(service, "_fetch_scan_segments", fetch_segments)
+        assert set(_paths(service, project)) == {"z.py"}
+
+    def test_append_rewrites_scan_data_without_the_segments_table(self, service, monkeypatch):
+        class MissingSegments:
+            def insert(self, row):
+                return self
+
+            def execute(self):
+                raise Exception(
+                    "{'code': 'PGRST205', 'message': \"Could not find the table "
+                    "'public.project_scan_segments' in the schema cache\"}"
+                )
+
+        written = {}
+        service._use_local_store = False
+        service.client = SimpleNamespace(table=lambda name: MissingSegments())
+        monkeypatch.setattr(service, "get_project_scan", lambda user_id, project_id: {
+            "id": project_id,
+            "scan_data": {"summary": {}, "files": [{"path": "a.py", "file_hash": "md5:1"}]},
+        })
+        monkeypatch.setattr(
+            service, "update_project_scan_data",
+            lambda user_id, project_id, scan_data: written.update({project_id: scan_data}),
+        )
+
+        service.append_scan_files("segment-user", "p1", [
+            {"path": "a.py", "file_hash": "md5:3"},
+            {"path": "b.py", "file_hash": "md5:2"},
+        ])
+
+        assert written["p1"]["files"] == [
+            {"path": "a.py", "file_hash": "md5:3"},
+            {"path": "b.py", "file_hash": "md5:2"},
+        ]
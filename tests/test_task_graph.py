@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.task_graph import TaskGraph, TaskGraphError, outcome_timings
+
+
+class TestTaskGraph:
+    def test_nodes_start_when_their_own_dependencies_settle(self):
+        """A node waits only for its inputs, not for unrelated slow nodes."""
+        git_release = threading.Event()
+        code_started = threading.Event()
+
+        def git():
+            code_started.wait(timeout=2)
+            git_release.wait(timeout=2)
+            return ["repo"]
+
+        def code():
+            code_started.set()
+            return {"files": 3}
+
+        def skills(git, code):
+            return (git, code)
+
+        graph = (
+            TaskGraph()
+            .add("git", git)
+            .add("code", code)
+            .add("skills", skills, deps=("git", "code"))
+        )
+        order = []
+
+        def on_complete(outcome, settled, total):
+            order.append(outcome.name)
+            if outcome.name == "code":
+                git_release.set()
+
+        outcomes = graph.run(on_complete=on_complete)
+
+        assert order == ["code", "git", "skills"]
+        assert outcomes["skills"].value == (["repo"], {"files": 3})
+
+    def test_failed_dependency_is_passed_as_none(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        graph = TaskGraph().add("git", broken).add("skills", lambda git: git is None, deps=("git",))
+        outcomes = graph.run()
+
+        assert outcomes["git"].status == "failed"
+        assert isinstance(outcomes["git"].error, RuntimeError)
+        assert outcomes["skills"].value is True
+
+    def test_timed_out_node_is_abandoned(self):
+        blocker = threading.Event()
+        graph = (
+            TaskGraph()
+            .add("slow", lambda: blocker.wait(5), timeout=0.05)
+            .add("after", lambda slow: slow, deps=("slow",))
+        )
+
+        started = time.monotonic()
+        outcomes = graph.run()
+        blocker.set()
+
+        assert time.monotonic() - started < 2
+        assert outcomes["slow"].status == "timeout"
+        assert outcomes["after"].ok and outcomes["after"].value is None
+
+    def test_cancellation_stops_pending_nodes(self):
+        cancel = threading.Event()
+        blocker = threading.Event()
+
+        def first():
+            cancel.set()
+            blocker.wait(5)
+
+        graph = TaskGraph().add("first", first).add("second", lambda first: "ran", deps=("first",))
+        outcomes = graph.run(cancel_event=cancel)
+        blocker.set()
+
+        assert outcomes["first"].status == "cancelled"
+        assert outcomes["second"].status == "cancelled"
+        assert outcomes["second"].started_at is None
+
+    def test_rejects_cycles_and_unknown_dependencies(self):
+        cyclic = TaskGraph().add("a", lambda b: b, deps=("b",)).add("b", lambda a: a, deps=("a",))
+        with pytest.raises(TaskGraphError):
+            cyclic.run()
+        with pytest.raises(TaskGraphError):
+            TaskGraph().add("a", lambda missing: missing, deps=("missing",)).run()
+
+    def test_outcome_timings_skip_unstarted_nodes(self):
+        outcomes = TaskGraph().add("git", lambda: 1).add("code", lambda: 2).run()
+
+        labels = [label for label, _ in outcome_timings(outcomes, prefix="Analysis: ")]
+        assert sorted(labels) == ["Analysis: code", "Analysis: git"]
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+# Ensure backend/src is importable
+backend_src = Path(__file__).parent.parent / "backend" / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.token_verifier import TokenRejected, TokenVerifier
+
+SECRET = "test-jwt-secret-that-is-long-enough-for-hs256"
+
+
+def _mint(key=SECRET, algorithm="HS256", headers=None, **overrides):
+    now = int(time.time())
+    claims = {
+        "sub": "user-1",
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "role": "authenticated",
+        "iat": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+    return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+
+class RemoteStub:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, token):
+        self.calls += 1
+        return {"id": "remote-user", "email": "remote@example.com"}
+
+
+def _verify(verifier, token, remote):
+    return asyncio.run(verifier.verify(token, remote))
+
+
+class TestTokenVerifier:
+    def test_secret_signed_token_is_verified_locally_and_cached(self):
+        verifier = TokenVerifier("https://example.supabase.co", jwt_secret=SECRET)
+        remote = RemoteStub()
+        token = _mint()
+
+        user = _verify(verifier, token, remote)
+        assert user["id"] == "user-1"
+        assert user["email"] == "user@example.com"
+        assert _verify(verifier, token, remote)["id"] == "user-1"
+
+        assert remote.calls == 0
+        metrics = verifier.metrics.snapshot()
+        assert metrics["local"]["count"] == 1
+        assert metrics["cache"]["count"] == 1
+
+    def test_invalid_tokens_are_rejected_without_remote_call(self):
+        verifier = TokenVerifier("https://example.supabase.co", jwt_secret=SECRET)
+        remote = RemoteStub()
+
+        for token in (
+            _mint(exp=int(time.time()) - 60),
+            _mint(aud="someone-else"),
+            _mint(key="a-different-secret-that-is-also-long-enough"),
+        ):
+            with pytest.raises(TokenRejected):
+                _verify(verifier, token, remote)
+
+        assert remote.calls == 0
+        assert verifier.metrics.snapshot()["rejected"]["count"] == 3
+
+    def test_falls_back_to_remote_without_a_local_key(self):
+        verifier = TokenVerifier("https://example.supabase.co", jwt_secret=None)
+        remote = RemoteStub()
+        token = _mint()
+
+        assert _verify(verifier, token, remote)["id"] == "remote-user"
+        assert _verify(verifier, token, remote)["id"] == "remote-user"
+
+        assert remote.calls == 1
+        assert verifier.metrics.snapshot()["remote"]["count"] == 1
+
+    def test_cache_never_outlives_token_expiry(self):
+        verifier = TokenVerifier("https://example.supabase.co", jwt_secret=SECRET, leeway_sec=0)
+        token = _mint(exp=int(time.time()) + 1)
+
+        _verify(verifier, token, RemoteStub())
+        time.sleep(1.1)
+
+        with pytest.raises(TokenRejected):
+            _verify(verifier, token, RemoteStub())
+
+    def test_asymmetric_token_is_verified_against_cached_jwks(self):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        public_jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+        public_jwk.update({"kid": "key-1", "alg": "RS256", "use": "sig"})
+        fetches = []
+
+        async def fetch_jwks(url):
+            fetches.append(url)
+            return {"keys": [public_jwk]}
+
+        verifier = TokenVerifier("https://example.supabase.co", jwks_fetcher=fetch_jwks)
+        remote = RemoteStub()
+
+        first = _mint(key=private_key, algorithm="RS256", headers={"kid": "key-1"})
+        second = _mint(key=private_key, algorithm="RS256", headers={"kid": "key-1"}, sub="user-2")
+        assert _verify(verifier, first, remote)["id"] == "user-1"
+        assert _verify(verifier, second, remote)["id"] == "user-2"
+
+        assert fetches == ["https://example.supabase.co/auth/v1/.well-known/jwks.json"]
+        assert remote.calls == 0
+
+        # A token for a key the JWKS does not publish goes to Supabase.
+        rotated = _mint(key=private_key, algorithm="RS256", headers={"kid": "key-2"})
+        assert _verify(verifier, rotated, remote)["id"] == "remote-user"
+        assert remote.calls == 1
+
+
+def test_auth_dependency_rejects_locally_invalid_token(monkeypatch):
+    from api import dependencies
+    from services import token_verifier
+
+    monkeypatch.setattr(
+        token_verifier,
+        "_token_verifier",
+        TokenVerifier("https://example.supabase.co", jwt_secret=SECRET),
+    )
+
+    async def _unexpected_remote(token):
+        raise AssertionError("remote validation should not be needed")
+
+    monkeypatch.setattr(dependencies, "_fetch_user", _unexpected_remote)
+
+    context = asyncio.run(dependencies.get_auth_context(f"Bearer {_mint()}"))
+    assert context.user_id == "user-1"
+    assert context.email == "user@example.com"
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(dependencies.get_auth_context(f"Bearer {_mint(exp=int(time.time()) - 60)}"))
+    assert excinfo.value.status_code == 401
+
+
+def test_revocation_is_seen_by_other_processes(tmp_path):
+    from services.token_verifier import TokenRevocations
+
+    path = tmp_path / "queue.sqlite3"
+    api_process = TokenVerifier("https://example.supabase.co", jwt_secret=SECRET, revocations=TokenRevocations(path))
+    other_process = TokenVerifier("https://example.supabase.co", jwt_secret=SECRET, revocations=TokenRevocations(path))
+    token = _mint(session_id="session-1")
+    refreshed = _mint(session_id="session-1", sub="user-1", iat=int(time.time()) + 1)
+
+    assert _verify(other_process, token, RemoteStub())["id"] == "user-1"
+    api_process.revoke(token)
+
+    # Rejected before the other process's cache, and for every token of the session.
+    for revoked in (token, refreshed):
+        with pytest.raises(TokenRejected):
+            _verify(other_process, revoked, RemoteStub())
+    assert _verify(other_process, _mint(session_id="session-2"), RemoteStub())["id"] == "user-1"
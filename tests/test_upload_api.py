@@ -4,6 +4,7 @@ Tests POST /api/uploads, GET /api/uploads/{upload_id}, POST /api/uploads/{upload
 """
 
 import io
+import json
 import zipfile
 import tempfile
 from pathlib import Path
@@ -17,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "backend" / "src"))
 
 from main import app
 from api.upload_routes import verify_auth_token
+from security.rate_limit import limiter
 
 
 client = TestClient(app)
@@ -361,3 +363,116 @@ class TestParseEndpoint:
         # Verify files have same hash (more files than unique hashes = duplicates)
         hashes = [f["file_hash"] for f in data["files"]]
         assert len(hashes) > len(set(hashes))  # At least one duplicate
+
+
+class TestParsedFilesEndpoints:
+    """Tests for GET /api/uploads/{upload_id}/files and /files/stream"""
+
+    @pytest.fixture(autouse=True)
+    def reset_rate_limits(self):
+        """Upload/parse are rate limited per client; start each test with a clean budget"""
+        limiter.reset()
+        yield
+
+    def _upload_and_parse(self, zip_bytes):
+        upload_response = client.post(
+            "/api/uploads",
+            files={"file": ("test.zip", zip_bytes, "application/zip")}
+        )
+        upload_id = upload_response.json()["upload_id"]
+        parse_response = client.post(f"/api/uploads/{upload_id}/parse", json={})
+        assert parse_response.status_code == 200
+        return upload_id, parse_response.json()
+
+    def test_parse_reports_total_and_cursor(self, valid_zip_bytes, cleanup_uploads):
+        """Small archives fit in the first page, so there is no next cursor"""
+        _, data = self._upload_and_parse(valid_zip_bytes)
+
+        assert data["total_files"] == 3
+        assert data["next_cursor"] is None
+
+    def test_files_are_paged_with_cursor(self, valid_zip_bytes, cleanup_uploads):
+        """Walking the cursor returns every file exactly once"""
+        upload_id, _ = self._upload_and_parse(valid_zip_bytes)
+
+        first = client.get(f"/api/uploads/{upload_id}/files", params={"limit": 2})
+        assert first.status_code == 200
+        first_data = first.json()
+        assert first_data["total_files"] == 3
+        assert len(first_data["files"]) == 2
+        assert first_data["next_cursor"] is not None
+
+        second = client.get(
+            f"/api/uploads/{upload_id}/files",
+            params={"limit": 2, "cursor": first_data["next_cursor"]},
+        )
+        second_data = second.json()
+        assert len(second_data["files"]) == 1
+        assert second_data["next_cursor"] is None
+
+        paths = {f["path"] for f in first_data["files"] + second_data["files"]}
+        assert paths == {"test.py", "app.js", "README.md"}
+
+    def test_files_rejects_invalid_cursor(self, valid_zip_bytes, cleanup_uploads):
+        """Malformed cursors return 400"""
+        upload_id, _ = self._upload_and_parse(valid_zip_bytes)
+
+        response = client.get(f"/api/uploads/{upload_id}/files", params={"cursor": "abc"})
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "invalid_cursor"
+
+    def test_files_before_parse_returns_409(self, valid_zip_bytes, cleanup_uploads):
+        """Listing files of an unparsed upload is a conflict"""
+        upload_response = client.post(
+            "/api/uploads",
+            files={"file": ("test.zip", valid_zip_bytes, "application/zip")}
+        )
+        upload_id = upload_response.json()["upload_id"]
+
+        response = client.get(f"/api/uploads/{upload_id}/files")
+        assert response.status_code == 409
+        assert response.json()["detail"]["error"] == "not_parsed"
+
+    def test_files_stream_ndjson(self, valid_zip_bytes, cleanup_uploads):
+        """NDJSON stream emits one file per line"""
+        upload_id, _ = self._upload_and_parse(valid_zip_bytes)
+
+        response = client.get(f"/api/uploads/{upload_id}/files/stream")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [line for line in response.text.splitlines() if line]
+        assert len(lines) == 3
+        assert {json.loads(line)["path"] for line in lines} == {"test.py", "app.js", "README.md"}
+
+    def test_least_recently_used_result_is_evicted_with_410(self, valid_zip_bytes, cleanup_uploads, monkeypatch):
+        """Past the entry cap the oldest parse result is dropped and must be re-parsed"""
+        import api.upload_routes as upload_routes
+
+        monkeypatch.setattr(upload_routes, "PARSE_RESULTS_MAX_ENTRIES", 1)
+        first_id, _ = self._upload_and_parse(valid_zip_bytes)
+        second_id, _ = self._upload_and_parse(valid_zip_bytes)
+
+        assert client.get(f"/api/uploads/{second_id}/files").status_code == 200
+        response = client.get(f"/api/uploads/{first_id}/files")
+        assert response.status_code == 410
+        assert response.json()["detail"]["error"] == "parse_expired"
+
+        assert client.post(f"/api/uploads/{first_id}/parse", json={}).status_code == 200
+        assert client.get(f"/api/uploads/{first_id}/files").status_code == 200
+
+    def test_idle_result_expires_with_410(self, valid_zip_bytes, cleanup_uploads, monkeypatch):
+        """Parse results are dropped once idle past PARSE_RESULT_TTL_SECONDS"""
+        import api.upload_routes as upload_routes
+
+        upload_id, _ = self._upload_and_parse(valid_zip_bytes)
+        now = upload_routes.time.monotonic()
+        monkeypatch.setattr(
+            upload_routes.time,
+            "monotonic",
+            lambda: now + upload_routes.PARSE_RESULT_TTL_SECONDS + 1,
+        )
+
+        response = client.get(f"/api/uploads/{upload_id}/files/stream")
+        assert response.status_code == 410
+        assert upload_id not in upload_routes.parse_results_store